@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# benchmarks/bench_cache.py
+# CacheManager 性能基准
+# - 连接模式对比（每次新建连接 vs 线程长连接池 + WAL）
+# - OHLCV 批量写入吞吐（rows/s）
+# - Parquet 归档追加耗时与历史长度的关系
+# - 重复读取：SQLite vs 内存热点层
+# - v1 函数包裹列（全表扫描）vs v2 整数日期键（索引查找），含迁移耗时
+#
+# 用法：
+#   python benchmarks/bench_cache.py
+#   python benchmarks/bench_cache.py --threads 1 4 16 --ops 2000
+#   python benchmarks/bench_cache.py --symbols 500 --bars 3800
+#   python benchmarks/bench_cache.py --rows 10000000
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pstds.data.cache import CacheManager, HotCache
+from pstds.temporal.context import TemporalContext
+
+
+def _make_cache(tmpdir: str, pooled: bool, hot_cache: HotCache = None) -> CacheManager:
+    root = Path(tmpdir)
+    return CacheManager(
+        db_path=str(root / "bench.db"),
+        parquet_dir=str(root / "parquet"),
+        news_dir=str(root / "news"),
+        pooled=pooled,
+        hot_cache=hot_cache,
+    )
+
+
+def _run_threads(n_threads: int, target) -> float:
+    """并发运行 target(thread_idx)，返回总耗时（秒）"""
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(n_threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start
+
+
+def bench_connection_modes(thread_counts, ops_per_thread: int) -> None:
+    """基本面缓存单行读写：每秒操作数"""
+    as_of = date(2024, 1, 2)
+    ctx = TemporalContext.for_live(as_of)
+    payload = {"pe_ratio": 25.5, "pb_ratio": 3.2, "roe": 15.8, "data_source": "bench"}
+
+    print(f"{'mode':<10}{'threads':>8}{'writes/s':>14}{'reads/s':>14}")
+    for pooled in (False, True):
+        mode = "pooled" if pooled else "per-call"
+        for n_threads in thread_counts:
+            with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmpdir:
+                cache = _make_cache(tmpdir, pooled)
+
+                def writer(idx: int) -> None:
+                    for i in range(ops_per_thread):
+                        cache.set_fundamentals(f"S{idx}_{i % 50}", as_of, payload)
+
+                def reader(idx: int) -> None:
+                    for i in range(ops_per_thread):
+                        cache.get_fundamentals(f"S{idx}_{i % 50}", as_of, ctx)
+
+                total_ops = n_threads * ops_per_thread
+                write_secs = _run_threads(n_threads, writer)
+                read_secs = _run_threads(n_threads, reader)
+                cache.close()
+
+            print(
+                f"{mode:<10}{n_threads:>8}"
+                f"{total_ops / write_secs:>14,.0f}{total_ops / read_secs:>14,.0f}"
+            )
+
+
+def _make_history(n_bars: int) -> pd.DataFrame:
+    """生成 n_bars 根日线的随机行情"""
+    rng = np.random.default_rng(42)
+    close = 100 + rng.standard_normal(n_bars).cumsum()
+    return pd.DataFrame({
+        "date": pd.bdate_range("2010-01-01", periods=n_bars, tz="UTC"),
+        "open": close + rng.uniform(-1, 1, n_bars),
+        "high": close + 2,
+        "low": close - 2,
+        "close": close,
+        "volume": rng.integers(1_000_000, 5_000_000, n_bars),
+        "adj_close": close,
+        "data_source": "bench",
+    })
+
+
+def _legacy_row_insert(cache: CacheManager, symbol: str, df: pd.DataFrame) -> None:
+    """旧实现：iterrows 逐行 INSERT，每行取一次 fetched_at（仅用于对比）"""
+    from datetime import datetime, UTC
+
+    ttl_hours = 24
+    with cache._connection() as conn:
+        for _, row in df.iterrows():
+            fetched = datetime.now(UTC)
+            values = {
+                "symbol": symbol,
+                "date_key": cache._epoch_day(row["date"]),
+                "date": row["date"].isoformat(),
+                "open": row["open"],
+                "high": row["high"],
+                "low": row["low"],
+                "close": row["close"],
+                "volume": int(row["volume"]),
+                "adj_close": row["adj_close"],
+                "data_source": row["data_source"],
+                "fetched_at": fetched.isoformat(),
+                "ttl_hours": ttl_hours,
+                "expires_at": fetched.timestamp() + ttl_hours * 3600,
+            }
+            conn.execute(cache._OHLCV_UPSERT, tuple(values[c] for c in cache._OHLCV_COLUMNS))
+
+
+def bench_bulk_ingest(n_symbols: int, n_bars: int) -> None:
+    """OHLCV 批量写入：iterrows 逐行 vs 单事务 set_ohlcv_bulk"""
+    ctx = TemporalContext.for_backtest(date(2030, 1, 1))
+    history = _make_history(n_bars)
+    frames = {f"SYM{i:04d}": history for i in range(n_symbols)}
+    total_rows = n_symbols * n_bars
+
+    print(f"{'path':<18}{'rows':>12}{'seconds':>10}{'rows/s':>14}")
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmpdir:
+        cache = _make_cache(tmpdir, pooled=True)
+        start = time.perf_counter()
+        for symbol, df in frames.items():
+            _legacy_row_insert(cache, symbol, df)
+        secs = time.perf_counter() - start
+        cache.close()
+    print(f"{'iterrows (legacy)':<18}{total_rows:>12,}{secs:>10.2f}{total_rows / secs:>14,.0f}")
+
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmpdir:
+        cache = _make_cache(tmpdir, pooled=True)
+        stats = cache.set_ohlcv_bulk(frames, ctx)
+        cache.close()
+    print(f"{'set_ohlcv_bulk':<18}{stats['rows']:>12,}{stats['seconds']:>10.2f}{stats['rows_per_sec']:>14,.0f}")
+
+
+def bench_parquet_append(history_sizes, n_appends: int = 20) -> None:
+    """已有 N 根历史 K 线时，每次追加 1 根的平均耗时"""
+    print(f"{'history':>10}{'append ms':>12}")
+    for n_bars in history_sizes:
+        history = _make_history(n_bars + n_appends)
+        with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmpdir:
+            cache = _make_cache(tmpdir, pooled=True)
+            cache._append_parquet("SYM", history.iloc[:n_bars])
+            start = time.perf_counter()
+            for i in range(n_appends):
+                cache._append_parquet("SYM", history.iloc[n_bars + i:n_bars + i + 1])
+            secs = time.perf_counter() - start
+            cache.close()
+        print(f"{n_bars:>10,}{secs / n_appends * 1000:>12.2f}")
+
+
+def bench_hot_tier(n_reads: int = 500) -> None:
+    """同一窗口重复 get_ohlcv：仅 SQLite vs 内存热点层"""
+    ctx = TemporalContext.for_backtest(date(2030, 1, 1))
+    history = _make_history(500)
+    start_day, end_day = history["date"].iloc[0].date(), history["date"].iloc[-1].date()
+
+    print(f"{'tier':<10}{'reads/s':>14}")
+    for hot in (None, HotCache()):
+        with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmpdir:
+            cache = _make_cache(tmpdir, pooled=True, hot_cache=hot)
+            cache.set_ohlcv("SYM", history, ctx)
+            start = time.perf_counter()
+            for _ in range(n_reads):
+                cache.get_ohlcv("SYM", start_day, end_day, ctx)
+            secs = time.perf_counter() - start
+            cache.close()
+        print(f"{'sqlite' if hot is None else 'hot':<10}{n_reads / secs:>14,.0f}")
+        if hot is not None:
+            print(f"  {hot.stats()}")
+
+
+def _time_query(conn: sqlite3.Connection, sql: str, params: tuple, repeat: int) -> float:
+    """平均单次查询耗时（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        conn.execute(sql, params).fetchall()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def bench_scan_vs_seek(n_rows: int, n_symbols: int = 1000, repeat: int = 5) -> None:
+    """v1（date(date) 包裹列）与 v2（date_key / expires_at）在 n_rows 行上的查询耗时"""
+    from datetime import datetime, timedelta, UTC
+
+    bars_per_symbol = max(1, n_rows // n_symbols)
+    days = pd.bdate_range("1990-01-01", periods=bars_per_symbol, tz="UTC")
+    iso_days = [d.isoformat() for d in days]
+    fetched_at = (datetime.now(UTC) - timedelta(hours=1)).isoformat()
+    mid = days[len(days) // 2].date()
+    window = (mid, mid + timedelta(days=365))
+
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmpdir:
+        db_path = Path(tmpdir) / "bench.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE ohlcv_cache (
+                symbol TEXT, date TEXT, open REAL, high REAL, low REAL, close REAL,
+                volume INTEGER, adj_close REAL, data_source TEXT, fetched_at TEXT,
+                ttl_hours INTEGER DEFAULT 24, PRIMARY KEY (symbol, date))
+        """)
+        for i in range(n_symbols):
+            symbol = f"S{i:05d}"
+            conn.executemany(
+                "INSERT INTO ohlcv_cache VALUES (?, ?, 1, 2, 0.5, 1.5, 100, 1.5, 'bench', ?, 24)",
+                [(symbol, d, fetched_at) for d in iso_days],
+            )
+        conn.commit()
+        total = conn.execute("SELECT COUNT(*) FROM ohlcv_cache").fetchone()[0]
+        symbol = f"S{n_symbols // 2:05d}"
+
+        v1_range = _time_query(conn, """
+            SELECT * FROM ohlcv_cache
+            WHERE symbol = ? AND date(date) >= ? AND date(date) <= ? AND date(date) <= ?
+        """, (symbol, window[0], window[1], window[1]), repeat)
+        v1_expiry = _time_query(conn, """
+            SELECT COUNT(*) FROM ohlcv_cache
+            WHERE datetime(fetched_at) < datetime('now', '-' || ttl_hours || ' hours')
+        """, (), 1)
+        conn.close()
+
+        start = time.perf_counter()
+        cache = CacheManager(
+            db_path=str(db_path),
+            parquet_dir=str(Path(tmpdir) / "parquet"),
+            news_dir=str(Path(tmpdir) / "news"),
+        )
+        migrate_secs = time.perf_counter() - start
+
+        with cache._connection() as conn:
+            v2_range = _time_query(conn, """
+                SELECT * FROM ohlcv_cache WHERE symbol = ? AND date_key BETWEEN ? AND ?
+            """, (symbol, cache._epoch_day(window[0]), cache._epoch_day(window[1])), repeat)
+            v2_expiry = _time_query(conn, """
+                SELECT COUNT(*) FROM ohlcv_cache WHERE expires_at < ?
+            """, (datetime.now(UTC).timestamp(),), 1)
+        cache.close()
+
+    print(f"rows={total:,}  migration={migrate_secs:.1f}s")
+    print(f"{'query':<22}{'v1 scan ms':>14}{'v2 seek ms':>14}")
+    print(f"{'symbol + 1y range':<22}{v1_range:>14.2f}{v2_range:>14.2f}")
+    print(f"{'expired rows':<22}{v1_expiry:>14.2f}{v2_expiry:>14.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CacheManager 性能基准")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--ops", type=int, default=1000, help="每线程操作数")
+    parser.add_argument("--symbols", type=int, default=50, help="批量写入的股票数")
+    parser.add_argument("--bars", type=int, default=3800, help="每只股票的 K 线数（约 15 年日线）")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="扫描/查找对比的总行数")
+    args = parser.parse_args()
+
+    print("== 连接模式：单行读写吞吐 ==")
+    bench_connection_modes(args.threads, args.ops)
+
+    print("\n== OHLCV 批量写入吞吐 ==")
+    bench_bulk_ingest(args.symbols, args.bars)
+
+    print("\n== Parquet 归档追加（单根 K 线）==")
+    bench_parquet_append([1_000, 4_000, 16_000])
+
+    print("\n== 重复读取（500 根日线窗口）==")
+    bench_hot_tier()
+
+    print("\n== 全表扫描 vs 索引查找 ==")
+    bench_scan_vs_seek(args.rows)
+
+
+if __name__ == "__main__":
+    main()
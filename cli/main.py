@@ -23,12 +23,10 @@ from rich import box
 from rich.align import Align
 from rich.rule import Rule
 
-from tradingagents.graph.trading_graph import TradingAgentsGraph
 from tradingagents.default_config import DEFAULT_CONFIG
 from cli.models import AnalystType
 from cli.utils import *
 from cli.announcements import fetch_announcements, display_announcements
-from cli.stats_handler import StatsCallbackHandler
 
 console = Console()
 
@@ -897,6 +895,10 @@ def format_tool_args(args, max_length=80) -> str:
     return result
 
 def run_analysis():
+    # Deferred so `--help` and other commands don't pay for langchain/langgraph at startup
+    from tradingagents.graph.trading_graph import TradingAgentsGraph
+    from cli.stats_handler import StatsCallbackHandler
+
     # First get all user selections
     selections = get_user_selections()
 
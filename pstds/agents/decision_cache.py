@@ -0,0 +1,245 @@
+# pstds/agents/decision_cache.py
+# 决策缓存 - 输入指纹命中时跳过完整的多智能体分析
+
+import json
+import logging
+import re
+import threading
+from datetime import date
+from hashlib import sha256
+from typing import Any, Dict, Iterable, Optional
+
+import pandas as pd
+
+from pstds.agents.debate_referee import DebateQualityReport
+from pstds.agents.output_schemas import TradeDecision
+from pstds.data.cache import CacheManager
+
+logger = logging.getLogger(__name__)
+
+# 数据工具输出中的抓取时间行，每次调用都不同，计算摘要前剔除
+_VOLATILE_LINE = re.compile(r"^#\s*Data retrieved on:.*$", re.MULTILINE)
+
+
+class DecisionCache:
+    """
+    决策缓存
+
+    以确定性的输入指纹为键，将最终 TradeDecision 存入 CacheManager 的 decision_hash_cache 表。
+    指纹由 symbol、analysis_date、depth、分析师集合、模型配置和输入数据摘要组成，
+    任一项变化都会产生新指纹，旧结果自然失效。
+
+    只缓存成功的决策（insufficient_data=True 的结果不写入）。
+    """
+
+    # 指纹格式版本，指纹组成变化时递增使旧缓存全部失效
+    FINGERPRINT_VERSION = 2
+
+    # 影响决策结果的模型配置项（目录类配置不参与指纹）
+    MODEL_CONFIG_KEYS = (
+        "llm_provider",
+        "deep_think_llm",
+        "quick_think_llm",
+        "backend_url",
+        "google_thinking_level",
+        "openai_reasoning_effort",
+        "temperature",
+        "max_debate_rounds",
+        "max_risk_discuss_rounds",
+        "max_recur_limit",
+        "data_vendors",
+        "tool_vendors",
+        "min_debate_quality_score",
+    )
+
+    def __init__(self, cache: CacheManager, ttl_days: int = 7):
+        """
+        Args:
+            cache: 缓存管理器
+            ttl_days: 决策缓存有效天数
+        """
+        self.cache = cache
+        self.ttl_days = ttl_days
+
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "lookups": 0,
+            "hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "refreshed": 0,
+            "stores": 0,
+        }
+
+    @classmethod
+    def fingerprint(
+        cls,
+        symbol: str,
+        analysis_date: date,
+        depth: str,
+        analysts: Iterable[str],
+        model_config: Dict[str, Any],
+        input_digest: str,
+    ) -> str:
+        """
+        计算输入指纹
+
+        Args:
+            symbol: 股票代码
+            analysis_date: 分析基准日期
+            depth: 分析深度
+            analysts: 分析师列表（顺序无关）
+            model_config: 模型配置（只取 MODEL_CONFIG_KEYS 中的项）
+            input_digest: 输入数据摘要（见 digest_inputs）
+
+        Returns:
+            SHA-256 哈希字符串（前缀 "sha256:"，与 MongoStore.input_hash 格式一致）
+        """
+        hash_input = {
+            "version": cls.FINGERPRINT_VERSION,
+            "symbol": symbol.upper(),
+            "analysis_date": str(analysis_date),
+            "depth": depth,
+            "analysts": sorted(set(analysts)),
+            "model_config": {
+                key: model_config[key]
+                for key in cls.MODEL_CONFIG_KEYS
+                if model_config.get(key) is not None
+            },
+            "input_digest": input_digest,
+        }
+        hash_bytes = sha256(
+            json.dumps(hash_input, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        return f"sha256:{hash_bytes}"
+
+    @staticmethod
+    def digest_inputs(*parts: Any) -> str:
+        """
+        计算输入数据摘要
+
+        支持 DataFrame（按内容哈希）、字符串（剔除抓取时间行）、bytes、
+        以及可 JSON 序列化的 dict/list；None 视为空输入。
+        """
+        h = sha256()
+        for part in parts:
+            if part is None:
+                h.update(b"\x00none")
+            elif isinstance(part, pd.DataFrame):
+                h.update(b"\x00df")
+                h.update(",".join(map(str, part.columns)).encode("utf-8"))
+                h.update(pd.util.hash_pandas_object(part, index=False).values.tobytes())
+            elif isinstance(part, bytes):
+                h.update(b"\x00bytes")
+                h.update(part)
+            elif isinstance(part, str):
+                h.update(b"\x00str")
+                h.update(_VOLATILE_LINE.sub("", part).encode("utf-8"))
+            else:
+                h.update(b"\x00json")
+                h.update(json.dumps(part, sort_keys=True, default=str).encode("utf-8"))
+        return h.hexdigest()
+
+    def lookup(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        查询缓存决策
+
+        Returns:
+            命中时返回 {"final_trade_decision", "debate_quality_report", "cost_estimate"}，
+            未命中或缓存内容无法解析时返回 None
+        """
+        cached = self.cache.get_decision(fingerprint)
+        result = None
+        if cached is not None:
+            try:
+                report = cached.get("debate_quality_report")
+                result = {
+                    "final_trade_decision": TradeDecision.model_validate(cached["final_trade_decision"]),
+                    "debate_quality_report": DebateQualityReport.model_validate(report) if report else None,
+                    "cost_estimate": cached.get("cost_estimate"),
+                }
+            except Exception as e:
+                logger.warning(f"[DecisionCache] 缓存决策解析失败，按未命中处理: {e}")
+
+        with self._stats_lock:
+            self.stats["lookups"] += 1
+            self.stats["hits" if result is not None else "misses"] += 1
+        return result
+
+    def store(
+        self,
+        fingerprint: str,
+        trade_decision: TradeDecision,
+        debate_quality_report: Optional[DebateQualityReport] = None,
+        cost_estimate: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        写入决策缓存
+
+        Returns:
+            是否写入（数据不足的决策不缓存）
+        """
+        if trade_decision.insufficient_data:
+            return False
+
+        self.cache.set_decision(
+            fingerprint,
+            {
+                "final_trade_decision": trade_decision.model_dump(mode="json"),
+                "debate_quality_report": (
+                    debate_quality_report.model_dump(mode="json") if debate_quality_report else None
+                ),
+                "cost_estimate": cost_estimate,
+            },
+            ttl_days=self.ttl_days,
+        )
+        with self._stats_lock:
+            self.stats["stores"] += 1
+        return True
+
+    def record_bypass(self) -> None:
+        """记录一次跳过缓存（既不读也不写）"""
+        with self._stats_lock:
+            self.stats["bypassed"] += 1
+
+    def record_refresh(self) -> None:
+        """记录一次强制刷新（跳过读取，结果覆盖写入）"""
+        with self._stats_lock:
+            self.stats["refreshed"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取命中率统计"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats["hit_rate"] = stats["hits"] / stats["lookups"] if stats["lookups"] else 0.0
+        return stats
+
+
+# 全局决策缓存（单例）
+_global_decision_cache: Optional[DecisionCache] = None
+_global_lock = threading.Lock()
+
+
+def get_decision_cache() -> Optional[DecisionCache]:
+    """
+    获取全局决策缓存（单例，存于全局缓存管理器的 decision_hash_cache 表）
+
+    由配置 analysis.decision_cache 控制，有效期取 analysis.decision_cache_ttl_days。
+
+    Returns:
+        DecisionCache 实例，配置关闭时返回 None
+    """
+    from pstds.config import get_config
+    from pstds.data.cache import get_cache_manager
+
+    global _global_decision_cache
+    config = get_config()
+    if not config.get("analysis.decision_cache", True):
+        return None
+    with _global_lock:
+        if _global_decision_cache is None:
+            _global_decision_cache = DecisionCache(
+                get_cache_manager(),
+                ttl_days=config.get("analysis.decision_cache_ttl_days", 7),
+            )
+    return _global_decision_cache
@@ -1,19 +1,24 @@
 # pstds/agents/extended_graph.py
 # 扩展 TradingAgentsGraph - Phase 3 Task 3
 
+import logging
 import threading
-from typing import Dict, List, Optional, Any
-from datetime import date, datetime, UTC
+from typing import Callable, Dict, List, Optional, Any
+from datetime import date, datetime, timedelta, UTC
 from pydantic import ValidationError
 
 from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents.dataflows.run_memo import RunMemo, run_memo
 
 from pstds.temporal.context import TemporalContext
 from pstds.agents.debate_referee import DebateRefereeNode, DebateQualityReport
 from pstds.agents.output_schemas import TradeDecision, DataSource
+from pstds.agents.decision_cache import DecisionCache
 from pstds.llm.factory import create_llm
 from pstds.llm.cost_estimator import CostEstimator
 
+logger = logging.getLogger(__name__)
+
 
 class ExtendedTradingAgentsGraph(TradingAgentsGraph):
     # 类级别锁，保护 monkey-patch 操作的线程安全
@@ -26,14 +31,21 @@ class ExtendedTradingAgentsGraph(TradingAgentsGraph):
     2. 辩论裁判员节点
     3. Pydantic 输出校验
     4. 增强的 propagate 方法
+    5. 决策缓存：输入指纹命中时直接返回缓存决策，不调用任何 LLM
     """
 
+    # 默认输入摘要取数窗口（天）
+    DIGEST_PRICE_LOOKBACK_DAYS = 30
+    DIGEST_NEWS_LOOKBACK_DAYS = 7
+
     def __init__(
         self,
         selected_analysts=["market", "social", "news", "fundamentals"],
         debug=False,
         config: Optional[Dict[str, Any]] = None,
         min_debate_quality_score: float = 5.0,
+        decision_cache: Optional[DecisionCache] = None,
+        input_digest_fn: Optional[Callable[[str, TemporalContext], str]] = None,
     ):
         """
         初始化扩展图
@@ -43,7 +55,16 @@ class ExtendedTradingAgentsGraph(TradingAgentsGraph):
             debug: 调试模式
             config: 配置字典
             min_debate_quality_score: 最低辩论质量分阈值
+            decision_cache: 决策缓存（可选，未传入时不启用缓存；按配置创建见 get_decision_cache）
+            input_digest_fn: 输入数据摘要函数 (symbol, ctx) -> str（可选，
+                             默认取近期行情与新闻计算摘要）
         """
+        # 指纹需要分析师集合，父类不保存该参数
+        self.selected_analysts = list(selected_analysts)
+        self.min_debate_quality_score = min_debate_quality_score
+        self.decision_cache = decision_cache
+        self.input_digest_fn = input_digest_fn
+
         # 调用父类初始化
         super().__init__(
             selected_analysts=selected_analysts,
@@ -54,6 +75,9 @@ class ExtendedTradingAgentsGraph(TradingAgentsGraph):
         # 存储时间上下文
         self.ctx = None
 
+        # 最近一次 propagate 的工具调用记忆（每次调用新建，仅用于统计）
+        self._run_memo: Optional[RunMemo] = None
+
         # 辩论裁判员
         self.debate_referee = DebateRefereeNode(min_debate_quality_score)
 
@@ -158,15 +182,21 @@ class ExtendedTradingAgentsGraph(TradingAgentsGraph):
         trade_date: date,
         ctx: TemporalContext,
         depth: str = "L2",
+        use_cache: bool = True,
+        refresh_cache: bool = False,
     ) -> Dict[str, Any]:
         """
         重写 propagate 方法，接受 TemporalContext 参数
 
+        配置了 decision_cache 时先计算输入指纹，命中则直接返回缓存决策。
+
         Args:
             symbol: 股票代码
             trade_date: 交易日期
             ctx: 时间上下文
             depth: 分析深度
+            use_cache: False 时完全绕过决策缓存（不读不写）
+            refresh_cache: True 时跳过缓存读取，重新分析并覆盖缓存
 
         Returns:
             包含以下字段的字典：
@@ -176,10 +206,48 @@ class ExtendedTradingAgentsGraph(TradingAgentsGraph):
             - final_trade_decision: 最终决策（TradeDecision 对象）
             - debate_quality_report: 辩论质量报告
             - cost_estimate: 成本估算
+            - decision_cache_hit: 是否来自决策缓存
         """
+        # 每次调用新建工具调用记忆：本次运行内（含输入摘要取数与各分析师工具节点）
+        # 相同的数据请求只访问一次供应商，重复运行与 refresh_cache 总是取到新数据
+        self._run_memo = RunMemo(ctx.analysis_date, session_id=ctx.session_id)
+        with run_memo(memo=self._run_memo):
+            return self._propagate_in_session(
+                symbol, trade_date, ctx, depth, use_cache, refresh_cache
+            )
+
+    def _propagate_in_session(
+        self,
+        symbol: str,
+        trade_date: date,
+        ctx: TemporalContext,
+        depth: str,
+        use_cache: bool,
+        refresh_cache: bool,
+    ) -> Dict[str, Any]:
+        """propagate 主体，在本次运行的工具调用记忆生效期间执行"""
         # 存储时间上下文
         self.ctx = ctx
 
+        fingerprint = None
+        if self.decision_cache is not None:
+            if not use_cache:
+                self.decision_cache.record_bypass()
+            else:
+                fingerprint = self._compute_decision_fingerprint(symbol, ctx, depth)
+                if fingerprint is not None and refresh_cache:
+                    self.decision_cache.record_refresh()
+                elif fingerprint is not None:
+                    cached = self.decision_cache.lookup(fingerprint)
+                    if cached is not None:
+                        return {
+                            "symbol": symbol,
+                            "trade_date": trade_date,
+                            "analysis_date": ctx.analysis_date,
+                            **cached,
+                            "decision_cache_hit": True,
+                        }
+
         # BUG-002 修复：注入 TemporalContext 到原版 Agent 数据获取层
         self._inject_ctx_to_agents(ctx)
 
@@ -222,6 +290,11 @@ class ExtendedTradingAgentsGraph(TradingAgentsGraph):
             model=self.config.get("deep_think_llm", "unknown")
         )
 
+        if fingerprint is not None:
+            self.decision_cache.store(
+                fingerprint, trade_decision, debate_quality_report, cost_estimate
+            )
+
         return {
             "symbol": symbol,
             "trade_date": trade_date,
@@ -229,8 +302,76 @@ class ExtendedTradingAgentsGraph(TradingAgentsGraph):
             "final_trade_decision": trade_decision,
             "debate_quality_report": debate_quality_report,
             "cost_estimate": cost_estimate,
+            "decision_cache_hit": False,
         }
 
+    def _compute_decision_fingerprint(
+        self,
+        symbol: str,
+        ctx: TemporalContext,
+        depth: str,
+    ) -> Optional[str]:
+        """
+        计算决策缓存指纹
+
+        输入数据摘要获取失败时返回 None，本次分析不读写缓存。
+        """
+        try:
+            if self.input_digest_fn is not None:
+                input_digest = self.input_digest_fn(symbol, ctx)
+            else:
+                input_digest = self._default_input_digest(symbol, ctx)
+        except Exception as e:
+            logger.warning(f"[ExtendedTradingAgentsGraph] 输入摘要计算失败，跳过决策缓存: {e}")
+            return None
+
+        model_config = dict(self.config)
+        model_config["min_debate_quality_score"] = self.min_debate_quality_score
+        return DecisionCache.fingerprint(
+            symbol=symbol,
+            analysis_date=ctx.analysis_date,
+            depth=depth,
+            analysts=self.selected_analysts,
+            model_config=model_config,
+            input_digest=input_digest,
+        )
+
+    def _default_input_digest(self, symbol: str, ctx: TemporalContext) -> str:
+        """
+        默认输入摘要：analysis_date 之前的近期行情与新闻
+
+        与 Agent 工具走同一 route_to_vendor，日期均不超过 analysis_date。
+        LIVE 模式下新增行情或新闻会改变摘要，从而触发重新分析。
+        """
+        from tradingagents.dataflows.interface import route_to_vendor
+
+        end = ctx.analysis_date
+        price = route_to_vendor(
+            "get_stock_data",
+            symbol,
+            (end - timedelta(days=self.DIGEST_PRICE_LOOKBACK_DAYS)).isoformat(),
+            end.isoformat(),
+        )
+        news = route_to_vendor(
+            "get_news",
+            symbol,
+            (end - timedelta(days=self.DIGEST_NEWS_LOOKBACK_DAYS)).isoformat(),
+            end.isoformat(),
+        )
+        return DecisionCache.digest_inputs(price, news)
+
+    def get_run_memo_stats(self) -> Optional[Dict[str, Any]]:
+        """获取最近一次 propagate 的工具调用记忆命中统计（尚未运行时返回 None）"""
+        if self._run_memo is None:
+            return None
+        return self._run_memo.get_stats()
+
+    def get_decision_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """获取决策缓存命中率统计（未启用缓存时返回 None）"""
+        if self.decision_cache is None:
+            return None
+        return self.decision_cache.get_stats()
+
     def _convert_to_trade_decision(
         self,
         state: Dict[str, Any],
@@ -6,19 +6,22 @@ from datetime import date, datetime, timedelta
 import pandas as pd
 from pathlib import Path
 
-try:
-    import pandas_market_calendars as mcal
-    MCAL_AVAILABLE = True
-except ImportError:
-    MCAL_AVAILABLE = False
-    mcal = None
+from pstds.lazy import module_available, optional_import
 
-try:
-    import akshare as ak
-    AKSHARE_AVAILABLE = True
-except ImportError:
-    AKSHARE_AVAILABLE = False
-    ak = None
+# 可选依赖只检查是否安装，首次使用时才导入（导入 akshare / pandas_market_calendars 需要数秒）
+MCAL_AVAILABLE = module_available("pandas_market_calendars")
+AKSHARE_AVAILABLE = module_available("akshare")
+
+# 模块属性 mcal / ak 按需导入（PEP 562），未安装时为 None
+_OPTIONAL_MODULES = {"mcal": "pandas_market_calendars", "ak": "akshare"}
+
+
+def __getattr__(name: str):
+    if name in _OPTIONAL_MODULES:
+        module = optional_import(_OPTIONAL_MODULES[name])
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class TradingCalendar:
@@ -62,6 +65,8 @@ class TradingCalendar:
             print("pandas_market_calendars 未安装，仅支持 A 股（使用 AKShare）")
             return None
 
+        import pandas_market_calendars as mcal
+
         # 创建日历实例
         if market_type == "US":
             cal = mcal.get_calendar('NYSE')
@@ -102,6 +107,8 @@ class TradingCalendar:
             return []
 
         try:
+            import akshare as ak
+
             # 获取交易日历
             df = ak.tool_trade_date_hist_sina(f"{year}")
             if df is not None and not df.empty:
@@ -191,6 +198,22 @@ class TradingCalendar:
 
         return sorted(trading_days)
 
+    def is_available(self, market_type: str = "US") -> bool:
+        """
+        检查该市场的交易日历是否可用
+
+        不可用时 get_trading_days 返回空列表，调用方应自行降级（如按工作日估算）。
+
+        Args:
+            market_type: 市场类型
+
+        Returns:
+            日历数据源是否可用
+        """
+        if market_type == "CN_A":
+            return AKSHARE_AVAILABLE or any(self.cache_dir.glob("cn_a_trading_days_*.json"))
+        return self._get_calendar(market_type) is not None
+
     def is_trading_day(self, check_date: date, market_type: str = "US") -> bool:
         """
         检查指定日期是否为交易日
@@ -13,7 +13,6 @@ from pstds.backtest.executor import SignalExecutor
 from pstds.backtest.performance import PerformanceCalculator
 from pstds.storage.mongo_store import MongoStore
 from pstds.agents.output_schemas import TradeDecision
-from pstds.agents.extended_graph import ExtendedTradingAgentsGraph
 
 
 class BacktestRunner:
@@ -32,6 +31,7 @@ class BacktestRunner:
         slippage_bps: int = 5,
         mongo_store: Optional[MongoStore] = None,
         save_snapshots: bool = True,
+        router=None,
     ):
         """
         初始化回测运行器
@@ -43,8 +43,10 @@ class BacktestRunner:
             slippage_bps: 滑点（bps）
             mongo_store: MongoDB 存储实例（可选）
             save_snapshots: 是否保存每日快照到 MongoDB
+            router: DataRouter 实例（可选，默认使用共享适配器注册表与全局缓存）
         """
         self.initial_capital = initial_capital
+        self._router = router
         self.mongo_store = mongo_store
         self.save_snapshots = save_snapshots
 
@@ -67,6 +69,15 @@ class BacktestRunner:
         # 每日快照
         self.daily_snapshots: List[Dict] = []
 
+    @property
+    def router(self):
+        """数据路由器（适配器实例来自进程级注册表，行情经全局缓存增量获取，多次回测之间复用）"""
+        if self._router is None:
+            from pstds.data.cache import get_cache_manager
+            from pstds.data.router import DataRouter
+            self._router = DataRouter(cache=get_cache_manager())
+        return self._router
+
     def run(
         self,
         symbol: str,
@@ -107,7 +118,10 @@ class BacktestRunner:
         # 初始化扩展图（如果没有提供决策回调）
         graph = None
         if decision_callback is None:
-            graph = ExtendedTradingAgentsGraph()
+            # 延迟导入：图依赖 langchain / langgraph，仅在需要 LLM 决策时加载
+            from pstds.agents.decision_cache import get_decision_cache
+            from pstds.agents.extended_graph import ExtendedTradingAgentsGraph
+            graph = ExtendedTradingAgentsGraph(decision_cache=get_decision_cache())
 
         # 重置组合
         self.portfolio.reset()
@@ -276,8 +290,6 @@ class BacktestRunner:
         if not dates:
             return {}
 
-        from pstds.data.router import DataRouter
-
         start_date = dates[0]
         end_date = dates[-1]
 
@@ -285,10 +297,8 @@ class BacktestRunner:
         ctx = TemporalContext.for_live(end_date)
 
         try:
-            router = DataRouter()
-            adapter = router.get_adapter(symbol, ctx=ctx)
-
-            df = adapter.get_ohlcv(
+            # 经路由器的缓存读取路径：已缓存的区间不再请求，主源失败时自动降级
+            df = self.router.get_ohlcv(
                 symbol=symbol,
                 start_date=start_date,
                 end_date=end_date,
@@ -296,7 +306,7 @@ class BacktestRunner:
                 ctx=ctx,
             )
 
-            if df.empty:
+            if df is None or df.empty:
                 print(f"警告: {symbol} 在 {start_date}~{end_date} 无价格数据，回测将跳过所有交易日")
                 return {}
 
@@ -1,11 +1,9 @@
 # pstds/data/adapters/__init__.py
-# 数据适配器模块导出
+# 数据适配器模块导出（延迟导入：访问导出名时才加载对应子模块及其 SDK）
 
-from .base import MarketDataAdapter
-from .yfinance_adapter import YFinanceAdapter
-from .akshare_adapter import AKShareAdapter
-from .alphavantage_adapter import AlphaVantageAdapter
-from .local_csv_adapter import LocalCSVAdapter
+from typing import TYPE_CHECKING
+
+from pstds.lazy import lazy_exports
 
 __all__ = [
     "MarketDataAdapter",
@@ -13,4 +11,31 @@ __all__ = [
     "AKShareAdapter",
     "AlphaVantageAdapter",
     "LocalCSVAdapter",
-]
\ No newline at end of file
+    "SingleFlight",
+    "SingleFlightAdapter",
+    "get_singleflight",
+    "AdapterRegistry",
+    "get_adapter_registry",
+]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "MarketDataAdapter": ".base",
+    "YFinanceAdapter": ".yfinance_adapter",
+    "AKShareAdapter": ".akshare_adapter",
+    "AlphaVantageAdapter": ".alphavantage_adapter",
+    "LocalCSVAdapter": ".local_csv_adapter",
+    "SingleFlight": ".singleflight",
+    "SingleFlightAdapter": ".singleflight",
+    "get_singleflight": ".singleflight",
+    "AdapterRegistry": ".registry",
+    "get_adapter_registry": ".registry",
+})
+
+if TYPE_CHECKING:  # pragma: no cover - 仅供静态类型检查
+    from .base import MarketDataAdapter
+    from .yfinance_adapter import YFinanceAdapter
+    from .akshare_adapter import AKShareAdapter
+    from .alphavantage_adapter import AlphaVantageAdapter
+    from .local_csv_adapter import LocalCSVAdapter
+    from .singleflight import SingleFlight, SingleFlightAdapter, get_singleflight
+    from .registry import AdapterRegistry, get_adapter_registry
@@ -1,17 +1,114 @@
 # pstds/data/adapters/akshare_adapter.py
 # AKShare 数据适配器 - ISD v1.0 Section 4.1
 
+import threading
+import time
 import akshare as ak
 import pandas as pd
-from typing import List, Literal
+from typing import Callable, Dict, List, Literal, Optional
 from datetime import date, datetime, UTC
 
 from pstds.temporal.context import TemporalContext
 from pstds.temporal.guard import TemporalGuard, RealtimeAPIBlockedError
 from pstds.data.adapters.base import MarketDataAdapter
+from pstds.data.adapters.batch import fan_out_ohlcv
 from pstds.data.models import NewsItem, MarketType
 
 
+# 港股全市场快照缓存时间（秒）
+HK_SPOT_TTL_SECONDS = 300
+
+
+class SpotSnapshot:
+    """
+    全市场行情快照（TTL 缓存）
+
+    一次下载即包含全市场所有股票，TTL 内所有股票的查询共用同一份数据，按代码索引查找；
+    并发刷新时只有一个线程下载，其余线程等待并复用其结果。下载失败不缓存。
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], pd.DataFrame],
+        key_column: str = "代码",
+        ttl_seconds: float = HK_SPOT_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            loader: 全市场快照下载函数
+            key_column: 股票代码列名
+            ttl_seconds: 缓存有效期（秒）
+            clock: 时钟函数（测试可替换）
+        """
+        self._loader = loader
+        self.key_column = key_column
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._frame: Optional[pd.DataFrame] = None
+        self._loaded_at = 0.0
+        self.loads = 0
+
+    def _fresh(self) -> bool:
+        return self._frame is not None and self._clock() - self._loaded_at < self.ttl_seconds
+
+    def get(self) -> pd.DataFrame:
+        """当前快照（以代码为索引），过期时重新下载"""
+        if self._fresh():
+            return self._frame
+        with self._lock:
+            if not self._fresh():
+                df = self._loader()
+                if df is None or df.empty:
+                    raise ValueError("行情快照为空")
+                self._frame = df.assign(**{self.key_column: df[self.key_column].astype(str)}).set_index(
+                    self.key_column, drop=False
+                )
+                self._loaded_at = self._clock()
+                self.loads += 1
+            return self._frame
+
+    def lookup(self, code: str) -> Optional[dict]:
+        """单只股票的快照行，不存在时返回 None"""
+        frame = self.get()
+        if code not in frame.index:
+            return None
+        row = frame.loc[code]
+        if isinstance(row, pd.DataFrame):
+            row = row.iloc[0]
+        return row.to_dict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frame = None
+            self._loaded_at = 0.0
+
+
+# 港股全市场快照（进程级共享，单例）
+_hk_spot_snapshot: Optional[SpotSnapshot] = None
+_hk_spot_snapshot_lock = threading.Lock()
+
+
+def get_hk_spot_snapshot() -> SpotSnapshot:
+    """
+    获取港股全市场快照缓存（单例）
+
+    Returns:
+        SpotSnapshot 实例（数据来自 ak.stock_hk_spot_em）
+    """
+    global _hk_spot_snapshot
+    with _hk_spot_snapshot_lock:
+        if _hk_spot_snapshot is None:
+            _hk_spot_snapshot = SpotSnapshot(lambda: ak.stock_hk_spot_em())
+    return _hk_spot_snapshot
+
+
+def _hk_code(symbol: str) -> str:
+    """0700.HK → 00700（东方财富港股代码为 5 位）"""
+    return symbol.replace(".HK", "").zfill(5)
+
+
 class AKShareAdapter:
     """
     AKShare 数据适配器
@@ -19,6 +116,9 @@ class AKShareAdapter:
     主要用于 A 股和港股数据获取。
     """
 
+    # get_ohlcv_batch 并发上限
+    BATCH_MAX_WORKERS = 4
+
     def __init__(self):
         self.name = "akshare"
 
@@ -49,11 +149,12 @@ class AKShareAdapter:
 
         try:
             if symbol.endswith(".HK"):
-                # 港股接口
-                hk_code = symbol.replace(".HK", "")
+                # 港股接口：只拉取 [start_date, end_date]，增量补齐时不再重复下载全部历史
                 df = ak.stock_hk_hist(
-                    symbol=hk_code,
+                    symbol=_hk_code(symbol),
                     period="daily",
+                    start_date=start_date.strftime("%Y%m%d"),
+                    end_date=end_date.strftime("%Y%m%d"),
                     adjust="qfq"  # 前复权
                 )
             else:
@@ -84,9 +185,11 @@ class AKShareAdapter:
             }
             df = df.rename(columns=column_map)
 
-            # 确保 date 列为 datetime
+            # 确保 date 列为 datetime，并按请求区间截取
             if "date" in df.columns:
                 df["date"] = pd.to_datetime(df["date"], utc=True)
+                days = df["date"].dt.date
+                df = df[(days >= start_date) & (days <= end_date)].copy()
 
             # AKShare 没有复权价，使用收盘价
             df["adj_close"] = df["close"]
@@ -109,6 +212,26 @@ class AKShareAdapter:
                 "volume", "adj_close", "data_source"
             ])
 
+    def get_ohlcv_batch(
+        self,
+        symbols: List[str],
+        start_date: date,
+        end_date: date,
+        interval: Literal["1d", "1wk", "1mo"],
+        ctx: TemporalContext,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        批量获取 OHLCV 行情数据
+
+        AKShare 无多股票历史行情接口，有界并发逐只获取（BATCH_MAX_WORKERS）
+        """
+        TemporalGuard.validate_timestamp(end_date, ctx, f"{self.name}.get_ohlcv_batch")
+        return fan_out_ohlcv(
+            lambda symbol: self.get_ohlcv(symbol, start_date, end_date, interval, ctx),
+            symbols,
+            max_workers=self.BATCH_MAX_WORKERS,
+        )
+
     def get_fundamentals(
         self,
         symbol: str,
@@ -125,10 +248,11 @@ class AKShareAdapter:
             TemporalGuard.assert_backtest_safe(ctx, f"{self.name}.get_fundamentals")
 
             if symbol.endswith(".HK"):
-                # 港股基本面数据
-                df = ak.stock_hk_spot_em()
-                if df.empty:
-                    raise ValueError("港股基本面数据不可用")
+                # 港股基本面数据：全市场快照 TTL 内共享，按代码取本股票所在行
+                row = get_hk_spot_snapshot().lookup(_hk_code(symbol))
+                if row is None:
+                    raise ValueError(f"港股基本面数据不可用: {symbol}")
+                df = pd.DataFrame([row])
             else:
                 # A股基本面数据
                 df = ak.stock_individual_info_em(symbol=symbol)
@@ -228,8 +352,7 @@ class AKShareAdapter:
         try:
             if symbol.endswith(".HK"):
                 # 港股检查
-                df = ak.stock_hk_spot_em()
-                return not df.empty
+                return get_hk_spot_snapshot().lookup(_hk_code(symbol)) is not None
             else:
                 # A股检查
                 df = ak.stock_individual_info_em(symbol=symbol)
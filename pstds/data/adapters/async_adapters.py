@@ -0,0 +1,115 @@
+# pstds/data/adapters/async_adapters.py
+# 异步数据适配器 - AsyncMarketDataAdapter 实现
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any, Dict, List, Literal, Optional
+
+import pandas as pd
+
+from pstds.data.adapters.singleflight import SingleFlightAdapter
+from pstds.data.models import NewsItem
+from pstds.temporal.context import TemporalContext
+
+
+# 同步 SDK 专用 I/O 线程池（单例）：与默认线程池隔离，避免阻塞型网络调用占满 CPU 任务线程
+_io_executor: Optional[ThreadPoolExecutor] = None
+_io_executor_lock = threading.Lock()
+
+
+def get_io_executor(max_workers: int = 32) -> ThreadPoolExecutor:
+    """
+    获取同步 SDK 调用使用的 I/O 线程池（单例）
+
+    Args:
+        max_workers: 首次创建时的线程数上限
+    """
+    global _io_executor
+    with _io_executor_lock:
+        if _io_executor is None:
+            _io_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pstds-io")
+    return _io_executor
+
+
+class ExecutorAsyncAdapter:
+    """
+    同步适配器的异步包装
+
+    用于仅有同步 SDK 的数据源（yfinance、AKShare）以及本地文件（LocalCSV）：
+    调用在 I/O 线程池中执行，事件循环不被阻塞。
+    被包装的是 SingleFlightAdapter 时使用其 *_async 方法，异步调用方之间同样合并请求。
+    """
+
+    def __init__(self, adapter, executor: Optional[ThreadPoolExecutor] = None):
+        """
+        Args:
+            adapter: 同步 MarketDataAdapter
+            executor: 线程池（默认 get_io_executor()）
+        """
+        self._adapter = adapter
+        self._executor = executor
+
+    @property
+    def adapter(self):
+        """被包装的同步适配器"""
+        return self._adapter
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._adapter, item)
+
+    async def _run(self, method: str, *args) -> Any:
+        if isinstance(self._adapter, SingleFlightAdapter):
+            coalesced = getattr(self._adapter, f"{method}_async", None)
+            if coalesced is not None:
+                return await coalesced(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor or get_io_executor(),
+            functools.partial(getattr(self._adapter, method), *args),
+        )
+
+    async def get_ohlcv(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        interval: Literal["1d", "1wk", "1mo"],
+        ctx: TemporalContext,
+    ) -> pd.DataFrame:
+        return await self._run("get_ohlcv", symbol, start_date, end_date, interval, ctx)
+
+    async def get_ohlcv_batch(
+        self,
+        symbols: List[str],
+        start_date: date,
+        end_date: date,
+        interval: Literal["1d", "1wk", "1mo"],
+        ctx: TemporalContext,
+    ) -> Dict[str, pd.DataFrame]:
+        return await self._run("get_ohlcv_batch", symbols, start_date, end_date, interval, ctx)
+
+    async def get_fundamentals(
+        self,
+        symbol: str,
+        as_of_date: date,
+        ctx: TemporalContext,
+    ) -> dict:
+        return await self._run("get_fundamentals", symbol, as_of_date, ctx)
+
+    async def get_news(
+        self,
+        symbol: str,
+        days_back: int,
+        ctx: TemporalContext,
+    ) -> List[NewsItem]:
+        return await self._run("get_news", symbol, days_back, ctx)
+
+
+def to_async_adapter(adapter):
+    """同步适配器包装为 AsyncMarketDataAdapter；已是异步实现的原样返回"""
+    if asyncio.iscoroutinefunction(getattr(type(adapter), "get_ohlcv", None)):
+        return adapter
+    return ExecutorAsyncAdapter(adapter)
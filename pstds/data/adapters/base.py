@@ -1,7 +1,7 @@
 # pstds/data/adapters/base.py
 # MarketDataAdapter Protocol - ISD v1.0 Section 4
 
-from typing import Protocol, List, Literal
+from typing import Dict, Protocol, List, Literal
 from datetime import date
 import pandas as pd
 
@@ -43,6 +43,34 @@ class MarketDataAdapter(Protocol):
         """
         ...
 
+    def get_ohlcv_batch(
+        self,
+        symbols: List[str],
+        start_date: date,
+        end_date: date,
+        interval: Literal["1d", "1wk", "1mo"],
+        ctx: TemporalContext,  # 必填，时间隔离上下文
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        批量获取多只股票的 OHLCV 行情数据
+
+        数据源支持时使用原生批量请求，否则有界并发逐只获取
+        （pstds.data.adapters.batch.fan_out_ohlcv）。
+
+        Args:
+            symbols: 股票代码列表
+            start_date: 起始日期
+            end_date: 结束日期
+            interval: K线周期
+            ctx: 时间上下文（必填）
+
+        Returns:
+            {symbol: DataFrame}，每个 DataFrame 列名同 get_ohlcv；
+            获取失败的股票为空 DataFrame。需要长表时用 batch.to_long_format()
+            - 内部调用 TemporalGuard.validate_timestamp(end_date, ctx)
+        """
+        ...
+
     def get_fundamentals(
         self,
         symbol: str,
@@ -108,3 +136,45 @@ class MarketDataAdapter(Protocol):
             市场类型: "US", "CN_A", 或 "HK"
         """
         ...
+
+
+class AsyncMarketDataAdapter(Protocol):
+    """
+    异步市场数据适配器协议
+
+    方法语义与 MarketDataAdapter 相同，供 asyncio 调用方在单个事件循环中
+    保持大量请求在途。实现见 pstds.data.adapters.async_adapters：
+    - 有 REST 接口的数据源使用共享连接池的异步 HTTP 客户端
+    - 仅有同步 SDK 的数据源在有界 I/O 线程池中执行
+    """
+
+    name: str
+
+    async def get_ohlcv(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        interval: Literal["1d", "1wk", "1mo"],
+        ctx: TemporalContext,  # 必填，时间隔离上下文
+    ) -> pd.DataFrame:
+        """异步获取 OHLCV 行情数据，返回格式同 MarketDataAdapter.get_ohlcv"""
+        ...
+
+    async def get_fundamentals(
+        self,
+        symbol: str,
+        as_of_date: date,
+        ctx: TemporalContext,
+    ) -> dict:
+        """异步获取基本面数据，返回格式同 MarketDataAdapter.get_fundamentals"""
+        ...
+
+    async def get_news(
+        self,
+        symbol: str,
+        days_back: int,
+        ctx: TemporalContext,
+    ) -> List[NewsItem]:
+        """异步获取新闻数据，返回格式同 MarketDataAdapter.get_news"""
+        ...
@@ -0,0 +1,88 @@
+# pstds/data/adapters/batch.py
+# 多股票批量 OHLCV - 无原生批量接口的数据源使用有界并发扇出
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from pstds.temporal.context import TemporalContext
+
+OHLCV_COLUMNS = ["date", "open", "high", "low", "close", "volume", "adj_close", "data_source"]
+
+
+def empty_ohlcv() -> pd.DataFrame:
+    """标准列的空 OHLCV DataFrame"""
+    return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+
+def unique_symbols(symbols: Iterable[str]) -> List[str]:
+    """去重并保持顺序"""
+    return list(dict.fromkeys(symbols))
+
+
+def fan_out_ohlcv(
+    fetch_one: Callable[[str], pd.DataFrame],
+    symbols: Iterable[str],
+    max_workers: int = 8,
+) -> Dict[str, pd.DataFrame]:
+    """
+    有界并发逐只获取
+
+    Args:
+        fetch_one: 单只股票获取函数（失败时应返回空 DataFrame 或抛出异常）
+        symbols: 股票代码列表
+        max_workers: 最大并发数
+
+    Returns:
+        {symbol: DataFrame}，失败的股票为空 DataFrame
+    """
+    symbols = unique_symbols(symbols)
+    if not symbols:
+        return {}
+
+    def safe_fetch(symbol: str) -> pd.DataFrame:
+        try:
+            df = fetch_one(symbol)
+        except Exception as e:
+            print(f"Batch fetch {symbol} failed: {e}")
+            return empty_ohlcv()
+        return df if df is not None else empty_ohlcv()
+
+    if max_workers <= 1 or len(symbols) == 1:
+        return {symbol: safe_fetch(symbol) for symbol in symbols}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols)), thread_name_prefix="ohlcv-batch") as pool:
+        return dict(zip(symbols, pool.map(safe_fetch, symbols)))
+
+
+def filter_wide_by_date(wide: pd.DataFrame, ctx: TemporalContext) -> pd.DataFrame:
+    """
+    宽表时间隔离
+
+    对以日期为索引、每只股票占若干列的宽表，一次比较索引过滤掉 analysis_date
+    之后的行，所有股票的列同时生效，无需逐只过滤。
+    """
+    if wide.empty:
+        return wide
+    index = pd.DatetimeIndex(wide.index)
+    if index.tz is not None:
+        index = index.tz_convert("UTC")
+    keep = index.normalize().tz_localize(None) <= np.datetime64(ctx.analysis_date)
+    return wide[keep]
+
+
+def to_long_format(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    {symbol: DataFrame} 合并为长表，增加 symbol 列
+
+    Returns:
+        列为 ['symbol'] + OHLCV_COLUMNS，按 symbol、date 排序
+    """
+    parts = [df.assign(symbol=symbol) for symbol, df in frames.items() if df is not None and not df.empty]
+    if not parts:
+        return pd.DataFrame(columns=["symbol"] + OHLCV_COLUMNS)
+    long_df = pd.concat(parts, ignore_index=True)
+    columns = ["symbol"] + [c for c in OHLCV_COLUMNS if c in long_df.columns]
+    return long_df[columns].sort_values(["symbol", "date"], kind="stable").reset_index(drop=True)
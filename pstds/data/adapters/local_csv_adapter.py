@@ -1,17 +1,60 @@
 # pstds/data/adapters/local_csv_adapter.py
 # Local CSV 数据适配器 - ISD v1.0 Section 4.1
 
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+import numpy as np
 import pandas as pd
-from typing import List, Literal
-from datetime import date, datetime, UTC
+from typing import Dict, List, Literal, Optional
+from datetime import date, datetime, timedelta, UTC
 from pathlib import Path
 
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - 可选依赖
+    pa = None
+    feather = None
+
 from pstds.temporal.context import TemporalContext
 from pstds.temporal.guard import TemporalGuard
 from pstds.data.adapters.base import MarketDataAdapter
+from pstds.data.adapters.batch import OHLCV_COLUMNS, empty_ohlcv, fan_out_ohlcv
 from pstds.data.models import NewsItem
 
 
+# 解析结果缓存的文件数上限（LRU）
+PARSED_CACHE_SIZE = 512
+
+# 列式副本目录（位于 data_dir 下）；副本元数据记录源 CSV 的 mtime/size，CSV 变化后自动重建
+SIDECAR_DIR = ".columnar"
+
+
+@dataclass(frozen=True)
+class _ParsedPrices:
+    """按日期升序排好的行情与对应的 datetime64[ns] 日期索引（二分查找用）"""
+    signature: tuple
+    frame: pd.DataFrame
+    dates: np.ndarray
+
+
+_parsed_cache: "OrderedDict[Path, _ParsedPrices]" = OrderedDict()
+_parsed_cache_lock = threading.Lock()
+
+
+def clear_parsed_cache() -> None:
+    """清空进程内解析结果缓存"""
+    with _parsed_cache_lock:
+        _parsed_cache.clear()
+
+
+def _file_signature(path: Path) -> tuple:
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
 class LocalCSVAdapter:
     """
     Local CSV 数据适配器
@@ -20,6 +63,9 @@ class LocalCSVAdapter:
     用于回测场景，确保数据不可篡改。
     """
 
+    # get_ohlcv_batch 并发上限
+    BATCH_MAX_WORKERS = 8
+
     def __init__(self, data_dir: str = "./data/raw/prices"):
         self.name = "local_csv"
         self.data_dir = Path(data_dir)
@@ -38,55 +84,125 @@ class LocalCSVAdapter:
 
         读取 data/raw/prices/{symbol}.csv
         天然时间隔离：过滤 date > ctx.analysis_date 的行
+
+        解析结果按文件 mtime 缓存，重复读取只做二分查找与切片
         """
         csv_path = self.data_dir / f"{symbol}.csv"
 
-        if not csv_path.exists():
+        try:
+            parsed = self._load(csv_path)
+        except FileNotFoundError:
             print(f"LocalCSVAdapter: CSV file not found: {csv_path}")
-            return pd.DataFrame(columns=[
-                "date", "open", "high", "low", "close",
-                "volume", "adj_close", "data_source"
-            ])
+            return empty_ohlcv()
+        except Exception as e:
+            print(f"LocalCSVAdapter.get_ohlcv error: {e}")
+            return empty_ohlcv()
+
+        # 天然时间隔离（date 所在日 <= analysis_date）与日期范围在已排序的日期索引上二分查找
+        start_dt = np.datetime64(pd.Timestamp(start_date))
+        end_dt = np.datetime64(pd.Timestamp(end_date))
+        isolation_dt = np.datetime64(pd.Timestamp(ctx.analysis_date + timedelta(days=1)))
+        lo = np.searchsorted(parsed.dates, start_dt, side="left")
+        hi = min(
+            np.searchsorted(parsed.dates, end_dt, side="right"),
+            np.searchsorted(parsed.dates, isolation_dt, side="left"),
+        )
+        if hi <= lo:
+            return empty_ohlcv()
+        return parsed.frame.iloc[lo:hi].copy()
+
+    def _load(self, csv_path: Path) -> _ParsedPrices:
+        """
+        读取并解析行情文件
 
-        try:
+        进程内按 (mtime, size) 校验缓存；未命中时优先读取列式副本，副本缺失或过期则解析 CSV 并写出副本。
+        """
+        signature = _file_signature(csv_path)
+        with _parsed_cache_lock:
+            cached = _parsed_cache.get(csv_path)
+            if cached is not None and cached.signature == signature:
+                _parsed_cache.move_to_end(csv_path)
+                return cached
+
+        df = self._read_sidecar(csv_path, signature)
+        if df is None:
             df = pd.read_csv(csv_path)
+            self._write_sidecar(csv_path, signature, df)
+        parsed = self._prepare(df, signature)
+
+        with _parsed_cache_lock:
+            _parsed_cache[csv_path] = parsed
+            _parsed_cache.move_to_end(csv_path)
+            while len(_parsed_cache) > PARSED_CACHE_SIZE:
+                _parsed_cache.popitem(last=False)
+        return parsed
+
+    def _prepare(self, df: pd.DataFrame, signature: tuple) -> _ParsedPrices:
+        """转换日期、按日期排序并选出标准列，每个文件版本只执行一次"""
+        if "date" not in df.columns:
+            raise ValueError("CSV 缺少 date 列")
+        df = df.copy()
+        df["date"] = pd.to_datetime(df["date"], utc=True)
+        df = df.dropna(subset=["date"]).sort_values("date", kind="stable").reset_index(drop=True)
+        df["data_source"] = self.name
+        frame = df[[c for c in OHLCV_COLUMNS if c in df.columns]]
+        dates = frame["date"].dt.tz_convert(None).to_numpy(dtype="datetime64[ns]")
+        return _ParsedPrices(signature=signature, frame=frame, dates=dates)
+
+    def _sidecar_path(self, csv_path: Path) -> Path:
+        return csv_path.parent / SIDECAR_DIR / f"{csv_path.stem}.arrow"
+
+    def _read_sidecar(self, csv_path: Path, signature: tuple) -> Optional[pd.DataFrame]:
+        """读取列式副本（Feather/Arrow IPC），与源 CSV 版本不一致时返回 None"""
+        if feather is None:
+            return None
+        path = self._sidecar_path(csv_path)
+        if not path.exists():
+            return None
+        try:
+            table = feather.read_table(path, memory_map=True)
+            metadata = table.schema.metadata or {}
+            if metadata.get(b"pstds.source_signature") != repr(signature).encode():
+                return None
+            return table.to_pandas()
+        except Exception as e:
+            print(f"LocalCSVAdapter: sidecar read failed {path}: {e}")
+            return None
+
+    def _write_sidecar(self, csv_path: Path, signature: tuple, df: pd.DataFrame) -> None:
+        """把原始 CSV 内容写成列式副本（先写临时文件再原子替换），失败不影响本次读取"""
+        if feather is None:
+            return
+        path = self._sidecar_path(csv_path)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            metadata = dict(table.schema.metadata or {})
+            metadata[b"pstds.source_signature"] = repr(signature).encode()
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            feather.write_feather(table.replace_schema_metadata(metadata), tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"LocalCSVAdapter: sidecar write failed {path}: {e}")
 
-            # 确保 date 列为 datetime
-            if "date" in df.columns:
-                df["date"] = pd.to_datetime(df["date"], utc=True)
-
-            # 天然时间隔离：过滤 date > analysis_date 的行
-            analysis_date = ctx.analysis_date
-            df = df[df["date"].dt.date <= analysis_date]
-
-            # 进一步按日期范围过滤
-            if "date" in df.columns:
-                start_dt = pd.Timestamp(start_date, tz="UTC")
-                end_dt = pd.Timestamp(end_date, tz="UTC")
-                df = df[(df["date"] >= start_dt) & (df["date"] <= end_dt)]
-
-            if df.empty:
-                return pd.DataFrame(columns=[
-                    "date", "open", "high", "low", "close",
-                    "volume", "adj_close", "data_source"
-                ])
-
-            # 添加 data_source
-            df["data_source"] = self.name
-
-            # 确保列名和顺序
-            required_cols = ["date", "open", "high", "low", "close", "volume", "adj_close", "data_source"]
-            existing_cols = [c for c in required_cols if c in df.columns]
-            df = df[existing_cols]
-
-            return df
+    def get_ohlcv_batch(
+        self,
+        symbols: List[str],
+        start_date: date,
+        end_date: date,
+        interval: Literal["1d", "1wk", "1mo"],
+        ctx: TemporalContext,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        批量获取 OHLCV 行情数据
 
-        except Exception as e:
-            print(f"LocalCSVAdapter.get_ohlcv error: {e}")
-            return pd.DataFrame(columns=[
-                "date", "open", "high", "low", "close",
-                "volume", "adj_close", "data_source"
-            ])
+        本地文件读取，有界并发逐只获取（BATCH_MAX_WORKERS）；时间隔离同 get_ohlcv 按行过滤
+        """
+        return fan_out_ohlcv(
+            lambda symbol: self.get_ohlcv(symbol, start_date, end_date, interval, ctx),
+            symbols,
+            max_workers=self.BATCH_MAX_WORKERS,
+        )
 
     def get_fundamentals(
         self,
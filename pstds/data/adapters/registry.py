@@ -0,0 +1,201 @@
+# pstds/data/adapters/registry.py
+# 适配器注册表 - 进程级共享适配器实例，延迟构造，统一预热与关闭
+
+import atexit
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+def _yfinance():
+    from pstds.data.adapters.yfinance_adapter import YFinanceAdapter
+    return YFinanceAdapter()
+
+
+def _akshare():
+    from pstds.data.adapters.akshare_adapter import AKShareAdapter
+    return AKShareAdapter()
+
+
+def _local_csv():
+    from pstds.data.adapters.local_csv_adapter import LocalCSVAdapter
+    return LocalCSVAdapter()
+
+
+def _alphavantage():
+    from pstds.config import get_config
+    from pstds.data.adapters.alphavantage_adapter import AlphaVantageAdapter
+    return AlphaVantageAdapter(api_key=get_config().get_api_key("alpha_vantage"))
+
+
+# 默认适配器工厂（键为适配器 name）
+DEFAULT_FACTORIES: Dict[str, Callable[[], Any]] = {
+    "yfinance": _yfinance,
+    "akshare": _akshare,
+    "local_csv": _local_csv,
+    "alphavantage": _alphavantage,
+}
+
+
+class AdapterRegistry:
+    """
+    数据适配器注册表
+
+    按名称登记适配器工厂，首次 get() 时构造并在进程内复用：适配器内部的会话、缓存与
+    熔断统计因此跨调用、跨回测、跨页面保留。DataRouter 只是该注册表上的轻量视图。
+
+    - get(name) 默认返回同一个 SingleFlightAdapter 包装，singleflight=False 返回原始实例
+    - 构造失败（如缺少 API key）不缓存，异常原样抛出，下次 get() 重试
+    - warmup() 提前构造（SDK 导入等冷启动开销），并调用适配器自身的 warmup()（若有）
+    - close() 调用适配器自身的 close()（若有）并丢弃实例，之后的 get() 重新构造
+    """
+
+    def __init__(self, factories: Optional[Dict[str, Callable[[], Any]]] = None):
+        """
+        Args:
+            factories: {适配器名: 无参工厂}（默认 DEFAULT_FACTORIES）
+        """
+        self._factories = dict(DEFAULT_FACTORIES if factories is None else factories)
+        self._instances: Dict[str, Any] = {}
+        self._wrapped: Dict[str, Any] = {}
+        self._async: Dict[int, tuple] = {}
+        self._lock = threading.Lock()
+        # 每个名称一把构造锁：慢速构造（如导入 akshare）不阻塞其他适配器
+        self._build_locks: Dict[str, threading.Lock] = {}
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """登记（或替换）适配器工厂；已构造的同名实例被关闭并丢弃"""
+        with self._lock:
+            self._factories[name] = factory
+            adapter = self._drop(name)
+        if adapter is not None:
+            self._close_adapter(name, adapter)
+
+    def names(self) -> List[str]:
+        """已登记的适配器名"""
+        with self._lock:
+            return list(self._factories)
+
+    def loaded(self) -> List[str]:
+        """已构造的适配器名"""
+        with self._lock:
+            return list(self._instances)
+
+    def _build_lock(self, name: str) -> threading.Lock:
+        with self._lock:
+            return self._build_locks.setdefault(name, threading.Lock())
+
+    def get(self, name: str, singleflight: bool = True) -> Any:
+        """
+        获取适配器（首次调用时构造）
+
+        Args:
+            name: 适配器名
+            singleflight: 是否返回 SingleFlightAdapter 包装
+
+        Raises:
+            KeyError: 名称未登记
+        """
+        adapter = self._instances.get(name)
+        if adapter is None:
+            with self._build_lock(name):
+                adapter = self._instances.get(name)
+                if adapter is None:
+                    with self._lock:
+                        factory = self._factories.get(name)
+                    if factory is None:
+                        raise KeyError(f"未登记的数据适配器: {name}")
+                    adapter = factory()
+                    with self._lock:
+                        self._instances[name] = adapter
+        if not singleflight:
+            return adapter
+
+        wrapped = self._wrapped.get(name)
+        if wrapped is None or wrapped.adapter is not adapter:
+            from pstds.data.adapters.singleflight import SingleFlightAdapter
+
+            with self._lock:
+                wrapped = self._wrapped.get(name)
+                if wrapped is None or wrapped.adapter is not adapter:
+                    wrapped = self._wrapped[name] = SingleFlightAdapter(adapter)
+        return wrapped
+
+    def as_async(self, adapter: Any) -> Any:
+        """适配器的异步包装（每个实例只包装一次）"""
+        from pstds.data.adapters.async_adapters import to_async_adapter
+
+        with self._lock:
+            entry = self._async.get(id(adapter))
+            if entry is not None and entry[0] is adapter:
+                return entry[1]
+            wrapped = to_async_adapter(adapter)
+            self._async[id(adapter)] = (adapter, wrapped)
+            return wrapped
+
+    def warmup(self, names: Optional[Iterable[str]] = None) -> Dict[str, bool]:
+        """
+        预热适配器
+
+        Args:
+            names: 需要预热的适配器名（默认全部已登记的）
+
+        Returns:
+            {适配器名: 是否成功}
+        """
+        results = {}
+        for name in list(names) if names is not None else self.names():
+            try:
+                adapter = self.get(name, singleflight=False)
+                hook = getattr(adapter, "warmup", None)
+                if callable(hook):
+                    hook()
+                results[name] = True
+            except Exception as e:
+                print(f"AdapterRegistry: warmup {name} failed: {e}")
+                results[name] = False
+        return results
+
+    def _drop(self, name: str) -> Any:
+        """移除实例及其包装（调用方持有 self._lock）"""
+        adapter = self._instances.pop(name, None)
+        wrapped = self._wrapped.pop(name, None)
+        for adapter_obj in (adapter, wrapped):
+            if adapter_obj is not None:
+                self._async.pop(id(adapter_obj), None)
+        return adapter
+
+    @staticmethod
+    def _close_adapter(name: str, adapter: Any) -> None:
+        hook = getattr(adapter, "close", None)
+        if callable(hook):
+            try:
+                hook()
+            except Exception as e:
+                print(f"AdapterRegistry: close {name} failed: {e}")
+
+    def close(self) -> None:
+        """关闭并丢弃所有已构造的适配器"""
+        with self._lock:
+            closing = [(name, self._drop(name)) for name in list(self._instances)]
+        for name, adapter in closing:
+            self._close_adapter(name, adapter)
+
+
+# 全局适配器注册表（单例）
+_registry: Optional[AdapterRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_adapter_registry() -> AdapterRegistry:
+    """
+    获取进程级适配器注册表（单例，进程退出时关闭）
+
+    Returns:
+        AdapterRegistry 实例
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = AdapterRegistry()
+            atexit.register(_registry.close)
+    return _registry
@@ -0,0 +1,281 @@
+# pstds/data/adapters/singleflight.py
+# 请求合并（single-flight）- 并发的相同适配器调用只发起一次上游请求
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Literal, Optional, Tuple
+
+import pandas as pd
+
+from pstds.data.models import NewsItem
+from pstds.temporal.context import TemporalContext
+
+
+class SingleFlight:
+    """
+    请求合并组
+
+    同一 key 的请求在途时，后到的调用方等待首个请求（leader）的结果并共享，
+    不再重复发起。结果不做缓存：leader 完成后下一次调用重新发起请求。
+
+    在途表使用 concurrent.futures.Future，线程与 asyncio 调用方可以互相合并：
+    - do(): 线程调用，阻塞等待
+    - do_async(): 协程调用，非阻塞等待；leader 的同步函数在 I/O 线程池（get_io_executor）中执行
+
+    leader 抛出的异常同样传给所有等待方。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+        self.stats = {
+            "calls": 0,
+            "upstream_calls": 0,
+            "coalesced": 0,
+        }
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        """登记调用，返回 (在途 Future, 是否为 leader)"""
+        with self._lock:
+            self.stats["calls"] += 1
+            future = self._inflight.get(key)
+            if future is not None:
+                self.stats["coalesced"] += 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            self.stats["upstream_calls"] += 1
+            return future, True
+
+    def _finish(self, key: Hashable, future: Future, result: Any = None, error: BaseException = None) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        执行或加入同 key 的在途请求
+
+        Returns:
+            (结果, 是否为共享结果)；共享结果与 leader 返回的是同一对象
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result, False
+
+    async def do_async(
+        self,
+        key: Hashable,
+        fn: Callable[[], Any],
+    ) -> Tuple[Any, bool]:
+        """
+        协程版 do()
+
+        上游调用与调用方解耦：leader 或等待方被取消（对冲落败、超时）时只影响
+        其自身，上游调用继续执行到完成，结果照常交给其余等待方。
+
+        Args:
+            key: 合并键
+            fn: 同步函数（在 I/O 线程池中执行）或返回 awaitable 的函数
+        """
+        future, leader = self._join(key)
+        if leader:
+            self._start_upstream(key, future, fn)
+        # shield：取消当前调用方时不取消共享的 Future
+        result = await asyncio.shield(asyncio.wrap_future(future))
+        return result, not leader
+
+    def _start_upstream(self, key: Hashable, future: Future, fn: Callable[[], Any]) -> None:
+        """启动上游调用，完成时由回调结束共享 Future"""
+
+        def on_done(upstream) -> None:
+            if upstream.cancelled():
+                # 仅在线程池/事件循环关闭时发生；以普通异常结束，不向等待方传播取消
+                self._finish(key, future, error=RuntimeError(f"upstream call {key!r} was cancelled"))
+            elif upstream.exception() is not None:
+                self._finish(key, future, error=upstream.exception())
+            else:
+                self._finish(key, future, upstream.result())
+
+        try:
+            if asyncio.iscoroutinefunction(fn):
+                upstream = asyncio.ensure_future(fn())
+            else:
+                from pstds.data.adapters.async_adapters import get_io_executor
+
+                upstream = get_io_executor().submit(fn)
+        except Exception as e:
+            self._finish(key, future, error=e)
+            return
+        upstream.add_done_callback(on_done)
+
+    def inflight_count(self) -> int:
+        """当前在途请求数"""
+        with self._lock:
+            return len(self._inflight)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取合并统计
+
+        coalesced 即节省的上游调用次数
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        stats["saved_ratio"] = stats["coalesced"] / stats["calls"] if stats["calls"] else 0.0
+        return stats
+
+
+def _normalize(value: Any) -> Hashable:
+    """参数标准化为可哈希的合并键成分"""
+    if isinstance(value, TemporalContext):
+        # session_id 不影响返回数据，不同会话的相同请求可以合并
+        return ("ctx", value.analysis_date.isoformat(), value.mode)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, str):
+        return value.strip().upper()
+    return value
+
+
+def _share(value: Any) -> Any:
+    """共享结果返回副本，避免调用方之间互相修改"""
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+class SingleFlightAdapter:
+    """
+    MarketDataAdapter 请求合并包装
+
+    get_ohlcv / get_fundamentals / get_news 按 (适配器名, 方法, 标准化参数) 合并；
+    同名适配器的不同实例共享同一合并组中的在途请求。
+    *_async 方法供 asyncio 调用方使用，可与线程调用方互相合并。
+    其余属性（name、is_available 等）直接委托给被包装的适配器。
+    """
+
+    def __init__(self, adapter, group: Optional[SingleFlight] = None):
+        """
+        Args:
+            adapter: 被包装的 MarketDataAdapter
+            group: 合并组（默认使用进程级全局组）
+        """
+        self._adapter = adapter
+        self._group = group or get_singleflight()
+
+    @property
+    def adapter(self):
+        """被包装的适配器"""
+        return self._adapter
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._adapter, item)
+
+    def _key(self, method: str, args: tuple) -> tuple:
+        name = getattr(self._adapter, "name", type(self._adapter).__name__)
+        return (name, method) + tuple(_normalize(a) for a in args)
+
+    def _call(self, method: str, *args) -> Any:
+        result, shared = self._group.do(
+            self._key(method, args),
+            lambda: getattr(self._adapter, method)(*args),
+        )
+        return _share(result) if shared else result
+
+    async def _call_async(self, method: str, *args) -> Any:
+        result, shared = await self._group.do_async(
+            self._key(method, args),
+            lambda: getattr(self._adapter, method)(*args),
+        )
+        return _share(result) if shared else result
+
+    def get_ohlcv(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        interval: Literal["1d", "1wk", "1mo"],
+        ctx: TemporalContext,
+    ) -> pd.DataFrame:
+        return self._call("get_ohlcv", symbol, start_date, end_date, interval, ctx)
+
+    def get_fundamentals(
+        self,
+        symbol: str,
+        as_of_date: date,
+        ctx: TemporalContext,
+    ) -> dict:
+        return self._call("get_fundamentals", symbol, as_of_date, ctx)
+
+    def get_news(
+        self,
+        symbol: str,
+        days_back: int,
+        ctx: TemporalContext,
+    ) -> List[NewsItem]:
+        return self._call("get_news", symbol, days_back, ctx)
+
+    async def get_ohlcv_async(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        interval: Literal["1d", "1wk", "1mo"],
+        ctx: TemporalContext,
+    ) -> pd.DataFrame:
+        return await self._call_async("get_ohlcv", symbol, start_date, end_date, interval, ctx)
+
+    async def get_fundamentals_async(
+        self,
+        symbol: str,
+        as_of_date: date,
+        ctx: TemporalContext,
+    ) -> dict:
+        return await self._call_async("get_fundamentals", symbol, as_of_date, ctx)
+
+    async def get_news_async(
+        self,
+        symbol: str,
+        days_back: int,
+        ctx: TemporalContext,
+    ) -> List[NewsItem]:
+        return await self._call_async("get_news", symbol, days_back, ctx)
+
+
+# 全局合并组（单例）
+_global_group: Optional[SingleFlight] = None
+_global_lock = threading.Lock()
+
+
+def get_singleflight() -> SingleFlight:
+    """
+    获取进程级请求合并组（单例）
+
+    Returns:
+        SingleFlight 实例
+    """
+    global _global_group
+    with _global_lock:
+        if _global_group is None:
+            _global_group = SingleFlight()
+    return _global_group
@@ -3,12 +3,13 @@
 
 import yfinance as yf
 import pandas as pd
-from typing import List, Literal
+from typing import Dict, List, Literal
 from datetime import date, datetime, UTC
 
 from pstds.temporal.context import TemporalContext
 from pstds.temporal.guard import TemporalGuard, RealtimeAPIBlockedError
 from pstds.data.adapters.base import MarketDataAdapter
+from pstds.data.adapters.batch import empty_ohlcv, filter_wide_by_date, unique_symbols
 from pstds.data.models import NewsItem, MarketType
 
 
@@ -19,6 +20,9 @@ class YFinanceAdapter:
     主要用于美股数据获取，港股为备用源。
     """
 
+    # yf.download 单次请求的股票数上限
+    BATCH_CHUNK_SIZE = 100
+
     def __init__(self):
         self.name = "yfinance"
 
@@ -51,68 +55,134 @@ class YFinanceAdapter:
                 prepost=False,
             )
 
-            if df.empty:
-                # 返回空 DataFrame，不抛出异常（符合 ISD 规范）
-                return pd.DataFrame(columns=[
-                    "date", "open", "high", "low", "close",
-                    "volume", "adj_close", "data_source"
-                ])
-
-            # 标准化列名
-            df = df.reset_index()
-            # 映射 yfinance 列名到标准列名
-            column_map = {
-                "date": "date",
-                "datetime": "date",
-                "open": "open",
-                "high": "high",
-                "low": "low",
-                "close": "close",
-                "volume": "volume",
-                "adj close": "adj_close",
-                "adj_close": "adj_close",
-            }
-            df.columns = [column_map.get(col.lower(), col.lower()) for col in df.columns]
+            return self._standardize_history(df, ctx)
 
-            # 确保 date 列为 datetime（统一 UTC）
-            if "date" in df.columns:
-                df["date"] = pd.to_datetime(df["date"], utc=True)
+        except Exception as e:
+            # 记录错误日志，返回空 DataFrame
+            print(f"YFinanceAdapter.get_ohlcv error: {e}")
+            return pd.DataFrame(columns=[
+                "date", "open", "high", "low", "close",
+                "volume", "adj_close", "data_source"
+            ])
 
-            # BUG-001 修复：对 DataFrame 每行逐条过滤，防止 yfinance 返回超出
-            # end_date 的数据（盘后数据、end+Timedelta 导致的额外一天等）
-            if "date" in df.columns:
-                df = df[df["date"].dt.date <= ctx.analysis_date]
+    def _standardize_history(self, df: pd.DataFrame, ctx: TemporalContext) -> pd.DataFrame:
+        """yfinance history 结果标准化为 ISD 列格式，并按 analysis_date 过滤"""
+        if df.empty:
+            # 返回空 DataFrame，不抛出异常（符合 ISD 规范）
+            return pd.DataFrame(columns=[
+                "date", "open", "high", "low", "close",
+                "volume", "adj_close", "data_source"
+            ])
 
-            if df.empty:
-                return pd.DataFrame(columns=[
-                    "date", "open", "high", "low", "close",
-                    "volume", "adj_close", "data_source"
-                ])
+        # 标准化列名
+        df = df.reset_index()
+        # 映射 yfinance 列名到标准列名
+        column_map = {
+            "date": "date",
+            "datetime": "date",
+            "open": "open",
+            "high": "high",
+            "low": "low",
+            "close": "close",
+            "volume": "volume",
+            "adj close": "adj_close",
+            "adj_close": "adj_close",
+        }
+        df.columns = [column_map.get(col.lower(), col.lower()) for col in df.columns]
+
+        # 确保 date 列为 datetime（统一 UTC）
+        if "date" in df.columns:
+            df["date"] = pd.to_datetime(df["date"], utc=True)
+
+        # BUG-001 修复：对 DataFrame 每行逐条过滤，防止 yfinance 返回超出
+        # end_date 的数据（盘后数据、end+Timedelta 导致的额外一天等）
+        if "date" in df.columns:
+            df = df[df["date"].dt.date <= ctx.analysis_date]
+
+        if df.empty:
+            return pd.DataFrame(columns=[
+                "date", "open", "high", "low", "close",
+                "volume", "adj_close", "data_source"
+            ])
 
-            # 如果没有 adj_close，使用 close
-            if "adj_close" not in df.columns and "close" in df.columns:
-                df["adj_close"] = df["close"]
+        # 如果没有 adj_close，使用 close
+        if "adj_close" not in df.columns and "close" in df.columns:
+            df["adj_close"] = df["close"]
 
-            # 添加 data_source 列
-            df["data_source"] = self.name
+        # 添加 data_source 列
+        df["data_source"] = self.name
 
-            # 添加 fetched_at 列
-            df["fetched_at"] = datetime.now(UTC)
+        # 添加 fetched_at 列
+        df["fetched_at"] = datetime.now(UTC)
 
-            # 确保列名和顺序（只保留存在的列）
-            required_cols = ["date", "open", "high", "low", "close", "volume", "adj_close", "data_source"]
-            existing_cols = [c for c in required_cols if c in df.columns]
-            df = df[existing_cols]
+        # 确保列名和顺序（只保留存在的列）
+        required_cols = ["date", "open", "high", "low", "close", "volume", "adj_close", "data_source"]
+        existing_cols = [c for c in required_cols if c in df.columns]
+        df = df[existing_cols]
 
-            return df
+        return df
 
+    def get_ohlcv_batch(
+        self,
+        symbols: List[str],
+        start_date: date,
+        end_date: date,
+        interval: Literal["1d", "1wk", "1mo"],
+        ctx: TemporalContext,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        批量获取 OHLCV 行情数据
+
+        使用 yf.download 原生批量下载（每 BATCH_CHUNK_SIZE 只一次请求），
+        时间隔离先对整张宽表按日期索引一次过滤，再拆分为单只股票的标准 DataFrame
+        """
+        TemporalGuard.assert_backtest_safe(ctx, f"{self.name}.get_ohlcv_batch")
+        TemporalGuard.validate_timestamp(end_date, ctx, f"{self.name}.get_ohlcv_batch")
+
+        symbols = unique_symbols(symbols)
+        frames: Dict[str, pd.DataFrame] = {}
+        for i in range(0, len(symbols), self.BATCH_CHUNK_SIZE):
+            chunk = symbols[i:i + self.BATCH_CHUNK_SIZE]
+            try:
+                wide = yf.download(
+                    chunk,
+                    start=start_date,
+                    end=end_date + pd.Timedelta(days=1),  # yfinance 需要包含结束日
+                    interval=interval,
+                    auto_adjust=True,
+                    prepost=False,
+                    group_by="ticker",
+                    threads=True,
+                    progress=False,
+                )
+            except Exception as e:
+                print(f"YFinanceAdapter.get_ohlcv_batch error: {e}")
+                wide = None
+
+            if wide is None or wide.empty:
+                frames.update({symbol: empty_ohlcv() for symbol in chunk})
+                continue
+
+            wide = filter_wide_by_date(wide, ctx)
+            for symbol in chunk:
+                frames[symbol] = self._split_batch(wide, symbol, ctx)
+        return frames
+
+    def _split_batch(self, wide: pd.DataFrame, symbol: str, ctx: TemporalContext) -> pd.DataFrame:
+        """从 yf.download 宽表中取出单只股票并标准化"""
+        if isinstance(wide.columns, pd.MultiIndex):
+            if symbol not in wide.columns.get_level_values(0):
+                return empty_ohlcv()
+            df = wide[symbol]
+        else:
+            df = wide
+        # 宽表按所有股票的交易日对齐，停牌/未上市日期整行为 NaN
+        df = df.dropna(how="all")
+        try:
+            return self._standardize_history(df, ctx)
         except Exception as e:
-            # 记录错误日志，返回空 DataFrame
-            print(f"YFinanceAdapter.get_ohlcv error: {e}")
-            return pd.DataFrame(columns=[
-                "date", "open", "high", "low", "close",
-                "volume", "adj_close", "data_source"
-            ])
+            print(f"YFinanceAdapter.get_ohlcv_batch {symbol} error: {e}")
+            return empty_ohlcv()
 
     def get_fundamentals(
         self,
@@ -1,18 +1,179 @@
 # pstds/data/cache.py
 # SQLite 缓存管理器 - DDD v2.0 Section 3.3
 
+import logging
+import os
+import re
 import sqlite3
+import threading
+import time
+import numpy as np
 import pandas as pd
 import pyarrow as pa
+import pyarrow.dataset as ds
 import pyarrow.parquet as pq
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Callable, Tuple
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import date, datetime, timedelta, UTC
+from uuid import uuid4
 import json
 import hashlib
 
 from pstds.temporal.context import TemporalContext
 
+logger = logging.getLogger(__name__)
+
+_EPOCH_DATE = date(1970, 1, 1)
+
+# 中日韩文字：FTS5 默认 unicode61 分词器把连续的汉字视为一个词，索引与查询前按单字切分
+_CJK_CHAR = re.compile(r"([\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af])")
+
+
+def _segment_cjk(text: Optional[str]) -> Optional[str]:
+    """在每个中日韩字符两侧加空格，使其成为独立词元（查询时按短语匹配相邻单字）"""
+    if not text:
+        return text
+    return _CJK_CHAR.sub(r" \1 ", text)
+
+# Parquet 归档合并任务的默认触发时间：每周日 03:00
+PARQUET_COMPACTION_CRON = "0 3 * * SUN"
+
+
+class HotCache:
+    """
+    进程内热点缓存（LRU）
+
+    位于 SQLite 缓存之前，减少同一次分析中重复的 SQLite 查询与 DataFrame 构建。
+    - 键：(table, symbol, range, analysis_date)
+    - 容量：同时受条目数与估算字节数限制，超出时按 LRU 淘汰
+    - 过期：条目过期时间不晚于底层缓存行的 fetched_at + ttl_hours
+    - 失效：CacheManager 写入某表某 symbol 时清除对应条目
+
+    仅感知本进程内的写入；其他进程的写入最迟在条目 TTL 到期后可见。
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_ttl_seconds: Optional[float] = None,
+    ):
+        """
+        Args:
+            max_entries: 最大条目数
+            max_bytes: 最大估算字节数
+            max_ttl_seconds: 条目最长存活秒数（None 表示仅受底层 TTL 约束）
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_ttl_seconds = max_ttl_seconds
+
+        self._lock = threading.Lock()
+        # key -> (value, deadline_monotonic, nbytes)
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        # (table, symbol) -> {key}，用于写入时按 symbol 失效
+        self._by_symbol: Dict[tuple, set] = {}
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: tuple) -> Any:
+        """命中返回值，未命中或已过期返回 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, deadline, _ = entry
+            if time.monotonic() >= deadline:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: tuple, value: Any, expires_at: Optional[datetime], nbytes: int) -> None:
+        """
+        写入条目
+
+        Args:
+            key: (table, symbol, range, analysis_date)
+            value: 缓存值
+            expires_at: 底层缓存行的过期时间（UTC），None 表示不受底层 TTL 约束
+            nbytes: 估算字节数
+        """
+        ttl = self.max_ttl_seconds if self.max_ttl_seconds is not None else float("inf")
+        if expires_at is not None:
+            ttl = min(ttl, (expires_at - datetime.now(UTC)).total_seconds())
+        if ttl <= 0 or nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic() + ttl, nbytes)
+            self._by_symbol.setdefault(key[:2], set()).add(key)
+            self._bytes += nbytes
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, table: str, symbol: Optional[str] = None) -> None:
+        """清除某表（可限定 symbol）的全部条目"""
+        with self._lock:
+            if symbol is None:
+                groups = [g for g in self._by_symbol if g[0] == table]
+            else:
+                groups = [(table, symbol)]
+            for group in groups:
+                for key in list(self._by_symbol.get(group, ())):
+                    self._remove(key)
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        """清空全部条目（计数器保留）"""
+        with self._lock:
+            self._entries.clear()
+            self._by_symbol.clear()
+            self._bytes = 0
+
+    def _remove(self, key: tuple) -> None:
+        """调用方需持有锁"""
+        _, _, nbytes = self._entries.pop(key)
+        self._bytes -= nbytes
+        group = self._by_symbol.get(key[:2])
+        if group is not None:
+            group.discard(key)
+            if not group:
+                del self._by_symbol[key[:2]]
+
+    def stats(self) -> Dict[str, Any]:
+        """命中/未命中/淘汰计数与当前容量"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
 
 class CacheManager:
     """
@@ -26,18 +187,48 @@ class CacheManager:
     - decision_hash_cache (7天 TTL)
 
     读取缓存时 WHERE 条件包含时间隔离校验。
-    行情数据同时追加写入 Parquet 文件（原始数据不可篡改）。
+    行情数据同时追加写入按 symbol/year 分区的 Parquet 归档（原始数据不可篡改）。
+    新闻同时写入 news_archive 全文检索归档（FTS5，永久保存，按标题哈希去重）。
+
+    连接模式：
+    - 默认（pooled=False）：每次操作新建连接，用完即关闭
+    - 连接池模式（pooled=True）：每个线程持有一个长连接，启用 WAL 日志，
+      读写并发不再互相阻塞；语句缓存随连接复用（预编译语句）
+
+    可选传入 HotCache 作为内存热点层，读取先查内存，写入时使对应条目失效。
     """
 
+    # 连接池模式下每个连接执行的 PRAGMA（WAL + 性能调优）
+    POOL_PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",       # WAL 下 NORMAL 已保证一致性
+        "PRAGMA mmap_size=268435456",      # 256MB 内存映射读
+        "PRAGMA cache_size=-65536",        # 64MB 页缓存（负数单位为 KiB）
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA busy_timeout=5000",        # 写锁竞争时等待而非立即失败
+    )
+
+    # 每个连接缓存的预编译语句数量
+    STATEMENT_CACHE_SIZE = 256
+
     def __init__(
         self,
         db_path: str = "./data/cache.db",
         parquet_dir: str = "./data/raw/prices",
         news_dir: str = "./data/raw/news",
+        pooled: bool = False,
+        hot_cache: Optional[HotCache] = None,
     ):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
+        self.pooled = pooled
+        self._local = threading.local()
+        self._pool_lock = threading.Lock()
+        self._pool_connections: List[sqlite3.Connection] = []
+        self._parquet_lock = threading.Lock()
+        self.hot_cache = hot_cache
+
         self.parquet_dir = Path(parquet_dir)
         self.parquet_dir.mkdir(parents=True, exist_ok=True)
 
@@ -46,84 +237,350 @@ class CacheManager:
 
         self._init_db()
 
-    def _init_db(self) -> None:
-        """初始化数据库表结构"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+    def _open_connection(self) -> sqlite3.Connection:
+        """为连接池新建长连接并应用 PRAGMA"""
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,  # 允许 close() 在其他线程统一关闭
+            cached_statements=self.STATEMENT_CACHE_SIZE,
+        )
+        for pragma in self.POOL_PRAGMAS:
+            conn.execute(pragma)
+        self._register_functions(conn)
+        return conn
 
-            # ohlcv_cache 表
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS ohlcv_cache (
-                    symbol TEXT,
-                    date TEXT,
-                    open REAL,
-                    high REAL,
-                    low REAL,
-                    close REAL,
-                    volume INTEGER,
-                    adj_close REAL,
-                    data_source TEXT,
-                    fetched_at TEXT,
-                    ttl_hours INTEGER DEFAULT 24,
-                    PRIMARY KEY (symbol, date)
-                )
-            """)
+    @staticmethod
+    def _register_functions(conn: sqlite3.Connection) -> None:
+        """注册新闻全文索引触发器使用的 SQL 函数（每个连接都需注册）"""
+        conn.create_function("pstds_segment", 1, _segment_cjk, deterministic=True)
 
-            # fundamentals_cache 表
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS fundamentals_cache (
-                    symbol TEXT,
-                    as_of_date TEXT,
-                    data_json TEXT,
-                    fetched_at TEXT,
-                    ttl_hours INTEGER DEFAULT 24,
-                    PRIMARY KEY (symbol, as_of_date)
-                )
-            """)
+    def _get_pooled_connection(self) -> sqlite3.Connection:
+        """获取当前线程的长连接（不存在时创建）"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open_connection()
+            self._local.conn = conn
+            with self._pool_lock:
+                self._pool_connections.append(conn)
+        return conn
 
-            # news_cache 表
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS news_cache (
-                    symbol TEXT,
-                    published_at TEXT,
-                    title_hash TEXT,
-                    news_json TEXT,
-                    fetched_at TEXT,
-                    ttl_hours INTEGER DEFAULT 6,
-                    PRIMARY KEY (symbol, title_hash)
-                )
-            """)
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        获取数据库连接
 
-            # technical_cache 表
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS technical_cache (
-                    symbol TEXT,
-                    date TEXT,
-                    indicator TEXT,
-                    value REAL,
-                    fetched_at TEXT,
-                    ttl_hours INTEGER DEFAULT 24,
-                    PRIMARY KEY (symbol, date, indicator)
-                )
-            """)
+        with 块正常结束时提交事务，异常时回滚。
+        连接池模式下连接保留给当前线程复用，否则用完即关闭。
+        """
+        if self.pooled:
+            conn = self._get_pooled_connection()
+            with conn:
+                yield conn
+        else:
+            conn = sqlite3.connect(self.db_path)
+            self._register_functions(conn)
+            try:
+                with conn:
+                    yield conn
+            finally:
+                conn.close()
 
-            # decision_hash_cache 表
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS decision_hash_cache (
-                    input_hash TEXT PRIMARY KEY,
-                    result_json TEXT,
-                    created_at TEXT,
-                    ttl_days INTEGER DEFAULT 7
-                )
-            """)
+    # 缓存表结构版本（PRAGMA user_version）
+    # v1: 日期为 TEXT，查询用 date(...) 包裹列，过期判断在查询时计算
+    # v2: 整数 epoch-day 日期键 + 预计算 expires_at（epoch 秒），WITHOUT ROWID 聚簇主键
+    # v3: news_fts 索引内容按中日韩单字切分（触发器调用 pstds_segment），旧索引重建
+    SCHEMA_VERSION = 3
 
-            conn.commit()
+    _TABLES = {
+        "ohlcv_cache": """
+            CREATE TABLE IF NOT EXISTS ohlcv_cache (
+                symbol TEXT NOT NULL,
+                date_key INTEGER NOT NULL,
+                date TEXT,
+                open REAL,
+                high REAL,
+                low REAL,
+                close REAL,
+                volume INTEGER,
+                adj_close REAL,
+                data_source TEXT,
+                fetched_at TEXT,
+                ttl_hours INTEGER DEFAULT 24,
+                expires_at REAL,
+                PRIMARY KEY (symbol, date_key)
+            ) WITHOUT ROWID
+        """,
+        "fundamentals_cache": """
+            CREATE TABLE IF NOT EXISTS fundamentals_cache (
+                symbol TEXT NOT NULL,
+                as_of_key INTEGER NOT NULL,
+                as_of_date TEXT,
+                data_json TEXT,
+                fetched_at TEXT,
+                ttl_hours INTEGER DEFAULT 24,
+                expires_at REAL,
+                PRIMARY KEY (symbol, as_of_key)
+            ) WITHOUT ROWID
+        """,
+        "news_cache": """
+            CREATE TABLE IF NOT EXISTS news_cache (
+                symbol TEXT NOT NULL,
+                title_hash TEXT NOT NULL,
+                published_key INTEGER,
+                published_at TEXT,
+                news_json TEXT,
+                fetched_at TEXT,
+                ttl_hours INTEGER DEFAULT 6,
+                expires_at REAL,
+                PRIMARY KEY (symbol, title_hash)
+            )
+        """,
+        "technical_cache": """
+            CREATE TABLE IF NOT EXISTS technical_cache (
+                symbol TEXT NOT NULL,
+                indicator TEXT NOT NULL,
+                date_key INTEGER NOT NULL,
+                date TEXT,
+                value REAL,
+                fetched_at TEXT,
+                ttl_hours INTEGER DEFAULT 24,
+                expires_at REAL,
+                PRIMARY KEY (symbol, indicator, date_key)
+            ) WITHOUT ROWID
+        """,
+        "decision_hash_cache": """
+            CREATE TABLE IF NOT EXISTS decision_hash_cache (
+                input_hash TEXT PRIMARY KEY,
+                result_json TEXT,
+                created_at TEXT,
+                ttl_days INTEGER DEFAULT 7,
+                expires_at REAL
+            )
+        """,
+        # 已缓存且完整（经交易日历校验）的日期区间
+        "ohlcv_coverage": """
+            CREATE TABLE IF NOT EXISTS ohlcv_coverage (
+                symbol TEXT,
+                interval TEXT,
+                start_date TEXT,
+                end_date TEXT,
+                updated_at TEXT,
+                PRIMARY KEY (symbol, interval, start_date)
+            )
+        """,
+    }
+
+    # 二级索引：新闻 symbol + 发布日期范围、各表过期清理
+    # （ohlcv/fundamentals/technical 的 symbol + 日期查询由 WITHOUT ROWID 聚簇主键直接覆盖）
+    _INDEXES = (
+        "CREATE INDEX IF NOT EXISTS idx_ohlcv_expires ON ohlcv_cache (expires_at, symbol)",
+        "CREATE INDEX IF NOT EXISTS idx_fundamentals_expires ON fundamentals_cache (expires_at)",
+        "CREATE INDEX IF NOT EXISTS idx_news_symbol_published ON news_cache "
+        "(symbol, published_key, published_at, expires_at)",
+        "CREATE INDEX IF NOT EXISTS idx_news_expires ON news_cache (expires_at)",
+        "CREATE INDEX IF NOT EXISTS idx_technical_expires ON technical_cache (expires_at)",
+        "CREATE INDEX IF NOT EXISTS idx_decision_expires ON decision_hash_cache (expires_at)",
+    )
+
+    # v1 → v2 数据迁移（全部在 SQL 内完成，千万行级别无需逐行回到 Python）
+    # julianday(x) - 2440587.5 为 UTC epoch 天数
+    _V1_TO_V2_COPY = {
+        "ohlcv_cache": """
+            INSERT OR REPLACE INTO ohlcv_cache
+            (symbol, date_key, date, open, high, low, close, volume, adj_close,
+             data_source, fetched_at, ttl_hours, expires_at)
+            SELECT symbol, CAST(julianday(date(date)) - 2440587.5 AS INTEGER), date,
+                   open, high, low, close, volume, adj_close, data_source, fetched_at, ttl_hours,
+                   (julianday(fetched_at) - 2440587.5) * 86400.0 + ttl_hours * 3600.0
+            FROM ohlcv_cache_v1 WHERE date IS NOT NULL
+        """,
+        "fundamentals_cache": """
+            INSERT OR REPLACE INTO fundamentals_cache
+            (symbol, as_of_key, as_of_date, data_json, fetched_at, ttl_hours, expires_at)
+            SELECT symbol, CAST(julianday(date(as_of_date)) - 2440587.5 AS INTEGER), as_of_date,
+                   data_json, fetched_at, ttl_hours,
+                   (julianday(fetched_at) - 2440587.5) * 86400.0 + ttl_hours * 3600.0
+            FROM fundamentals_cache_v1 WHERE as_of_date IS NOT NULL
+        """,
+        "news_cache": """
+            INSERT OR REPLACE INTO news_cache
+            (symbol, title_hash, published_key, published_at, news_json, fetched_at, ttl_hours, expires_at)
+            SELECT symbol, title_hash, CAST(julianday(date(published_at)) - 2440587.5 AS INTEGER),
+                   published_at, news_json, fetched_at, ttl_hours,
+                   (julianday(fetched_at) - 2440587.5) * 86400.0 + ttl_hours * 3600.0
+            FROM news_cache_v1
+        """,
+        "technical_cache": """
+            INSERT OR REPLACE INTO technical_cache
+            (symbol, indicator, date_key, date, value, fetched_at, ttl_hours, expires_at)
+            SELECT symbol, indicator, CAST(julianday(date(date)) - 2440587.5 AS INTEGER), date,
+                   value, fetched_at, ttl_hours,
+                   (julianday(fetched_at) - 2440587.5) * 86400.0 + ttl_hours * 3600.0
+            FROM technical_cache_v1 WHERE date IS NOT NULL
+        """,
+        "decision_hash_cache": """
+            INSERT OR REPLACE INTO decision_hash_cache
+            (input_hash, result_json, created_at, ttl_days, expires_at)
+            SELECT input_hash, result_json, created_at, ttl_days,
+                   (julianday(created_at) - 2440587.5) * 86400.0 + ttl_days * 86400.0
+            FROM decision_hash_cache_v1
+        """,
+    }
+
+    # 新闻全文归档（永久保存，不参与 TTL 清理）
+    # news_fts 为外部内容 FTS5 表，正文只在 news_archive 存一份，由触发器同步索引
+    # 索引的是 pstds_segment 切分后的文本（中文逐字成词），删除时同样切分以抵消原词元
+    _NEWS_ARCHIVE_DDL = (
+        """
+            CREATE TABLE IF NOT EXISTS news_archive (
+                id INTEGER PRIMARY KEY,
+                symbol TEXT NOT NULL,
+                title_hash TEXT NOT NULL,
+                published_key INTEGER,
+                published_at TEXT,
+                source TEXT,
+                title TEXT,
+                content TEXT,
+                news_json TEXT,
+                archived_at TEXT,
+                UNIQUE (symbol, title_hash)
+            )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_news_archive_published ON news_archive (symbol, published_key)",
+        """
+            CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+                symbol UNINDEXED, published_at UNINDEXED, source, title, content,
+                content='news_archive', content_rowid='id'
+            )
+        """,
+        """
+            CREATE TRIGGER IF NOT EXISTS news_archive_ai AFTER INSERT ON news_archive BEGIN
+                INSERT INTO news_fts (rowid, symbol, published_at, source, title, content)
+                VALUES (new.id, new.symbol, new.published_at, pstds_segment(new.source),
+                        pstds_segment(new.title), pstds_segment(new.content));
+            END
+        """,
+        """
+            CREATE TRIGGER IF NOT EXISTS news_archive_ad AFTER DELETE ON news_archive BEGIN
+                INSERT INTO news_fts (news_fts, rowid, symbol, published_at, source, title, content)
+                VALUES ('delete', old.id, old.symbol, old.published_at, pstds_segment(old.source),
+                        pstds_segment(old.title), pstds_segment(old.content));
+            END
+        """,
+    )
+
+    def _init_db(self) -> None:
+        """初始化数据库表结构，旧版本 cache.db 自动迁移到当前版本"""
+        with self._connection() as conn:
+            # 写锁内检查版本，避免多个进程同时迁移
+            conn.execute("BEGIN IMMEDIATE")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < self.SCHEMA_VERSION:
+                existing = {
+                    row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+                }
+                legacy_tables = existing & set(self._V1_TO_V2_COPY)
+                if version < 2 and legacy_tables:
+                    self._migrate_v1_to_v2(conn, legacy_tables)
+                if version < 3 and "news_fts" in existing:
+                    self._rebuild_news_fts(conn)
+
+            for ddl in self._TABLES.values():
+                conn.execute(ddl)
+            for ddl in self._INDEXES:
+                conn.execute(ddl)
+            for ddl in self._NEWS_ARCHIVE_DDL:
+                conn.execute(ddl)
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def _migrate_v1_to_v2(self, conn: sqlite3.Connection, tables: set) -> None:
+        """重建 v1 表：改名保留旧表 → 建新表 → SQL 内批量换算键值 → 删除旧表"""
+        for table in sorted(tables):
+            conn.execute(f"ALTER TABLE {table} RENAME TO {table}_v1")
+            conn.execute(self._TABLES[table])
+            conn.execute(self._V1_TO_V2_COPY[table])
+            conn.execute(f"DROP TABLE {table}_v1")
+        logger.info(f"cache.db 已迁移到 schema v{self.SCHEMA_VERSION}: {sorted(tables)}")
+
+    def _rebuild_news_fts(self, conn: sqlite3.Connection) -> None:
+        """v2 → v3：删除未切分的全文索引与触发器，按切分后的文本重建（归档正文不变）"""
+        conn.execute("DROP TRIGGER IF EXISTS news_archive_ai")
+        conn.execute("DROP TRIGGER IF EXISTS news_archive_ad")
+        conn.execute("DROP TABLE IF EXISTS news_fts")
+        for ddl in self._NEWS_ARCHIVE_DDL:
+            conn.execute(ddl)
+        conn.execute("""
+            INSERT INTO news_fts (rowid, symbol, published_at, source, title, content)
+            SELECT id, symbol, published_at, pstds_segment(source), pstds_segment(title), pstds_segment(content)
+            FROM news_archive
+        """)
+        logger.info(f"news_fts 已按 schema v{self.SCHEMA_VERSION} 重建")
+
+    @staticmethod
+    def _safe_epoch_day(value: Any) -> Optional[int]:
+        """无法解析的日期返回 None（与 SQLite date() 返回 NULL 一致）"""
+        try:
+            return CacheManager._epoch_day(value)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _epoch_day(value: Any) -> Optional[int]:
+        """date / datetime / ISO 字符串 → UTC epoch 天数（与 SQLite date() 的 UTC 换算一致）"""
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        if isinstance(value, datetime):
+            if value.tzinfo is not None:
+                value = value.astimezone(UTC)
+            value = value.date()
+        return (value - _EPOCH_DATE).days
 
     def _is_expired(self, fetched_at: str, ttl_hours: int) -> bool:
         """检查缓存是否过期"""
-        fetched = datetime.fromisoformat(fetched_at)
-        expiry = fetched + timedelta(hours=ttl_hours)
-        return datetime.now(UTC) > expiry
+        return datetime.now(UTC) > self._expiry(fetched_at, ttl_hours)
+
+    @staticmethod
+    def _expiry(fetched_at: str, ttl_hours: int) -> datetime:
+        """缓存行的过期时间"""
+        return datetime.fromisoformat(fetched_at) + timedelta(hours=int(ttl_hours))
+
+    def _cached_read(
+        self,
+        key: tuple,
+        loader: Callable[[], Tuple[Any, Optional[datetime], int]],
+    ) -> Any:
+        """
+        经内存热点层读取
+
+        loader 返回 (value, expires_at, nbytes)；value 为 None 时不写入热点层。
+        """
+        if self.hot_cache is None:
+            return loader()[0]
+
+        value = self.hot_cache.get(key)
+        if value is None:
+            value, expires_at, nbytes = loader()
+            if value is None:
+                return None
+            self.hot_cache.put(key, value, expires_at, nbytes)
+        return self._copy_value(value)
+
+    @staticmethod
+    def _copy_value(value: Any) -> Any:
+        """返回副本，防止调用方修改热点层中的对象"""
+        if isinstance(value, pd.DataFrame):
+            return value.copy()
+        if isinstance(value, list):
+            return [dict(v) if isinstance(v, dict) else v for v in value]
+        if isinstance(value, dict):
+            return dict(value)
+        return value
+
+    def _invalidate_hot(self, table: str, symbol: Optional[str] = None) -> None:
+        if self.hot_cache is not None:
+            self.hot_cache.invalidate(table, symbol)
 
     def get_ohlcv(
         self,
@@ -131,27 +588,46 @@ class CacheManager:
         start_date: date,
         end_date: date,
         ctx: TemporalContext,
+        ignore_ttl: bool = False,
     ) -> Optional[pd.DataFrame]:
         """
         获取 OHLCV 缓存
 
         WHERE 条件包含 date <= ctx.analysis_date（时间隔离）
-        同时检查 fetched_at + ttl_hours 是否过期
+        同时检查 fetched_at + ttl_hours 是否过期；
+        ignore_ttl=True 时跳过过期检查（覆盖索引已确认完整的已收盘历史 K 线）
         """
-        with sqlite3.connect(self.db_path) as conn:
+        key = ("ohlcv_cache", symbol, (start_date, end_date, ignore_ttl), ctx.analysis_date)
+        return self._cached_read(
+            key, lambda: self._load_ohlcv(symbol, start_date, end_date, ctx, ignore_ttl)
+        )
+
+    def _load_ohlcv(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        ctx: TemporalContext,
+        ignore_ttl: bool,
+    ) -> Tuple[Optional[pd.DataFrame], Optional[datetime], int]:
+        """从 SQLite 读取 OHLCV，返回 (df, 过期时间, 字节数)"""
+        with self._connection() as conn:
             query = """
                 SELECT symbol, date, open, high, low, close, volume, adj_close, data_source, fetched_at, ttl_hours
                 FROM ohlcv_cache
                 WHERE symbol = ?
-                AND date(date) >= ?
-                AND date(date) <= ?
-                AND date(date) <= ?
-                ORDER BY date
+                AND date_key BETWEEN ? AND ?
+                ORDER BY date_key
             """
+            # 时间隔离：上界取 end_date 与 ctx.analysis_date 中较早者
             df = pd.read_sql_query(
                 query,
                 conn,
-                params=(symbol, start_date, end_date, ctx.analysis_date)
+                params=(
+                    symbol,
+                    self._epoch_day(start_date),
+                    self._epoch_day(min(end_date, ctx.analysis_date)),
+                ),
             )
 
             # 检查过期
@@ -159,13 +635,104 @@ class CacheManager:
                 # 取 fetched_at 最新的记录的 ttl 进行过期判断
                 latest_fetched = df["fetched_at"].max()
                 ttl = int(df.loc[df["fetched_at"] == latest_fetched, "ttl_hours"].iloc[0])
-                if self._is_expired(latest_fetched, ttl):
-                    return None
+                expires_at = self._expiry(latest_fetched, ttl)
+                if not ignore_ttl and datetime.now(UTC) > expires_at:
+                    return None, None, 0
                 df["date"] = pd.to_datetime(df["date"])
                 # 返回时去掉内部列
-                return df[["symbol", "date", "open", "high", "low", "close", "volume", "adj_close", "data_source"]]
+                df = df[["symbol", "date", "open", "high", "low", "close", "volume", "adj_close", "data_source"]]
+                return df, (None if ignore_ttl else expires_at), int(df.memory_usage(deep=True).sum())
+
+        return None, None, 0
+
+    def get_ohlcv_coverage(self, symbol: str, interval: str) -> List[tuple]:
+        """
+        获取已覆盖的日期区间
+
+        Returns:
+            [(start_date, end_date), ...]，按起始日期排序，区间互不相交（闭区间）
+        """
+        with self._connection() as conn:
+            rows = conn.execute("""
+                SELECT start_date, end_date
+                FROM ohlcv_coverage
+                WHERE symbol = ? AND interval = ?
+                ORDER BY start_date
+            """, (symbol, interval)).fetchall()
+        return [(date.fromisoformat(start), date.fromisoformat(end)) for start, end in rows]
+
+    def record_ohlcv_coverage(
+        self,
+        symbol: str,
+        interval: str,
+        start_date: date,
+        end_date: date,
+    ) -> None:
+        """记录新覆盖的日期区间，与相交或相邻的已有区间合并"""
+        if start_date > end_date:
+            return
+
+        merged_start, merged_end = start_date, end_date
+        absorbed = []
+        for seg_start, seg_end in self.get_ohlcv_coverage(symbol, interval):
+            if seg_start <= merged_end + timedelta(days=1) and seg_end >= merged_start - timedelta(days=1):
+                merged_start = min(merged_start, seg_start)
+                merged_end = max(merged_end, seg_end)
+                absorbed.append(seg_start.isoformat())
+
+        with self._connection() as conn:
+            conn.executemany(
+                "DELETE FROM ohlcv_coverage WHERE symbol = ? AND interval = ? AND start_date = ?",
+                [(symbol, interval, seg_start) for seg_start in absorbed],
+            )
+            conn.execute("""
+                INSERT OR REPLACE INTO ohlcv_coverage
+                (symbol, interval, start_date, end_date, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (
+                symbol, interval, merged_start.isoformat(), merged_end.isoformat(),
+                datetime.now(UTC).isoformat(),
+            ))
+
+    def missing_ohlcv_ranges(
+        self,
+        symbol: str,
+        interval: str,
+        start_date: date,
+        end_date: date,
+    ) -> List[tuple]:
+        """
+        计算 [start_date, end_date] 中尚未覆盖的子区间
 
-        return None
+        Returns:
+            [(gap_start, gap_end), ...]（闭区间，按日历日计算）
+        """
+        gaps = []
+        cursor = start_date
+        for seg_start, seg_end in self.get_ohlcv_coverage(symbol, interval):
+            if seg_end < cursor:
+                continue
+            if seg_start > end_date:
+                break
+            if seg_start > cursor:
+                gaps.append((cursor, min(seg_start - timedelta(days=1), end_date)))
+            cursor = max(cursor, seg_end + timedelta(days=1))
+            if cursor > end_date:
+                break
+        if cursor <= end_date:
+            gaps.append((cursor, end_date))
+        return gaps
+
+    # OHLCV 写入列与语句（executemany 批量执行；_ohlcv_rows 按此列序生成参数）
+    _OHLCV_COLUMNS = (
+        "symbol", "date_key", "date", "open", "high", "low", "close", "volume", "adj_close",
+        "data_source", "fetched_at", "ttl_hours", "expires_at",
+    )
+    _OHLCV_UPSERT = f"""
+        INSERT OR REPLACE INTO ohlcv_cache
+        ({", ".join(_OHLCV_COLUMNS)})
+        VALUES ({", ".join("?" * len(_OHLCV_COLUMNS))})
+    """
 
     def set_ohlcv(
         self,
@@ -179,50 +746,344 @@ class CacheManager:
 
         同时追加写入 Parquet 文件（原始数据不可篡改）
         """
-        # 写入 SQLite 缓存
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            for _, row in df.iterrows():
-                date_str = row["date"].isoformat() if pd.notna(row["date"]) else None
-                fetched_at = datetime.now(UTC).isoformat()
+        self.set_ohlcv_bulk({symbol: df}, ctx, ttl_hours=ttl_hours)
 
-                cursor.execute("""
-                    INSERT OR REPLACE INTO ohlcv_cache
-                    (symbol, date, open, high, low, close, volume, adj_close, data_source, fetched_at, ttl_hours)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    symbol, date_str, row["open"], row["high"], row["low"],
-                    row["close"], row["volume"], row["adj_close"],
-                    row.get("data_source", "unknown"), fetched_at, ttl_hours
-                ))
-            conn.commit()
+    def set_ohlcv_bulk(
+        self,
+        data: "pd.DataFrame | pa.Table | Dict[str, pd.DataFrame]",
+        ctx: TemporalContext,
+        ttl_hours: int = 24,
+    ) -> Dict[str, float]:
+        """
+        批量写入多只股票的 OHLCV 缓存
+
+        所有行在同一个事务内通过 executemany 写入，fetched_at 每批只取一次。
+
+        Args:
+            data: {symbol: DataFrame}，或带 symbol 列的长表 DataFrame / Arrow Table
+            ctx: 时间上下文
+            ttl_hours: 缓存有效期（小时）
+
+        Returns:
+            写入统计：rows, symbols, seconds, rows_per_sec
+        """
+        started = time.perf_counter()
+        frames = self._split_by_symbol(data)
+        fetched = datetime.now(UTC)
+        fetched_at = fetched.isoformat()
+        expires_at = fetched.timestamp() + ttl_hours * 3600
+
+        rows: List[tuple] = []
+        for symbol, df in frames.items():
+            rows.extend(self._ohlcv_rows(symbol, df, fetched_at, ttl_hours, expires_at))
+
+        with self._connection() as conn:
+            conn.executemany(self._OHLCV_UPSERT, rows)
+        for symbol in frames:
+            self._invalidate_hot("ohlcv_cache", symbol)
 
         # 追加写入 Parquet 文件（原始数据不可篡改）
-        self._append_parquet(symbol, df)
+        for symbol, df in frames.items():
+            self._append_parquet(symbol, df)
+
+        seconds = time.perf_counter() - started
+        return {
+            "rows": len(rows),
+            "symbols": len(frames),
+            "seconds": seconds,
+            "rows_per_sec": len(rows) / seconds if seconds > 0 else float("inf"),
+        }
+
+    @staticmethod
+    def _split_by_symbol(
+        data: "pd.DataFrame | pa.Table | Dict[str, pd.DataFrame]",
+    ) -> Dict[str, pd.DataFrame]:
+        """将批量输入统一为 {symbol: DataFrame}"""
+        if isinstance(data, dict):
+            return {symbol: df for symbol, df in data.items() if df is not None and not df.empty}
+
+        if isinstance(data, pa.Table):
+            data = data.to_pandas()
+
+        if "symbol" not in data.columns:
+            raise ValueError("批量写入的长表必须包含 symbol 列")
+
+        return {
+            symbol: group.drop(columns=["symbol"])
+            for symbol, group in data.groupby("symbol", sort=False)
+        }
+
+    @staticmethod
+    def _ohlcv_rows(
+        symbol: str,
+        df: pd.DataFrame,
+        fetched_at: str,
+        ttl_hours: int,
+        expires_at: float,
+    ) -> List[tuple]:
+        """按列向量化生成 executemany 参数（tolist 转为 sqlite3 可绑定的原生类型）"""
+        df = df[df["date"].notna()]
+        n = len(df)
+        if "data_source" in df.columns:
+            sources = df["data_source"].tolist()
+        else:
+            sources = ["unknown"] * n
+
+        return list(zip(
+            [symbol] * n,
+            CacheManager._epoch_days(df["date"]),
+            CacheManager._iso_dates(df["date"]),
+            df["open"].tolist(),
+            df["high"].tolist(),
+            df["low"].tolist(),
+            df["close"].tolist(),
+            df["volume"].tolist(),
+            df["adj_close"].tolist(),
+            sources,
+            [fetched_at] * n,
+            [ttl_hours] * n,
+            [expires_at] * n,
+        ))
+
+    @staticmethod
+    def _epoch_days(col: pd.Series) -> List[int]:
+        """日期列整列换算为 UTC epoch 天数"""
+        if not pd.api.types.is_datetime64_any_dtype(col):
+            return [CacheManager._epoch_day(d) for d in col]
+        if col.dt.tz is not None:
+            col = col.dt.tz_convert("UTC").dt.tz_localize(None)
+        return col.to_numpy(dtype="datetime64[D]").astype(np.int64).tolist()
+
+    @staticmethod
+    def _iso_dates(col: pd.Series) -> List[Optional[str]]:
+        """日期列整列格式化为 ISO 字符串（与逐个 isoformat() 结果一致）"""
+        # 非 datetime 列或非 UTC 时区（偏移量可能随夏令时变化）逐个格式化
+        if not pd.api.types.is_datetime64_any_dtype(col) or str(col.dt.tz or "UTC") != "UTC":
+            return [d.isoformat() if pd.notna(d) else None for d in col]
+
+        is_utc = col.dt.tz is not None
+        values = col.dt.tz_localize(None) if is_utc else col
+        text = np.datetime_as_string(values.to_numpy(dtype="datetime64[s]"), unit="s")
+        if is_utc:
+            text = np.char.add(text, "+00:00")
+        return [None if missing else t for t, missing in zip(text.tolist(), col.isna().tolist())]
+
+    # Parquet 归档的固定列与类型（各分片 schema 一致，便于 dataset 统一扫描）
+    _PARQUET_SCHEMA = pa.schema([
+        ("date", pa.timestamp("us", tz="UTC")),
+        ("open", pa.float64()),
+        ("high", pa.float64()),
+        ("low", pa.float64()),
+        ("close", pa.float64()),
+        ("volume", pa.int64()),
+        ("adj_close", pa.float64()),
+        ("data_source", pa.string()),
+    ])
+
+    def _symbol_parquet_dir(self, symbol: str) -> Path:
+        """单只股票的分区根目录：{parquet_dir}/symbol={symbol}"""
+        return self.parquet_dir / f"symbol={symbol}"
+
+    def _to_archive_table(self, df: pd.DataFrame) -> pa.Table:
+        """标准化为归档 schema（缺失列填空）"""
+        out = pd.DataFrame(index=df.index)
+        for field in self._PARQUET_SCHEMA:
+            if field.name in df.columns:
+                out[field.name] = df[field.name]
+            else:
+                out[field.name] = None
+        out["date"] = pd.to_datetime(out["date"], utc=True)
+        out["volume"] = pd.to_numeric(out["volume"]).round().astype("Int64")
+        return pa.Table.from_pandas(out, schema=self._PARQUET_SCHEMA, preserve_index=False)
+
+    @staticmethod
+    def _write_parquet_atomic(table: pa.Table, path: Path) -> None:
+        """先写隐藏临时文件再原子替换，崩溃时不会留下半个分片"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
 
     def _append_parquet(self, symbol: str, df: pd.DataFrame) -> None:
         """
-        追加写入 Parquet 文件
+        追加写入 Parquet 归档
 
-        只追加不修改，确保回测数据不可篡改（按 date 去重避免重复累积）
+        按 symbol/year 分区，每次写入只新增分片文件，不读取、不改写已有文件，
+        写入成本只与新增行数相关（C-06 原始数据不可篡改）。
+        分片文件名以纳秒时间戳开头，读取时按文件名顺序去重，后写入者优先。
         """
-        parquet_path = self.parquet_dir / f"{symbol}.parquet"
+        if df is None or df.empty:
+            return
 
         try:
-            if parquet_path.exists():
-                # 读取现有数据并追加
-                existing_df = pq.read_table(parquet_path).to_pandas()
-                combined = pd.concat([existing_df, df], ignore_index=True)
-                # 按 date 去重，保留最新记录（C-06 只追加不修改原始内容，但去重避免重复累积）
-                combined = combined.drop_duplicates(subset=["date"], keep="last")
-                df = combined
-
-            # 写入 Parquet
-            table = pa.Table.from_pandas(df)
-            pq.write_table(table, parquet_path)
+            table = self._to_archive_table(df)
+            years = pd.DatetimeIndex(table.column("date").to_pandas()).year
+            part_name = f"part-{time.time_ns():020d}-{uuid4().hex[:8]}.parquet"
+
+            for year in sorted(set(years)):
+                mask = pa.array(years == year)
+                path = self._symbol_parquet_dir(symbol) / f"year={year}" / part_name
+                self._write_parquet_atomic(table.filter(mask), path)
         except Exception as e:
-            import logging
-            logging.getLogger(__name__).error(f"Error appending Parquet for {symbol}: {e}")
+            logger.error(f"Error appending Parquet for {symbol}: {e}")
+
+    def _parquet_fragments(self, symbol: str, filter_expr=None) -> List:
+        """按写入顺序列出分区分片（隐藏的临时文件自动忽略）"""
+        symbol_dir = self._symbol_parquet_dir(symbol)
+        if not symbol_dir.exists():
+            return []
+
+        dataset = ds.dataset(
+            str(symbol_dir),
+            format="parquet",
+            partitioning=ds.partitioning(pa.schema([("year", pa.int32())]), flavor="hive"),
+        )
+        fragments = dataset.get_fragments(filter=filter_expr)
+        return sorted(fragments, key=lambda f: Path(f.path).name)
+
+    @staticmethod
+    def _dedup_by_date(tables: List[pa.Table]) -> pd.DataFrame:
+        """合并分片并按 date 去重，保留最后写入的记录"""
+        if not tables:
+            return pd.DataFrame(columns=[field.name for field in CacheManager._PARQUET_SCHEMA])
+        df = pa.concat_tables(tables).to_pandas()
+        df = df.drop_duplicates(subset=["date"], keep="last")
+        return df.sort_values("date").reset_index(drop=True)
+
+    def read_parquet(
+        self,
+        symbol: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> pd.DataFrame:
+        """
+        从 Parquet 归档读取行情
+
+        年份分区裁剪 + date 谓词下推，只扫描覆盖日期范围的分片。
+        """
+        partition_filter = None
+        row_filter = None
+        if start_date is not None:
+            partition_filter = ds.field("year") >= start_date.year
+            row_filter = ds.field("date") >= pa.scalar(pd.Timestamp(start_date, tz="UTC"))
+        if end_date is not None:
+            year_cond = ds.field("year") <= end_date.year
+            date_cond = ds.field("date") < pa.scalar(
+                pd.Timestamp(end_date, tz="UTC") + pd.Timedelta(days=1)
+            )
+            partition_filter = year_cond if partition_filter is None else partition_filter & year_cond
+            row_filter = date_cond if row_filter is None else row_filter & date_cond
+
+        tables = self._legacy_parquet_tables(symbol, row_filter)
+        tables += [
+            fragment.to_table(filter=row_filter, columns=self._PARQUET_SCHEMA.names)
+            for fragment in self._parquet_fragments(symbol, partition_filter)
+        ]
+        return self._dedup_by_date(tables)
+
+    def _legacy_parquet_tables(self, symbol: str, row_filter=None) -> List[pa.Table]:
+        """
+        尚未迁移的旧版单文件 {symbol}.parquet
+
+        排在分区分片之前（视为最早写入），合并任务迁移前的数据同样可读。
+        """
+        legacy_path = self.parquet_dir / f"{symbol}.parquet"
+        if not legacy_path.exists():
+            return []
+        try:
+            table = self._to_archive_table(pq.read_table(legacy_path).to_pandas())
+        except FileNotFoundError:
+            # 读取途中被合并任务迁移，分区分片中已有同样的数据
+            return []
+        except Exception as e:
+            logger.error(f"Error reading legacy Parquet for {symbol}: {e}")
+            return []
+        return [table.filter(row_filter) if row_filter is not None else table]
+
+    def compact_parquet(self, symbol: Optional[str] = None) -> int:
+        """
+        合并 Parquet 归档的小分片（定期维护任务）
+
+        每个 symbol/year 分区合并为一个文件：先原子写入合并结果，再删除旧分片。
+        中途崩溃只会留下重复分片，读取时去重，不会丢数据。
+        旧版单文件 {symbol}.parquet 同时迁移到分区目录。
+
+        Args:
+            symbol: 股票代码，None 表示全部
+
+        Returns:
+            被合并删除的分片数量
+        """
+        if symbol is None:
+            symbols = {p.name[len("symbol="):] for p in self.parquet_dir.glob("symbol=*")}
+            symbols |= {p.stem for p in self.parquet_dir.glob("*.parquet")}
+        else:
+            symbols = {symbol}
+
+        removed = 0
+        with self._parquet_lock:
+            for sym in sorted(symbols):
+                self._migrate_legacy_parquet(sym)
+                removed += self._compact_symbol(sym)
+        return removed
+
+    def register_compaction(self, scheduler, cron_expr: str = PARQUET_COMPACTION_CRON) -> bool:
+        """
+        注册定期归档合并任务到 TaskScheduler
+
+        Args:
+            scheduler: TaskScheduler 实例
+            cron_expr: Cron 表达式（默认每周日凌晨，避开盘前预热）
+
+        Returns:
+            是否注册成功
+        """
+        return scheduler.add_cron_job(
+            task_id="parquet_compaction",
+            func=self.compact_parquet,
+            name="Parquet 归档分片合并",
+            cron_expr=cron_expr,
+        )
+
+    def _migrate_legacy_parquet(self, symbol: str) -> None:
+        """旧版单文件归档拆入分区（文件名时间戳为 0，视为最早写入）"""
+        legacy_path = self.parquet_dir / f"{symbol}.parquet"
+        if not legacy_path.exists():
+            return
+
+        table = self._to_archive_table(pq.read_table(legacy_path).to_pandas())
+        years = pd.DatetimeIndex(table.column("date").to_pandas()).year
+        for year in sorted(set(years)):
+            path = self._symbol_parquet_dir(symbol) / f"year={year}" / f"part-{0:020d}-legacy.parquet"
+            self._write_parquet_atomic(table.filter(pa.array(years == year)), path)
+        legacy_path.unlink()
+
+    def _compact_symbol(self, symbol: str) -> int:
+        """逐个年份分区合并分片"""
+        by_year: Dict[Path, List] = {}
+        for fragment in self._parquet_fragments(symbol):
+            by_year.setdefault(Path(fragment.path).parent, []).append(fragment)
+
+        removed = 0
+        for year_dir, fragments in by_year.items():
+            if len(fragments) < 2:
+                continue
+            merged = self._dedup_by_date(
+                [fragment.to_table(columns=self._PARQUET_SCHEMA.names) for fragment in fragments]
+            )
+            # 沿用最后一个分片的时间戳：排序位于被合并分片之后、后续新分片之前
+            last_stamp = Path(fragments[-1].path).name.split("-")[1]
+            target = year_dir / f"part-{last_stamp}-compacted.parquet"
+            self._write_parquet_atomic(
+                pa.Table.from_pandas(merged, schema=self._PARQUET_SCHEMA, preserve_index=False),
+                target,
+            )
+            for fragment in fragments:
+                path = Path(fragment.path)
+                if path != target:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+        return removed
 
     def get_fundamentals(
         self,
@@ -235,25 +1096,35 @@ class CacheManager:
 
         WHERE 条件包含 as_of_date <= ctx.analysis_date
         """
-        with sqlite3.connect(self.db_path) as conn:
+        key = ("fundamentals_cache", symbol, None, ctx.analysis_date)
+        return self._cached_read(key, lambda: self._load_fundamentals(symbol, ctx))
+
+    def _load_fundamentals(
+        self,
+        symbol: str,
+        ctx: TemporalContext,
+    ) -> Tuple[Optional[Dict], Optional[datetime], int]:
+        """从 SQLite 读取基本面，返回 (data, 过期时间, 字节数)"""
+        with self._connection() as conn:
             query = """
                 SELECT data_json, fetched_at, ttl_hours
                 FROM fundamentals_cache
                 WHERE symbol = ?
-                AND date(as_of_date) <= ?
-                ORDER BY as_of_date DESC
+                AND as_of_key <= ?
+                ORDER BY as_of_key DESC
                 LIMIT 1
             """
             cursor = conn.cursor()
-            cursor.execute(query, (symbol, ctx.analysis_date))
+            cursor.execute(query, (symbol, self._epoch_day(ctx.analysis_date)))
             result = cursor.fetchone()
 
             if result:
                 data_json, fetched_at, ttl_hours = result
-                if not self._is_expired(fetched_at, ttl_hours):
-                    return json.loads(data_json)
+                expires_at = self._expiry(fetched_at, ttl_hours)
+                if datetime.now(UTC) <= expires_at:
+                    return json.loads(data_json), expires_at, len(data_json)
 
-        return None
+        return None, None, 0
 
     def set_fundamentals(
         self,
@@ -263,19 +1134,141 @@ class CacheManager:
         ttl_hours: int = 24,
     ) -> None:
         """设置基本面缓存"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
-            fetched_at = datetime.now(UTC).isoformat()
+            fetched = datetime.now(UTC)
 
             cursor.execute("""
                 INSERT OR REPLACE INTO fundamentals_cache
-                (symbol, as_of_date, data_json, fetched_at, ttl_hours)
-                VALUES (?, ?, ?, ?, ?)
+                (symbol, as_of_key, as_of_date, data_json, fetched_at, ttl_hours, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
             """, (
-                symbol, as_of_date.isoformat(), json.dumps(data),
-                fetched_at, ttl_hours
+                symbol, self._epoch_day(as_of_date), as_of_date.isoformat(), json.dumps(data, default=str),
+                fetched.isoformat(), ttl_hours, fetched.timestamp() + ttl_hours * 3600
             ))
             conn.commit()
+        self._invalidate_hot("fundamentals_cache", symbol)
+
+    # 技术指标写入语句（executemany 批量执行）
+    _TECHNICAL_UPSERT = """
+        INSERT OR REPLACE INTO technical_cache
+        (symbol, indicator, date_key, date, value, fetched_at, ttl_hours, expires_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    def set_technical_bulk(
+        self,
+        symbol: str,
+        df: pd.DataFrame,
+        ttl_hours: int = 24,
+    ) -> int:
+        """
+        批量写入单只股票的技术指标序列
+
+        Args:
+            symbol: 股票代码
+            df: 宽表，date 列 + 每个指标一列；NaN 写为 NULL（预热期不足）
+            ttl_hours: 缓存有效期（小时）
+
+        Returns:
+            写入行数
+        """
+        df = df[df["date"].notna()]
+        fetched = datetime.now(UTC)
+        fetched_at = fetched.isoformat()
+        expires_at = fetched.timestamp() + ttl_hours * 3600
+
+        date_keys = self._epoch_days(df["date"])
+        dates = self._iso_dates(df["date"])
+        n = len(df)
+
+        rows: List[tuple] = []
+        for indicator in df.columns.drop("date"):
+            values = df[indicator].astype("float64")
+            rows.extend(zip(
+                [symbol] * n,
+                [indicator] * n,
+                date_keys,
+                dates,
+                values.where(values.notna(), None).tolist(),
+                [fetched_at] * n,
+                [ttl_hours] * n,
+                [expires_at] * n,
+            ))
+
+        with self._connection() as conn:
+            conn.executemany(self._TECHNICAL_UPSERT, rows)
+        self._invalidate_hot("technical_cache", symbol)
+        return len(rows)
+
+    def get_technical(
+        self,
+        symbol: str,
+        indicator: str,
+        start_date: date,
+        end_date: date,
+        ctx: Optional[TemporalContext] = None,
+    ) -> Optional[Dict[date, Optional[float]]]:
+        """
+        获取技术指标窗口
+
+        传入 ctx 时上界取 end_date 与 ctx.analysis_date 中较早者（时间隔离）。
+
+        Returns:
+            {交易日: 指标值}（预热期内值为 None），无未过期数据时返回 None
+        """
+        if ctx is not None:
+            end_date = min(end_date, ctx.analysis_date)
+        key = ("technical_cache", symbol, (indicator, start_date, end_date), None)
+        return self._cached_read(
+            key, lambda: self._load_technical(symbol, indicator, start_date, end_date)
+        )
+
+    def _load_technical(
+        self,
+        symbol: str,
+        indicator: str,
+        start_date: date,
+        end_date: date,
+    ) -> Tuple[Optional[Dict[date, Optional[float]]], Optional[datetime], int]:
+        """从 SQLite 读取技术指标，返回 (values, 过期时间, 字节数)"""
+        with self._connection() as conn:
+            rows = conn.execute("""
+                SELECT date_key, value, expires_at
+                FROM technical_cache
+                WHERE symbol = ? AND indicator = ?
+                AND date_key BETWEEN ? AND ?
+                AND expires_at >= ?
+                ORDER BY date_key
+            """, (
+                symbol, indicator,
+                self._epoch_day(start_date), self._epoch_day(end_date),
+                datetime.now(UTC).timestamp(),
+            )).fetchall()
+
+        if not rows:
+            return None, None, 0
+        values = {_EPOCH_DATE + timedelta(days=key): value for key, value, _ in rows}
+        expires_at = datetime.fromtimestamp(min(row[2] for row in rows), UTC)
+        return values, expires_at, 64 * len(rows)
+
+    def get_technical_state(self, symbol: str) -> Optional[Tuple[date, datetime]]:
+        """
+        获取已物化指标的状态
+
+        Returns:
+            (最新交易日, 最近物化时间)，无未过期数据时返回 None
+        """
+        with self._connection() as conn:
+            row = conn.execute("""
+                SELECT MAX(date_key), MAX(fetched_at)
+                FROM technical_cache
+                WHERE symbol = ? AND expires_at >= ?
+            """, (symbol, datetime.now(UTC).timestamp())).fetchone()
+
+        if row is None or row[0] is None:
+            return None
+        return _EPOCH_DATE + timedelta(days=row[0]), datetime.fromisoformat(row[1])
 
     def get_news(
         self,
@@ -287,27 +1280,39 @@ class CacheManager:
 
         WHERE 条件包含 published_at <= ctx.analysis_date
         """
-        with sqlite3.connect(self.db_path) as conn:
+        key = ("news_cache", symbol, None, ctx.analysis_date)
+        return self._cached_read(key, lambda: self._load_news(symbol, ctx))
+
+    def _load_news(
+        self,
+        symbol: str,
+        ctx: TemporalContext,
+    ) -> Tuple[Optional[List[Dict]], Optional[datetime], int]:
+        """从 SQLite 读取新闻，返回 (news_list, 最早过期时间, 字节数)"""
+        with self._connection() as conn:
+            # 过期判断下推到 SQL（expires_at 预计算，走覆盖索引）
             query = """
-                SELECT news_json, fetched_at, ttl_hours
+                SELECT news_json, expires_at
                 FROM news_cache
                 WHERE symbol = ?
-                AND date(published_at) <= ?
-                ORDER BY published_at DESC
+                AND published_key <= ?
+                AND expires_at >= ?
+                ORDER BY published_key DESC, published_at DESC
             """
-            df = pd.read_sql_query(
+            rows = conn.execute(
                 query,
-                conn,
-                params=(symbol, ctx.analysis_date)
-            )
+                (symbol, self._epoch_day(ctx.analysis_date), datetime.now(UTC).timestamp()),
+            ).fetchall()
 
-            # 过滤过期数据
-            valid_news = []
-            for _, row in df.iterrows():
-                if not self._is_expired(row["fetched_at"], row["ttl_hours"]):
-                    valid_news.append(json.loads(row["news_json"]))
+            valid_news = [json.loads(news_json) for news_json, _ in rows]
+            nbytes = sum(len(news_json) for news_json, _ in rows)
+            earliest_expiry = (
+                datetime.fromtimestamp(min(exp for _, exp in rows), UTC) if rows else None
+            )
 
-            return valid_news if valid_news else None
+            if not valid_news:
+                return None, None, 0
+            return valid_news, earliest_expiry, nbytes
 
     def set_news(
         self,
@@ -318,33 +1323,186 @@ class CacheManager:
         """
         设置新闻缓存
 
-        同时追加写入 JSON 文件
+        同时写入全文检索归档（按标题哈希去重）并追加写入 JSON 文件
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
-            fetched_at = datetime.now(UTC).isoformat()
+            fetched = datetime.now(UTC)
+            fetched_at = fetched.isoformat()
+            expires_at = fetched.timestamp() + ttl_hours * 3600
 
             for news in news_list:
                 title = news.get("title", "")
                 title_hash = hashlib.md5(title.encode()).hexdigest()
+                published_at = news.get("published_at", fetched_at)
 
                 cursor.execute("""
                     INSERT OR REPLACE INTO news_cache
-                    (symbol, published_at, title_hash, news_json, fetched_at, ttl_hours)
-                    VALUES (?, ?, ?, ?, ?, ?)
+                    (symbol, title_hash, published_key, published_at, news_json, fetched_at, ttl_hours, expires_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
                     symbol,
-                    news.get("published_at", datetime.now(UTC).isoformat()),
                     title_hash,
+                    self._safe_epoch_day(published_at),
+                    published_at,
                     json.dumps(news),
                     fetched_at,
-                    ttl_hours
+                    ttl_hours,
+                    expires_at,
                 ))
             conn.commit()
+        self._invalidate_hot("news_cache", symbol)
+
+        self.archive_news(symbol, news_list)
 
         # 追加写入 JSON 文件
         self._append_news_json(symbol, news_list)
 
+    # 新闻归档写入语句（标题哈希冲突时忽略，保留最早归档的一条）
+    _NEWS_ARCHIVE_INSERT = """
+        INSERT OR IGNORE INTO news_archive
+        (symbol, title_hash, published_key, published_at, source, title, content, news_json, archived_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    # bm25 列权重：symbol, published_at, source, title, content（标题命中权重更高）
+    _NEWS_BM25 = "bm25(news_fts, 0.0, 0.0, 1.0, 10.0, 1.0)"
+
+    def archive_news(self, symbol: str, news_list: List) -> int:
+        """
+        写入新闻全文检索归档
+
+        Args:
+            symbol: 股票代码
+            news_list: 新闻字典或 NewsItem 列表
+
+        Returns:
+            新增条数（同一 symbol 下标题哈希重复的新闻被忽略）
+        """
+        archived_at = datetime.now(UTC).isoformat()
+        rows = []
+        for news in news_list:
+            if hasattr(news, "model_dump"):
+                news = news.model_dump(mode="json")
+            title = news.get("title", "")
+            published_at = news.get("published_at")
+            if isinstance(published_at, datetime):
+                published_at = published_at.isoformat()
+            rows.append((
+                symbol,
+                hashlib.md5(title.encode()).hexdigest(),
+                self._safe_epoch_day(published_at),
+                published_at,
+                news.get("source", ""),
+                title,
+                news.get("content", ""),
+                json.dumps(news, default=str),
+                archived_at,
+            ))
+
+        with self._connection() as conn:
+            # rowcount 只计 news_archive 本身的新增行（不含触发器写入）
+            return conn.executemany(self._NEWS_ARCHIVE_INSERT, rows).rowcount
+
+    @staticmethod
+    def _fts_query(query: str, require_all: bool) -> str:
+        """
+        关键词转为 FTS5 表达式（每个词加引号，避免特殊字符被当作语法）
+
+        中文词与索引一样逐字切分，引号内的多个单字按短语匹配（须相邻且有序）。
+        """
+        terms = [f'"{_segment_cjk(term).strip()}"' for term in re.findall(r"\w+", query)]
+        return (" AND " if require_all else " OR ").join(terms)
+
+    def _archive_bounds(
+        self,
+        ctx: TemporalContext,
+        start_date: Optional[date],
+        end_date: Optional[date],
+    ) -> Tuple[int, int]:
+        """归档查询的发布日期范围（epoch 天），上界不超过 ctx.analysis_date"""
+        end = ctx.analysis_date if end_date is None else min(end_date, ctx.analysis_date)
+        start = self._epoch_day(start_date) if start_date is not None else -(2 ** 31)
+        return start, self._epoch_day(end)
+
+    def search_news(
+        self,
+        query: str,
+        ctx: TemporalContext,
+        symbol: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        limit: int = 20,
+        require_all: bool = True,
+    ) -> List[Dict]:
+        """
+        按关键词检索新闻归档，bm25 相关度排序
+
+        Args:
+            query: 关键词（空格分隔）
+            ctx: 时间上下文（published_at 不晚于 analysis_date）
+            symbol: 限定股票代码（可选）
+            start_date: 发布日期下界（可选）
+            end_date: 发布日期上界（可选，与 analysis_date 取较早者）
+            limit: 最多返回条数
+            require_all: True 时须包含全部关键词，False 时任一即可
+
+        Returns:
+            新闻字典列表（相关度从高到低），每条附带 score（bm25，越小越相关）
+        """
+        match = self._fts_query(query, require_all)
+        if not match:
+            return []
+
+        start_key, end_key = self._archive_bounds(ctx, start_date, end_date)
+        sql = f"""
+            SELECT a.news_json, {self._NEWS_BM25} AS score
+            FROM news_fts
+            JOIN news_archive a ON a.id = news_fts.rowid
+            WHERE news_fts MATCH ?
+            AND a.published_key BETWEEN ? AND ?
+        """
+        params: List[Any] = [match, start_key, end_key]
+        if symbol is not None:
+            sql += " AND a.symbol = ?"
+            params.append(symbol)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+
+        with self._connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [{**json.loads(news_json), "score": score} for news_json, score in rows]
+
+    def get_archived_news(
+        self,
+        symbol: str,
+        ctx: TemporalContext,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        """
+        按发布日期范围读取新闻归档（最新在前）
+
+        Args:
+            symbol: 股票代码
+            ctx: 时间上下文（published_at 不晚于 analysis_date）
+            start_date: 发布日期下界（可选）
+            end_date: 发布日期上界（可选，与 analysis_date 取较早者）
+            limit: 最多返回条数（可选）
+        """
+        start_key, end_key = self._archive_bounds(ctx, start_date, end_date)
+        with self._connection() as conn:
+            rows = conn.execute("""
+                SELECT news_json
+                FROM news_archive
+                WHERE symbol = ?
+                AND published_key BETWEEN ? AND ?
+                ORDER BY published_key DESC, published_at DESC
+                LIMIT ?
+            """, (symbol, start_key, end_key, -1 if limit is None else limit)).fetchall()
+        return [json.loads(news_json) for (news_json,) in rows]
+
     def _append_news_json(self, symbol: str, news_list: List) -> None:
         """追加写入新闻 JSON 文件"""
         today_str = date.today().isoformat()
@@ -361,7 +1519,15 @@ class CacheManager:
         input_hash: str,
     ) -> Optional[Dict]:
         """获取决策哈希缓存"""
-        with sqlite3.connect(self.db_path) as conn:
+        key = ("decision_hash_cache", input_hash, None, None)
+        return self._cached_read(key, lambda: self._load_decision(input_hash))
+
+    def _load_decision(
+        self,
+        input_hash: str,
+    ) -> Tuple[Optional[Dict], Optional[datetime], int]:
+        """从 SQLite 读取决策缓存，返回 (result, 过期时间, 字节数)"""
+        with self._connection() as conn:
             query = """
                 SELECT result_json, created_at, ttl_days
                 FROM decision_hash_cache
@@ -376,9 +1542,9 @@ class CacheManager:
                 created = datetime.fromisoformat(created_at)
                 expiry = created + timedelta(days=ttl_days)
                 if datetime.now(UTC) <= expiry:
-                    return json.loads(result_json)
+                    return json.loads(result_json), expiry, len(result_json)
 
-        return None
+        return None, None, 0
 
     def set_decision(
         self,
@@ -387,53 +1553,128 @@ class CacheManager:
         ttl_days: int = 7,
     ) -> None:
         """设置决策哈希缓存"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
-            created_at = datetime.now(UTC).isoformat()
+            created = datetime.now(UTC)
 
             cursor.execute("""
                 INSERT OR REPLACE INTO decision_hash_cache
-                (input_hash, result_json, created_at, ttl_days)
-                VALUES (?, ?, ?, ?)
+                (input_hash, result_json, created_at, ttl_days, expires_at)
+                VALUES (?, ?, ?, ?, ?)
             """, (
                 input_hash,
                 json.dumps(result),
-                created_at,
-                ttl_days
+                created.isoformat(),
+                ttl_days,
+                created.timestamp() + ttl_days * 86400,
             ))
             conn.commit()
+        self._invalidate_hot("decision_hash_cache", input_hash)
 
     def close(self) -> None:
-        """关闭并释放数据库文件（Windows 文件锁定修复）"""
+        """
+        关闭并释放数据库文件（Windows 文件锁定修复）
+
+        连接池模式下关闭所有线程的长连接；WAL 内容先合并回主库。
+        非连接池模式保留原行为：切回 DELETE 日志模式，确保不残留 -wal/-shm 文件。
+        """
+        with self._pool_lock:
+            connections = self._pool_connections
+            self._pool_connections = []
+        self._local = threading.local()
+
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
         try:
             conn = sqlite3.connect(self.db_path)
             conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
-            conn.execute("PRAGMA journal_mode=DELETE")
+            if not self.pooled:
+                conn.execute("PRAGMA journal_mode=DELETE")
             conn.close()
         except Exception:
             pass
 
+    @staticmethod
+    def _trim_ohlcv_coverage(cursor: sqlite3.Cursor, symbol: str, start_date: date, end_date: date) -> None:
+        """从该股票各周期的覆盖区间中扣除 [start_date, end_date]，两侧未受影响的部分保留"""
+        start, end = start_date.isoformat(), end_date.isoformat()
+        rows = cursor.execute("""
+            SELECT interval, start_date, end_date FROM ohlcv_coverage
+            WHERE symbol = ? AND start_date <= ? AND end_date >= ?
+        """, (symbol, end, start)).fetchall()
+        updated_at = datetime.now(UTC).isoformat()
+        for interval, seg_start, seg_end in rows:
+            cursor.execute(
+                "DELETE FROM ohlcv_coverage WHERE symbol = ? AND interval = ? AND start_date = ?",
+                (symbol, interval, seg_start),
+            )
+            remains = []
+            if seg_start < start:
+                remains.append((seg_start, (start_date - timedelta(days=1)).isoformat()))
+            if seg_end > end:
+                remains.append(((end_date + timedelta(days=1)).isoformat(), seg_end))
+            cursor.executemany("""
+                INSERT OR REPLACE INTO ohlcv_coverage
+                (symbol, interval, start_date, end_date, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, [(symbol, interval, seg_s, seg_e, updated_at) for seg_s, seg_e in remains])
+
     def clear_expired(self) -> int:
         """清除过期缓存，返回清除的行数"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
             total_cleared = 0
 
-            # 清理各表的过期数据（unit 为 'hours' 或 'days'）
+            now = datetime.now(UTC).timestamp()
             tables = [
-                ("ohlcv_cache",         "fetched_at", "ttl_hours", "hours"),
-                ("fundamentals_cache",  "fetched_at", "ttl_hours", "hours"),
-                ("news_cache",          "fetched_at", "ttl_hours", "hours"),
-                ("technical_cache",     "fetched_at", "ttl_hours", "hours"),
-                ("decision_hash_cache", "created_at", "ttl_days",  "days"),
+                "ohlcv_cache",
+                "fundamentals_cache",
+                "news_cache",
+                "technical_cache",
+                "decision_hash_cache",
             ]
 
-            for table, time_col, ttl_col, unit in tables:
-                cursor.execute(f"""
-                    DELETE FROM {table}
-                    WHERE datetime({time_col}) < datetime('now', '-' || {ttl_col} || ' {unit}')
-                """)
+            # 行情行被清除后，覆盖区间扣除被清除的日期跨度（下次只按缺口重新获取）
+            expired_spans = cursor.execute(
+                "SELECT symbol, MIN(date_key), MAX(date_key) FROM ohlcv_cache WHERE expires_at < ? GROUP BY symbol",
+                (now,),
+            ).fetchall()
+            for symbol, first_key, last_key in expired_spans:
+                self._trim_ohlcv_coverage(
+                    cursor, symbol,
+                    _EPOCH_DATE + timedelta(days=first_key), _EPOCH_DATE + timedelta(days=last_key),
+                )
+
+            # expires_at 已预计算，按索引范围删除
+            for table in tables:
+                cursor.execute(f"DELETE FROM {table} WHERE expires_at < ?", (now,))
                 total_cleared += cursor.rowcount
 
             conn.commit()
-            return total_cleared
+
+        if self.hot_cache is not None and total_cleared:
+            self.hot_cache.clear()
+        return total_cleared
+
+
+# 全局缓存管理器（单例）
+_global_cache: Optional[CacheManager] = None
+_global_cache_lock = threading.Lock()
+
+
+def get_cache_manager() -> CacheManager:
+    """
+    获取全局缓存管理器实例（单例，使用默认路径的连接池缓存）
+
+    Returns:
+        CacheManager 实例
+    """
+    global _global_cache
+    with _global_cache_lock:
+        if _global_cache is None:
+            _global_cache = CacheManager(pooled=True)
+    return _global_cache
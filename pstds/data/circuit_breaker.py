@@ -0,0 +1,340 @@
+# pstds/data/circuit_breaker.py
+# 适配器熔断器 - 按滚动错误率/慢调用率熔断，并提供健康评分
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, UTC
+from typing import Any, Callable, Deque, Dict, List, Literal, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BreakerState = Literal["closed", "open", "half_open"]
+
+
+@dataclass
+class BreakerEvent:
+    """熔断器状态变更事件"""
+
+    adapter: str
+    from_state: BreakerState
+    to_state: BreakerState
+    reason: str
+    at: datetime = field(default_factory=lambda: datetime.now(UTC))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "adapter": self.adapter,
+            "from_state": self.from_state,
+            "to_state": self.to_state,
+            "reason": self.reason,
+            "at": self.at.isoformat(),
+        }
+
+
+class CircuitBreaker:
+    """
+    单个适配器的熔断器
+
+    - closed: 正常放行；滚动窗口（最近 window 次且 window_seconds 秒内）失败率或
+      慢调用率超过阈值时转为 open
+    - open: 拒绝调用，open_seconds 后转为 half_open
+    - half_open: 放行最多 half_open_max_calls 个探测调用；成功则 closed，失败则重新 open
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        window_seconds: float = 300.0,
+        min_calls: int = 5,
+        failure_threshold: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        slow_call_threshold: float = 0.8,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+        on_transition: Optional[Callable[[BreakerEvent], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            name: 适配器名
+            window: 滚动窗口（最近调用次数）
+            window_seconds: 滚动窗口时长（秒），过期样本不计入
+            min_calls: 窗口内至少多少次调用才评估是否熔断
+            failure_threshold: 失败率阈值
+            slow_call_seconds: 慢调用判定耗时（秒）
+            slow_call_threshold: 慢调用率阈值
+            open_seconds: open 状态持续时间（秒）
+            half_open_max_calls: half_open 状态允许的探测调用数
+            on_transition: 状态变更回调
+            clock: 单调时钟（测试可替换）
+        """
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_threshold = slow_call_threshold
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._on_transition = on_transition
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._outcomes: Deque[Tuple[float, bool, bool]] = deque(maxlen=window)  # (时间, 失败, 慢调用)
+        self._state: BreakerState = "closed"
+        self._opened_at = 0.0
+        self._probes = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> BreakerState:
+        """当前状态（open 到期时惰性转为 half_open）"""
+        with self._lock:
+            event = self._maybe_half_open()
+            state = self._state
+        self._emit(event)
+        return state
+
+    def _transition(self, to_state: BreakerState, reason: str) -> Optional[BreakerEvent]:
+        """调用方需持有锁；返回事件在锁外发布"""
+        if to_state == self._state:
+            return None
+        event = BreakerEvent(self.name, self._state, to_state, reason)
+        self._state = to_state
+        if to_state == "open":
+            self._opened_at = self._clock()
+        if to_state != "closed":
+            self._probes = 0
+        if to_state == "closed":
+            self._outcomes.clear()
+        return event
+
+    def _maybe_half_open(self) -> Optional[BreakerEvent]:
+        if self._state == "open" and self._clock() - self._opened_at >= self.open_seconds:
+            return self._transition("half_open", f"open for {self.open_seconds}s")
+        return None
+
+    def _emit(self, event: Optional[BreakerEvent]) -> None:
+        if event is None:
+            return
+        log = logger.warning if event.to_state == "open" else logger.info
+        log(f"[CircuitBreaker] {event.adapter}: {event.from_state} -> {event.to_state} ({event.reason})")
+        if self._on_transition:
+            self._on_transition(event)
+
+    def allow(self) -> bool:
+        """是否放行本次调用（half_open 状态下会占用一个探测名额）"""
+        with self._lock:
+            event = self._maybe_half_open()
+            if self._state == "closed":
+                allowed = True
+            elif self._state == "half_open" and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                allowed = True
+            else:
+                self.rejected += 1
+                allowed = False
+        self._emit(event)
+        return allowed
+
+    def release_probe(self) -> None:
+        """
+        归还 half_open 探测名额
+
+        探测调用被取消（对冲落败、超时）时没有结果可记录；不归还的话名额一直被占用，
+        熔断器停留在 half_open 且拒绝之后的所有调用。
+        """
+        with self._lock:
+            if self._state == "half_open" and self._probes > 0:
+                self._probes -= 1
+
+    def record(self, seconds: float, failed: bool, error: Optional[BaseException] = None) -> None:
+        """
+        记录一次调用结果
+
+        Args:
+            seconds: 调用耗时
+            failed: 是否失败（抛出异常或返回无效结果）
+            error: 异常对象（用于事件原因；无效结果时为 None）
+        """
+        slow = seconds >= self.slow_call_seconds
+        with self._lock:
+            event = None
+            if self._state == "half_open":
+                if failed or slow:
+                    reason = f"probe failed: {error or 'invalid result'}" if failed else f"probe slow: {seconds:.1f}s"
+                    event = self._transition("open", reason)
+                else:
+                    event = self._transition("closed", "probe succeeded")
+            elif self._state == "closed":
+                self._outcomes.append((self._clock(), failed, slow))
+                failure_rate, slow_rate = self._rates()
+                if len(self._outcomes) >= self.min_calls:
+                    if failure_rate >= self.failure_threshold:
+                        event = self._transition("open", f"failure rate {failure_rate:.0%}")
+                    elif slow_rate >= self.slow_call_threshold:
+                        event = self._transition("open", f"slow call rate {slow_rate:.0%}")
+            # open 状态下完成的调用（对冲/超时遗留）不影响状态
+        self._emit(event)
+
+    def _rates(self) -> Tuple[float, float]:
+        """窗口内失败率与慢调用率（调用方需持有锁，顺带清理过期样本）"""
+        expire_before = self._clock() - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < expire_before:
+            self._outcomes.popleft()
+        n = len(self._outcomes)
+        if n == 0:
+            return 0.0, 0.0
+        failures = sum(1 for _, failed, _ in self._outcomes if failed)
+        slow = sum(1 for _, _, slow in self._outcomes if slow)
+        return failures / n, slow / n
+
+    def health(self) -> float:
+        """
+        健康评分 0-1
+
+        open 为 0；否则 (1 - 失败率) × (1 - 慢调用率 / 2)，half_open 再减半。
+        窗口样本不足 min_calls 时不据此降级（视为健康）。
+        """
+        state = self.state
+        if state == "open":
+            return 0.0
+        with self._lock:
+            failure_rate, slow_rate = self._rates()
+            if len(self._outcomes) < self.min_calls:
+                failure_rate, slow_rate = 0.0, 0.0
+        score = (1 - failure_rate) * (1 - slow_rate / 2)
+        return score / 2 if state == "half_open" else score
+
+    def get_metrics(self) -> Dict[str, Any]:
+        state = self.state
+        with self._lock:
+            failure_rate, slow_rate = self._rates()
+            calls = len(self._outcomes)
+        return {
+            "state": state,
+            "health": self.health(),
+            "failure_rate": failure_rate,
+            "slow_call_rate": slow_rate,
+            "window_calls": calls,
+            "rejected": self.rejected,
+        }
+
+
+class BreakerRegistry:
+    """
+    熔断器注册表
+
+    按适配器名共享熔断器，进程内所有 DataRouter / FallbackManager 使用同一注册表
+    （见 get_breaker_registry）。状态变更记录为事件并按 (适配器, 目标状态) 计数，
+    可通过 subscribe 订阅。
+    """
+
+    # 健康评分低于此值视为降级，排在健康适配器之后
+    DEGRADED_HEALTH = 0.5
+
+    def __init__(self, max_events: int = 200, **breaker_kwargs):
+        """
+        Args:
+            max_events: 保留的最近事件数
+            **breaker_kwargs: 传给 CircuitBreaker 的参数
+        """
+        self._breaker_kwargs = breaker_kwargs
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._listeners: List[Callable[[BreakerEvent], None]] = []
+        self._events: Deque[BreakerEvent] = deque(maxlen=max_events)
+        self._transitions: Dict[Tuple[str, str], int] = {}
+
+    def get(self, adapter_name: str) -> CircuitBreaker:
+        """获取（或创建）适配器熔断器"""
+        with self._lock:
+            breaker = self._breakers.get(adapter_name)
+            if breaker is None:
+                breaker = CircuitBreaker(adapter_name, on_transition=self._publish, **self._breaker_kwargs)
+                self._breakers[adapter_name] = breaker
+            return breaker
+
+    def subscribe(self, listener: Callable[[BreakerEvent], None]) -> None:
+        """订阅状态变更事件"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def _publish(self, event: BreakerEvent) -> None:
+        with self._lock:
+            self._events.append(event)
+            key = (event.adapter, event.to_state)
+            self._transitions[key] = self._transitions.get(key, 0) + 1
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.warning(f"[CircuitBreaker] 事件订阅回调失败: {e}")
+
+    def rank(self, items: List[Any], name_of: Callable[[Any], str]) -> List[Any]:
+        """
+        按健康状况排序（稳定排序，健康时保持原优先级）
+
+        分层：健康 closed → 降级或 half_open → open
+        """
+        def tier(item) -> int:
+            breaker = self.get(name_of(item))
+            state = breaker.state
+            if state == "open":
+                return 2
+            if state == "half_open" or breaker.health() < self.DEGRADED_HEALTH:
+                return 1
+            return 0
+
+        return sorted(items, key=tier)
+
+    def get_events(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """最近的状态变更事件（新在后）"""
+        with self._lock:
+            events = list(self._events)[-limit:]
+        return [e.to_dict() for e in events]
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """各适配器熔断器指标，含状态变更计数"""
+        with self._lock:
+            breakers = dict(self._breakers)
+            transitions = dict(self._transitions)
+        metrics = {}
+        for name, breaker in breakers.items():
+            m = breaker.get_metrics()
+            m["transitions"] = {
+                to_state: count for (adapter, to_state), count in transitions.items() if adapter == name
+            }
+            metrics[name] = m
+        return metrics
+
+    def reset(self) -> None:
+        """清空熔断器与事件（测试用）"""
+        with self._lock:
+            self._breakers.clear()
+            self._events.clear()
+            self._transitions.clear()
+
+
+# 全局熔断器注册表（单例）
+_registry: Optional[BreakerRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_breaker_registry() -> BreakerRegistry:
+    """
+    获取进程级熔断器注册表（单例）
+
+    Returns:
+        BreakerRegistry 实例
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = BreakerRegistry()
+    return _registry
@@ -1,11 +1,17 @@
 # pstds/data/fallback.py
 # FallbackManager - 降级管理器
 
-from typing import List, Optional, Dict, Any
+from typing import Awaitable, Callable, List, Optional, Dict, Any, Tuple
 from datetime import date, datetime, UTC
 from pathlib import Path
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import asyncio
 import json
+import threading
+import time
 
+from pstds.data.circuit_breaker import BreakerRegistry
 from pstds.temporal.context import TemporalContext
 
 
@@ -13,7 +19,8 @@ class DataQualityReport:
     """
     数据质量报告
 
-    包含 score、missing_fields、anomaly_alerts、filtered_news_count、fallbacks_used
+    包含 score、missing_fields、anomaly_alerts、filtered_news_count、fallbacks_used、
+    sources（数据类型 -> 实际提供数据的适配器）
     """
 
     def __init__(
@@ -29,6 +36,7 @@ class DataQualityReport:
         self.anomaly_alerts = anomaly_alerts or []
         self.filtered_news_count = filtered_news_count
         self.fallbacks_used = fallbacks_used or []
+        self.sources: Dict[str, str] = {}
 
     def add_fallback(self, adapter_name: str) -> None:
         """记录降级使用的适配器"""
@@ -37,6 +45,10 @@ class DataQualityReport:
             # 降级每次扣 10 分
         self.score = max(0, self.score - 10)
 
+    def record_source(self, kind: str, adapter_name: str) -> None:
+        """记录某类数据（ohlcv/fundamentals/news）最终由哪个适配器提供"""
+        self.sources[kind] = adapter_name
+
     def add_missing_field(self, field: str) -> None:
         """记录缺失字段"""
         if field not in self.missing_fields:
@@ -65,26 +77,305 @@ class DataQualityReport:
             "anomaly_alerts": self.anomaly_alerts,
             "filtered_news_count": self.filtered_news_count,
             "fallbacks_used": self.fallbacks_used,
+            "sources": self.sources,
             "generated_at": datetime.now(UTC).isoformat(),
         }
 
 
+
+
+class LatencyTracker:
+    """
+    适配器延迟统计
+
+    按适配器名保存最近 window 次调用耗时，供对冲请求计算触发阈值
+    """
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, deque] = {}
+
+    def record(self, adapter_name: str, seconds: float) -> None:
+        """记录一次调用耗时（秒）"""
+        with self._lock:
+            samples = self._samples.get(adapter_name)
+            if samples is None:
+                samples = self._samples[adapter_name] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def percentile(self, adapter_name: str, q: float, min_samples: int = 5) -> Optional[float]:
+        """
+        耗时分位数
+
+        Args:
+            adapter_name: 适配器名
+            q: 分位（0-1）
+            min_samples: 样本不足时返回 None
+
+        Returns:
+            分位耗时（秒）或 None
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(adapter_name, ()))
+        if len(samples) < min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+# 全局延迟统计（单例）：FallbackManager 按请求创建，延迟样本需跨实例累积
+_latency_tracker: Optional[LatencyTracker] = None
+_latency_lock = threading.Lock()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """获取进程级适配器延迟统计（单例）"""
+    global _latency_tracker
+    with _latency_lock:
+        if _latency_tracker is None:
+            _latency_tracker = LatencyTracker()
+    return _latency_tracker
+
+
+def _adapter_name(adapter) -> str:
+    return str(getattr(adapter, "name", type(adapter).__name__))
+
+
+def _has_fundamentals(result) -> bool:
+    return bool(result) and any(
+        v is not None for k, v in result.items() if k not in ["data_source", "fetched_at"]
+    )
+
+
 class FallbackManager:
     """
     降级管理器
 
     主源失败时按优先级尝试备用源，记录 fallback_used 到 DataQualityReport
+
+    对冲模式（hedge=True）：当前适配器耗时超过其历史延迟的 hedge_percentile 分位
+    （样本不足时用 hedge_delay 秒）仍未返回时，并行启动下一个适配器，
+    首个有效非空结果胜出，其余请求取消（未开始的直接取消，已在执行的结果丢弃）。
+    deadline（秒）为单次调用的总时限，超时按全部失败处理；设置 deadline 时
+    即使不对冲也在线程中执行，以便按时返回。
+
+    传入 breakers（熔断器注册表）时：熔断（open）的适配器直接跳过，不再等待超时；
+    候选顺序按健康状况调整（见 BreakerRegistry.rank），是否计为降级仍按原主/备分组。
     """
 
+    # 无效结果计为熔断失败的数据类型：适配器出错时返回空 DataFrame / 全 None 字典。
+    # 新闻列表为空是正常结果（该股票近期无新闻），只有抛出异常才计为失败，
+    # 否则冷门股票的空新闻会打开适配器熔断器，连带阻断同一适配器的行情请求。
+    INVALID_IS_FAILURE = frozenset({"ohlcv", "fundamentals"})
+
     def __init__(
         self,
         primary_adapters: List,
         fallback_adapters: List,
         report: Optional[DataQualityReport] = None,
+        hedge: bool = False,
+        hedge_percentile: float = 0.95,
+        hedge_delay: float = 2.0,
+        deadline: Optional[float] = None,
+        latency_tracker: Optional[LatencyTracker] = None,
+        breakers: Optional[BreakerRegistry] = None,
     ):
+        """
+        Args:
+            primary_adapters: 主源适配器（按优先级）
+            fallback_adapters: 备用源适配器（按优先级）
+            report: 数据质量报告
+            hedge: 是否启用对冲请求
+            hedge_percentile: 触发对冲的延迟分位
+            hedge_delay: 延迟样本不足时的对冲等待秒数
+            deadline: 单次调用总时限（秒），None 表示不限
+            latency_tracker: 延迟统计（默认使用进程级全局实例）
+            breakers: 熔断器注册表（None 表示不熔断）
+        """
         self.primary_adapters = primary_adapters
         self.fallback_adapters = fallback_adapters
         self.report = report or DataQualityReport()
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_delay = hedge_delay
+        self.deadline = deadline
+        self.latency_tracker = latency_tracker or get_latency_tracker()
+        self.breakers = breakers
+
+    def _candidates(self) -> List[Tuple[Any, bool]]:
+        """(适配器, 是否备用源) 按优先级排列；有熔断器时按健康状况调整"""
+        candidates = [(a, False) for a in self.primary_adapters] + [(a, True) for a in self.fallback_adapters]
+        if self.breakers is not None:
+            candidates = self.breakers.rank(candidates, lambda c: _adapter_name(c[0]))
+        return candidates
+
+    def _admit(self, adapter) -> bool:
+        """熔断器是否放行该适配器"""
+        if self.breakers is None or self.breakers.get(_adapter_name(adapter)).allow():
+            return True
+        print(f"Adapter {_adapter_name(adapter)} skipped: circuit open")
+        return False
+
+    def _accept(self, kind: str, adapter, is_fallback: bool, result: Any) -> Any:
+        name = _adapter_name(adapter)
+        if is_fallback:
+            self.report.add_fallback(name)
+        self.report.record_source(kind, name)
+        return result
+
+    def _record(
+        self,
+        adapter,
+        seconds: float,
+        error: Optional[BaseException],
+        invalid: bool = False,
+    ) -> None:
+        """
+        记录调用耗时到延迟统计与熔断器
+
+        适配器内部捕获异常后返回空结果（空 DataFrame / 全 None 字典），
+        因此这类无效结果（invalid=True，见 INVALID_IS_FAILURE）与抛出异常同样计为熔断失败。
+        """
+        name = _adapter_name(adapter)
+        self.latency_tracker.record(name, seconds)
+        if self.breakers is not None:
+            self.breakers.get(name).record(seconds, failed=error is not None or invalid, error=error)
+
+    def _timed_call(
+        self,
+        adapter,
+        call: Callable[[Any], Any],
+        is_valid: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        start = time.monotonic()
+        error = None
+        invalid = False
+        try:
+            result = call(adapter)
+            invalid = is_valid is not None and not is_valid(result)
+            return result
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._record(adapter, time.monotonic() - start, error, invalid)
+
+    def _failure_check(self, kind: str, is_valid: Callable[[Any], bool]) -> Optional[Callable[[Any], bool]]:
+        """熔断统计使用的结果校验；None 表示只有抛出异常才计为失败"""
+        return is_valid if kind in self.INVALID_IS_FAILURE else None
+
+    def _fetch(
+        self,
+        kind: str,
+        call: Callable[[Any], Any],
+        is_valid: Callable[[Any], bool],
+        default: Any,
+    ) -> Any:
+        """按优先级获取数据；启用对冲或设置 deadline 时走并行路径"""
+        if self.hedge or self.deadline is not None:
+            return self._fetch_hedged(kind, call, is_valid, default)
+
+        failure_check = self._failure_check(kind, is_valid)
+        for adapter, is_fallback in self._candidates():
+            if not self._admit(adapter):
+                continue
+            try:
+                result = self._timed_call(adapter, call, failure_check)
+                if is_valid(result):
+                    return self._accept(kind, adapter, is_fallback, result)
+            except Exception as e:
+                label = "Fallback" if is_fallback else "Primary"
+                print(f"{label} adapter {_adapter_name(adapter)} failed: {e}")
+                continue
+
+        # 所有适配器都失败
+        return default
+
+    def _hedge_wait(self, adapter) -> Optional[float]:
+        """当前适配器在触发对冲前的等待秒数；不对冲时为 None（一直等待）"""
+        if not self.hedge:
+            return None
+        observed = self.latency_tracker.percentile(_adapter_name(adapter), self.hedge_percentile)
+        return observed if observed is not None else self.hedge_delay
+
+    def _fetch_hedged(
+        self,
+        kind: str,
+        call: Callable[[Any], Any],
+        is_valid: Callable[[Any], bool],
+        default: Any,
+    ) -> Any:
+        candidates = self._candidates()
+        if not candidates:
+            return default
+
+        deadline_at = time.monotonic() + self.deadline if self.deadline is not None else None
+        failure_check = self._failure_check(kind, is_valid)
+        executor = ThreadPoolExecutor(max_workers=len(candidates), thread_name_prefix="pstds-hedge")
+        running: Dict[Any, Tuple[Any, bool]] = {}
+        next_index = 0
+        hedge_at: Optional[float] = None
+
+        def launch() -> bool:
+            """启动下一个放行的适配器；没有可启动的适配器时返回 False"""
+            nonlocal next_index, hedge_at
+            while next_index < len(candidates):
+                adapter, is_fallback = candidates[next_index]
+                next_index += 1
+                if not self._admit(adapter):
+                    continue
+                running[executor.submit(self._timed_call, adapter, call, failure_check)] = (adapter, is_fallback)
+                delay = self._hedge_wait(adapter)
+                hedge_at = time.monotonic() + delay if delay is not None else None
+                return True
+            hedge_at = None
+            return False
+
+        try:
+            launch()
+            while running:
+                now = time.monotonic()
+                limits = [t for t in (hedge_at, deadline_at) if t is not None]
+                timeout = max(0.0, min(limits) - now) if limits else None
+                done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+
+                if not done:
+                    if deadline_at is not None and time.monotonic() >= deadline_at:
+                        print(f"{kind} fetch exceeded deadline {self.deadline}s")
+                        return default
+                    launch()
+                    continue
+
+                # 同时完成时按优先级取第一个有效结果
+                failed = 0
+                for future in sorted(done, key=lambda f: candidates.index(running[f])):
+                    adapter, is_fallback = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        label = "Fallback" if is_fallback else "Primary"
+                        print(f"{label} adapter {_adapter_name(adapter)} failed: {e}")
+                        failed += 1
+                        continue
+                    if is_valid(result):
+                        return self._accept(kind, adapter, is_fallback, result)
+                    failed += 1
+
+                # 失败或无效的请求由下一个适配器立即补位
+                for _ in range(failed):
+                    launch()
+
+            # 所有适配器都失败
+            return default
+        finally:
+            # 取消未开始的请求；已在执行的请求不等待，结果丢弃
+            for future in running:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
 
     def get_ohlcv(
         self,
@@ -99,29 +390,12 @@ class FallbackManager:
 
         按优先级尝试适配器，失败时自动切换到备用源
         """
-        # 先尝试主源
-        for adapter in self.primary_adapters:
-            try:
-                result = adapter.get_ohlcv(symbol, start_date, end_date, interval, ctx)
-                if not result.empty:
-                    return result
-            except Exception as e:
-                print(f"Primary adapter {adapter.name} failed: {e}")
-                continue
-
-        # 主源失败，尝试备用源
-        for adapter in self.fallback_adapters:
-            try:
-                result = adapter.get_ohlcv(symbol, start_date, end_date, interval, ctx)
-                if not result.empty:
-                    self.report.add_fallback(adapter.name)
-                    return result
-            except Exception as e:
-                print(f"Fallback adapter {adapter.name} failed: {e}")
-                continue
-
-        # 所有适配器都失败，返回空 DataFrame
-        return None
+        return self._fetch(
+            "ohlcv",
+            lambda adapter: adapter.get_ohlcv(symbol, start_date, end_date, interval, ctx),
+            lambda result: result is not None and not result.empty,
+            None,
+        )
 
     def get_fundamentals(
         self,
@@ -132,30 +406,12 @@ class FallbackManager:
         """
         获取基本面数据，支持自动降级
         """
-        # 先尝试主源
-        for adapter in self.primary_adapters:
-            try:
-                result = adapter.get_fundamentals(symbol, as_of_date, ctx)
-                # 检查是否有有效数据
-                if any(v is not None for k, v in result.items() if k not in ["data_source", "fetched_at"]):
-                    return result
-            except Exception as e:
-                print(f"Primary adapter {adapter.name} failed: {e}")
-                continue
-
-        # 主源失败，尝试备用源
-        for adapter in self.fallback_adapters:
-            try:
-                result = adapter.get_fundamentals(symbol, as_of_date, ctx)
-                if any(v is not None for k, v in result.items() if k not in ["data_source", "fetched_at"]):
-                    self.report.add_fallback(adapter.name)
-                    return result
-            except Exception as e:
-                print(f"Fallback adapter {adapter.name} failed: {e}")
-                continue
-
-        # 所有适配器都失败
-        return None
+        return self._fetch(
+            "fundamentals",
+            lambda adapter: adapter.get_fundamentals(symbol, as_of_date, ctx),
+            _has_fundamentals,
+            None,
+        )
 
     def get_news(
         self,
@@ -166,30 +422,158 @@ class FallbackManager:
         """
         获取新闻数据，支持自动降级
         """
-        # 先尝试主源
-        for adapter in self.primary_adapters:
-            try:
-                result = adapter.get_news(symbol, days_back, ctx)
-                if result:
-                    return result
-            except Exception as e:
-                print(f"Primary adapter {adapter.name} failed: {e}")
-                continue
-
-        # 主源失败，尝试备用源
-        for adapter in self.fallback_adapters:
-            try:
-                result = adapter.get_news(symbol, days_back, ctx)
-                if result:
-                    self.report.add_fallback(adapter.name)
-                    return result
-            except Exception as e:
-                print(f"Fallback adapter {adapter.name} failed: {e}")
-                continue
-
-        # 所有适配器都失败
-        return []
+        return self._fetch(
+            "news",
+            lambda adapter: adapter.get_news(symbol, days_back, ctx),
+            bool,
+            [],
+        )
 
     def get_report(self) -> DataQualityReport:
         """获取数据质量报告"""
         return self.report
+
+
+class AsyncFallbackManager(FallbackManager):
+    """
+    异步降级管理器
+
+    与 FallbackManager 相同的降级、对冲、总时限与熔断语义，适配器为
+    AsyncMarketDataAdapter（见 pstds.data.adapters.async_adapters）。
+    请求以 asyncio 任务并发，对冲落败或超时的任务会被真正取消。
+    """
+
+    async def _timed_call_async(
+        self,
+        adapter,
+        call: Callable[[Any], Awaitable],
+        is_valid: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        start = time.monotonic()
+        try:
+            result = await call(adapter)
+        except asyncio.CancelledError:
+            # 被取消（对冲落败/超时）不计入熔断统计；若占用了 half_open 探测名额则归还
+            if self.breakers is not None:
+                self.breakers.get(_adapter_name(adapter)).release_probe()
+            raise
+        except Exception as e:
+            self._record(adapter, time.monotonic() - start, e)
+            raise
+        invalid = is_valid is not None and not is_valid(result)
+        self._record(adapter, time.monotonic() - start, None, invalid)
+        return result
+
+    async def _fetch_async(
+        self,
+        kind: str,
+        call: Callable[[Any], Awaitable],
+        is_valid: Callable[[Any], bool],
+        default: Any,
+    ) -> Any:
+        """按优先级获取数据；不对冲时逐个等待，对冲时到达阈值即并发下一个"""
+        candidates = self._candidates()
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + self.deadline if self.deadline is not None else None
+        failure_check = self._failure_check(kind, is_valid)
+        running: Dict[asyncio.Task, Tuple[Any, bool]] = {}
+        next_index = 0
+        hedge_at: Optional[float] = None
+
+        def launch() -> bool:
+            """启动下一个放行的适配器；没有可启动的适配器时返回 False"""
+            nonlocal next_index, hedge_at
+            while next_index < len(candidates):
+                adapter, is_fallback = candidates[next_index]
+                next_index += 1
+                if not self._admit(adapter):
+                    continue
+                running[asyncio.ensure_future(self._timed_call_async(adapter, call, failure_check))] = (adapter, is_fallback)
+                delay = self._hedge_wait(adapter)
+                hedge_at = loop.time() + delay if delay is not None else None
+                return True
+            hedge_at = None
+            return False
+
+        try:
+            launch()
+            while running:
+                limits = [t for t in (hedge_at, deadline_at) if t is not None]
+                timeout = max(0.0, min(limits) - loop.time()) if limits else None
+                done, _ = await asyncio.wait(list(running), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    if deadline_at is not None and loop.time() >= deadline_at:
+                        print(f"{kind} fetch exceeded deadline {self.deadline}s")
+                        return default
+                    launch()
+                    continue
+
+                # 同时完成时按优先级取第一个有效结果
+                failed = 0
+                for task in sorted(done, key=lambda t: candidates.index(running[t])):
+                    adapter, is_fallback = running.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        label = "Fallback" if is_fallback else "Primary"
+                        print(f"{label} adapter {_adapter_name(adapter)} failed: {e}")
+                        failed += 1
+                        continue
+                    if is_valid(result):
+                        return self._accept(kind, adapter, is_fallback, result)
+                    failed += 1
+
+                # 失败或无效的请求由下一个适配器立即补位
+                for _ in range(failed):
+                    launch()
+
+            # 所有适配器都失败
+            return default
+        finally:
+            for task in running:
+                task.cancel()
+
+    async def get_ohlcv(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        interval: str,
+        ctx: TemporalContext,
+    ) -> Any:
+        """异步获取 OHLCV 数据，支持自动降级"""
+        return await self._fetch_async(
+            "ohlcv",
+            lambda adapter: adapter.get_ohlcv(symbol, start_date, end_date, interval, ctx),
+            lambda result: result is not None and not result.empty,
+            None,
+        )
+
+    async def get_fundamentals(
+        self,
+        symbol: str,
+        as_of_date: date,
+        ctx: TemporalContext,
+    ) -> Optional[Dict]:
+        """异步获取基本面数据，支持自动降级"""
+        return await self._fetch_async(
+            "fundamentals",
+            lambda adapter: adapter.get_fundamentals(symbol, as_of_date, ctx),
+            _has_fundamentals,
+            None,
+        )
+
+    async def get_news(
+        self,
+        symbol: str,
+        days_back: int,
+        ctx: TemporalContext,
+    ) -> List:
+        """异步获取新闻数据，支持自动降级"""
+        return await self._fetch_async(
+            "news",
+            lambda adapter: adapter.get_news(symbol, days_back, ctx),
+            bool,
+            [],
+        )
@@ -0,0 +1,168 @@
+# pstds/data/incremental.py
+# 增量行情获取 - 按覆盖索引只拉取缺失的日期区间
+
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+from datetime import date, datetime, timedelta, UTC
+import pandas as pd
+
+from pstds.temporal.context import TemporalContext
+from pstds.data.cache import CacheManager
+from pstds.data.fallback import DataQualityReport
+
+
+class IncrementalOHLCVFetcher:
+    """
+    增量 OHLCV 获取器
+
+    CacheManager 的 ohlcv_coverage 表记录每个 (symbol, interval) 已完整缓存的日期区间。
+    请求时只对未覆盖的子区间调用 FallbackManager，结果写入缓存后与已有数据合并返回。
+
+    覆盖规则：
+    - 只记录到抓取日前一天（当日 K 线可能未收盘，下次请求重新获取）
+    - 返回数据需包含区间内交易日历的全部交易日才记为完整，缺失的交易日留作缺口
+    - 交易日历不可用时按工作日估算
+    - 缓存只存日线，其他周期直接透传给 FallbackManager
+    """
+
+    CACHED_INTERVAL = "1d"
+
+    def __init__(
+        self,
+        cache: CacheManager,
+        router=None,
+        calendar=None,
+    ):
+        """
+        Args:
+            cache: 缓存管理器
+            router: DataRouter 实例，未传入 fallback_manager 时用于构建（可选）
+            calendar: TradingCalendar 实例（可选，默认使用全局单例）
+        """
+        self.cache = cache
+        self.router = router
+        self._calendar = calendar
+
+        # 累计统计（预热线程与交互请求并发更新，经 _count 加锁累加）
+        self.stats = {
+            "requests": 0,
+            "full_hits": 0,
+            "ranges_fetched": 0,
+            "bars_fetched": 0,
+        }
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[name] += n
+
+    @property
+    def calendar(self):
+        if self._calendar is None:
+            from pstds.backtest.calendar import get_calendar
+            self._calendar = get_calendar()
+        return self._calendar
+
+    def get_ohlcv(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        interval: str,
+        ctx: TemporalContext,
+        fallback_manager=None,
+        quality_report: Optional[DataQualityReport] = None,
+    ) -> Optional[pd.DataFrame]:
+        """
+        获取 OHLCV 数据，只拉取缓存未覆盖的子区间
+
+        Returns:
+            合并后的 DataFrame，无任何数据时返回 None（与 FallbackManager 一致）
+        """
+        if fallback_manager is None:
+            fallback_manager = self.router.get_fallback_manager(symbol, quality_report)
+
+        if interval != self.CACHED_INTERVAL:
+            return fallback_manager.get_ohlcv(symbol, start_date, end_date, interval, ctx)
+
+        self._count("requests")
+        end_date = min(end_date, ctx.analysis_date)
+        if start_date > end_date:
+            return None
+
+        market_type = self._market_type(symbol)
+        trading_days = self._expected_trading_days(start_date, end_date, market_type)
+        # 抓取日当天及之后的 K 线不记入覆盖
+        last_closed = datetime.now(UTC).date() - timedelta(days=1)
+
+        gaps = self.cache.missing_ohlcv_ranges(symbol, interval, start_date, end_date)
+        if not gaps:
+            self._count("full_hits")
+
+        for gap_start, gap_end in gaps:
+            days = [d for d in trading_days if gap_start <= d <= gap_end]
+            if not days:
+                # 缺口内无交易日（周末/节假日），无需请求
+                self.cache.record_ohlcv_coverage(symbol, interval, gap_start, min(gap_end, last_closed))
+                continue
+
+            df = fallback_manager.get_ohlcv(symbol, days[0], days[-1], interval, ctx)
+            self._count("ranges_fetched")
+            if df is None or df.empty:
+                continue
+
+            self._count("bars_fetched", len(df))
+            self.cache.set_ohlcv(symbol, df, ctx)
+
+            received = {pd.Timestamp(d).date() for d in df["date"]}
+            for seg_start, seg_end in self._complete_segments(gap_start, gap_end, days, received):
+                self.cache.record_ohlcv_coverage(symbol, interval, seg_start, min(seg_end, last_closed))
+
+        return self.cache.get_ohlcv(symbol, start_date, end_date, ctx, ignore_ttl=True)
+
+    @staticmethod
+    def _complete_segments(
+        gap_start: date,
+        gap_end: date,
+        trading_days: List[date],
+        received: Set[date],
+    ) -> List[Tuple[date, date]]:
+        """按缺失的交易日切分缺口，返回数据完整的子区间"""
+        segments = []
+        seg_start = gap_start
+        for day in trading_days:
+            if day not in received:
+                if seg_start < day:
+                    segments.append((seg_start, day - timedelta(days=1)))
+                seg_start = day + timedelta(days=1)
+        if seg_start <= gap_end:
+            segments.append((seg_start, gap_end))
+        return segments
+
+    def _expected_trading_days(
+        self,
+        start_date: date,
+        end_date: date,
+        market_type: str,
+    ) -> List[date]:
+        """区间内应有的交易日；日历不可用或取数失败时按工作日估算"""
+        days: List[date] = []
+        if self.calendar.is_available(market_type):
+            days = self.calendar.get_trading_days(start_date, end_date, market_type)
+        if not days:
+            days = [ts.date() for ts in pd.bdate_range(start_date, end_date)]
+        return days
+
+    @staticmethod
+    def _market_type(symbol: str) -> str:
+        from pstds.data.router import MarketRouter, MarketNotSupportedError
+
+        try:
+            return MarketRouter.route(symbol)
+        except MarketNotSupportedError:
+            return "US"
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取累计统计"""
+        with self._stats_lock:
+            return dict(self.stats)
@@ -0,0 +1,243 @@
+# pstds/data/indicators.py
+# 技术指标物化 - 每只股票每根新 K 线只计算一次全部指标，窗口查询走 technical_cache
+
+import threading
+from datetime import date, datetime, UTC
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from pstds.data.cache import CacheManager, get_cache_manager
+from pstds.temporal.context import TemporalContext
+from tradingagents.dataflows.indicator_kernels import compute_arrays
+
+
+# 支持的指标（与 tradingagents get_indicators 工具一致，stockstats 命名）
+SUPPORTED_INDICATORS = (
+    "close_50_sma",
+    "close_200_sma",
+    "close_10_ema",
+    "macd",
+    "macds",
+    "macdh",
+    "rsi",
+    "boll",
+    "boll_ub",
+    "boll_lb",
+    "atr",
+    "vwma",
+    "mfi",
+)
+
+# 默认历史行情来源（tradingagents 在线日线历史）
+DEFAULT_SOURCE = "yfinance"
+
+
+def compute_indicators(
+    history: pd.DataFrame,
+    indicators: Sequence[str] = SUPPORTED_INDICATORS,
+) -> pd.DataFrame:
+    """
+    在完整历史上一次性计算多个指标（NumPy 指标内核，数值与 stockstats 一致）
+
+    Args:
+        history: 含 Date/date 及 OHLCV 列的历史行情（列名大小写不限）
+        indicators: 指标列表（stockstats 命名）
+
+    Returns:
+        宽表：date 列（datetime）+ 每个指标一列
+    """
+    data = history.rename(columns=str.lower)
+    out = pd.DataFrame({"date": pd.to_datetime(data["date"]).to_numpy()})
+    for indicator, values in compute_arrays(data, indicators).items():
+        out[indicator] = values
+    return out
+
+
+class IndicatorMaterializer:
+    """
+    技术指标物化器
+
+    指标值只依赖截至当日的 K 线，因此按股票整体物化：
+    - technical_cache 已覆盖请求窗口的终点，或今天已物化过 → 直接按主键范围查询
+    - 否则加载历史行情，出现新 K 线时一次计算全部指标并批量写入
+
+    重新物化时覆盖全部历史行（复权价格调整后旧值同步更新，过期时间一起刷新）。
+    缓存键包含历史行情来源（如离线快照 local 与在线 yfinance），不同来源算出的值互不覆盖。
+    """
+
+    def __init__(
+        self,
+        cache: CacheManager,
+        indicators: Sequence[str] = SUPPORTED_INDICATORS,
+        ttl_hours: int = 24,
+    ):
+        """
+        Args:
+            cache: 缓存管理器
+            indicators: 物化的指标列表
+            ttl_hours: 指标缓存有效期（小时）
+        """
+        self.cache = cache
+        self.indicators = tuple(indicators)
+        self.ttl_hours = ttl_hours
+
+        # 同一股票的物化串行执行，避免并发工具调用重复计算
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+        self.stats = {
+            "queries": 0,
+            "materializations": 0,
+            "rows_written": 0,
+        }
+
+    @staticmethod
+    def cache_key(symbol: str, source: str = DEFAULT_SOURCE) -> str:
+        """technical_cache 中的股票键：{symbol}@{source}"""
+        return f"{symbol}@{source}"
+
+    def _symbol_lock(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def get_state(self, symbol: str, source: str = DEFAULT_SOURCE) -> Optional[Tuple[date, datetime]]:
+        """
+        已物化指标的状态
+
+        Returns:
+            (最新交易日, 最近物化时间)，未物化或已过期时返回 None
+        """
+        return self.cache.get_technical_state(self.cache_key(symbol, source))
+
+    def _is_fresh(self, symbol: str, end_date: date, source: str) -> bool:
+        """已物化数据覆盖 end_date，或今天已物化（当天不会再有新 K 线）"""
+        state = self.get_state(symbol, source)
+        if state is None:
+            return False
+        last_date, materialized_at = state
+        return last_date >= end_date or materialized_at.date() >= datetime.now(UTC).date()
+
+    def materialize(self, symbol: str, history: pd.DataFrame, source: str = DEFAULT_SOURCE) -> int:
+        """
+        计算全部指标并批量写入 technical_cache
+
+        Args:
+            symbol: 股票代码
+            history: 完整历史行情
+            source: 历史行情来源
+
+        Returns:
+            写入行数（历史行情为空时为 0）
+        """
+        if history is None or history.empty:
+            return 0
+        frame = compute_indicators(history, self.indicators)
+        rows = self.cache.set_technical_bulk(self.cache_key(symbol, source), frame, ttl_hours=self.ttl_hours)
+        self.stats["materializations"] += 1
+        self.stats["rows_written"] += rows
+        return rows
+
+    def get_window(
+        self,
+        symbol: str,
+        indicator: str,
+        start_date: date,
+        end_date: date,
+        history_loader: Callable[[], pd.DataFrame],
+        ctx: Optional[TemporalContext] = None,
+        source: str = DEFAULT_SOURCE,
+    ) -> Dict[date, Optional[float]]:
+        """
+        获取指标窗口，必要时先物化
+
+        Args:
+            symbol: 股票代码
+            indicator: 指标名（须在 indicators 中）
+            start_date: 窗口起始日
+            end_date: 窗口结束日
+            history_loader: 返回完整历史行情的函数，仅在需要物化时调用
+            ctx: 时间上下文（可选，上界截断到 analysis_date）
+            source: history_loader 的历史行情来源
+
+        Returns:
+            {交易日: 指标值}，非交易日不出现，预热期内值为 None
+        """
+        return self.get_windows(symbol, [indicator], start_date, end_date, history_loader, ctx, source)[indicator]
+
+    def get_windows(
+        self,
+        symbol: str,
+        indicators: Sequence[str],
+        start_date: date,
+        end_date: date,
+        history_loader: Callable[[], pd.DataFrame],
+        ctx: Optional[TemporalContext] = None,
+        source: str = DEFAULT_SOURCE,
+    ) -> Dict[str, Dict[date, Optional[float]]]:
+        """
+        批量获取多个指标的同一窗口（只做一次新鲜度检查，必要时只物化一次）
+
+        Args:
+            symbol: 股票代码
+            indicators: 指标名列表（均须在 indicators 中）
+            start_date: 窗口起始日
+            end_date: 窗口结束日
+            history_loader: 返回完整历史行情的函数，仅在需要物化时调用
+            ctx: 时间上下文（可选，上界截断到 analysis_date）
+            source: history_loader 的历史行情来源
+
+        Returns:
+            {指标名: {交易日: 指标值}}
+        """
+        unsupported = [name for name in indicators if name not in self.indicators]
+        if unsupported:
+            raise ValueError(f"Indicator {', '.join(unsupported)} is not supported. Please choose from: {list(self.indicators)}")
+
+        self.stats["queries"] += 1
+        key = self.cache_key(symbol, source)
+        with self._symbol_lock(key):
+            if not self._is_fresh(symbol, end_date, source):
+                self.materialize(symbol, history_loader(), source)
+
+        return {
+            name: self.cache.get_technical(key, name, start_date, end_date, ctx) or {}
+            for name in indicators
+        }
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取累计统计"""
+        return dict(self.stats)
+
+
+# 全局指标物化器（每个缓存目录一个）
+_global_materializers: Dict[Optional[str], IndicatorMaterializer] = {}
+_global_lock = threading.Lock()
+
+
+def get_indicator_materializer(cache_dir: Optional[str] = None) -> IndicatorMaterializer:
+    """
+    获取全局指标物化器实例（每个缓存目录一个单例，使用连接池缓存）
+
+    Args:
+        cache_dir: 缓存根目录（如 tradingagents 的 data_cache_dir），
+            数据库位于其下的 pstds/cache.db；None 表示全局缓存管理器（默认路径）
+
+    Returns:
+        IndicatorMaterializer 实例
+    """
+    with _global_lock:
+        if cache_dir not in _global_materializers:
+            if cache_dir is None:
+                cache = get_cache_manager()
+            else:
+                root = Path(cache_dir) / "pstds"
+                cache = CacheManager(
+                    db_path=str(root / "cache.db"),
+                    parquet_dir=str(root / "raw" / "prices"),
+                    news_dir=str(root / "raw" / "news"),
+                    pooled=True,
+                )
+            _global_materializers[cache_dir] = IndicatorMaterializer(cache)
+        return _global_materializers[cache_dir]
@@ -0,0 +1,510 @@
+# pstds/data/rate_limiter.py
+# 跨进程数据源限速 - 令牌桶 + 每日配额，SQLite（默认）或 Redis 持久化
+
+import asyncio
+import hashlib
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - 可选依赖
+    redis = None
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    单个令牌桶的限速规则
+
+    rate: 每个周期补充的令牌数
+    period: 周期长度（秒）
+    burst: 桶容量（默认等于 rate）
+    daily_quota: 每日（UTC）请求上限，None 表示不限
+    """
+    rate: float
+    period: float = 1.0
+    burst: Optional[float] = None
+    daily_quota: Optional[int] = None
+
+    @property
+    def capacity(self) -> float:
+        return float(self.burst if self.burst is not None else self.rate)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RateLimit":
+        return cls(
+            rate=float(data["rate"]),
+            period=float(data.get("period", 1.0)),
+            burst=data.get("burst"),
+            daily_quota=data.get("daily_quota"),
+        )
+
+
+# 数据源级限速（同一数据源的所有 API key 共享）
+DEFAULT_RATE_LIMITS: Dict[str, RateLimit] = {}
+
+# API key 级限速（每个 key 独立计数）；Alpha Vantage 免费档：5 次/分钟，25 次/天
+DEFAULT_KEY_RATE_LIMITS: Dict[str, RateLimit] = {
+    "alpha_vantage": RateLimit(rate=5, period=60, daily_quota=25),
+}
+
+# 默认最长排队等待（秒）：超过则立即失败交给降级逻辑，而不是无限阻塞
+DEFAULT_MAX_WAIT = 60.0
+
+# 多个进程同时等待时的随机抖动比例，避免同一时刻集中重试
+WAIT_JITTER = 0.1
+
+# 状态行在最后一次使用后的保留时间（秒），跨过日配额重置即可
+STATE_TTL_SECONDS = 2 * 86400
+
+
+class RateLimitExceeded(Exception):
+    """在 max_wait 内无法取得令牌"""
+
+    def __init__(self, vendor: str, retry_after: float, message: Optional[str] = None):
+        self.vendor = vendor
+        self.retry_after = retry_after
+        super().__init__(message or f"{vendor} 限速：需等待 {retry_after:.1f} 秒")
+
+
+class QuotaExhaustedError(RateLimitExceeded):
+    """当日配额已用尽（UTC 零点重置）"""
+
+    def __init__(self, vendor: str, retry_after: float):
+        super().__init__(vendor, retry_after, f"{vendor} 当日配额已用尽，{retry_after:.0f} 秒后重置")
+
+
+def _quota_day(now: float) -> str:
+    return datetime.fromtimestamp(now, UTC).strftime("%Y-%m-%d")
+
+
+def _seconds_to_next_day(now: float) -> float:
+    current = datetime.fromtimestamp(now, UTC)
+    tomorrow = (current + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (tomorrow - current).total_seconds()
+
+
+def _key_fingerprint(key: str) -> str:
+    """API key 只以摘要形式出现在桶名中，不落盘明文"""
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+class SQLiteRateLimitBackend:
+    """
+    SQLite 令牌桶存储
+
+    每次取令牌在一个 BEGIN IMMEDIATE 事务内完成“读取—补充—判断—扣减”，
+    写锁保证同一数据库文件上的多个进程、多个线程之间原子执行。
+    """
+
+    def __init__(self, db_path: str = "./data/cache/rate_limits.db", busy_timeout: float = 30.0):
+        """
+        Args:
+            db_path: 数据库文件路径（所有共享配额的进程需指向同一文件）
+            busy_timeout: 等待其他进程释放写锁的超时（秒）
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        with self._transaction() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS rate_buckets (
+                    bucket TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    day TEXT NOT NULL,
+                    day_count INTEGER NOT NULL
+                )
+                """
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        """当前线程的连接；fork 后的子进程不复用父进程连接"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """写锁事务：正常结束提交，异常回滚"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def try_acquire(self, buckets: List[Tuple[str, RateLimit]], cost: float = 1.0) -> Tuple[float, bool]:
+        """
+        尝试从所有桶各取 cost 个令牌（全部成功才扣减）
+
+        Returns:
+            (需等待秒数, 是否配额耗尽)；(0.0, False) 表示已取得
+        """
+        with self._transaction() as conn:
+            now = time.time()
+            day = _quota_day(now)
+            wait = 0.0
+            states = []
+            for bucket, limit in buckets:
+                row = conn.execute(
+                    "SELECT tokens, updated_at, day, day_count FROM rate_buckets WHERE bucket = ?",
+                    (bucket,),
+                ).fetchone()
+                tokens, updated_at, row_day, count = row if row else (limit.capacity, now, day, 0)
+                if row_day != day:
+                    count = 0
+                tokens = min(limit.capacity, tokens + max(0.0, now - updated_at) * limit.rate / limit.period)
+                if limit.daily_quota is not None and count + cost > limit.daily_quota:
+                    return _seconds_to_next_day(now), True
+                if tokens < cost:
+                    wait = max(wait, (cost - tokens) * limit.period / limit.rate)
+                states.append((bucket, tokens, count))
+            if wait > 0:
+                return wait, False
+            conn.executemany(
+                "INSERT OR REPLACE INTO rate_buckets (bucket, tokens, updated_at, day, day_count) VALUES (?, ?, ?, ?, ?)",
+                [(bucket, tokens - cost, now, day, count + cost) for bucket, tokens, count in states],
+            )
+            conn.execute("DELETE FROM rate_buckets WHERE updated_at < ?", (now - STATE_TTL_SECONDS,))
+            return 0.0, False
+
+    def drain(self, buckets: List[Tuple[str, RateLimit]], daily: bool = False) -> None:
+        """清空令牌（数据源返回限速响应时调用）；daily=True 时同时标记当日配额用尽"""
+        with self._transaction() as conn:
+            now = time.time()
+            day = _quota_day(now)
+            for bucket, limit in buckets:
+                row = conn.execute("SELECT day, day_count FROM rate_buckets WHERE bucket = ?", (bucket,)).fetchone()
+                count = row[1] if row and row[0] == day else 0
+                if daily and limit.daily_quota is not None:
+                    count = max(count, limit.daily_quota)
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_buckets (bucket, tokens, updated_at, day, day_count) VALUES (?, 0, ?, ?, ?)",
+                    (bucket, now, day, count),
+                )
+
+    def reset(self) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM rate_buckets")
+
+
+# 与 SQLite 版相同的取令牌逻辑；以 Redis 服务器时间为准，多台机器共享同一时钟
+_REDIS_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local day = ARGV[1]
+local cost = tonumber(ARGV[2])
+local ttl = tonumber(ARGV[3])
+local wait = 0
+local states = {}
+for i, key in ipairs(KEYS) do
+  local base = 3 + (i - 1) * 4
+  local rate = tonumber(ARGV[base + 1])
+  local period = tonumber(ARGV[base + 2])
+  local capacity = tonumber(ARGV[base + 3])
+  local quota = tonumber(ARGV[base + 4])
+  local row = redis.call('HMGET', key, 'tokens', 'updated_at', 'day', 'day_count')
+  local tokens = tonumber(row[1]) or capacity
+  local updated = tonumber(row[2]) or now
+  local count = tonumber(row[4]) or 0
+  if row[3] ~= day then count = 0 end
+  tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate / period)
+  if quota >= 0 and count + cost > quota then
+    return {-1, '0'}
+  end
+  if tokens < cost then
+    wait = math.max(wait, (cost - tokens) * period / rate)
+  end
+  states[i] = {tokens, count}
+end
+if wait > 0 then return {0, tostring(wait)} end
+for i, key in ipairs(KEYS) do
+  redis.call('HSET', key, 'tokens', tostring(states[i][1] - cost), 'updated_at', tostring(now),
+             'day', day, 'day_count', tostring(states[i][2] + cost))
+  redis.call('EXPIRE', key, ttl)
+end
+return {1, '0'}
+"""
+
+
+class RedisRateLimitBackend:
+    """
+    Redis 令牌桶存储（可选）
+
+    取令牌由一段 Lua 脚本原子执行，适用于多台机器共享同一组 API key 配额。
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", client=None, prefix: str = "pstds:ratelimit:"):
+        """
+        Args:
+            url: Redis 连接串（client 为 None 时使用）
+            client: 已有的 redis.Redis 实例（可选）
+            prefix: 键前缀
+        """
+        if client is None:
+            if redis is None:
+                raise ImportError("redis 未安装，无法使用 Redis 限速后端。请运行: pip install redis")
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        self._acquire = client.register_script(_REDIS_ACQUIRE_SCRIPT)
+
+    def try_acquire(self, buckets: List[Tuple[str, RateLimit]], cost: float = 1.0) -> Tuple[float, bool]:
+        """同 SQLiteRateLimitBackend.try_acquire"""
+        now = time.time()
+        args: List[Any] = [_quota_day(now), cost, int(STATE_TTL_SECONDS)]
+        for _, limit in buckets:
+            quota = limit.daily_quota if limit.daily_quota is not None else -1
+            args.extend([limit.rate, limit.period, limit.capacity, quota])
+        status, wait = self._acquire(keys=[self.prefix + bucket for bucket, _ in buckets], args=args)
+        if int(status) < 0:
+            return _seconds_to_next_day(now), True
+        return float(wait), False
+
+    def drain(self, buckets: List[Tuple[str, RateLimit]], daily: bool = False) -> None:
+        """同 SQLiteRateLimitBackend.drain"""
+        now = time.time()
+        day = _quota_day(now)
+        pipe = self.client.pipeline()
+        for bucket, limit in buckets:
+            key = self.prefix + bucket
+            pipe.hset(key, mapping={"tokens": 0, "updated_at": now, "day": day})
+            if daily and limit.daily_quota is not None:
+                pipe.hset(key, "day_count", limit.daily_quota)
+            pipe.expire(key, int(STATE_TTL_SECONDS))
+        pipe.execute()
+
+    def reset(self) -> None:
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+
+class RateLimiter:
+    """
+    数据源限速器
+
+    请求发出前调用 acquire()：令牌不足时排队等待，直到桶内补充出令牌；
+    预计等待超过 max_wait 或当日配额已用尽时立即抛出 RateLimitExceeded / QuotaExhaustedError，
+    由调用方降级到其他数据源，而不是把请求发出去消耗配额再失败。
+
+    桶分两级：
+    - 数据源级 limits[vendor]：该数据源所有请求共享
+    - key 级 key_limits[vendor]：按 API key 分别计数
+    两级都配置时须同时取得令牌。状态存储在后端（SQLite 文件或 Redis），多进程共享。
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        limits: Optional[Dict[str, RateLimit]] = None,
+        key_limits: Optional[Dict[str, RateLimit]] = None,
+        max_wait: float = DEFAULT_MAX_WAIT,
+        sleep=time.sleep,
+    ):
+        """
+        Args:
+            backend: SQLiteRateLimitBackend / RedisRateLimitBackend（默认 SQLite）
+            limits: 数据源级规则（默认 DEFAULT_RATE_LIMITS）
+            key_limits: key 级规则（默认 DEFAULT_KEY_RATE_LIMITS）
+            max_wait: 默认最长排队等待（秒）
+            sleep: 等待函数（测试可替换）
+        """
+        self.backend = backend or SQLiteRateLimitBackend()
+        self.limits = dict(DEFAULT_RATE_LIMITS if limits is None else limits)
+        self.key_limits = dict(DEFAULT_KEY_RATE_LIMITS if key_limits is None else key_limits)
+        self.max_wait = max_wait
+        self._sleep = sleep
+        self._metrics: Dict[str, Dict[str, float]] = {}
+        self._metrics_lock = threading.Lock()
+
+    def buckets(self, vendor: str, key: Optional[str] = None) -> List[Tuple[str, RateLimit]]:
+        """本次请求需要取令牌的桶"""
+        buckets = []
+        if vendor in self.limits:
+            buckets.append((vendor, self.limits[vendor]))
+        if vendor in self.key_limits:
+            suffix = _key_fingerprint(key) if key else "default"
+            buckets.append((f"{vendor}:key:{suffix}", self.key_limits[vendor]))
+        return buckets
+
+    def _count(self, vendor: str, field: str, amount: float = 1) -> None:
+        with self._metrics_lock:
+            stats = self._metrics.setdefault(vendor, {"acquired": 0, "waited": 0, "wait_seconds": 0.0, "rejected": 0})
+            stats[field] += amount
+
+    def try_acquire(self, vendor: str, key: Optional[str] = None, cost: float = 1.0) -> float:
+        """
+        非阻塞取令牌
+
+        Returns:
+            0.0 表示已取得，否则为需等待的秒数
+
+        Raises:
+            QuotaExhaustedError: 当日配额已用尽
+        """
+        buckets = self.buckets(vendor, key)
+        if not buckets:
+            return 0.0
+        wait, exhausted = self.backend.try_acquire(buckets, cost)
+        if exhausted:
+            self._count(vendor, "rejected")
+            raise QuotaExhaustedError(vendor, wait)
+        if wait <= 0:
+            self._count(vendor, "acquired")
+        return wait
+
+    def _next_wait(self, vendor: str, wait: float, deadline: float) -> float:
+        """本轮应等待的秒数（带抖动）；超过截止时间则抛出 RateLimitExceeded"""
+        remaining = deadline - time.monotonic()
+        if wait > remaining:
+            self._count(vendor, "rejected")
+            raise RateLimitExceeded(vendor, wait)
+        return min(remaining, wait * (1 + random.uniform(0, WAIT_JITTER)))
+
+    def acquire(
+        self,
+        vendor: str,
+        key: Optional[str] = None,
+        cost: float = 1.0,
+        max_wait: Optional[float] = None,
+    ) -> float:
+        """
+        阻塞取令牌
+
+        Args:
+            vendor: 数据源名（如 'alpha_vantage'）
+            key: API key（可选，key 级限速使用）
+            cost: 本次请求消耗的令牌数
+            max_wait: 最长等待（秒，默认 self.max_wait）
+
+        Returns:
+            实际等待的秒数
+
+        Raises:
+            RateLimitExceeded: 预计等待超过 max_wait
+            QuotaExhaustedError: 当日配额已用尽
+        """
+        start = time.monotonic()
+        deadline = start + (self.max_wait if max_wait is None else max_wait)
+        waited = False
+        while True:
+            wait = self.try_acquire(vendor, key, cost)
+            if wait <= 0:
+                break
+            waited = True
+            self._sleep(self._next_wait(vendor, wait, deadline))
+        elapsed = time.monotonic() - start
+        if waited:
+            self._count(vendor, "waited")
+            self._count(vendor, "wait_seconds", elapsed)
+        return elapsed
+
+    async def acquire_async(
+        self,
+        vendor: str,
+        key: Optional[str] = None,
+        cost: float = 1.0,
+        max_wait: Optional[float] = None,
+    ) -> float:
+        """
+        acquire() 的异步版本：排队期间让出事件循环
+
+        取令牌是阻塞的后端事务（SQLite 可能等待写锁），放到线程中执行，不占用事件循环。
+        """
+        start = time.monotonic()
+        deadline = start + (self.max_wait if max_wait is None else max_wait)
+        waited = False
+        while True:
+            wait = await asyncio.to_thread(self.try_acquire, vendor, key, cost)
+            if wait <= 0:
+                break
+            waited = True
+            await asyncio.sleep(self._next_wait(vendor, wait, deadline))
+        elapsed = time.monotonic() - start
+        if waited:
+            self._count(vendor, "waited")
+            self._count(vendor, "wait_seconds", elapsed)
+        return elapsed
+
+    def drain(self, vendor: str, key: Optional[str] = None, daily: bool = False) -> None:
+        """
+        数据源返回限速响应时清空对应桶，让其他进程也停止发请求
+
+        Args:
+            daily: 响应表明当日配额已用尽时为 True
+        """
+        buckets = self.buckets(vendor, key)
+        if buckets:
+            self.backend.drain(buckets, daily=daily)
+
+    def get_metrics(self) -> Dict[str, Dict[str, float]]:
+        """本进程内各数据源的取令牌统计"""
+        with self._metrics_lock:
+            return {vendor: dict(stats) for vendor, stats in self._metrics.items()}
+
+
+def _limits_from_config(section: Dict[str, Any], defaults: Dict[str, RateLimit]) -> Dict[str, RateLimit]:
+    limits = dict(defaults)
+    for vendor, spec in (section or {}).items():
+        if spec:
+            limits[vendor] = RateLimit.from_dict(spec)
+        else:
+            limits.pop(vendor, None)
+    return limits
+
+
+# 全局限速器（单例）
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    获取进程级限速器（单例）
+
+    读取配置 rate_limits 节：backend（sqlite / redis）、db_path、redis_url、max_wait、
+    vendors（数据源级规则）、keys（key 级规则）；enabled 为 false 时不做任何限速。
+
+    Returns:
+        RateLimiter 实例
+    """
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            from pstds.config import get_config
+
+            cfg = get_config().get("rate_limits", {}) or {}
+            if cfg.get("backend") == "redis":
+                backend = RedisRateLimitBackend(cfg.get("redis_url") or "redis://localhost:6379/0")
+            else:
+                backend = SQLiteRateLimitBackend(cfg.get("db_path", "./data/cache/rate_limits.db"))
+            if cfg.get("enabled", True):
+                limits = _limits_from_config(cfg.get("vendors"), DEFAULT_RATE_LIMITS)
+                key_limits = _limits_from_config(cfg.get("keys"), DEFAULT_KEY_RATE_LIMITS)
+            else:
+                limits, key_limits = {}, {}
+            _rate_limiter = RateLimiter(
+                backend,
+                limits=limits,
+                key_limits=key_limits,
+                max_wait=float(cfg.get("max_wait", DEFAULT_MAX_WAIT)),
+            )
+    return _rate_limiter
@@ -2,6 +2,8 @@
 # 市场路由器 - 集成 FallbackManager
 
 import re
+import threading
+from datetime import date
 from typing import Literal, List, Optional
 from pstds.data.models import MarketType
 from pstds.temporal.context import TemporalContext
@@ -61,39 +63,93 @@ class MarketRouter:
         raise MarketNotSupportedError(symbol)
 
 
+class _registry_view:
+    """
+    按需从注册表解析的只读属性（非数据描述符）
+
+    每次访问重新解析，注册表关闭重建后自动取到新实例；在实例上直接赋值可覆盖（测试注入替身）。
+    """
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.__doc__ = fn.__doc__
+
+    def __get__(self, router, owner=None):
+        if router is None:
+            return self
+        return self.fn(router)
+
+
 class DataRouter:
     """
     数据路由器 - 集成 FallbackManager
 
     根据股票代码和市场类型返回主源适配器（附带自动降级能力）
+
+    适配器默认经 SingleFlightAdapter 包装：多个分析并发请求相同数据时只发起一次上游调用
+    （config["singleflight"] = False 时关闭）。
+
+    get_fallback_manager 默认按优先级逐个尝试（不对冲、不限时）。config["hedge_requests"] = True
+    时启用对冲请求：主源耗时超过其 p95 延迟时并行请求备用源；config["fetch_deadline"]（秒）
+    设置单次调用总时限（另有 hedge_percentile / hedge_delay）。
+    各适配器的熔断器在进程内共享（get_breaker_registry），候选顺序随健康状况自动调整
+    （config["circuit_breakers"] = False 时关闭）。
+
+    get_async_adapter / get_async_fallback_manager 提供同一组数据源的 asyncio 版本。
+
+    get_ohlcv 是带缓存的行情读取入口：传入 cache 时经 IncrementalOHLCVFetcher 只拉取缓存未覆盖的
+    日期区间，否则直接经 get_fallback_manager 获取。
+
+    适配器实例来自进程级 AdapterRegistry（延迟构造、进程内复用），DataRouter 本身只是轻量视图，
+    可以随用随建；适配器的会话、缓存与熔断统计跨调用、跨回测、跨页面保留。
     """
 
-    def __init__(self, config: dict = None):
+    def __init__(self, config: dict = None, registry=None, cache=None):
         """
         初始化数据路由器
 
         Args:
             config: 配置字典，包含数据源配置
+            registry: 适配器注册表（可选，默认 get_adapter_registry()）
+            cache: CacheManager 实例（可选，传入后 get_ohlcv 增量补齐缓存缺口）
         """
         self.config = config or {}
+        self.cache = cache
+        self._ohlcv_fetcher = None
+        self._ohlcv_fetcher_lock = threading.Lock()
 
-        # 延迟导入适配器（避免循环依赖）
-        from pstds.data.adapters.yfinance_adapter import YFinanceAdapter
-        from pstds.data.adapters.akshare_adapter import AKShareAdapter
-        from pstds.data.adapters.local_csv_adapter import LocalCSVAdapter
-        from pstds.data.fallback import FallbackManager
+        # 延迟导入（避免循环依赖）
+        from pstds.data.adapters.registry import get_adapter_registry
 
-        # 初始化适配器实例
-        self.yfinance_adapter = YFinanceAdapter()
-        self.akshare_adapter = AKShareAdapter()
-        self.local_adapter = LocalCSVAdapter()
+        self.registry = registry or get_adapter_registry()
 
-        # 市场到适配器的映射（主源）
-        self.market_adapters = {
-            "US": self.yfinance_adapter,
-            "CN_A": self.akshare_adapter,
-            "HK": self.akshare_adapter,  # 港股主源为 AKShare，备用为 YFinance
-        }
+    def _registered(self, name: str):
+        """注册表中的适配器（config["singleflight"] = False 时不经请求合并包装）"""
+        return self.registry.get(name, singleflight=self.config.get("singleflight", True))
+
+    @_registry_view
+    def yfinance_adapter(self):
+        return self._registered("yfinance")
+
+    @_registry_view
+    def akshare_adapter(self):
+        return self._registered("akshare")
+
+    @_registry_view
+    def local_adapter(self):
+        return self._registered("local_csv")
+
+    # 市场到主源适配器属性的映射（按需只解析所需的一个）
+    _MARKET_PRIMARY = {
+        "US": "yfinance_adapter",
+        "CN_A": "akshare_adapter",
+        "HK": "akshare_adapter",  # 港股主源为 AKShare，备用为 YFinance
+    }
+
+    @property
+    def market_adapters(self):
+        """市场到适配器的映射（主源）"""
+        return {market: getattr(self, attr) for market, attr in self._MARKET_PRIMARY.items()}
 
     def get_market_type(self, symbol: str) -> MarketType:
         """
@@ -127,7 +183,7 @@ class DataRouter:
         market_type = self.get_market_type(symbol)
 
         # 返回主源适配器
-        return self.market_adapters.get(market_type, self.yfinance_adapter)
+        return getattr(self, self._MARKET_PRIMARY.get(market_type, "yfinance_adapter"))
 
     def get_fallback_manager(
         self,
@@ -146,6 +202,16 @@ class DataRouter:
         """
         from pstds.data.fallback import FallbackManager
 
+        primary_adapters, fallback_adapters = self._adapter_chain(symbol)
+        return FallbackManager(
+            primary_adapters=primary_adapters,
+            fallback_adapters=fallback_adapters,
+            report=quality_report,
+            **self._fallback_options(),
+        )
+
+    def _adapter_chain(self, symbol: str) -> tuple:
+        """按市场类型返回 (主源列表, 备用源列表)"""
         market_type = self.get_market_type(symbol)
 
         # 根据市场类型配置主源和备用源
@@ -161,9 +227,156 @@ class DataRouter:
         else:
             primary_adapters = [self.yfinance_adapter]
             fallback_adapters = [self.local_adapter]
+        return primary_adapters, fallback_adapters
+
+    def _fallback_options(self) -> dict:
+        """FallbackManager 的对冲、时限与熔断配置"""
+        from pstds.data.circuit_breaker import get_breaker_registry
+
+        return {
+            "hedge": self.config.get("hedge_requests", False),
+            "hedge_percentile": self.config.get("hedge_percentile", 0.95),
+            "hedge_delay": self.config.get("hedge_delay", 2.0),
+            "deadline": self.config.get("fetch_deadline"),
+            "breakers": get_breaker_registry() if self.config.get("circuit_breakers", True) else None,
+        }
 
-        return FallbackManager(
-            primary_adapters=primary_adapters,
-            fallback_adapters=fallback_adapters,
-            report=quality_report
+    def _as_async(self, adapter):
+        """同步适配器的异步包装（由注册表缓存，每个适配器实例只包装一次）"""
+        return self.registry.as_async(adapter)
+
+    def get_async_adapter(self, symbol: str):
+        """
+        获取主源适配器的异步版本（AsyncMarketDataAdapter）
+
+        Args:
+            symbol: 股票代码
+
+        Returns:
+            异步适配器实例
+        """
+        return self._as_async(self.get_adapter(symbol))
+
+    def get_async_fallback_manager(
+        self,
+        symbol: str,
+        quality_report: Optional[DataQualityReport] = None,
+    ):
+        """
+        获取异步降级管理器，主备源与配置同 get_fallback_manager
+
+        Args:
+            symbol: 股票代码
+            quality_report: 数据质量报告（可选）
+
+        Returns:
+            AsyncFallbackManager 实例
+        """
+        from pstds.data.fallback import AsyncFallbackManager
+
+        primary_adapters, fallback_adapters = self._adapter_chain(symbol)
+        return AsyncFallbackManager(
+            primary_adapters=[self._as_async(a) for a in primary_adapters],
+            fallback_adapters=[self._as_async(a) for a in fallback_adapters],
+            report=quality_report,
+            **self._fallback_options(),
+        )
+
+    @property
+    def ohlcv_fetcher(self):
+        """增量行情获取器（需要 cache，首次访问时创建）"""
+        with self._ohlcv_fetcher_lock:
+            if self._ohlcv_fetcher is None:
+                from pstds.data.incremental import IncrementalOHLCVFetcher
+                self._ohlcv_fetcher = IncrementalOHLCVFetcher(self.cache, router=self)
+            return self._ohlcv_fetcher
+
+    def get_ohlcv(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        interval: Literal["1d", "1wk", "1mo"],
+        ctx: TemporalContext,
+        quality_report: Optional[DataQualityReport] = None,
+    ):
+        """
+        获取单只股票的 OHLCV（带自动降级）
+
+        配置了 cache 时只对缓存未覆盖的子区间请求数据源，结果写入缓存后合并返回；
+        未配置时每次经 FallbackManager 获取完整区间。
+
+        Args:
+            symbol: 股票代码
+            start_date: 起始日期
+            end_date: 结束日期
+            interval: K线周期
+            ctx: 时间上下文
+            quality_report: 数据质量报告（可选）
+
+        Returns:
+            DataFrame，无任何数据时返回 None
+        """
+        if self.cache is None:
+            fallback_manager = self.get_fallback_manager(symbol, quality_report)
+            return fallback_manager.get_ohlcv(symbol, start_date, end_date, interval, ctx)
+        return self.ohlcv_fetcher.get_ohlcv(
+            symbol, start_date, end_date, interval, ctx, quality_report=quality_report
         )
+
+    def get_ohlcv_batch(
+        self,
+        symbols: List[str],
+        start_date: date,
+        end_date: date,
+        interval: Literal["1d", "1wk", "1mo"],
+        ctx: TemporalContext,
+        as_long: bool = False,
+        fallback_workers: int = 8,
+    ):
+        """
+        批量获取多只股票的 OHLCV（如自选股刷新）
+
+        按主源适配器分组调用 get_ohlcv_batch（yfinance 原生批量下载，其余有界并发），
+        主源未返回数据的股票再经 get_ohlcv 逐只降级获取（配置了 cache 时增量补齐）。
+
+        Args:
+            symbols: 股票代码列表
+            start_date: 起始日期
+            end_date: 结束日期
+            interval: K线周期
+            ctx: 时间上下文
+            as_long: True 时返回带 symbol 列的长表，否则返回 {symbol: DataFrame}
+            fallback_workers: 降级获取的并发数
+
+        Returns:
+            {symbol: DataFrame} 或长表 DataFrame
+        """
+        from pstds.data.adapters.batch import empty_ohlcv, fan_out_ohlcv, to_long_format, unique_symbols
+
+        symbols = unique_symbols(symbols)
+        groups = {}
+        for symbol in symbols:
+            try:
+                adapter = self.get_adapter(symbol)
+            except MarketNotSupportedError:
+                adapter = self.yfinance_adapter
+            groups.setdefault(id(adapter), (adapter, []))[1].append(symbol)
+
+        frames = {}
+        for adapter, group in groups.values():
+            try:
+                frames.update(adapter.get_ohlcv_batch(group, start_date, end_date, interval, ctx))
+            except Exception as e:
+                print(f"{getattr(adapter, 'name', adapter)}.get_ohlcv_batch failed: {e}")
+
+        missing = [s for s in symbols if frames.get(s) is None or frames[s].empty]
+        if missing:
+            frames.update(fan_out_ohlcv(
+                lambda symbol: self.get_ohlcv(symbol, start_date, end_date, interval, ctx),
+                missing,
+                max_workers=fallback_workers,
+            ))
+
+        frames = {symbol: frames.get(symbol, empty_ohlcv()) for symbol in symbols}
+        return to_long_format(frames) if as_long else frames
@@ -0,0 +1,62 @@
+# pstds/lazy.py
+# 延迟导入工具 - 重依赖推迟到首次使用（PEP 562 模块 __getattr__）
+
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def module_available(name: str) -> bool:
+    """
+    检查模块是否已安装（不执行模块代码）
+
+    Args:
+        name: 模块名（如 'akshare'、'google.generativeai'）
+    """
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def optional_import(name: str) -> Optional[ModuleType]:
+    """
+    导入可选依赖，未安装时返回 None
+
+    Args:
+        name: 模块名
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    生成包级 PEP 562 __getattr__ / __dir__
+
+    导出名首次被访问时才导入对应子模块，并写回包命名空间（之后的访问不再经过 __getattr__）。
+
+    Args:
+        package: 包名（通常传 __name__）
+        exports: {导出名: 相对子模块名}，如 {"YFinanceAdapter": ".yfinance_adapter"}
+
+    Returns:
+        (__getattr__, __dir__)
+    """
+
+    def __getattr__(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
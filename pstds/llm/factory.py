@@ -4,23 +4,11 @@
 from typing import Optional, Any, Dict
 from abc import ABC, abstractmethod
 
-import openai
-import anthropic
-import google.generativeai as genai
+from pstds.lazy import module_available
 
-# DeepSeek SDK
-try:
-    from deepseek import DeepSeek
-    DEEPSEEK_AVAILABLE = True
-except ImportError:
-    DEEPSEEK_AVAILABLE = False
-
-# DashScope SDK (阿里云)
-try:
-    import dashscope
-    DASHSCOPE_AVAILABLE = True
-except ImportError:
-    DASHSCOPE_AVAILABLE = False
+# 各提供商 SDK 在对应客户端构造时才导入（openai / anthropic / google.generativeai 合计导入耗时数秒）
+DEEPSEEK_AVAILABLE = module_available("deepseek")
+DASHSCOPE_AVAILABLE = module_available("dashscope")
 
 
 class BaseLLMClient(ABC):
@@ -52,6 +40,8 @@ class OpenAIClient(BaseLLMClient):
         # 温度参数检查
         assert kwargs.get('temperature', 0.0) == 0.0, "temperature 必须为 0.0"
 
+        import openai
+
         # 构建客户端
         if base_url:
             self.client = openai.OpenAI(
@@ -83,6 +73,8 @@ class AnthropicClient(BaseLLMClient):
         # 温度参数检查
         assert kwargs.get('temperature', 0.0) == 0.0, "temperature 必须为 0.0"
 
+        import anthropic
+
         if base_url:
             self.client = anthropic.Anthropic(
                 base_url=base_url,
@@ -113,6 +105,8 @@ class GoogleClient(BaseLLMClient):
         # 温度参数检查
         assert kwargs.get('temperature', 0.0) == 0.0, "temperature 必须为 0.0"
 
+        import google.generativeai as genai
+
         genai.configure(api_key=kwargs.get('api_key'))
         self.client = genai.GenerativeModel(self.model)
 
@@ -140,6 +134,8 @@ class DeepSeekClient(BaseLLMClient):
         # 温度参数检查
         assert kwargs.get('temperature', 0.0) == 0.0, "temperature 必须为 0.0"
 
+        from deepseek import DeepSeek
+
         api_key = kwargs.get('api_key', '')
         if base_url:
             self.client = DeepSeek(api_key=api_key, base_url=base_url)
@@ -171,11 +167,15 @@ class DashScopeClient(BaseLLMClient):
         # 温度参数检查
         assert kwargs.get('temperature', 0.0) == 0.0, "temperature 必须为 0.0"
 
+        import dashscope
+
         api_key = kwargs.get('api_key', '')
         dashscope.api_key = api_key
 
     def get_llm(self) -> Any:
         """返回 DashScope Qwen 实例（temperature=0.0）"""
+        import dashscope
+
         return dashscope.Generation.call(
             model=self.model,
             temperature=0.0,  # 硬编码为 0.0
@@ -0,0 +1,399 @@
+# pstds/scheduler/cache_warmer.py
+# 盘前缓存预热 - 开盘前批量拉取自选股数据写入 CacheManager
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, UTC
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from pstds.data.cache import CacheManager
+from pstds.data.incremental import IncrementalOHLCVFetcher
+from pstds.data.router import DataRouter, MarketRouter, MarketNotSupportedError
+from pstds.temporal.context import TemporalContext
+
+logger = logging.getLogger(__name__)
+
+
+# 各市场盘前预热时间（当地时间开盘前约 1 小时）：(cron 表达式, 时区)
+PRE_MARKET_SCHEDULES: Dict[str, Tuple[str, str]] = {
+    "US": ("30 8 * * MON-FRI", "America/New_York"),
+    "CN_A": ("30 8 * * MON-FRI", "Asia/Shanghai"),
+    "HK": ("30 8 * * MON-FRI", "Asia/Hong_Kong"),
+}
+
+# 预热的数据类型
+WARM_KINDS = ("ohlcv", "fundamentals", "news", "indicators")
+
+
+@dataclass
+class VendorLimit:
+    """
+    单个数据源的限速规则
+
+    max_concurrent: 同时在途请求数上限
+    min_interval: 相邻两次请求发起的最小间隔（秒）
+    """
+    max_concurrent: int = 4
+    min_interval: float = 0.0
+
+
+# 默认限速（按适配器 name）
+DEFAULT_VENDOR_LIMITS: Dict[str, VendorLimit] = {
+    "yfinance": VendorLimit(max_concurrent=4, min_interval=0.2),
+    "akshare": VendorLimit(max_concurrent=2, min_interval=0.5),
+    "alpha_vantage": VendorLimit(max_concurrent=1, min_interval=12.0),
+    "local_csv": VendorLimit(max_concurrent=8, min_interval=0.0),
+}
+
+
+class _VendorThrottle:
+    """按数据源限制并发数与请求间隔（进程内）"""
+
+    def __init__(self, limit: VendorLimit):
+        self.limit = limit
+        self._semaphore = threading.BoundedSemaphore(max(1, limit.max_concurrent))
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    @contextmanager
+    def acquire(self) -> Iterator[None]:
+        with self._semaphore:
+            if self.limit.min_interval > 0:
+                with self._lock:
+                    now = time.monotonic()
+                    slot = max(now, self._next_slot)
+                    self._next_slot = slot + self.limit.min_interval
+                if slot > now:
+                    time.sleep(slot - now)
+            yield
+
+
+@dataclass
+class WarmReport:
+    """
+    预热报告
+
+    results: {数据类型: {"ok": 成功数, "total": 任务数}}
+    failures: 失败任务描述（"SYMBOL/kind: 原因"）
+    """
+    market_type: Optional[str]
+    symbols: List[str]
+    started_at: datetime
+    seconds: float = 0.0
+    results: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    failures: List[str] = field(default_factory=list)
+
+    @property
+    def coverage(self) -> float:
+        """整体预热覆盖率（成功任务数 / 任务总数）"""
+        total = sum(r["total"] for r in self.results.values())
+        ok = sum(r["ok"] for r in self.results.values())
+        return ok / total if total else 1.0
+
+    def coverage_by_kind(self) -> Dict[str, float]:
+        """按数据类型的预热覆盖率"""
+        return {
+            kind: (r["ok"] / r["total"] if r["total"] else 1.0)
+            for kind, r in self.results.items()
+        }
+
+    def to_dict(self) -> Dict:
+        """转换为字典"""
+        return {
+            "market_type": self.market_type,
+            "symbols": self.symbols,
+            "started_at": self.started_at.isoformat(),
+            "seconds": self.seconds,
+            "coverage": self.coverage,
+            "coverage_by_kind": self.coverage_by_kind(),
+            "results": self.results,
+            "failures": self.failures,
+        }
+
+
+def _default_indicator_history(symbol: str) -> pd.DataFrame:
+    """与 tradingagents 指标工具相同的历史行情来源，保证物化结果可被其直接复用"""
+    from tradingagents.dataflows.y_finance import load_stock_history
+    return load_stock_history(symbol)
+
+
+def _default_indicator_source() -> str:
+    """默认历史行情的来源（离线快照 local 或在线 yfinance），作为指标缓存键的一部分"""
+    from tradingagents.dataflows.y_finance import indicator_history_source
+    return indicator_history_source()
+
+
+class CacheWarmer:
+    """
+    盘前缓存预热器
+
+    读取自选股列表（可按 market_type 分组），并发预取 OHLCV、基本面、新闻与技术指标写入缓存，
+    使开盘后的交互式分析直接命中热缓存。
+
+    - 请求按主源适配器名限速（并发数 + 最小间隔），互不相同的数据源并行
+    - 单个任务失败只记入报告，不影响其他任务
+    - 指标在 OHLCV 之后由同一任务物化（同一股票的行情与指标串行）
+    """
+
+    def __init__(
+        self,
+        cache: CacheManager,
+        router: Optional[DataRouter] = None,
+        watchlist=None,
+        materializer=None,
+        vendor_limits: Optional[Dict[str, VendorLimit]] = None,
+        max_workers: int = 8,
+        lookback_days: int = 365,
+        news_days: int = 7,
+        indicator_history_loader: Optional[Callable[[str], pd.DataFrame]] = None,
+        indicator_source: Optional[str] = None,
+    ):
+        """
+        Args:
+            cache: 缓存管理器
+            router: DataRouter 实例（可选，默认新建）
+            watchlist: WatchlistStore 实例（可选，默认连接配置中的 MongoDB）
+            materializer: IndicatorMaterializer 实例（可选，默认使用同一 cache 新建）
+            vendor_limits: 数据源限速规则（可选，覆盖 DEFAULT_VENDOR_LIMITS 中的同名项）
+            max_workers: 预热线程数
+            lookback_days: OHLCV 预热回看天数
+            news_days: 新闻预热回看天数
+            indicator_history_loader: 指标计算所用历史行情加载函数（可选）
+            indicator_source: 该历史行情的来源（可选，默认与 tradingagents 指标工具一致）
+        """
+        self.cache = cache
+        self._router = router
+        self._watchlist = watchlist
+        self._materializer = materializer
+        self.max_workers = max_workers
+        self.lookback_days = lookback_days
+        self.news_days = news_days
+        self.indicator_history_loader = indicator_history_loader or _default_indicator_history
+        self.indicator_source = indicator_source
+
+        limits = dict(DEFAULT_VENDOR_LIMITS)
+        limits.update(vendor_limits or {})
+        self._limits = limits
+        self._throttles: Dict[str, _VendorThrottle] = {}
+        self._throttles_lock = threading.Lock()
+
+        self._fetcher: Optional[IncrementalOHLCVFetcher] = None
+
+    @property
+    def router(self) -> DataRouter:
+        if self._router is None:
+            self._router = DataRouter()
+        return self._router
+
+    @property
+    def watchlist(self):
+        if self._watchlist is None:
+            from pstds.storage.watchlist_store import WatchlistStore
+            self._watchlist = WatchlistStore()
+        return self._watchlist
+
+    @property
+    def materializer(self):
+        if self._materializer is None:
+            from pstds.data.indicators import IndicatorMaterializer
+            self._materializer = IndicatorMaterializer(self.cache)
+        return self._materializer
+
+    @property
+    def fetcher(self) -> IncrementalOHLCVFetcher:
+        if self._fetcher is None:
+            self._fetcher = IncrementalOHLCVFetcher(self.cache, router=self.router)
+        return self._fetcher
+
+    def _throttle(self, vendor: str) -> _VendorThrottle:
+        with self._throttles_lock:
+            if vendor not in self._throttles:
+                self._throttles[vendor] = _VendorThrottle(self._limits.get(vendor, VendorLimit()))
+            return self._throttles[vendor]
+
+    def _vendor(self, symbol: str) -> str:
+        """主源适配器名，作为限速分组"""
+        return getattr(self.router.get_adapter(symbol), "name", "unknown")
+
+    def register(
+        self,
+        scheduler,
+        market_types: Optional[List[str]] = None,
+    ) -> bool:
+        """
+        注册盘前预热任务到 TaskScheduler
+
+        每个市场一个 Cron 任务（按 PRE_MARKET_SCHEDULES 的当地时间触发），只预热该市场的自选股。
+
+        Args:
+            scheduler: TaskScheduler 实例
+            market_types: 需要预热的市场（默认全部）
+
+        Returns:
+            是否全部注册成功
+        """
+        ok = True
+        for market_type in market_types or list(PRE_MARKET_SCHEDULES):
+            cron_expr, timezone = PRE_MARKET_SCHEDULES[market_type]
+            ok = scheduler.add_cron_job(
+                task_id=f"cache_warm_{market_type}",
+                func=self.warm,
+                name=f"盘前缓存预热 ({market_type})",
+                cron_expr=cron_expr,
+                timezone=timezone,
+                kwargs={"market_type": market_type},
+            ) and ok
+        return ok
+
+    def _watchlist_symbols(self, market_type: Optional[str]) -> List[str]:
+        symbols = []
+        for stock in self.watchlist.get_all(market_type=market_type):
+            symbol = stock.get("symbol")
+            if symbol and symbol not in symbols:
+                symbols.append(symbol)
+        return symbols
+
+    def warm(
+        self,
+        market_type: Optional[str] = None,
+        symbols: Optional[List[str]] = None,
+        ctx: Optional[TemporalContext] = None,
+        kinds: Tuple[str, ...] = WARM_KINDS,
+    ) -> WarmReport:
+        """
+        执行一次预热
+
+        Args:
+            market_type: 只预热该市场的自选股（可选）
+            symbols: 直接指定股票列表（可选，不读取自选股）
+            ctx: 时间上下文（默认当天 LIVE）
+            kinds: 预热的数据类型
+
+        Returns:
+            WarmReport
+        """
+        started = time.perf_counter()
+        ctx = ctx or TemporalContext.for_live(datetime.now(UTC).date())
+        if symbols is None:
+            symbols = self._watchlist_symbols(market_type)
+        if market_type is not None:
+            symbols = [s for s in symbols if self._market_type(s) == market_type]
+
+        report = WarmReport(
+            market_type=market_type,
+            symbols=list(symbols),
+            started_at=datetime.now(UTC),
+            results={kind: {"ok": 0, "total": 0} for kind in kinds},
+        )
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cache-warm") as pool:
+            futures = {}
+            for symbol in symbols:
+                vendor = self._vendor(symbol)
+                if "ohlcv" in kinds or "indicators" in kinds:
+                    futures[pool.submit(self._warm_prices, symbol, vendor, ctx, kinds)] = symbol
+                if "fundamentals" in kinds:
+                    futures[pool.submit(self._warm_fundamentals, symbol, vendor, ctx)] = symbol
+                if "news" in kinds:
+                    futures[pool.submit(self._warm_news, symbol, vendor, ctx)] = symbol
+
+            for future in as_completed(futures):
+                for kind, error in future.result():
+                    report.results[kind]["total"] += 1
+                    if error is None:
+                        report.results[kind]["ok"] += 1
+                    else:
+                        report.failures.append(f"{futures[future]}/{kind}: {error}")
+
+        report.seconds = time.perf_counter() - started
+        logger.info(
+            f"[CacheWarmer] 预热完成 market={market_type or 'ALL'} symbols={len(symbols)} "
+            f"coverage={report.coverage:.0%} seconds={report.seconds:.1f}"
+        )
+        return report
+
+    @staticmethod
+    def _market_type(symbol: str) -> str:
+        try:
+            return MarketRouter.route(symbol)
+        except MarketNotSupportedError:
+            return "US"
+
+    def _run(self, kind: str, func: Callable[[], bool]) -> Tuple[str, Optional[str]]:
+        """执行单个预热任务，返回 (kind, 失败原因或 None)"""
+        try:
+            return kind, None if func() else "no data"
+        except Exception as e:
+            return kind, str(e) or type(e).__name__
+
+    def _warm_prices(
+        self,
+        symbol: str,
+        vendor: str,
+        ctx: TemporalContext,
+        kinds: Tuple[str, ...],
+    ) -> List[Tuple[str, Optional[str]]]:
+        """OHLCV（增量）与技术指标"""
+        results = []
+        if "ohlcv" in kinds:
+            def fetch_ohlcv() -> bool:
+                start = ctx.analysis_date - timedelta(days=self.lookback_days)
+                with self._throttle(vendor).acquire():
+                    df = self.fetcher.get_ohlcv(symbol, start, ctx.analysis_date, "1d", ctx)
+                return df is not None and not df.empty
+            results.append(self._run("ohlcv", fetch_ohlcv))
+
+        if "indicators" in kinds:
+            def materialize() -> bool:
+                day = ctx.analysis_date
+                source = self.indicator_source or _default_indicator_source()
+                # 默认历史来源为 yfinance 下载，按 yfinance 限速
+                with self._throttle("yfinance").acquire():
+                    self.materializer.get_window(
+                        symbol, self.materializer.indicators[0], day, day,
+                        lambda: self.indicator_history_loader(symbol),
+                        source=source,
+                    )
+                return self.materializer.get_state(symbol, source) is not None
+            results.append(self._run("indicators", materialize))
+        return results
+
+    def _warm_fundamentals(
+        self,
+        symbol: str,
+        vendor: str,
+        ctx: TemporalContext,
+    ) -> List[Tuple[str, Optional[str]]]:
+        def fetch() -> bool:
+            fm = self.router.get_fallback_manager(symbol)
+            with self._throttle(vendor).acquire():
+                data = fm.get_fundamentals(symbol, ctx.analysis_date, ctx)
+            if data is None:
+                return False
+            self.cache.set_fundamentals(symbol, ctx.analysis_date, data)
+            return True
+        return [self._run("fundamentals", fetch)]
+
+    def _warm_news(
+        self,
+        symbol: str,
+        vendor: str,
+        ctx: TemporalContext,
+    ) -> List[Tuple[str, Optional[str]]]:
+        def fetch() -> bool:
+            fm = self.router.get_fallback_manager(symbol)
+            with self._throttle(vendor).acquire():
+                news = fm.get_news(symbol, self.news_days, ctx)
+            if not news:
+                return False
+            self.cache.set_news(symbol, [
+                n.model_dump(mode="json") if hasattr(n, "model_dump") else n for n in news
+            ])
+            return True
+        return [self._run("news", fetch)]
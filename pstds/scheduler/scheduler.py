@@ -93,6 +93,7 @@ class TaskScheduler:
         func: Callable,
         name: str,
         cron_expr: str,
+        timezone: Optional[str] = None,
         **kwargs,
     ) -> bool:
         """
@@ -103,6 +104,7 @@ class TaskScheduler:
             func: 任务执行函数
             name: 任务名称
             cron_expr: Cron 表达式（如 "0 9 * * MON-FRI" 表示工作日早上9点）
+            timezone: Cron 表达式所在时区（如 "America/New_York"，默认调度器本地时区）
             **kwargs: 传递给执行函数的额外参数
 
         Returns:
@@ -114,7 +116,7 @@ class TaskScheduler:
         try:
             job = self.scheduler.add_job(
                 func=func,
-                trigger=CronTrigger.from_crontab(cron_expr),
+                trigger=CronTrigger.from_crontab(cron_expr, timezone=timezone),
                 id=task_id,
                 name=name,
                 replace_existing=True,
@@ -127,7 +129,7 @@ class TaskScheduler:
                 name=name,
                 func=func,
                 trigger_type="cron",
-                trigger_args={"cron": cron_expr},
+                trigger_args={"cron": cron_expr, "timezone": timezone},
                 enabled=True,
                 next_run=job.next_run_time,
             )
@@ -6,6 +6,7 @@ from typing import Callable, Optional, Dict, Any, List
 from datetime import datetime, timedelta, UTC
 from dataclasses import dataclass, field
 import asyncio
+import functools
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -215,7 +216,10 @@ class TaskQueue:
                         if asyncio.iscoroutinefunction(task.func):
                             result = await task.func(*task.args, **task.kwargs)
                         else:
-                            result = task.func(*task.args, **task.kwargs)
+                            # 同步函数（如同步数据适配器调用）放到线程池执行，避免阻塞事件循环
+                            result = await asyncio.get_running_loop().run_in_executor(
+                                None, functools.partial(task.func, *task.args, **task.kwargs)
+                            )
 
                         task.result = result
                         task.completed_at = datetime.now(UTC)
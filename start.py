@@ -174,6 +174,7 @@ def run_endpoint_smoke_test():
     print("\n运行端到端冒烟测试...")
 
     from pstds.agents.output_schemas import TradeDecision
+    from pstds.agents.decision_cache import get_decision_cache
     from pstds.agents.extended_graph import ExtendedTradingAgentsGraph
     from pstds.temporal.context import TemporalContext
     from datetime import date
@@ -184,7 +185,8 @@ def run_endpoint_smoke_test():
 
         # 创建 Mock 图（避免实际 API 调用）
         graph = ExtendedTradingAgentsGraph(
-            config={'analysis_depth': 'L1', 'use_mock_llm': True}
+            config={'analysis_depth': 'L1', 'use_mock_llm': True},
+            decision_cache=get_decision_cache(),
         )
 
         # 运行测试分析
@@ -1,19 +1,22 @@
 # tests/adapters/test_akshare_adapter.py
-# AKShareAdapter 测试套件 - AK-001 至 AK-005
+# AKShareAdapter 测试套件 - AK-001 至 AK-008
 
 import pytest
+import threading
 from datetime import date, datetime
 from unittest.mock import Mock, patch
 import pandas as pd
 
 from pstds.temporal.context import TemporalContext
 from pstds.temporal.guard import RealtimeAPIBlockedError
-from pstds.data.adapters.akshare_adapter import AKShareAdapter
+from pstds.data.adapters.akshare_adapter import AKShareAdapter, SpotSnapshot, get_hk_spot_snapshot
 
 
 @pytest.fixture
 def akshare_adapter():
-    return AKShareAdapter()
+    get_hk_spot_snapshot().clear()
+    yield AKShareAdapter()
+    get_hk_spot_snapshot().clear()
 
 
 @pytest.fixture
@@ -131,6 +134,78 @@ class TestAKShareAdapterHKStock:
         assert akshare_adapter.get_market_type('0700.HK') == 'HK'
 
 
+class TestAKShareAdapterHKCaching:
+    """AK-006 至 AK-008: 港股按区间拉取与全市场快照缓存"""
+
+    def test_ak006_hk_ohlcv_bounded_by_range(self, akshare_adapter, live_ctx_2024_01_02):
+        """AK-006: 港股行情按 5 位代码与起止日期请求，结果截取到请求区间"""
+        with patch('akshare.stock_hk_hist') as mock_hist:
+            mock_hist.return_value = pd.DataFrame({
+                '日期': ['2023-12-29', '2024-01-02'],
+                '开盘': [300.0, 305.0],
+                '最高': [310.0, 315.0],
+                '最低': [295.0, 300.0],
+                '收盘': [308.0, 313.0],
+                '成交量': [10000000, 11000000],
+            })
+
+            result = akshare_adapter.get_ohlcv(
+                "0700.HK", date(2024, 1, 1), date(2024, 1, 2), "1d", live_ctx_2024_01_02
+            )
+
+        kwargs = mock_hist.call_args.kwargs
+        assert kwargs["symbol"] == "00700"
+        assert (kwargs["start_date"], kwargs["end_date"]) == ("20240101", "20240102")
+        assert result["close"].tolist() == [313.0]
+
+    def test_ak007_hk_fundamentals_share_one_snapshot(self, akshare_adapter, live_ctx_2024_01_02):
+        """AK-007: 50 只港股的基本面只下载一次全市场快照，并各自取到本股票的行"""
+        codes = [str(700 + i).zfill(5) for i in range(50)]
+        spot = pd.DataFrame({'代码': codes, '市盈率': [float(i) for i in range(50)]})
+
+        with patch('akshare.stock_hk_spot_em', return_value=spot) as mock_spot:
+            results = [
+                akshare_adapter.get_fundamentals(f"{700 + i:04d}.HK", date(2024, 1, 2), live_ctx_2024_01_02)
+                for i in range(50)
+            ]
+            assert akshare_adapter.is_available("0700.HK")
+            assert not akshare_adapter.is_available("99999.HK")
+
+        assert mock_spot.call_count == 1
+        assert [r["pe_ratio"] for r in results] == [float(i) for i in range(50)]
+        assert AKShareAdapter().get_fundamentals("9999.HK", date(2024, 1, 2), live_ctx_2024_01_02)["pe_ratio"] is None
+
+    def test_ak008_snapshot_ttl_and_concurrent_refresh(self):
+        """AK-008: 并发查询只触发一次下载；TTL 过期后重新下载，下载失败不缓存"""
+        now = [0.0]
+        calls = []
+        gate = threading.Event()
+
+        def loader():
+            calls.append(1)
+            gate.wait(1)
+            return pd.DataFrame({'代码': ['00700'], '最新价': [300.0 + len(calls)]})
+
+        snapshot = SpotSnapshot(loader, ttl_seconds=60, clock=lambda: now[0])
+        threads = [threading.Thread(target=snapshot.lookup, args=("00700",)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        gate.set()
+        for t in threads:
+            t.join()
+        assert len(calls) == 1
+
+        now[0] = 61
+        assert snapshot.lookup("00700")["最新价"] == 302.0
+        assert snapshot.loads == 2
+
+        now[0] = 200
+        failing = SpotSnapshot(lambda: pd.DataFrame(), clock=lambda: now[0])
+        with pytest.raises(ValueError):
+            failing.get()
+        assert failing.loads == 0
+
+
 class TestAKShareAdapterErrorHandling:
     """AK-005: 错误处理测试"""
 
@@ -0,0 +1,103 @@
+# tests/adapters/test_local_csv_adapter.py
+# LocalCSVAdapter 测试套件 - LC-001 至 LC-004
+
+import os
+import time
+from datetime import date
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from pstds.data.adapters import local_csv_adapter
+from pstds.data.adapters.local_csv_adapter import LocalCSVAdapter, clear_parsed_cache
+from pstds.temporal.context import TemporalContext
+
+
+def _write_prices(path, days, start="2024-01-01", shuffle=False):
+    dates = pd.bdate_range(start, periods=days)
+    df = pd.DataFrame({
+        "date": dates.strftime("%Y-%m-%d"),
+        "open": range(days),
+        "high": range(days),
+        "low": range(days),
+        "close": [float(i) for i in range(days)],
+        "volume": [1000] * days,
+        "adj_close": [float(i) for i in range(days)],
+    })
+    if shuffle:
+        df = df.sample(frac=1, random_state=0)
+    df.to_csv(path, index=False)
+    return dates
+
+
+@pytest.fixture
+def adapter(tmp_path):
+    clear_parsed_cache()
+    yield LocalCSVAdapter(data_dir=str(tmp_path))
+    clear_parsed_cache()
+
+
+def _fetch(adapter, start, end, analysis_date, symbol="600519"):
+    ctx = TemporalContext.for_backtest(analysis_date)
+    return adapter.get_ohlcv(symbol, start, end, "1d", ctx)
+
+
+class TestLocalCSVAdapter:
+    """LC-001 至 LC-004: 解析缓存、列式副本与二分查找"""
+
+    def test_lc001_range_and_isolation(self, adapter, tmp_path):
+        """LC-001: 乱序 CSV 按日期排序后截取区间，analysis_date 之后的行被过滤"""
+        _write_prices(tmp_path / "600519.csv", 10, shuffle=True)
+
+        result = _fetch(adapter, date(2024, 1, 3), date(2024, 1, 12), date(2024, 1, 9))
+
+        assert result["date"].dt.strftime("%Y-%m-%d").tolist() == [
+            "2024-01-03", "2024-01-04", "2024-01-05", "2024-01-08", "2024-01-09",
+        ]
+        assert list(result.columns) == ["date", "open", "high", "low", "close", "volume", "adj_close", "data_source"]
+        assert (result["data_source"] == "local_csv").all()
+        assert _fetch(adapter, date(2024, 2, 1), date(2024, 2, 2), date(2024, 2, 2)).empty
+        assert _fetch(adapter, date(2024, 1, 1), date(2024, 1, 2), date(2024, 1, 2), symbol="MISSING").empty
+
+    def test_lc002_repeated_reads_parse_once(self, adapter, tmp_path):
+        """LC-002: 250 日回测重复读取同一文件只解析一次，单次读取低于 1 毫秒"""
+        dates = _write_prices(tmp_path / "600519.csv", 1000, start="2020-01-01")
+        _fetch(adapter, date(2020, 1, 1), date(2023, 12, 31), date(2023, 12, 31))
+
+        with patch.object(local_csv_adapter.pd, "read_csv", wraps=pd.read_csv) as read_csv:
+            start = time.perf_counter()
+            for day in dates[-250:]:
+                result = _fetch(adapter, day.date().replace(year=day.year - 1), day.date(), day.date())
+            per_call = (time.perf_counter() - start) / 250
+
+        print(f"\nper-call latency: {per_call * 1e6:.0f}us")
+        assert read_csv.call_count == 0
+        assert result["date"].iloc[-1].date() == dates[-1].date()
+        assert per_call < 0.001
+
+    def test_lc003_mtime_change_invalidates(self, adapter, tmp_path):
+        """LC-003: CSV 被改写后（mtime/size 变化）重新解析并重建列式副本"""
+        path = tmp_path / "600519.csv"
+        _write_prices(path, 5)
+        assert len(_fetch(adapter, date(2024, 1, 1), date(2024, 1, 31), date(2024, 1, 31))) == 5
+
+        _write_prices(path, 8)
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+
+        assert len(_fetch(adapter, date(2024, 1, 1), date(2024, 1, 31), date(2024, 1, 31))) == 8
+
+    def test_lc004_sidecar_reused_across_processes(self, adapter, tmp_path):
+        """LC-004: 首次读取写出列式副本；进程内缓存清空后直接读取副本，不再解析 CSV"""
+        pytest.importorskip("pyarrow")
+        _write_prices(tmp_path / "600519.csv", 20)
+        first = _fetch(adapter, date(2024, 1, 1), date(2024, 1, 31), date(2024, 1, 31))
+        assert (tmp_path / ".columnar" / "600519.arrow").exists()
+
+        clear_parsed_cache()
+        with patch.object(local_csv_adapter.pd, "read_csv", side_effect=AssertionError("CSV re-parsed")):
+            second = LocalCSVAdapter(data_dir=str(tmp_path)).get_ohlcv(
+                "600519", date(2024, 1, 1), date(2024, 1, 31), "1d", TemporalContext.for_backtest(date(2024, 1, 31)),
+            )
+
+        pd.testing.assert_frame_equal(first, second)
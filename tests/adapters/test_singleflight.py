@@ -0,0 +1,157 @@
+# tests/adapters/test_singleflight.py
+# 请求合并测试套件 - SF-001 至 SF-006
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from pstds.data.adapters.singleflight import SingleFlight, SingleFlightAdapter
+from pstds.temporal.context import TemporalContext
+
+
+class SlowAdapter:
+    """每次调用耗时 delay 秒，记录上游调用次数"""
+
+    name = "slow"
+
+    def __init__(self, delay=0.1, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.threads = []
+        self._lock = threading.Lock()
+
+    def get_ohlcv(self, symbol, start_date, end_date, interval, ctx):
+        with self._lock:
+            self.calls += 1
+            self.threads.append(threading.current_thread().name)
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return pd.DataFrame({"date": [pd.Timestamp(end_date, tz="UTC")], "close": [1.0], "symbol": [symbol]})
+
+    def get_news(self, symbol, days_back, ctx):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return [symbol]
+
+    def is_available(self, symbol):
+        return True
+
+
+@pytest.fixture
+def ctx():
+    return TemporalContext.for_live(date(2024, 1, 2))
+
+
+def _concurrent(n, fn):
+    barrier = threading.Barrier(n)
+
+    def run():
+        barrier.wait()
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        return [f.result() for f in [pool.submit(run) for _ in range(n)]]
+
+
+class TestSingleFlight:
+    """SF-001 至 SF-006: 并发相同请求合并"""
+
+    def test_sf001_threads_share_one_upstream_call(self, ctx):
+        """SF-001: 多线程并发相同请求只调用一次上游，结果互为副本"""
+        upstream = SlowAdapter()
+        adapter = SingleFlightAdapter(upstream, SingleFlight())
+
+        results = _concurrent(8, lambda: adapter.get_ohlcv("AAPL", date(2024, 1, 1), date(2024, 1, 2), "1d", ctx))
+
+        assert upstream.calls == 1
+        assert all(r.equals(results[0]) for r in results)
+        assert len({id(r) for r in results}) == 8
+        stats = adapter._group.get_stats()
+        assert stats["upstream_calls"] == 1
+        assert stats["coalesced"] == 7
+
+    def test_sf002_different_args_not_coalesced(self, ctx):
+        """SF-002: 参数不同的请求各自调用上游；完成后的请求不缓存"""
+        upstream = SlowAdapter(delay=0.05)
+        adapter = SingleFlightAdapter(upstream, SingleFlight())
+
+        _concurrent(2, lambda: adapter.get_news(threading.current_thread().name, 7, ctx))
+        adapter.get_news("AAPL", 7, ctx)
+        adapter.get_news("AAPL", 7, ctx)
+
+        assert upstream.calls == 4
+
+    def test_sf003_error_shared_with_waiters(self, ctx):
+        """SF-003: leader 的异常传给所有等待方"""
+        upstream = SlowAdapter(error=RuntimeError("boom"))
+        adapter = SingleFlightAdapter(upstream, SingleFlight())
+
+        def call():
+            try:
+                adapter.get_ohlcv("AAPL", date(2024, 1, 1), date(2024, 1, 2), "1d", ctx)
+            except RuntimeError as e:
+                return str(e)
+
+        assert _concurrent(4, call) == ["boom"] * 4
+        assert upstream.calls == 1
+        assert adapter._group.inflight_count() == 0
+
+    def test_sf004_asyncio_and_threads_coalesce(self, ctx):
+        """SF-004: asyncio 调用方之间以及与线程调用方之间均可合并"""
+        upstream = SlowAdapter(delay=0.2)
+        adapter = SingleFlightAdapter(upstream, SingleFlight())
+        args = ("AAPL", date(2024, 1, 1), date(2024, 1, 2), "1d", ctx)
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            thread_call = loop.run_in_executor(None, lambda: adapter.get_ohlcv(*args))
+            await asyncio.sleep(0.05)
+            return await asyncio.gather(
+                thread_call, *[adapter.get_ohlcv_async(*args) for _ in range(5)]
+            )
+
+        results = asyncio.run(main())
+
+        assert upstream.calls == 1
+        assert len(results) == 6
+        assert adapter._group.get_stats()["coalesced"] == 5
+
+    def test_sf005_delegates_other_attributes(self):
+        """SF-005: name / is_available 等属性委托给原适配器"""
+        adapter = SingleFlightAdapter(SlowAdapter(), SingleFlight())
+
+        assert adapter.name == "slow"
+        assert adapter.is_available("AAPL") is True
+
+    def test_sf006_cancelled_leader_does_not_cancel_waiters(self, ctx):
+        """SF-006: leader 被取消（对冲落败/超时）时上游调用继续完成，线程与协程等待方正常拿到结果"""
+        upstream = SlowAdapter(delay=0.2)
+        adapter = SingleFlightAdapter(upstream, SingleFlight())
+        args = ("AAPL", date(2024, 1, 1), date(2024, 1, 2), "1d", ctx)
+
+        async def main():
+            leader = asyncio.ensure_future(adapter.get_ohlcv_async(*args))
+            await asyncio.sleep(0.05)
+            loop = asyncio.get_running_loop()
+            thread_call = loop.run_in_executor(None, lambda: adapter.get_ohlcv(*args))
+            follower = asyncio.ensure_future(adapter.get_ohlcv_async(*args))
+            await asyncio.sleep(0.05)
+            leader.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+            return await asyncio.gather(thread_call, follower)
+
+        results = asyncio.run(main())
+
+        assert upstream.calls == 1
+        assert all(r["close"].iloc[0] == 1.0 for r in results)
+        assert upstream.threads[0].startswith("pstds-io")
+        assert adapter._group.inflight_count() == 0
@@ -92,6 +92,51 @@ class TestYFinanceAdapterOHLCV:
             )
 
 
+class TestYFinanceAdapterBatch:
+    """YF-006 至 YF-007: 批量 OHLCV 测试"""
+
+    @staticmethod
+    def _wide(tickers, dates):
+        fields = ['Open', 'High', 'Low', 'Close', 'Volume']
+        columns = pd.MultiIndex.from_product([tickers, fields], names=['Ticker', 'Price'])
+        df = pd.DataFrame(100.0, index=dates, columns=columns)
+        df.index.name = 'Date'
+        return df
+
+    def test_yf006_batch_single_download_filters_future(self, yfinance_adapter, live_ctx_2024_01_02):
+        """YF-006: 多只股票一次 yf.download，宽表按日期过滤后拆分为标准 DataFrame"""
+        dates = pd.date_range('2023-12-29', periods=7)  # 含 analysis_date 之后两天
+        wide = self._wide(['AAPL', 'MSFT'], dates)
+        wide.loc[dates[0], ('MSFT', slice(None))] = float('nan')  # MSFT 当日无数据
+        with patch('yfinance.download', return_value=wide) as mock_download:
+            result = yfinance_adapter.get_ohlcv_batch(
+                ["AAPL", "MSFT", "AAPL"], date(2023, 12, 29), date(2024, 1, 2), "1d", live_ctx_2024_01_02
+            )
+
+        assert mock_download.call_count == 1
+        assert mock_download.call_args.args[0] == ["AAPL", "MSFT"]
+        assert set(result) == {"AAPL", "MSFT"}
+        assert list(result["AAPL"].columns) == ["date", "open", "high", "low", "close", "volume", "adj_close", "data_source"]
+        assert result["AAPL"]["date"].dt.date.max() == date(2024, 1, 2)
+        assert len(result["AAPL"]) == 5
+        assert len(result["MSFT"]) == 4
+
+    def test_yf007_batch_missing_ticker_and_backtest(self, yfinance_adapter, live_ctx_2024_01_02, backtest_ctx_2024_01_02):
+        """YF-007: 批量结果缺失的股票返回空 DataFrame；BACKTEST 模式阻断"""
+        wide = self._wide(['AAPL'], pd.date_range('2024-01-01', periods=2))
+        with patch('yfinance.download', return_value=wide):
+            result = yfinance_adapter.get_ohlcv_batch(
+                ["AAPL", "ZZZZ"], date(2024, 1, 1), date(2024, 1, 2), "1d", live_ctx_2024_01_02
+            )
+        assert len(result["AAPL"]) == 2
+        assert result["ZZZZ"].empty
+
+        with pytest.raises(RealtimeAPIBlockedError):
+            yfinance_adapter.get_ohlcv_batch(
+                ["AAPL"], date(2024, 1, 1), date(2024, 1, 2), "1d", backtest_ctx_2024_01_02
+            )
+
+
 class TestYFinanceAdapterFundamentals:
     """YF-003: 基本面数据测试"""
 
@@ -36,3 +36,16 @@ def mixed_news_fixture():
 @pytest.fixture
 def valid_decision_json():
     return json.loads((FIXTURES / "llm_responses/valid_trade_decision.json").read_text())
+
+
+@pytest.fixture(autouse=True)
+def isolated_rate_limiter(tmp_path, monkeypatch):
+    """每个测试使用独立且不限速的全局限速器，避免读写 ./data 下的共享配额"""
+    from pstds.data import rate_limiter
+    limiter = rate_limiter.RateLimiter(
+        rate_limiter.SQLiteRateLimitBackend(str(tmp_path / "rate_limits.db")),
+        limits={},
+        key_limits={},
+    )
+    monkeypatch.setattr(rate_limiter, "_rate_limiter", limiter)
+    return limiter
@@ -0,0 +1,118 @@
+# tests/unit/test_adapter_registry.py
+# 适配器注册表测试套件 - AR-001 至 AR-004
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from pstds.data.adapters.registry import AdapterRegistry, get_adapter_registry
+from pstds.data.adapters.singleflight import SingleFlightAdapter
+from pstds.data.router import DataRouter
+
+
+class CountingAdapter:
+    """记录构造次数与生命周期调用的适配器"""
+
+    built = []
+
+    def __init__(self, name):
+        self.name = name
+        self.warmed = False
+        self.closed = False
+        self.calls = 0
+        CountingAdapter.built.append(name)
+
+    def get_ohlcv(self, symbol, start_date, end_date, interval, ctx):
+        self.calls += 1
+        return pd.DataFrame({
+            "date": pd.to_datetime(["2024-01-02", "2024-01-03"], utc=True),
+            "close": [10.0, 11.0],
+        })
+
+    def warmup(self):
+        self.warmed = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def registry():
+    CountingAdapter.built = []
+    return AdapterRegistry({
+        name: (lambda name=name: CountingAdapter(name))
+        for name in ("yfinance", "akshare", "local_csv")
+    })
+
+
+class TestAdapterRegistry:
+    """AR-001 至 AR-004: 延迟构造、共享实例与生命周期"""
+
+    def test_ar001_router_is_lightweight_view(self, registry):
+        """AR-001: 创建 DataRouter 不构造适配器；多个 DataRouter 共享注册表中的同一实例"""
+        first = DataRouter(registry=registry)
+        second = DataRouter(registry=registry)
+        assert CountingAdapter.built == []
+
+        assert first.get_adapter("AAPL") is second.get_adapter("MSFT")
+        assert first.get_adapter("AAPL").adapter is registry.get("yfinance", singleflight=False)
+        assert CountingAdapter.built == ["yfinance"]
+        assert registry.loaded() == ["yfinance"]
+
+        raw = DataRouter({"singleflight": False}, registry=registry).get_adapter("600519")
+        assert not isinstance(raw, SingleFlightAdapter)
+        assert raw is registry.get("akshare", singleflight=False)
+        assert DataRouter().registry is get_adapter_registry()
+
+    def test_ar002_failed_construction_not_cached(self):
+        """AR-002: 构造失败原样抛出且不缓存，之后可重试；未登记名称抛出 KeyError"""
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ValueError("API key not found")
+            return CountingAdapter("alphavantage")
+
+        registry = AdapterRegistry({"alphavantage": flaky})
+        with pytest.raises(ValueError):
+            registry.get("alphavantage")
+        assert registry.get("alphavantage").name == "alphavantage"
+        with pytest.raises(KeyError):
+            registry.get("missing")
+
+    def test_ar003_warmup_close_and_register(self, registry):
+        """AR-003: warmup 提前构造并调用钩子；close 关闭后重新构造；register 替换工厂"""
+        assert registry.warmup(["yfinance", "akshare"]) == {"yfinance": True, "akshare": True}
+        old = registry.get("yfinance", singleflight=False)
+        old_async = DataRouter(registry=registry).get_async_adapter("AAPL")
+        assert old.warmed
+
+        registry.close()
+        assert old.closed
+        assert registry.loaded() == []
+
+        new = registry.get("yfinance", singleflight=False)
+        assert new is not old
+        assert DataRouter(registry=registry).get_async_adapter("AAPL") is not old_async
+
+        registry.register("yfinance", lambda: CountingAdapter("yfinance-v2"))
+        assert new.closed
+        assert registry.get("yfinance").name == "yfinance-v2"
+
+    def test_ar004_backtest_runner_reuses_adapters(self, registry):
+        """AR-004: 多次回测取价复用同一适配器实例，不再每次重建 DataRouter 与适配器"""
+        from pstds.backtest.runner import BacktestRunner
+
+        router = DataRouter(registry=registry)
+        days = [date(2024, 1, 2), date(2024, 1, 3)]
+        prices = [
+            BacktestRunner(router=router, save_snapshots=False)._get_real_prices("AAPL", days, "US")
+            for _ in range(3)
+        ]
+
+        assert prices[0] == {date(2024, 1, 2): 10.0, date(2024, 1, 3): 11.0}
+        # 取价经 FallbackManager，主源与备用源各构造一次
+        assert CountingAdapter.built == ["yfinance", "local_csv"]
+        assert registry.get("yfinance", singleflight=False).calls >= 1
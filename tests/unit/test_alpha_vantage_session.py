@@ -0,0 +1,145 @@
+# tests/unit/test_alpha_vantage_session.py
+# Alpha Vantage 连接池测试套件 - AV-001 至 AV-006（本地桩服务器）
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+import tradingagents.dataflows.alpha_vantage_common as av
+
+# 模拟每个新连接的 TCP+TLS 建连开销
+HANDSHAKE_SECONDS = 0.03
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # 支持 keep-alive
+    # 响应头与正文一次写出，避免 Nagle + 延迟 ACK 干扰延迟测量
+    wbufsize = 1 << 16
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+        time.sleep(HANDSHAKE_SECONDS)
+
+    def do_GET(self):
+        query = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        self.server.hits.append(query)
+        function = query.get("function")
+        if function == "FLAKY" and self.server.flaky_failures > 0:
+            self.server.flaky_failures -= 1
+            self._send(503, "unavailable")
+        elif function == "LIMITED":
+            self._send(200, json.dumps({"Note": "Thank you for using Alpha Vantage! Our standard API call frequency is 5 calls per minute."}))
+        elif function == "INVALID":
+            self._send(200, json.dumps({"Error Message": "Invalid API call. Please retry or visit the documentation."}))
+        elif function == "PREMIUM":
+            self._send(200, json.dumps({"Information": "This is a premium endpoint."}))
+        else:
+            self._send(200, f"timestamp,close\n2024-01-02,{query.get('symbol', '')}\n")
+
+    def _send(self, status, body):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.hits = []
+    server.flaky_failures = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    monkeypatch.setenv("ALPHA_VANTAGE_API_KEY", "test")
+    monkeypatch.setattr(av, "API_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}/query")
+    monkeypatch.setattr(av, "BACKOFF_FACTOR", 0.01)
+    av.close_session()
+    yield server
+    av.close_session()
+    server.shutdown()
+    server.server_close()
+
+
+class TestAlphaVantageSession:
+    """AV-001 至 AV-006: 共享会话、重试与响应缓存"""
+
+    def test_av001_keep_alive_reduces_latency(self, stub_server):
+        """AV-001: 共享会话复用连接，单次请求延迟低于每次新建连接"""
+        n = 10
+
+        start = time.perf_counter()
+        for i in range(n):
+            requests.get(av.API_BASE_URL, params={"function": "SMA", "symbol": f"F{i}"})
+        fresh = (time.perf_counter() - start) / n
+        fresh_connections = stub_server.connections
+
+        start = time.perf_counter()
+        for i in range(n):
+            av._make_api_request("SMA", {"symbol": f"P{i}"})
+        pooled = (time.perf_counter() - start) / n
+        pooled_connections = stub_server.connections - fresh_connections
+
+        print(f"\nper-call latency: fresh={fresh * 1000:.1f}ms pooled={pooled * 1000:.1f}ms")
+        assert fresh_connections == n
+        assert pooled_connections == 1
+        assert pooled < fresh / 2
+
+    def test_av002_retry_on_5xx(self, stub_server):
+        """AV-002: 5xx 响应按退避重试后成功"""
+        stub_server.flaky_failures = 2
+
+        body = av._make_api_request("FLAKY", {"symbol": "IBM"})
+
+        assert "IBM" in body
+        assert len(stub_server.hits) == 3
+
+    def test_av003_response_cache_per_trading_day(self, stub_server, monkeypatch):
+        """AV-003: 相同 (function, params, 交易日) 只请求一次，交易日变化后重新请求"""
+        av._make_api_request("RSI", {"symbol": "IBM", "interval": "daily"})
+        av._make_api_request("RSI", {"interval": "daily", "symbol": "IBM"})
+        assert len(stub_server.hits) == 1
+
+        monkeypatch.setattr(av, "_trading_day", lambda: "2099-01-01")
+        av._make_api_request("RSI", {"symbol": "IBM", "interval": "daily"})
+        assert len(stub_server.hits) == 2
+
+    def test_av004_rate_limit_not_cached(self, stub_server):
+        """AV-004: 限速文本响应抛出 AlphaVantageRateLimitError 且不缓存"""
+        for _ in range(2):
+            with pytest.raises(av.AlphaVantageRateLimitError):
+                av._make_api_request("LIMITED", {"symbol": "IBM"})
+
+        assert len(stub_server.hits) == 2
+
+    def test_av005_error_payload_not_cached(self, stub_server):
+        """AV-005: HTTP 200 的 Error Message / Information 响应原样返回但不缓存"""
+        for function in ("INVALID", "PREMIUM"):
+            for _ in range(2):
+                body = av._make_api_request(function, {"symbol": "IBM"})
+                assert "Error Message" in body or "Information" in body
+
+        assert len(stub_server.hits) == 4
+
+    def test_av006_cache_keyed_by_api_key(self, stub_server, monkeypatch):
+        """AV-006: 不同 API key 的相同请求不共用缓存"""
+        av._make_api_request("RSI", {"symbol": "IBM"})
+        av._make_api_request("RSI", {"symbol": "IBM"})
+        monkeypatch.setenv("ALPHA_VANTAGE_API_KEY", "other")
+        av._make_api_request("RSI", {"symbol": "IBM"})
+
+        assert [hit["apikey"] for hit in stub_server.hits] == ["test", "other"]
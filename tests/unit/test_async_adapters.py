@@ -0,0 +1,177 @@
+# tests/unit/test_async_adapters.py
+# 异步数据适配器测试套件 - AA-001 至 AA-003、AA-005 至 AA-006
+
+import asyncio
+import time
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from pstds.data.adapters.async_adapters import ExecutorAsyncAdapter
+from pstds.data.circuit_breaker import BreakerRegistry
+from pstds.data.fallback import AsyncFallbackManager, LatencyTracker
+from pstds.data.router import DataRouter
+from pstds.temporal.context import TemporalContext
+
+
+def _frame(source):
+    return pd.DataFrame({"close": [1.0], "data_source": [source]})
+
+
+class BlockingAdapter:
+    """同步适配器：阻塞 delay 秒"""
+
+    def __init__(self, name="yfinance", delay=0.1):
+        self.name = name
+        self.delay = delay
+
+    def get_ohlcv(self, symbol, start_date, end_date, interval, ctx):
+        time.sleep(self.delay)
+        return _frame(self.name)
+
+
+class NativeAsyncAdapter:
+    """原生异步适配器：记录是否被取消"""
+
+    def __init__(self, name, delay=0.0, error=None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.cancelled = False
+
+    async def get_ohlcv(self, symbol, start_date, end_date, interval, ctx):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return _frame(self.name)
+
+    async def get_news(self, symbol, days_back, ctx):
+        return []
+
+
+@pytest.fixture
+def ctx():
+    return TemporalContext.for_live(date(2024, 1, 2))
+
+
+def _args(ctx):
+    return ("AAPL", date(2024, 1, 1), date(2024, 1, 2), "1d", ctx)
+
+
+class TestAsyncAdapters:
+    """AA-001 至 AA-003、AA-005 至 AA-006: 异步适配器层"""
+
+    def test_aa001_executor_wrapper_keeps_loop_free(self, ctx):
+        """AA-001: 同步 SDK 调用在线程池执行，并发请求不阻塞事件循环"""
+        adapter = ExecutorAsyncAdapter(BlockingAdapter(delay=0.2))
+
+        async def main():
+            ticks = 0
+
+            async def heartbeat():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            beat = asyncio.create_task(heartbeat())
+            start = time.monotonic()
+            results = await asyncio.gather(*[adapter.get_ohlcv(*_args(ctx)) for _ in range(16)])
+            elapsed = time.monotonic() - start
+            beat.cancel()
+            return results, elapsed, ticks
+
+        results, elapsed, ticks = asyncio.run(main())
+
+        assert len(results) == 16
+        assert elapsed < 1.0
+        assert ticks >= 10
+        assert adapter.name == "yfinance"
+
+    def test_aa002_async_fallback_sequential(self, ctx):
+        """AA-002: 主源失败时降级到备用源并记录；全部无数据返回默认值"""
+        manager = AsyncFallbackManager(
+            [NativeAsyncAdapter("akshare", error=RuntimeError("down"))],
+            [NativeAsyncAdapter("local_csv")],
+            latency_tracker=LatencyTracker(),
+        )
+
+        async def main():
+            return await manager.get_ohlcv(*_args(ctx)), await manager.get_news("AAPL", 7, ctx)
+
+        ohlcv, news = asyncio.run(main())
+
+        assert ohlcv["data_source"][0] == "local_csv"
+        assert news == []
+        assert manager.get_report().fallbacks_used == ["local_csv"]
+        assert manager.get_report().sources == {"ohlcv": "local_csv"}
+
+    def test_aa003_hedge_cancels_loser_and_deadline(self, ctx):
+        """AA-003: 对冲胜出后慢请求被取消；超过总时限返回 None"""
+        slow = NativeAsyncAdapter("yfinance", delay=5.0)
+        manager = AsyncFallbackManager(
+            [slow], [NativeAsyncAdapter("local_csv")],
+            hedge=True, hedge_delay=0.05, latency_tracker=LatencyTracker(),
+        )
+        stuck = NativeAsyncAdapter("yfinance", delay=5.0)
+        bounded = AsyncFallbackManager([stuck], [], deadline=0.1, latency_tracker=LatencyTracker())
+
+        async def main():
+            start = time.monotonic()
+            hedged = await manager.get_ohlcv(*_args(ctx))
+            timed_out = await bounded.get_ohlcv(*_args(ctx))
+            await asyncio.sleep(0)
+            return hedged, timed_out, time.monotonic() - start
+
+        hedged, timed_out, elapsed = asyncio.run(main())
+
+        assert hedged["data_source"][0] == "local_csv"
+        assert slow.cancelled
+        assert timed_out is None
+        assert stuck.cancelled
+        assert elapsed < 1.0
+
+    def test_aa005_router_async_views(self):
+        """AA-005: DataRouter 提供异步主源适配器与异步降级管理器"""
+        router = DataRouter()
+
+        adapter = router.get_async_adapter("AAPL")
+        manager = router.get_async_fallback_manager("0700.HK")
+
+        assert isinstance(adapter, ExecutorAsyncAdapter)
+        assert adapter is router.get_async_adapter("MSFT")
+        assert adapter.name == "yfinance"
+        assert isinstance(manager, AsyncFallbackManager)
+        assert [a.name for a in manager.primary_adapters] == ["akshare"]
+        assert [a.name for a in manager.fallback_adapters] == ["yfinance", "local_csv"]
+        assert manager.breakers is not None
+
+    def test_aa006_cancelled_half_open_probe_released(self, ctx):
+        """AA-006: half_open 适配器作为对冲请求被取消后归还探测名额，之后仍可探测恢复"""
+        registry = BreakerRegistry(min_calls=1, open_seconds=0)
+        registry.get("yfinance").record(0.1, failed=True)
+        assert registry.get("yfinance").state == "half_open"
+
+        probe = NativeAsyncAdapter("yfinance", delay=5.0)
+        manager = AsyncFallbackManager(
+            [NativeAsyncAdapter("akshare", delay=0.2)], [probe],
+            hedge=True, hedge_delay=0.05, breakers=registry, latency_tracker=LatencyTracker(),
+        )
+
+        async def main():
+            result = await manager.get_ohlcv(*_args(ctx))
+            await asyncio.sleep(0)
+            return result
+
+        result = asyncio.run(main())
+
+        assert result["data_source"][0] == "akshare"
+        assert probe.cancelled
+        breaker = registry.get("yfinance")
+        assert breaker.state == "half_open"
+        assert breaker.allow() is True
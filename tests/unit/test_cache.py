@@ -0,0 +1,532 @@
+# tests/unit/test_cache.py
+# CacheManager 测试套件 - CM-001 起
+
+import threading
+from datetime import date
+
+import pytest
+
+from pstds.data.cache import CacheManager
+from pstds.temporal.context import TemporalContext
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    """按需创建 CacheManager，测试结束统一关闭"""
+    created = []
+
+    def _make(**kwargs):
+        manager = CacheManager(
+            db_path=str(tmp_path / "cache.db"),
+            parquet_dir=str(tmp_path / "parquet"),
+            news_dir=str(tmp_path / "news"),
+            **kwargs,
+        )
+        created.append(manager)
+        return manager
+
+    yield _make
+    for manager in created:
+        manager.close()
+
+
+class TestConnectionPool:
+    """CM-001 至 CM-004: 连接池模式"""
+
+    def test_cm001_pooled_uses_wal(self, make_cache):
+        """CM-001: 连接池模式启用 WAL 日志"""
+        cache = make_cache(pooled=True)
+        with cache._connection() as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode.lower() == "wal"
+
+    def test_cm002_connection_reused_per_thread(self, make_cache):
+        """CM-002: 同一线程复用长连接，不同线程各持一个连接"""
+        cache = make_cache(pooled=True)
+        with cache._connection() as first:
+            pass
+        with cache._connection() as second:
+            pass
+        assert first is second
+
+        seen = []
+
+        def worker():
+            with cache._connection() as conn:
+                seen.append(conn)
+
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+        assert seen[0] is not first
+
+    def test_cm003_concurrent_writes(self, make_cache):
+        """CM-003: 多线程并发写入全部落库"""
+        cache = make_cache(pooled=True)
+        as_of = date(2024, 1, 2)
+        ctx = TemporalContext.for_live(as_of)
+
+        def writer(idx):
+            for i in range(20):
+                cache.set_fundamentals(f"T{idx}_{i}", as_of, {"pe_ratio": float(i)})
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert cache.get_fundamentals("T7_19", as_of, ctx) == {"pe_ratio": 19.0}
+        with cache._connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM fundamentals_cache").fetchone()[0]
+        assert count == 160
+
+    def test_cm004_close_releases_pool(self, make_cache):
+        """CM-004: close() 关闭所有长连接，之后可重新获取"""
+        cache = make_cache(pooled=True)
+        with cache._connection() as conn:
+            pass
+        cache.close()
+        assert cache._pool_connections == []
+
+        cache.set_decision("h1", {"action": "BUY"})
+        assert cache.get_decision("h1") == {"action": "BUY"}
+
+
+def _ohlcv_frame(dates, base=100.0):
+    import pandas as pd
+
+    n = len(dates)
+    return pd.DataFrame({
+        "date": pd.to_datetime(dates, utc=True),
+        "open": [base] * n,
+        "high": [base + 2] * n,
+        "low": [base - 2] * n,
+        "close": [base + 1] * n,
+        "volume": [1_000_000] * n,
+        "adj_close": [base + 1] * n,
+        "data_source": ["test"] * n,
+    })
+
+
+class TestBulkOHLCV:
+    """CM-005 至 CM-007: OHLCV 批量写入"""
+
+    def test_cm005_bulk_dict_single_fetched_at(self, make_cache):
+        """CM-005: 字典输入一次写入多只股票，fetched_at 整批一致"""
+        cache = make_cache()
+        ctx = TemporalContext.for_backtest(date(2024, 1, 15))
+        frames = {
+            "AAA": _ohlcv_frame(["2024-01-02", "2024-01-03"]),
+            "BBB": _ohlcv_frame(["2024-01-02", "2024-01-03", "2024-01-04"]),
+        }
+
+        stats = cache.set_ohlcv_bulk(frames, ctx)
+
+        assert stats["rows"] == 5
+        assert stats["symbols"] == 2
+        assert stats["rows_per_sec"] > 0
+        with cache._connection() as conn:
+            stamps = conn.execute("SELECT DISTINCT fetched_at FROM ohlcv_cache").fetchall()
+        assert len(stamps) == 1
+
+    def test_cm006_bulk_long_frame_and_arrow(self, make_cache):
+        """CM-006: 长表 DataFrame 与 Arrow Table 输入按 symbol 拆分"""
+        import pandas as pd
+        import pyarrow as pa
+
+        cache = make_cache()
+        ctx = TemporalContext.for_backtest(date(2024, 1, 15))
+        long_df = pd.concat([
+            _ohlcv_frame(["2024-01-02"]).assign(symbol="AAA"),
+            _ohlcv_frame(["2024-01-02", "2024-01-03"]).assign(symbol="BBB"),
+        ], ignore_index=True)
+
+        cache.set_ohlcv_bulk(long_df, ctx)
+        cache.set_ohlcv_bulk(pa.Table.from_pandas(long_df.assign(symbol="CCC")), ctx)
+
+        for symbol, expected in (("AAA", 1), ("BBB", 2), ("CCC", 2)):
+            cached = cache.get_ohlcv(symbol, date(2024, 1, 1), date(2024, 1, 10), ctx)
+            assert len(cached) == expected
+
+    def test_cm007_long_frame_requires_symbol(self, make_cache):
+        """CM-007: 长表缺少 symbol 列时报错"""
+        cache = make_cache()
+        ctx = TemporalContext.for_backtest(date(2024, 1, 15))
+        with pytest.raises(ValueError):
+            cache.set_ohlcv_bulk(_ohlcv_frame(["2024-01-02"]), ctx)
+
+
+class TestParquetArchive:
+    """CM-008 至 CM-011、CM-024 至 CM-025: 分区 Parquet 归档"""
+
+    def test_cm008_append_creates_year_partitions(self, make_cache, tmp_path):
+        """CM-008: 写入按 symbol/year 分区，不改写已有分片"""
+        cache = make_cache()
+        ctx = TemporalContext.for_backtest(date(2024, 12, 31))
+        cache.set_ohlcv("AAA", _ohlcv_frame(["2023-12-29", "2024-01-02"]), ctx)
+        first_parts = sorted((tmp_path / "parquet").rglob("*.parquet"))
+        mtimes = [p.stat().st_mtime_ns for p in first_parts]
+
+        cache.set_ohlcv("AAA", _ohlcv_frame(["2024-01-03"]), ctx)
+
+        symbol_dir = tmp_path / "parquet" / "symbol=AAA"
+        assert {p.name for p in symbol_dir.iterdir()} == {"year=2023", "year=2024"}
+        assert [p.stat().st_mtime_ns for p in first_parts] == mtimes
+        assert len(list(symbol_dir.rglob("*.parquet"))) == 3
+
+    def test_cm009_read_dedups_and_filters_range(self, make_cache):
+        """CM-009: 读取按日期范围下推过滤，重复日期保留最后写入"""
+        cache = make_cache()
+        ctx = TemporalContext.for_backtest(date(2024, 12, 31))
+        cache.set_ohlcv("AAA", _ohlcv_frame(["2023-12-29", "2024-01-02", "2024-01-03"]), ctx)
+        cache.set_ohlcv("AAA", _ohlcv_frame(["2024-01-03"], base=200.0), ctx)
+
+        df = cache.read_parquet("AAA", date(2024, 1, 1), date(2024, 1, 3))
+
+        assert len(df) == 2
+        assert df["close"].tolist() == [101.0, 201.0]
+
+    def test_cm010_compaction_merges_parts(self, make_cache, tmp_path):
+        """CM-010: 合并后每个分区一个文件，数据不变"""
+        cache = make_cache()
+        ctx = TemporalContext.for_backtest(date(2024, 12, 31))
+        for day in ("2024-01-02", "2024-01-03", "2024-01-04"):
+            cache.set_ohlcv("AAA", _ohlcv_frame([day]), ctx)
+        before = cache.read_parquet("AAA")
+
+        removed = cache.compact_parquet("AAA")
+
+        files = list((tmp_path / "parquet" / "symbol=AAA").rglob("*.parquet"))
+        assert removed == 3
+        assert len(files) == 1
+        assert cache.read_parquet("AAA").equals(before)
+
+    def test_cm011_legacy_file_migrated(self, make_cache, tmp_path):
+        """CM-011: 旧版 {symbol}.parquet 在合并时迁入分区，新数据优先"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        cache = make_cache()
+        ctx = TemporalContext.for_backtest(date(2024, 12, 31))
+        legacy = tmp_path / "parquet" / "AAA.parquet"
+        pq.write_table(pa.Table.from_pandas(_ohlcv_frame(["2024-01-02", "2024-01-03"])), legacy)
+        cache.set_ohlcv("AAA", _ohlcv_frame(["2024-01-03"], base=200.0), ctx)
+
+        cache.compact_parquet()
+
+        assert not legacy.exists()
+        assert cache.read_parquet("AAA")["close"].tolist() == [101.0, 201.0]
+
+    def test_cm024_legacy_file_readable_before_compaction(self, make_cache, tmp_path):
+        """CM-024: 合并前旧版 {symbol}.parquet 即可读取，分区分片的新数据优先"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        cache = make_cache()
+        ctx = TemporalContext.for_backtest(date(2024, 12, 31))
+        legacy = tmp_path / "parquet" / "AAA.parquet"
+        legacy.parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(
+            pa.Table.from_pandas(_ohlcv_frame(["2023-12-29", "2024-01-02", "2024-01-03"])), legacy
+        )
+        assert cache.read_parquet("AAA")["close"].tolist() == [101.0, 101.0, 101.0]
+
+        cache.set_ohlcv("AAA", _ohlcv_frame(["2024-01-03"], base=200.0), ctx)
+        df = cache.read_parquet("AAA", date(2024, 1, 1), date(2024, 1, 3))
+
+        assert legacy.exists()
+        assert df["close"].tolist() == [101.0, 201.0]
+        cache.compact_parquet()
+        assert cache.read_parquet("AAA", date(2024, 1, 1), date(2024, 1, 3)).equals(df)
+
+    def test_cm025_register_compaction(self, make_cache):
+        """CM-025: 合并任务注册为 TaskScheduler 的周期 Cron 任务"""
+        from pstds.data.cache import PARQUET_COMPACTION_CRON
+        from pstds.scheduler.scheduler import TaskScheduler
+
+        scheduler = TaskScheduler()
+        if scheduler.scheduler is None:
+            pytest.skip("APScheduler not installed")
+        cache = make_cache()
+
+        assert cache.register_compaction(scheduler)
+
+        task = scheduler.tasks["parquet_compaction"]
+        assert task.func == cache.compact_parquet
+        assert task.trigger_args["cron"] == PARQUET_COMPACTION_CRON
+
+
+class TestHotCache:
+    """CM-012 至 CM-016: 内存热点层"""
+
+    def test_cm012_repeat_read_hits_memory(self, make_cache):
+        """CM-012: 重复读取命中内存，返回副本"""
+        from pstds.data.cache import HotCache
+
+        cache = make_cache(hot_cache=HotCache())
+        ctx = TemporalContext.for_backtest(date(2024, 1, 15))
+        cache.set_ohlcv("AAA", _ohlcv_frame(["2024-01-02", "2024-01-03"]), ctx)
+
+        first = cache.get_ohlcv("AAA", date(2024, 1, 1), date(2024, 1, 10), ctx)
+        first.loc[:, "close"] = 0.0
+        second = cache.get_ohlcv("AAA", date(2024, 1, 1), date(2024, 1, 10), ctx)
+
+        stats = cache.hot_cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert second["close"].tolist() == [101.0, 101.0]
+
+    def test_cm013_write_invalidates(self, make_cache):
+        """CM-013: 写入 SQLite 后对应 symbol 的条目失效"""
+        from pstds.data.cache import HotCache
+
+        cache = make_cache(hot_cache=HotCache())
+        as_of = date(2024, 1, 2)
+        ctx = TemporalContext.for_live(as_of)
+        cache.set_fundamentals("AAA", as_of, {"pe_ratio": 10.0})
+        cache.set_fundamentals("BBB", as_of, {"pe_ratio": 20.0})
+        assert cache.get_fundamentals("AAA", as_of, ctx) == {"pe_ratio": 10.0}
+        assert cache.get_fundamentals("BBB", as_of, ctx) == {"pe_ratio": 20.0}
+
+        cache.set_fundamentals("AAA", as_of, {"pe_ratio": 11.0})
+
+        assert cache.get_fundamentals("AAA", as_of, ctx) == {"pe_ratio": 11.0}
+        assert cache.get_fundamentals("BBB", as_of, ctx) == {"pe_ratio": 20.0}
+        assert cache.hot_cache.stats()["invalidations"] == 1
+
+    def test_cm014_lru_eviction_by_entries(self):
+        """CM-014: 超过条目上限时淘汰最久未使用的条目"""
+        from pstds.data.cache import HotCache
+
+        hot = HotCache(max_entries=2)
+        hot.put(("t", "A", None, None), 1, None, 10)
+        hot.put(("t", "B", None, None), 2, None, 10)
+        hot.get(("t", "A", None, None))
+        hot.put(("t", "C", None, None), 3, None, 10)
+
+        assert hot.get(("t", "B", None, None)) is None
+        assert hot.get(("t", "A", None, None)) == 1
+        assert hot.stats()["evictions"] == 1
+
+    def test_cm015_eviction_by_bytes(self):
+        """CM-015: 超过字节上限时淘汰，单个超大条目不缓存"""
+        from pstds.data.cache import HotCache
+
+        hot = HotCache(max_bytes=100)
+        hot.put(("t", "A", None, None), 1, None, 60)
+        hot.put(("t", "B", None, None), 2, None, 60)
+        hot.put(("t", "C", None, None), 3, None, 500)
+
+        assert hot.get(("t", "A", None, None)) is None
+        assert hot.get(("t", "B", None, None)) == 2
+        assert hot.get(("t", "C", None, None)) is None
+        assert hot.stats()["bytes"] == 60
+
+    def test_cm016_ttl_follows_expiry(self):
+        """CM-016: 条目在底层缓存行过期时间后失效"""
+        import time
+        from datetime import datetime, timedelta, UTC
+        from pstds.data.cache import HotCache
+
+        hot = HotCache()
+        hot.put(("t", "A", None, None), 1, datetime.now(UTC) + timedelta(milliseconds=50), 10)
+        hot.put(("t", "B", None, None), 2, datetime.now(UTC) - timedelta(seconds=1), 10)
+        assert hot.get(("t", "A", None, None)) == 1
+        assert hot.get(("t", "B", None, None)) is None
+
+        time.sleep(0.06)
+        assert hot.get(("t", "A", None, None)) is None
+        assert hot.stats()["expirations"] == 1
+
+
+# v1 版本（未迁移）的缓存表结构
+_V1_DDL = [
+    """CREATE TABLE ohlcv_cache (
+        symbol TEXT, date TEXT, open REAL, high REAL, low REAL, close REAL,
+        volume INTEGER, adj_close REAL, data_source TEXT, fetched_at TEXT,
+        ttl_hours INTEGER DEFAULT 24, PRIMARY KEY (symbol, date))""",
+    """CREATE TABLE fundamentals_cache (
+        symbol TEXT, as_of_date TEXT, data_json TEXT, fetched_at TEXT,
+        ttl_hours INTEGER DEFAULT 24, PRIMARY KEY (symbol, as_of_date))""",
+    """CREATE TABLE news_cache (
+        symbol TEXT, published_at TEXT, title_hash TEXT, news_json TEXT,
+        fetched_at TEXT, ttl_hours INTEGER DEFAULT 6, PRIMARY KEY (symbol, title_hash))""",
+    """CREATE TABLE technical_cache (
+        symbol TEXT, date TEXT, indicator TEXT, value REAL, fetched_at TEXT,
+        ttl_hours INTEGER DEFAULT 24, PRIMARY KEY (symbol, date, indicator))""",
+    """CREATE TABLE decision_hash_cache (
+        input_hash TEXT PRIMARY KEY, result_json TEXT, created_at TEXT, ttl_days INTEGER DEFAULT 7)""",
+]
+
+
+class TestSchemaMigration:
+    """CM-017 至 CM-019: 整数日期键与 expires_at 迁移"""
+
+    def test_cm017_v1_database_auto_migrated(self, make_cache, tmp_path):
+        """CM-017: 旧版 cache.db 打开时自动迁移，数据可读"""
+        import json
+        import sqlite3
+        from datetime import datetime, UTC
+
+        now = datetime.now(UTC).isoformat()
+        conn = sqlite3.connect(tmp_path / "cache.db")
+        for ddl in _V1_DDL:
+            conn.execute(ddl)
+        conn.execute(
+            "INSERT INTO ohlcv_cache VALUES ('AAA', '2024-01-02T00:00:00+00:00', 1, 2, 0.5, 1.5, 100, 1.5, 'v1', ?, 24)",
+            (now,),
+        )
+        conn.execute(
+            "INSERT INTO fundamentals_cache VALUES ('AAA', '2024-01-02', ?, ?, 24)",
+            (json.dumps({"pe_ratio": 9.0}), now),
+        )
+        conn.execute(
+            "INSERT INTO news_cache VALUES ('AAA', '2024-01-02T08:00:00+00:00', 'h1', ?, ?, 6)",
+            (json.dumps({"title": "t"}), now),
+        )
+        conn.execute("INSERT INTO decision_hash_cache VALUES ('h', ?, ?, 7)", (json.dumps({"action": "BUY"}), now))
+        conn.commit()
+        conn.close()
+
+        cache = make_cache()
+        ctx = TemporalContext.for_live(date(2024, 1, 2))
+
+        with cache._connection() as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == CacheManager.SCHEMA_VERSION
+            assert conn.execute("SELECT date_key FROM ohlcv_cache").fetchone()[0] == 19724
+        assert len(cache.get_ohlcv("AAA", date(2024, 1, 1), date(2024, 1, 3), ctx)) == 1
+        assert cache.get_fundamentals("AAA", date(2024, 1, 2), ctx) == {"pe_ratio": 9.0}
+        assert cache.get_news("AAA", ctx) == [{"title": "t"}]
+        assert cache.get_decision("h") == {"action": "BUY"}
+
+    def test_cm018_range_query_uses_key_seek(self, make_cache):
+        """CM-018: symbol + 日期范围查询走主键范围查找而非全表扫描"""
+        cache = make_cache()
+        with cache._connection() as conn:
+            plan = " ".join(row[-1] for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM ohlcv_cache "
+                "WHERE symbol = ? AND date_key BETWEEN ? AND ?", ("A", 1, 2)
+            ))
+            expiry_plan = " ".join(row[-1] for row in conn.execute(
+                "EXPLAIN QUERY PLAN DELETE FROM news_cache WHERE expires_at < ?", (0,)
+            ))
+        assert "SEARCH" in plan and "date_key>? AND date_key<?" in plan
+        assert "idx_news_expires" in expiry_plan
+
+    def test_cm019_clear_expired_uses_expires_at(self, make_cache):
+        """CM-019: clear_expired 按预计算的 expires_at 删除"""
+        cache = make_cache()
+        ctx = TemporalContext.for_backtest(date(2024, 1, 15))
+        cache.set_ohlcv("OLD", _ohlcv_frame(["2024-01-02"]), ctx, ttl_hours=0)
+        cache.set_ohlcv("NEW", _ohlcv_frame(["2024-01-02"]), ctx)
+
+        assert cache.clear_expired() == 1
+        assert cache.get_ohlcv("NEW", date(2024, 1, 1), date(2024, 1, 3), ctx) is not None
+
+
+def _news(title, published_at, content="", source="Reuters"):
+    return {"title": title, "content": content, "published_at": published_at, "source": source}
+
+
+class TestNewsArchive:
+    """CM-020 至 CM-023、CM-026 至 CM-027: 新闻全文检索归档"""
+
+    @pytest.fixture
+    def archive(self, make_cache):
+        cache = make_cache()
+        filler = [_news(f"Market wrap {i}", "2024-01-03T08:00:00+00:00", "stocks moved") for i in range(8)]
+        cache.archive_news("AAPL", filler + [
+            _news("Apple earnings beat expectations", "2024-01-02T10:00:00+00:00", "iPhone sales strong"),
+            _news("Apple faces antitrust probe", "2024-01-05T10:00:00+00:00", "earnings outlook unaffected"),
+        ])
+        cache.archive_news("MSFT", [
+            _news("Microsoft earnings call scheduled", "2024-01-02T12:00:00+00:00"),
+        ])
+        return cache
+
+    def test_cm020_title_hash_dedup(self, archive):
+        """CM-020: 同一股票重复标题不重复归档"""
+        added = archive.archive_news("AAPL", [
+            _news("Apple earnings beat expectations", "2024-01-02T11:00:00+00:00", source="CNBC"),
+            _news("Apple opens new store", "2024-01-03T09:00:00+00:00"),
+        ])
+        assert added == 1
+
+    def test_cm021_ranked_search(self, archive):
+        """CM-021: 关键词检索按 bm25 排序，标题命中优先"""
+        ctx = TemporalContext.for_backtest(date(2024, 1, 10))
+
+        results = archive.search_news("earnings", ctx, symbol="AAPL")
+
+        assert [r["title"] for r in results] == [
+            "Apple earnings beat expectations",
+            "Apple faces antitrust probe",
+        ]
+        assert results[0]["score"] < results[1]["score"]
+        assert len(archive.search_news("earnings", ctx)) == 3
+        assert archive.search_news("earnings iphone", ctx, require_all=True)[0]["source"] == "Reuters"
+        assert archive.search_news("S&P-500 (\"", ctx) == []
+
+    def test_cm026_cjk_search(self, archive):
+        """CM-026: 中文新闻逐字切分索引，词语可在连续汉字中命中"""
+        ctx = TemporalContext.for_backtest(date(2024, 1, 10))
+        archive.archive_news("600519", [
+            _news("茅台 营收创新高", "2024-01-02T10:00:00+00:00", "白酒龙头业绩稳健", source="新浪财经"),
+            _news("贵州茅台发布公告", "2024-01-03T10:00:00+00:00", "公司营收同比增长"),
+        ])
+
+        results = archive.search_news("营收", ctx, symbol="600519")
+
+        assert [r["title"] for r in results] == ["茅台 营收创新高", "贵州茅台发布公告"]
+        assert [r["title"] for r in archive.search_news("茅台业绩", ctx)] == []
+        assert [r["title"] for r in archive.search_news("茅台 业绩", ctx, require_all=True)] == ["茅台 营收创新高"]
+        assert archive.search_news("收营", ctx) == []
+        assert len(archive.search_news("新浪财经", ctx)) == 1
+
+    def test_cm027_v2_news_index_rebuilt(self, make_cache):
+        """CM-027: v2 库的未切分全文索引在打开时重建，已归档的中文新闻可检索"""
+        ctx = TemporalContext.for_backtest(date(2024, 1, 10))
+        cache = make_cache()
+        with cache._connection() as conn:
+            conn.execute("DROP TRIGGER news_archive_ai")
+            conn.execute("DROP TABLE news_fts")
+            conn.execute(
+                "CREATE VIRTUAL TABLE news_fts USING fts5(symbol UNINDEXED, published_at UNINDEXED, "
+                "source, title, content, content='news_archive', content_rowid='id')"
+            )
+            conn.execute("""
+                CREATE TRIGGER news_archive_ai AFTER INSERT ON news_archive BEGIN
+                    INSERT INTO news_fts (rowid, symbol, published_at, source, title, content)
+                    VALUES (new.id, new.symbol, new.published_at, new.source, new.title, new.content);
+                END
+            """)
+            conn.execute("PRAGMA user_version = 2")
+        cache.archive_news("600519", [_news("茅台营收创新高", "2024-01-02T10:00:00+00:00")])
+        assert cache.search_news("营收", ctx) == []
+        cache.close()
+
+        reopened = make_cache()
+
+        assert [r["title"] for r in reopened.search_news("营收", ctx)] == ["茅台营收创新高"]
+        with reopened._connection() as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == CacheManager.SCHEMA_VERSION
+
+    def test_cm022_search_respects_analysis_date(self, archive):
+        """CM-022: 检索结果不含 analysis_date 之后发布的新闻"""
+        ctx = TemporalContext.for_backtest(date(2024, 1, 4))
+
+        results = archive.search_news("earnings", ctx, symbol="AAPL", end_date=date(2024, 12, 31))
+
+        assert [r["title"] for r in results] == ["Apple earnings beat expectations"]
+
+    def test_cm023_date_bounded_listing(self, archive):
+        """CM-023: 按日期范围读取归档，最新在前"""
+        ctx = TemporalContext.for_backtest(date(2024, 1, 10))
+
+        recent = archive.get_archived_news("AAPL", ctx, start_date=date(2024, 1, 4))
+        bounded = archive.get_archived_news("AAPL", ctx, end_date=date(2024, 1, 2))
+
+        assert [n["title"] for n in recent] == ["Apple faces antitrust probe"]
+        assert [n["title"] for n in bounded] == ["Apple earnings beat expectations"]
+        assert len(archive.get_archived_news("AAPL", ctx, limit=3)) == 3
@@ -0,0 +1,207 @@
+# tests/unit/test_cache_warmer.py
+# 盘前缓存预热测试套件 - CW-001 至 CW-005
+
+import threading
+import time
+from datetime import date, datetime, UTC
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pstds.data.cache import CacheManager
+from pstds.data.models import NewsItem
+from pstds.scheduler.cache_warmer import CacheWarmer, VendorLimit, PRE_MARKET_SCHEDULES
+from pstds.temporal.context import TemporalContext
+
+
+class FakeAdapter:
+    """按工作日生成行情，记录并发峰值"""
+
+    def __init__(self, name, delay=0.0, fail=()):
+        self.name = name
+        self.delay = delay
+        self.fail = set(fail)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+
+    def _enter(self, symbol):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        if symbol in self.fail:
+            raise RuntimeError("upstream error")
+
+    def get_ohlcv(self, symbol, start_date, end_date, interval, ctx):
+        self._enter(symbol)
+        days = pd.bdate_range(start_date, end_date)
+        n = len(days)
+        return pd.DataFrame({
+            "date": pd.DatetimeIndex(days, tz="UTC"),
+            "open": [10.0] * n, "high": [11.0] * n, "low": [9.0] * n, "close": [10.5] * n,
+            "volume": [1000] * n, "adj_close": [10.5] * n, "data_source": [self.name] * n,
+        })
+
+    def get_fundamentals(self, symbol, as_of_date, ctx):
+        self._enter(symbol)
+        return {"pe_ratio": 20.0, "data_source": self.name, "fetched_at": datetime.now(UTC)}
+
+    def get_news(self, symbol, days_back, ctx):
+        self._enter(symbol)
+        return [NewsItem(
+            title=f"{symbol} headline", content="body", published_at=datetime(2024, 3, 1, tzinfo=UTC),
+            source="wire", relevance_score=0.8, market_type="US", symbol=symbol,
+        )]
+
+
+class FakeFallbackManager:
+    def __init__(self, adapter):
+        self.adapter = adapter
+
+    def get_ohlcv(self, *args):
+        return self.adapter.get_ohlcv(*args)
+
+    def get_fundamentals(self, *args):
+        return self.adapter.get_fundamentals(*args)
+
+    def get_news(self, *args):
+        return self.adapter.get_news(*args)
+
+
+class FakeRouter:
+    def __init__(self, adapter):
+        self.adapter = adapter
+
+    def get_adapter(self, symbol):
+        return self.adapter
+
+    def get_fallback_manager(self, symbol, quality_report=None):
+        return FakeFallbackManager(self.adapter)
+
+
+class FakeWatchlist:
+    def __init__(self, stocks):
+        self.stocks = stocks
+
+    def get_all(self, market_type=None):
+        return [s for s in self.stocks if market_type is None or s["market_type"] == market_type]
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.jobs = {}
+
+    def add_cron_job(self, task_id, func, name, cron_expr, timezone=None, **kwargs):
+        self.jobs[task_id] = (func, cron_expr, timezone, kwargs)
+        return True
+
+
+def _history(symbol):
+    n = 260
+    close = 100 + np.arange(n, dtype=float)
+    return pd.DataFrame({
+        "Date": pd.bdate_range("2023-03-01", periods=n),
+        "Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": [1000] * n,
+    })
+
+
+WATCHLIST = [
+    {"symbol": "AAPL", "market_type": "US"},
+    {"symbol": "MSFT", "market_type": "US"},
+    {"symbol": "600519", "market_type": "CN_A"},
+]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    manager = CacheManager(
+        db_path=str(tmp_path / "cache.db"),
+        parquet_dir=str(tmp_path / "parquet"),
+        news_dir=str(tmp_path / "news"),
+        pooled=True,
+    )
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def ctx():
+    return TemporalContext.for_live(date(2024, 3, 1))
+
+
+def _warmer(cache, adapter, **kwargs):
+    return CacheWarmer(
+        cache,
+        router=FakeRouter(adapter),
+        watchlist=FakeWatchlist(WATCHLIST),
+        indicator_history_loader=_history,
+        **kwargs,
+    )
+
+
+class TestCacheWarmer:
+    """CW-001 至 CW-005: 自选股预热"""
+
+    def test_cw001_warm_loads_cache(self, cache, ctx):
+        """CW-001: 预热后 OHLCV、基本面、新闻、指标均可从缓存读取"""
+        warmer = _warmer(cache, FakeAdapter("yfinance"))
+
+        report = warmer.warm(ctx=ctx)
+
+        assert report.coverage == 1.0
+        assert report.results["ohlcv"] == {"ok": 3, "total": 3}
+        assert cache.get_ohlcv("AAPL", date(2024, 2, 1), date(2024, 3, 1), ctx) is not None
+        assert cache.get_fundamentals("AAPL", date(2024, 3, 1), ctx)["pe_ratio"] == 20.0
+        assert cache.get_news("MSFT", ctx)[0]["title"] == "MSFT headline"
+        assert warmer.materializer.get_state("600519", "yfinance") is not None
+
+    def test_cw002_market_type_grouping(self, cache, ctx):
+        """CW-002: 按 market_type 只预热对应市场的自选股"""
+        warmer = _warmer(cache, FakeAdapter("yfinance"))
+
+        report = warmer.warm(market_type="CN_A", ctx=ctx, kinds=("fundamentals",))
+
+        assert report.symbols == ["600519"]
+        assert report.results["fundamentals"] == {"ok": 1, "total": 1}
+
+    def test_cw003_failures_reported(self, cache, ctx):
+        """CW-003: 单个任务失败计入报告，不影响其他股票"""
+        warmer = _warmer(cache, FakeAdapter("yfinance", fail={"MSFT"}))
+
+        report = warmer.warm(ctx=ctx, kinds=("fundamentals", "news"))
+
+        assert report.coverage_by_kind() == {"fundamentals": pytest.approx(2 / 3), "news": pytest.approx(2 / 3)}
+        assert sorted(report.failures) == [
+            "MSFT/fundamentals: upstream error",
+            "MSFT/news: upstream error",
+        ]
+        assert report.seconds > 0
+
+    def test_cw004_vendor_concurrency_limited(self, cache, ctx):
+        """CW-004: 同一数据源的在途请求数不超过限速"""
+        adapter = FakeAdapter("slowvendor", delay=0.05)
+        warmer = _warmer(
+            cache, adapter, max_workers=8,
+            vendor_limits={"slowvendor": VendorLimit(max_concurrent=2)},
+        )
+
+        warmer.warm(symbols=["A", "B", "C", "D", "E", "F"], ctx=ctx, kinds=("fundamentals", "news"))
+
+        assert adapter.peak <= 2
+
+    def test_cw005_register_per_market(self, cache):
+        """CW-005: 每个市场注册一个当地时区的盘前 Cron 任务"""
+        scheduler = FakeScheduler()
+        warmer = _warmer(cache, FakeAdapter("yfinance"))
+
+        assert warmer.register(scheduler)
+
+        assert set(scheduler.jobs) == {f"cache_warm_{m}" for m in PRE_MARKET_SCHEDULES}
+        func, cron_expr, timezone, kwargs = scheduler.jobs["cache_warm_HK"]
+        assert timezone == "Asia/Hong_Kong"
+        assert kwargs == {"kwargs": {"market_type": "HK"}}
+        assert func == warmer.warm
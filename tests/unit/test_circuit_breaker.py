@@ -0,0 +1,180 @@
+# tests/unit/test_circuit_breaker.py
+# 适配器熔断器测试套件 - CB-001 至 CB-007
+
+from datetime import date
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from pstds.data.adapters.akshare_adapter import AKShareAdapter
+from pstds.data.circuit_breaker import BreakerRegistry, CircuitBreaker
+from pstds.data.fallback import FallbackManager, LatencyTracker
+from pstds.data.router import DataRouter
+from pstds.temporal.context import TemporalContext
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FlakyAdapter:
+    def __init__(self, name, fail=False):
+        self.name = name
+        self.fail = fail
+        self.calls = 0
+
+    def get_ohlcv(self, symbol, start_date, end_date, interval, ctx):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("timeout")
+        return pd.DataFrame({"close": [1.0], "data_source": [self.name]})
+
+    def get_news(self, symbol, days_back, ctx):
+        return []
+
+
+@pytest.fixture
+def ctx():
+    return TemporalContext.for_live(date(2024, 1, 2))
+
+
+def _fetch(manager, ctx):
+    return manager.get_ohlcv("000001", date(2024, 1, 1), date(2024, 1, 2), "1d", ctx)
+
+
+class TestCircuitBreaker:
+    """CB-001 至 CB-007: 熔断状态机、健康排序与事件"""
+
+    def test_cb001_opens_on_failure_rate(self):
+        """CB-001: 滚动窗口失败率超过阈值时熔断，open 期间拒绝调用"""
+        clock = FakeClock()
+        breaker = CircuitBreaker("akshare", min_calls=4, failure_threshold=0.5, clock=clock)
+
+        for failed in (False, True, False, True):
+            assert breaker.allow()
+            breaker.record(0.1, failed=failed)
+
+        assert breaker.state == "open"
+        assert not breaker.allow()
+        assert breaker.rejected == 1
+        assert breaker.health() == 0.0
+
+    def test_cb002_half_open_probe(self):
+        """CB-002: open 到期后转为 half_open 放行一个探测，成功则恢复 closed，失败则重新 open"""
+        clock = FakeClock()
+        breaker = CircuitBreaker("akshare", min_calls=2, open_seconds=30, clock=clock)
+        breaker.record(0.1, failed=True)
+        breaker.record(0.1, failed=True)
+
+        clock.now += 30
+        assert breaker.state == "half_open"
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record(0.1, failed=True)
+        assert breaker.state == "open"
+
+        clock.now += 30
+        assert breaker.allow()
+        breaker.record(0.1, failed=False)
+        assert breaker.state == "closed"
+        assert breaker.health() == 1.0
+
+    def test_cb003_slow_calls_trip(self):
+        """CB-003: 慢调用率超过阈值同样熔断"""
+        breaker = CircuitBreaker(
+            "alpha_vantage", min_calls=3, slow_call_seconds=5.0, slow_call_threshold=0.6, clock=FakeClock(),
+        )
+
+        breaker.record(6.0, failed=False)
+        assert breaker.health() == 1.0  # 样本不足 min_calls
+        breaker.record(1.0, failed=False)
+        breaker.record(1.0, failed=False)
+        assert breaker.health() == pytest.approx(1 - 1 / 6)
+        assert breaker.state == "closed"
+
+        breaker.record(7.0, failed=False)
+        breaker.record(8.0, failed=False)
+
+        assert breaker.state == "open"
+
+    def test_cb004_open_adapter_skipped_and_reordered(self, ctx):
+        """CB-004: 熔断的主源被跳过且排到最后，备用源直接提供数据并记为降级"""
+        registry = BreakerRegistry(min_calls=2, clock=FakeClock())
+        primary = FlakyAdapter("akshare", fail=True)
+        fallback = FlakyAdapter("local_csv")
+
+        for _ in range(2):
+            manager = FallbackManager([primary], [fallback], breakers=registry, latency_tracker=LatencyTracker())
+            _fetch(manager, ctx)
+        assert registry.get("akshare").state == "open"
+
+        manager = FallbackManager([primary], [fallback], breakers=registry, latency_tracker=LatencyTracker())
+        assert [a.name for a, _ in manager._candidates()] == ["local_csv", "akshare"]
+        result = _fetch(manager, ctx)
+
+        assert primary.calls == 2
+        assert result["data_source"][0] == "local_csv"
+        assert manager.get_report().fallbacks_used == ["local_csv"]
+
+    def test_cb005_events_metrics_and_shared_state(self):
+        """CB-005: 状态变更发布事件并计数；不同 DataRouter 共享同一注册表"""
+        registry = BreakerRegistry(min_calls=1, open_seconds=0, clock=FakeClock())
+        seen = []
+        registry.subscribe(seen.append)
+
+        breaker = registry.get("yfinance")
+        breaker.record(0.1, failed=True)
+        breaker.allow()
+        breaker.record(0.1, failed=False)
+
+        assert [(e.from_state, e.to_state) for e in seen] == [
+            ("closed", "open"), ("open", "half_open"), ("half_open", "closed"),
+        ]
+        assert [e["to_state"] for e in registry.get_events()] == ["open", "half_open", "closed"]
+        metrics = registry.get_metrics()["yfinance"]
+        assert metrics["state"] == "closed"
+        assert metrics["transitions"] == {"open": 1, "half_open": 1, "closed": 1}
+
+        first = DataRouter().get_fallback_manager("AAPL")
+        second = DataRouter().get_fallback_manager("AAPL")
+        assert first.breakers is second.breakers
+
+    def test_cb006_adapter_swallowing_errors_trips_breaker(self, ctx):
+        """CB-006: 真实适配器内部捕获供应商异常返回空结果时，同样计为失败并熔断（顺序与对冲路径）"""
+        adapter = AKShareAdapter()
+
+        with patch("akshare.stock_zh_a_hist", side_effect=ConnectionError("reset by peer")):
+            for hedge in (False, True):
+                registry = BreakerRegistry(min_calls=5, clock=FakeClock())
+                for _ in range(5):
+                    manager = FallbackManager(
+                        [adapter], [], hedge=hedge, breakers=registry, latency_tracker=LatencyTracker()
+                    )
+                    assert _fetch(manager, ctx) is None
+
+                metrics = registry.get_metrics()["akshare"]
+                assert metrics["state"] == "open"
+                assert metrics["health"] == 0.0
+                assert metrics["failure_rate"] == 1.0
+
+    def test_cb007_empty_news_does_not_block_ohlcv(self, ctx):
+        """CB-007: 无新闻的空列表是正常结果，不计为失败，不影响同一适配器的行情请求（顺序与对冲路径）"""
+        for hedge in (False, True):
+            registry = BreakerRegistry(min_calls=5, clock=FakeClock())
+            primary, fallback = FlakyAdapter("yfinance"), FlakyAdapter("local_csv")
+            for _ in range(5):
+                manager = FallbackManager(
+                    [primary], [fallback], hedge=hedge, breakers=registry, latency_tracker=LatencyTracker()
+                )
+                assert manager.get_news("NONEWS", 7, ctx) == []
+
+            assert registry.get_metrics()["yfinance"]["state"] == "closed"
+            assert registry.get_metrics()["local_csv"]["failure_rate"] == 0.0
+            manager = FallbackManager([primary], [fallback], hedge=hedge, breakers=registry, latency_tracker=LatencyTracker())
+            assert _fetch(manager, ctx)["data_source"][0] == "yfinance"
+            assert primary.calls == 1
@@ -0,0 +1,201 @@
+# tests/unit/test_decision_cache.py
+# 决策缓存测试套件 - DC-001 至 DC-008
+
+import sys
+import types
+from datetime import date, datetime, UTC
+
+import pandas as pd
+import pytest
+
+from pstds.agents.debate_referee import DebateQualityReport
+from pstds.agents.decision_cache import DecisionCache
+from pstds.agents.output_schemas import TradeDecision, DataSource
+from pstds.data.cache import CacheManager
+
+
+def _decision(action="BUY", insufficient_data=False):
+    return TradeDecision(
+        action=action,
+        confidence=0.7,
+        conviction="MEDIUM",
+        primary_reason="技术面突破",
+        insufficient_data=insufficient_data,
+        time_horizon="1-4 weeks",
+        risk_factors=["市场波动"],
+        data_sources=[
+            DataSource(
+                name="market_report",
+                data_timestamp=datetime(2024, 1, 2, tzinfo=UTC),
+                market_type="US",
+                fetched_at=datetime(2024, 1, 2, 9, tzinfo=UTC),
+            )
+        ],
+        analysis_date=date(2024, 1, 2),
+        analysis_timestamp=datetime(2024, 1, 2, 10, tzinfo=UTC),
+        volatility_adjustment=1.0,
+        debate_quality_score=7.5,
+        symbol="AAPL",
+        market_type="US",
+    )
+
+
+def _fingerprint(**overrides):
+    params = {
+        "symbol": "AAPL",
+        "analysis_date": date(2024, 1, 2),
+        "depth": "L2",
+        "analysts": ["market", "news"],
+        "model_config": {"llm_provider": "ollama", "deep_think_llm": "qwen3:4b"},
+        "input_digest": "abc",
+    }
+    params.update(overrides)
+    return DecisionCache.fingerprint(**params)
+
+
+@pytest.fixture
+def decision_cache(tmp_path):
+    manager = CacheManager(
+        db_path=str(tmp_path / "cache.db"),
+        parquet_dir=str(tmp_path / "parquet"),
+        news_dir=str(tmp_path / "news"),
+    )
+    yield DecisionCache(manager)
+    manager.close()
+
+
+class TestFingerprint:
+    """DC-001 至 DC-003、DC-007: 输入指纹"""
+
+    def test_dc001_fingerprint_deterministic(self):
+        """DC-001: 相同输入指纹一致，分析师顺序与无关配置项不影响指纹"""
+        a = _fingerprint()
+        b = _fingerprint(
+            analysts=["news", "market"],
+            model_config={"deep_think_llm": "qwen3:4b", "llm_provider": "ollama", "results_dir": "/tmp"},
+        )
+        assert a == b
+        assert a.startswith("sha256:")
+
+    def test_dc002_fingerprint_sensitive_to_inputs(self):
+        """DC-002: 日期、深度、模型或输入数据变化均产生新指纹"""
+        base = _fingerprint()
+        assert _fingerprint(analysis_date=date(2024, 1, 3)) != base
+        assert _fingerprint(depth="L3") != base
+        assert _fingerprint(model_config={"llm_provider": "ollama", "deep_think_llm": "qwen3:8b"}) != base
+        assert _fingerprint(input_digest="abd") != base
+
+    def test_dc003_digest_ignores_retrieval_timestamp(self):
+        """DC-003: 数据摘要忽略抓取时间行，但对数据内容敏感"""
+        a = "# Stock data\n# Data retrieved on: 2024-01-02 10:00:00\n\nclose,1.0\n"
+        b = "# Stock data\n# Data retrieved on: 2024-01-05 18:30:00\n\nclose,1.0\n"
+        c = "# Stock data\n# Data retrieved on: 2024-01-05 18:30:00\n\nclose,1.1\n"
+        assert DecisionCache.digest_inputs(a) == DecisionCache.digest_inputs(b)
+        assert DecisionCache.digest_inputs(a) != DecisionCache.digest_inputs(c)
+
+        df = pd.DataFrame({"close": [1.0, 2.0]})
+        assert DecisionCache.digest_inputs(df) == DecisionCache.digest_inputs(df.copy())
+        assert DecisionCache.digest_inputs(df) != DecisionCache.digest_inputs(df.assign(close=[1.0, 2.5]))
+
+    def test_dc007_debate_threshold_in_fingerprint(self):
+        """DC-007: 辩论质量阈值不同（5.0 vs 9.0）时指纹不同，严格门槛不复用宽松门槛的决策"""
+        config = {"llm_provider": "ollama", "deep_think_llm": "qwen3:4b"}
+        loose = _fingerprint(model_config={**config, "min_debate_quality_score": 5.0})
+        strict = _fingerprint(model_config={**config, "min_debate_quality_score": 9.0})
+
+        assert loose != strict
+        assert loose == _fingerprint(model_config={**config, "min_debate_quality_score": 5.0})
+
+
+class TestDecisionCacheStore:
+    """DC-004 至 DC-006: 读写与命中率统计"""
+
+    def test_dc004_round_trip(self, decision_cache):
+        """DC-004: 写入后命中，还原为 TradeDecision 与 DebateQualityReport"""
+        fp = _fingerprint()
+        assert decision_cache.lookup(fp) is None
+
+        report = DebateQualityReport(overall_score=6.0)
+        assert decision_cache.store(fp, _decision(), report, {"estimated_tokens": 10})
+
+        cached = decision_cache.lookup(fp)
+        assert isinstance(cached["final_trade_decision"], TradeDecision)
+        assert cached["final_trade_decision"].action == "BUY"
+        assert cached["debate_quality_report"].overall_score == 6.0
+        assert cached["cost_estimate"] == {"estimated_tokens": 10}
+
+    def test_dc005_insufficient_data_not_cached(self, decision_cache):
+        """DC-005: 数据不足的决策不写入缓存"""
+        fp = _fingerprint()
+        assert not decision_cache.store(fp, _decision("INSUFFICIENT_DATA", insufficient_data=True))
+        assert decision_cache.lookup(fp) is None
+
+    def test_dc006_hit_rate_stats(self, decision_cache):
+        """DC-006: 统计命中、未命中、绕过与刷新次数"""
+        fp = _fingerprint()
+        decision_cache.lookup(fp)
+        decision_cache.store(fp, _decision())
+        decision_cache.lookup(fp)
+        decision_cache.lookup(fp)
+        decision_cache.record_bypass()
+        decision_cache.record_refresh()
+
+        stats = decision_cache.get_stats()
+        assert stats["lookups"] == 3
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(2 / 3)
+        assert stats["bypassed"] == 1
+        assert stats["refreshed"] == 1
+        assert stats["stores"] == 1
+
+
+class TestDecisionCacheWiring:
+    """DC-008: 按配置启用全局决策缓存并传入回测使用的分析图"""
+
+    def test_dc008_runner_builds_graph_with_configured_cache(self, tmp_path, monkeypatch):
+        """DC-008: analysis.decision_cache 开启时回测运行器以全局决策缓存构建图，关闭时不启用"""
+        import pstds.agents.decision_cache as decision_cache_module
+        import pstds.config as config_module
+        import pstds.data.cache as cache_module
+        from pstds.backtest.runner import BacktestRunner
+
+        manager = CacheManager(
+            db_path=str(tmp_path / "cache.db"),
+            parquet_dir=str(tmp_path / "parquet"),
+            news_dir=str(tmp_path / "news"),
+        )
+        monkeypatch.setattr(cache_module, "_global_cache", manager)
+        monkeypatch.setattr(decision_cache_module, "_global_decision_cache", None)
+        config = config_module.Config()
+        monkeypatch.setattr(config_module, "_global_config", config)
+
+        built = []
+
+        class RecordingGraph:
+            """替代依赖 LangGraph 的 ExtendedTradingAgentsGraph，只记录构造参数"""
+
+            def __init__(self, decision_cache=None, **kwargs):
+                built.append(decision_cache)
+
+            def propagate(self, symbol, trade_date, ctx, depth="L2"):
+                return {"final_trade_decision": _decision("HOLD")}
+
+        graph_module = types.ModuleType("pstds.agents.extended_graph")
+        graph_module.ExtendedTradingAgentsGraph = RecordingGraph
+        monkeypatch.setitem(sys.modules, "pstds.agents.extended_graph", graph_module)
+
+        days = [date(2024, 1, 2), date(2024, 1, 3)]
+        runner = BacktestRunner(save_snapshots=False)
+        monkeypatch.setattr(runner.calendar, "get_trading_days", lambda start, end, market_type: days)
+        monkeypatch.setattr(runner, "_get_real_prices", lambda symbol, dates, market_type: {d: 10.0 for d in dates})
+        try:
+            runner.run("AAPL", days[0], days[-1])
+            config._config["analysis"]["decision_cache"] = False
+            runner.run("AAPL", days[0], days[-1])
+        finally:
+            manager.close()
+
+        assert isinstance(built[0], DecisionCache)
+        assert built[0].cache is manager
+        assert built[1] is None
@@ -0,0 +1,144 @@
+# tests/unit/test_fallback_hedge.py
+# 对冲请求测试套件 - HF-001 至 HF-006
+
+import threading
+import time
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from pstds.data.fallback import DataQualityReport, FallbackManager, LatencyTracker
+from pstds.data.router import DataRouter
+from pstds.temporal.context import TemporalContext
+
+
+class TimedAdapter:
+    """延迟 delay 秒后返回数据或抛出异常"""
+
+    def __init__(self, name, delay=0.0, rows=1, error=None):
+        self.name = name
+        self.delay = delay
+        self.rows = rows
+        self.error = error
+        self.calls = 0
+        self.finished = threading.Event()
+
+    def get_ohlcv(self, symbol, start_date, end_date, interval, ctx):
+        self.calls += 1
+        time.sleep(self.delay)
+        self.finished.set()
+        if self.error:
+            raise self.error
+        return pd.DataFrame({"close": [100.0] * self.rows, "data_source": [self.name] * self.rows})
+
+    def get_news(self, symbol, days_back, ctx):
+        self.calls += 1
+        time.sleep(self.delay)
+        return [self.name] * self.rows
+
+
+@pytest.fixture
+def ctx():
+    return TemporalContext.for_live(date(2024, 1, 2))
+
+
+def _fetch(manager, ctx):
+    return manager.get_ohlcv("AAPL", date(2024, 1, 1), date(2024, 1, 2), "1d", ctx)
+
+
+class TestHedgedFallback:
+    """HF-001 至 HF-006: 对冲请求与总时限"""
+
+    def test_hf001_slow_primary_hedged(self, ctx):
+        """HF-001: 主源超过对冲阈值未返回时并行请求备用源，备用源胜出并记录"""
+        primary = TimedAdapter("yfinance", delay=1.0)
+        fallback = TimedAdapter("local_csv", delay=0.0)
+        manager = FallbackManager(
+            [primary], [fallback], hedge=True, hedge_delay=0.05, latency_tracker=LatencyTracker(),
+        )
+
+        start = time.monotonic()
+        result = _fetch(manager, ctx)
+
+        assert time.monotonic() - start < 0.5
+        assert result["data_source"][0] == "local_csv"
+        assert manager.get_report().fallbacks_used == ["local_csv"]
+        assert manager.get_report().sources == {"ohlcv": "local_csv"}
+
+    def test_hf002_fast_primary_no_hedge(self, ctx):
+        """HF-002: 主源在阈值内返回时不发起备用请求"""
+        primary = TimedAdapter("yfinance", delay=0.0)
+        fallback = TimedAdapter("local_csv")
+        manager = FallbackManager(
+            [primary], [fallback], hedge=True, hedge_delay=0.5, latency_tracker=LatencyTracker(),
+        )
+
+        result = _fetch(manager, ctx)
+
+        assert result["data_source"][0] == "yfinance"
+        assert fallback.calls == 0
+        assert manager.get_report().fallbacks_used == []
+        assert manager.get_report().sources == {"ohlcv": "yfinance"}
+
+    def test_hf003_threshold_from_latency_percentile(self, ctx):
+        """HF-003: 有足够延迟样本时按分位数计算对冲阈值"""
+        tracker = LatencyTracker()
+        for _ in range(20):
+            tracker.record("yfinance", 0.02)
+        primary = TimedAdapter("yfinance", delay=0.5)
+        fallback = TimedAdapter("local_csv")
+        manager = FallbackManager(
+            [primary], [fallback], hedge=True, hedge_delay=10.0, latency_tracker=tracker,
+        )
+
+        start = time.monotonic()
+        result = _fetch(manager, ctx)
+
+        assert time.monotonic() - start < 0.4
+        assert result["data_source"][0] == "local_csv"
+        assert tracker.percentile("yfinance", 0.95) == pytest.approx(0.02)
+
+    def test_hf004_empty_or_failed_result_falls_through(self, ctx):
+        """HF-004: 主源报错或返回空数据时立即尝试下一个适配器"""
+        failing = TimedAdapter("akshare", error=RuntimeError("down"))
+        empty = TimedAdapter("yfinance", rows=0)
+        fallback = TimedAdapter("local_csv")
+        report = DataQualityReport()
+        manager = FallbackManager(
+            [failing], [empty, fallback], report=report,
+            hedge=True, hedge_delay=5.0, latency_tracker=LatencyTracker(),
+        )
+
+        start = time.monotonic()
+        result = _fetch(manager, ctx)
+
+        assert time.monotonic() - start < 1.0
+        assert result["data_source"][0] == "local_csv"
+        assert report.fallbacks_used == ["local_csv"]
+
+    def test_hf005_deadline_bounds_call(self, ctx):
+        """HF-005: 超过总时限时返回空结果，不等待慢请求"""
+        slow = TimedAdapter("yfinance", delay=1.0)
+        manager = FallbackManager(
+            [slow], [], hedge=False, deadline=0.1, latency_tracker=LatencyTracker(),
+        )
+
+        start = time.monotonic()
+        ohlcv = _fetch(manager, ctx)
+        news = manager.get_news("AAPL", 7, ctx)
+
+        assert time.monotonic() - start < 0.5
+        assert ohlcv is None
+        assert news == []
+        assert not slow.finished.is_set()
+
+    def test_hf006_router_hedging_opt_in(self):
+        """HF-006: DataRouter 默认不对冲、不限时；通过配置显式开启"""
+        default = DataRouter().get_fallback_manager("AAPL")
+        assert default.hedge is False
+        assert default.deadline is None
+
+        opted_in = DataRouter({"hedge_requests": True, "fetch_deadline": 30.0}).get_fallback_manager("AAPL")
+        assert opted_in.hedge is True
+        assert opted_in.deadline == 30.0
@@ -0,0 +1,91 @@
+# tests/unit/test_import_time.py
+# 导入开销测试套件 - IT-001 至 IT-004
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# 只应在首次使用时加载的重量级依赖
+HEAVY_MODULES = (
+    "akshare",
+    "yfinance",
+    "pandas_market_calendars",
+    "openai",
+    "anthropic",
+    "google.generativeai",
+    "dashscope",
+    "langchain_core",
+    "langgraph",
+)
+
+# 单个入口模块的累计导入耗时上限（秒）；pandas / pydantic 仍为急切导入，预算留有余量
+IMPORT_BUDGET_SECONDS = 3.0
+
+
+def _import_in_subprocess(module):
+    """在全新解释器中导入模块，返回 (累计导入耗时秒数, 已加载的重量级依赖)"""
+    code = (
+        "import json, sys\n"
+        f"import {module}\n"
+        f"print(json.dumps([m for m in {list(HEAVY_MODULES)!r} if m in sys.modules]))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+
+    cumulative = 0
+    for line in proc.stderr.splitlines():
+        # 格式: "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            cumulative = int(parts[1].strip())
+    return cumulative / 1e6, json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+class TestImportTime:
+    """IT-001 至 IT-004: 入口模块不急切加载 SDK，导入耗时在预算内"""
+
+    @pytest.mark.parametrize("module", [
+        "pstds.data.router",
+        "pstds.data.adapters",
+        "pstds.data.adapters.registry",
+        "pstds.scheduler.cache_warmer",
+        "pstds.scheduler.scheduler",
+    ])
+    def test_it001_data_layer_defers_vendor_sdks(self, module):
+        """IT-001: 导入数据层与调度器不加载 akshare / yfinance 等供应商 SDK"""
+        seconds, heavy = _import_in_subprocess(module)
+        assert heavy == []
+        assert 0 < seconds < IMPORT_BUDGET_SECONDS
+
+    def test_it002_calendar_and_llm_factory(self):
+        """IT-002: 交易日历与 LLM 工厂导入时不加载日历库与各家 LLM SDK"""
+        for module in ("pstds.backtest.calendar", "pstds.llm.factory"):
+            seconds, heavy = _import_in_subprocess(module)
+            assert heavy == [], module
+            assert seconds < IMPORT_BUDGET_SECONDS, module
+
+    def test_it003_backtest_runner_defers_graph(self):
+        """IT-003: 导入回测执行器不加载 langchain / langgraph（仅 LLM 决策时才需要）"""
+        _, heavy = _import_in_subprocess("pstds.backtest.runner")
+        assert heavy == []
+        _, heavy = _import_in_subprocess("tradingagents.graph")
+        assert heavy == []
+
+    def test_it004_lazy_exports_resolve_on_access(self):
+        """IT-004: 延迟导出名在访问时解析并写回包命名空间；未知名称抛出 AttributeError"""
+        import pstds.data.adapters as adapters
+        from pstds.data.adapters.local_csv_adapter import LocalCSVAdapter
+
+        assert "LocalCSVAdapter" in dir(adapters)
+        assert adapters.LocalCSVAdapter is LocalCSVAdapter
+        assert vars(adapters)["LocalCSVAdapter"] is LocalCSVAdapter
+        with pytest.raises(AttributeError):
+            adapters.NoSuchAdapter
@@ -0,0 +1,196 @@
+# tests/unit/test_incremental_fetch.py
+# 增量行情获取测试套件 - IF-001 至 IF-008
+
+import threading
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from pstds.data.cache import CacheManager
+from pstds.data.incremental import IncrementalOHLCVFetcher
+from pstds.data.router import DataRouter
+from pstds.temporal.context import TemporalContext
+
+
+class FakeCalendar:
+    """以工作日为交易日，可指定休市日"""
+
+    def __init__(self, holidays=()):
+        self.holidays = set(holidays)
+
+    def is_available(self, market_type="US"):
+        return True
+
+    def get_trading_days(self, start_date, end_date, market_type="US"):
+        return [
+            ts.date() for ts in pd.bdate_range(start_date, end_date)
+            if ts.date() not in self.holidays
+        ]
+
+
+class FakeFallbackManager:
+    """记录请求区间，按工作日生成行情，可指定缺失日期"""
+
+    def __init__(self, missing=()):
+        self.calls = []
+        self.missing = set(missing)
+
+    def get_ohlcv(self, symbol, start_date, end_date, interval, ctx):
+        self.calls.append((start_date, end_date))
+        days = [d for d in pd.bdate_range(start_date, end_date) if d.date() not in self.missing]
+        n = len(days)
+        return pd.DataFrame({
+            "date": pd.DatetimeIndex(days, tz="UTC"),
+            "open": [10.0] * n,
+            "high": [11.0] * n,
+            "low": [9.0] * n,
+            "close": [10.5] * n,
+            "volume": [1000] * n,
+            "adj_close": [10.5] * n,
+            "data_source": ["fake"] * n,
+        })
+
+
+@pytest.fixture
+def cache(tmp_path):
+    manager = CacheManager(
+        db_path=str(tmp_path / "cache.db"),
+        parquet_dir=str(tmp_path / "parquet"),
+        news_dir=str(tmp_path / "news"),
+    )
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def ctx():
+    return TemporalContext.for_backtest(date(2024, 3, 1))
+
+
+class TestIncrementalFetch:
+    """IF-001 至 IF-008: 只拉取缺失区间，DataRouter 与回测取价经同一缓存路径"""
+
+    def test_if001_cold_fetch_records_coverage(self, cache, ctx):
+        """IF-001: 首次请求全量拉取并记录覆盖区间"""
+        fetcher = IncrementalOHLCVFetcher(cache, calendar=FakeCalendar())
+        fm = FakeFallbackManager()
+
+        df = fetcher.get_ohlcv("AAPL", date(2024, 1, 1), date(2024, 1, 31), "1d", ctx, fallback_manager=fm)
+
+        assert fm.calls == [(date(2024, 1, 1), date(2024, 1, 31))]
+        assert len(df) == 23
+        assert cache.get_ohlcv_coverage("AAPL", "1d") == [(date(2024, 1, 1), date(2024, 1, 31))]
+
+    def test_if002_extension_fetches_only_tail(self, cache, ctx):
+        """IF-002: 窗口后移只拉取新增部分"""
+        fetcher = IncrementalOHLCVFetcher(cache, calendar=FakeCalendar())
+        fm = FakeFallbackManager()
+        fetcher.get_ohlcv("AAPL", date(2024, 1, 1), date(2024, 1, 31), "1d", ctx, fallback_manager=fm)
+
+        df = fetcher.get_ohlcv("AAPL", date(2024, 1, 2), date(2024, 2, 2), "1d", ctx, fallback_manager=fm)
+
+        assert fm.calls[1:] == [(date(2024, 2, 1), date(2024, 2, 2))]
+        assert len(df) == 24
+        assert fetcher.get_stats()["bars_fetched"] == 25
+
+    def test_if003_full_hit_no_fetch(self, cache, ctx):
+        """IF-003: 已完整覆盖时不发起请求"""
+        fetcher = IncrementalOHLCVFetcher(cache, calendar=FakeCalendar())
+        fm = FakeFallbackManager()
+        fetcher.get_ohlcv("AAPL", date(2024, 1, 1), date(2024, 1, 31), "1d", ctx, fallback_manager=fm)
+
+        fetcher.get_ohlcv("AAPL", date(2024, 1, 8), date(2024, 1, 19), "1d", ctx, fallback_manager=fm)
+
+        assert len(fm.calls) == 1
+        assert fetcher.get_stats()["full_hits"] == 1
+
+    def test_if004_weekend_gap_skipped(self, cache, ctx):
+        """IF-004: 缺口内无交易日时不请求"""
+        fetcher = IncrementalOHLCVFetcher(cache, calendar=FakeCalendar())
+        fm = FakeFallbackManager()
+        fetcher.get_ohlcv("AAPL", date(2024, 1, 1), date(2024, 1, 5), "1d", ctx, fallback_manager=fm)
+
+        fetcher.get_ohlcv("AAPL", date(2024, 1, 1), date(2024, 1, 7), "1d", ctx, fallback_manager=fm)
+
+        assert len(fm.calls) == 1
+        assert cache.missing_ohlcv_ranges("AAPL", "1d", date(2024, 1, 1), date(2024, 1, 7)) == []
+
+    def test_if005_missing_trading_day_left_as_gap(self, cache, ctx):
+        """IF-005: 返回数据缺少交易日时该日保留为缺口"""
+        fetcher = IncrementalOHLCVFetcher(cache, calendar=FakeCalendar())
+        fm = FakeFallbackManager(missing={date(2024, 1, 10)})
+
+        fetcher.get_ohlcv("AAPL", date(2024, 1, 8), date(2024, 1, 12), "1d", ctx, fallback_manager=fm)
+
+        assert cache.missing_ohlcv_ranges("AAPL", "1d", date(2024, 1, 8), date(2024, 1, 12)) == [
+            (date(2024, 1, 10), date(2024, 1, 10))
+        ]
+
+    def test_if006_router_and_backtest_use_cache(self, cache, ctx, monkeypatch):
+        """IF-006: 配置 cache 的 DataRouter.get_ohlcv 与回测取价只拉取缺失区间；未配置时透传完整区间"""
+        from pstds.backtest.runner import BacktestRunner
+
+        fm = FakeFallbackManager()
+        router = DataRouter({"singleflight": False}, cache=cache)
+        router.ohlcv_fetcher._calendar = FakeCalendar()
+        monkeypatch.setattr(router, "get_fallback_manager", lambda symbol, quality_report=None: fm)
+
+        router.get_ohlcv("AAPL", date(2024, 1, 1), date(2024, 1, 31), "1d", ctx)
+        df = router.get_ohlcv("AAPL", date(2024, 1, 2), date(2024, 2, 2), "1d", ctx)
+        prices = BacktestRunner(router=router, save_snapshots=False)._get_real_prices(
+            "AAPL", [date(2024, 1, 8), date(2024, 2, 2)], "US"
+        )
+
+        assert fm.calls == [(date(2024, 1, 1), date(2024, 1, 31)), (date(2024, 2, 1), date(2024, 2, 2))]
+        assert len(df) == 24
+        assert len(prices) == 20
+        assert router.ohlcv_fetcher.get_stats()["full_hits"] == 1
+
+        uncached = DataRouter({"singleflight": False})
+        monkeypatch.setattr(uncached, "get_fallback_manager", lambda symbol, quality_report=None: fm)
+        uncached.get_ohlcv("AAPL", date(2024, 1, 2), date(2024, 2, 2), "1d", ctx)
+        assert fm.calls[-1] == (date(2024, 1, 2), date(2024, 2, 2))
+
+    def test_if007_stats_consistent_across_threads(self, cache, ctx):
+        """IF-007: 多线程并发请求时统计计数不丢失"""
+        fetcher = IncrementalOHLCVFetcher(cache, calendar=FakeCalendar())
+        fm = FakeFallbackManager()
+        fetcher.get_ohlcv("AAPL", date(2024, 1, 1), date(2024, 1, 31), "1d", ctx, fallback_manager=fm)
+
+        def worker():
+            for _ in range(25):
+                fetcher.get_ohlcv("AAPL", date(2024, 1, 8), date(2024, 1, 19), "1d", ctx, fallback_manager=fm)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = fetcher.get_stats()
+        assert stats["requests"] == 201
+        assert stats["full_hits"] == 200
+        assert len(fm.calls) == 1
+
+    def test_if008_clear_expired_trims_coverage(self, cache, ctx):
+        """IF-008: 清除过期行情只扣除对应日期跨度的覆盖区间，其余区间保留"""
+        fetcher = IncrementalOHLCVFetcher(cache, calendar=FakeCalendar())
+        fm = FakeFallbackManager()
+        for symbol in ("AAPL", "MSFT"):
+            fetcher.get_ohlcv(symbol, date(2024, 1, 1), date(2024, 1, 31), "1d", ctx, fallback_manager=fm)
+        with cache._connection() as conn:
+            conn.execute(
+                "UPDATE ohlcv_cache SET expires_at = 0 WHERE symbol = 'AAPL' AND date BETWEEN ? AND ?",
+                ("2024-01-10", "2024-01-13"),
+            )
+
+        assert cache.clear_expired() == 3
+        assert cache.get_ohlcv_coverage("AAPL", "1d") == [
+            (date(2024, 1, 1), date(2024, 1, 9)),
+            (date(2024, 1, 13), date(2024, 1, 31)),
+        ]
+        assert cache.get_ohlcv_coverage("MSFT", "1d") == [(date(2024, 1, 1), date(2024, 1, 31))]
+        assert cache.missing_ohlcv_ranges("AAPL", "1d", date(2024, 1, 1), date(2024, 1, 31)) == [
+            (date(2024, 1, 10), date(2024, 1, 12)),
+        ]
@@ -0,0 +1,109 @@
+# tests/unit/test_indicator_kernels.py
+# NumPy 指标内核测试套件 - IK-001 至 IK-004
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows import indicator_kernels
+from tradingagents.dataflows.indicator_kernels import IndicatorStream, compute_arrays
+
+ALL_INDICATORS = [
+    "close_50_sma", "close_200_sma", "close_10_ema",
+    "macd", "macds", "macdh", "rsi",
+    "boll", "boll_ub", "boll_lb", "atr", "vwma", "mfi",
+]
+
+
+def _history(n_bars=10_000, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n_bars))
+    spread = rng.uniform(0.1, 2.0, n_bars)
+    return pd.DataFrame({
+        "date": pd.bdate_range("1985-01-01", periods=n_bars),
+        "open": close + rng.normal(0, 0.5, n_bars),
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.integers(1_000, 50_000, n_bars).astype(float),
+    })
+
+
+@pytest.fixture(scope="module")
+def history():
+    return _history()
+
+
+def _stockstats(history, indicators):
+    from stockstats import wrap
+
+    stats = wrap(history.copy())
+    return {name: stats[name].to_numpy() for name in indicators}
+
+
+class TestIndicatorKernels:
+    """IK-001 至 IK-004: 与 stockstats 数值一致、缺失值处理、流式更新与耗时"""
+
+    def test_ik001_matches_stockstats(self, history):
+        """IK-001: 10k 根 K 线上全部支持的指标与 stockstats 一致；不支持的名称报错"""
+        assert all(indicator_kernels.is_supported(name) for name in ALL_INDICATORS)
+        ours = compute_arrays(history, ALL_INDICATORS)
+        reference = _stockstats(history, ALL_INDICATORS)
+
+        for name in ALL_INDICATORS:
+            np.testing.assert_allclose(ours[name], reference[name], rtol=1e-9, atol=1e-9, err_msg=name)
+        assert not indicator_kernels.is_supported("stochrsi")
+        with pytest.raises(ValueError, match="stochrsi"):
+            compute_arrays(history, ["rsi", "stochrsi"])
+
+    def test_ik002_nan_and_short_series(self):
+        """IK-002: 含缺失值与短序列时与 pandas rolling/ewm 语义一致"""
+        values = np.array([1.0, np.nan, 3.0, 4.0, np.nan, np.nan, 7.0, 8.0, 9.0, 10.0])
+        series = pd.Series(values)
+
+        np.testing.assert_allclose(indicator_kernels.sma(values, 3), series.rolling(3, min_periods=1).mean())
+        np.testing.assert_allclose(indicator_kernels.sma(values, 3, min_periods=3), series.rolling(3).mean())
+        np.testing.assert_allclose(indicator_kernels.rolling_std(values, 3), series.rolling(3, min_periods=1).std())
+        np.testing.assert_allclose(indicator_kernels.ema(values, 4), series.ewm(span=4, adjust=True).mean())
+        np.testing.assert_allclose(indicator_kernels.smma(values, 4), series.ewm(alpha=0.25, adjust=True).mean())
+
+        short = _history(n_bars=5)
+        np.testing.assert_allclose(
+            compute_arrays(short, ["close_200_sma", "macd", "rsi"])["close_200_sma"],
+            short["close"].expanding().mean(),
+        )
+
+    def test_ik003_stream_matches_batch(self, history):
+        """IK-003: 预热后逐根更新得到的最新值与批量计算一致"""
+        head, tail = history.iloc[:2_000], history.iloc[2_000:2_050]
+        stream = IndicatorStream(ALL_INDICATORS)
+        stream.warmup(head)
+
+        for row in tail.itertuples(index=False):
+            latest = stream.update(high=row.high, low=row.low, close=row.close, volume=row.volume, open=row.open)
+
+        batch = compute_arrays(history.iloc[:2_050], ALL_INDICATORS)
+        for name in ALL_INDICATORS:
+            assert latest[name] == pytest.approx(batch[name][-1], rel=1e-9, abs=1e-9), name
+        with pytest.raises(ValueError, match="stochrsi"):
+            IndicatorStream(["stochrsi"])
+
+    def test_ik004_faster_than_stockstats(self, history):
+        """IK-004: 10k 根 K 线全部指标的计算耗时低于 stockstats"""
+
+        def best_of(fn, repeat=3):
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                fn()
+                timings.append(time.perf_counter() - start)
+            return min(timings)
+
+        kernels = best_of(lambda: compute_arrays(history, ALL_INDICATORS))
+        reference = best_of(lambda: _stockstats(history, ALL_INDICATORS))
+
+        print(f"\n{len(ALL_INDICATORS)} indicators x {len(history)} bars: "
+              f"kernels {kernels * 1e3:.1f}ms, stockstats {reference * 1e3:.1f}ms")
+        assert kernels < reference
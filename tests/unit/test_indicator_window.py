@@ -0,0 +1,134 @@
+# tests/unit/test_indicator_window.py
+# 多指标窗口测试套件 - IW-001 至 IW-005
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pstds.data.cache import CacheManager
+from pstds.data.indicators import IndicatorMaterializer
+from tradingagents.dataflows import stockstats_utils, y_finance
+
+EIGHT_INDICATORS = ["close_50_sma", "close_200_sma", "close_10_ema", "macd", "rsi", "boll_ub", "atr", "vwma"]
+
+
+def _history(n_bars=3000, seed=11):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n_bars))
+    return pd.DataFrame({
+        "Date": pd.bdate_range("2013-01-01", periods=n_bars),
+        "Open": close,
+        "High": close + 1.0,
+        "Low": close - 1.0,
+        "Close": close,
+        "Volume": rng.integers(1_000, 5_000, n_bars),
+    })
+
+
+@pytest.fixture
+def history(monkeypatch):
+    data = _history()
+    monkeypatch.setattr(y_finance, "load_stock_history", lambda symbol: data)
+    monkeypatch.setattr(y_finance, "_get_indicator_materializer", lambda: None)
+    monkeypatch.setattr(stockstats_utils, "_wrapped_cache", {})
+    return data
+
+
+def _window(indicator, curr_date="2024-06-10", look_back_days=30):
+    return y_finance.get_stock_stats_indicators_window("AAPL", indicator, curr_date, look_back_days)
+
+
+class TestIndicatorWindow:
+    """IW-001 至 IW-005: 一次计算多个指标、二分定位窗口、整体格式化、指标缓存配置"""
+
+    def test_iw001_single_indicator_format(self, history):
+        """IW-001: 逐日历日输出，非交易日标注，数值与 stockstats 一致"""
+        from stockstats import wrap
+
+        report = _window("rsi")
+        lines = report.splitlines()
+        reference = wrap(history.rename(columns=str.lower))["rsi"]
+
+        assert lines[0] == "## rsi values from 2024-05-11 to 2024-06-10:"
+        day, value = lines[2].split(": ")
+        assert day == "2024-06-10"
+        assert float(value) == pytest.approx(reference.loc["2024-06-10"], rel=1e-9)
+        assert lines[3] == "2024-06-09: N/A: Not a trading day (weekend or holiday)"
+        assert lines[2 + 30] == "2024-05-11: N/A: Not a trading day (weekend or holiday)"
+        assert lines[-1].startswith("RSI: Measures momentum")
+
+    def test_iw002_batch_equals_single_calls(self, history):
+        """IW-002: 逗号分隔的多指标调用等于逐个调用结果拼接；不支持的名称报错"""
+        batch = _window(",".join(EIGHT_INDICATORS))
+        singles = [_window(name) for name in EIGHT_INDICATORS]
+
+        assert batch == "\n\n".join(singles)
+        assert len(stockstats_utils._wrapped_cache) == 1
+        with pytest.raises(ValueError, match="stochrsi"):
+            _window("rsi, stochrsi")
+
+    def test_iw003_materializer_batch(self, history, tmp_path, monkeypatch):
+        """IW-003: 启用指标缓存时多指标只物化一次，输出与内存计算一致"""
+        expected = _window("close_200_sma,macd", curr_date="2013-03-01")
+        assert "2013-02-24: N/A: Not a trading day (weekend or holiday)\n" in expected
+
+        cache = CacheManager(
+            db_path=str(tmp_path / "cache.db"),
+            parquet_dir=str(tmp_path / "parquet"),
+            news_dir=str(tmp_path / "news"),
+        )
+        materializer = IndicatorMaterializer(cache)
+        monkeypatch.setattr(y_finance, "_get_indicator_materializer", lambda: materializer)
+        try:
+            assert _window("close_200_sma,macd", curr_date="2013-03-01") == expected
+            assert materializer.get_stats()["materializations"] == 1
+            assert materializer.get_stats()["queries"] == 1
+        finally:
+            cache.close()
+
+    def test_iw004_latency_one_vs_eight(self, history, monkeypatch):
+        """IW-004: 单次调用 8 个指标的耗时低于 8 次单指标调用之和（每次均为冷启动）"""
+
+        def cold_call(indicator):
+            # 每次换一份新的历史行情对象，不复用已包装的帧与已算好的指标列
+            monkeypatch.setattr(y_finance, "load_stock_history", lambda symbol: history.copy())
+            start = time.perf_counter()
+            _window(indicator)
+            return time.perf_counter() - start
+
+        cold_call("rsi")  # 预热导入
+        one = min(cold_call("rsi") for _ in range(3))
+        eight_separate = sum(min(cold_call(name) for _ in range(3)) for name in EIGHT_INDICATORS)
+        eight_batched = min(cold_call(",".join(EIGHT_INDICATORS)) for _ in range(3))
+
+        print(
+            f"\n1 indicator: {one * 1e3:.1f}ms"
+            f"\n8 indicators, 8 calls: {eight_separate * 1e3:.1f}ms"
+            f"\n8 indicators, 1 call: {eight_batched * 1e3:.1f}ms"
+        )
+        assert eight_batched < eight_separate
+
+    def test_iw005_indicator_cache_config(self, tmp_path, monkeypatch):
+        """IW-005: 指标缓存默认关闭；启用后位于 data_cache_dir 下，按历史来源区分缓存键"""
+        from pstds.data import indicators
+        from tradingagents.default_config import DEFAULT_CONFIG
+        from tradingagents.dataflows import config
+
+        assert DEFAULT_CONFIG["indicator_cache"] is False
+        monkeypatch.setattr(indicators, "_global_materializers", {})
+        monkeypatch.setattr(config, "_config", None)
+        try:
+            assert y_finance._get_indicator_materializer() is None
+
+            config.set_config({"indicator_cache": True, "data_cache_dir": str(tmp_path)})
+            materializer = y_finance._get_indicator_materializer()
+            assert materializer.cache.db_path == tmp_path / "pstds" / "cache.db"
+            assert y_finance.indicator_history_source() == "yfinance"
+
+            config.set_config({"data_vendors": {**DEFAULT_CONFIG["data_vendors"], "technical_indicators": "local"}})
+            assert y_finance.indicator_history_source() == "local"
+        finally:
+            for materializer in indicators._global_materializers.values():
+                materializer.cache.close()
@@ -0,0 +1,153 @@
+# tests/unit/test_indicators.py
+# 技术指标物化测试套件 - TI-001 至 TI-007
+
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pstds.data.cache import CacheManager
+from pstds.data import indicators
+from pstds.data.indicators import IndicatorMaterializer, SUPPORTED_INDICATORS, compute_indicators
+from pstds.temporal.context import TemporalContext
+
+
+def _history(n_bars=260, start="2023-01-02", seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n_bars))
+    return pd.DataFrame({
+        "Date": pd.bdate_range(start, periods=n_bars),
+        "Open": close + rng.normal(0, 0.5, n_bars),
+        "High": close + 1.0,
+        "Low": close - 1.0,
+        "Close": close,
+        "Volume": rng.integers(1_000, 5_000, n_bars),
+    })
+
+
+class CountingLoader:
+    """记录历史行情加载次数"""
+
+    def __init__(self, history):
+        self.history = history
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.history
+
+
+@pytest.fixture
+def cache(tmp_path):
+    manager = CacheManager(
+        db_path=str(tmp_path / "cache.db"),
+        parquet_dir=str(tmp_path / "parquet"),
+        news_dir=str(tmp_path / "news"),
+    )
+    yield manager
+    manager.close()
+
+
+class TestIndicatorMaterializer:
+    """TI-001 至 TI-007: 指标一次物化、窗口按索引读取、按来源与缓存目录隔离"""
+
+    def test_ti001_compute_matches_stockstats(self):
+        """TI-001: 批量计算结果与 stockstats 逐指标计算一致"""
+        from stockstats import wrap
+
+        history = _history()
+        frame = compute_indicators(history)
+        reference = wrap(history.copy())
+
+        for indicator in SUPPORTED_INDICATORS:
+            np.testing.assert_allclose(
+                frame[indicator].to_numpy(), reference[indicator].to_numpy(), equal_nan=True
+            )
+
+    def test_ti002_window_served_from_cache(self, cache):
+        """TI-002: 首次查询物化全部指标，窗口值与直接计算一致"""
+        history = _history()
+        materializer = IndicatorMaterializer(cache)
+        loader = CountingLoader(history)
+
+        window = materializer.get_window("AAPL", "rsi", date(2023, 9, 1), date(2023, 9, 29), loader)
+
+        expected = compute_indicators(history).set_index("date")["rsi"]
+        assert loader.calls == 1
+        assert len(window) == 21
+        for day, value in window.items():
+            assert value == pytest.approx(expected[pd.Timestamp(day)])
+        assert materializer.get_stats()["rows_written"] == len(history) * len(SUPPORTED_INDICATORS)
+
+    def test_ti003_other_indicators_reuse_materialization(self, cache):
+        """TI-003: 同一股票其他指标与更早窗口不再重新加载与计算"""
+        materializer = IndicatorMaterializer(cache)
+        loader = CountingLoader(_history())
+        materializer.get_window("AAPL", "rsi", date(2023, 9, 1), date(2023, 9, 29), loader)
+
+        materializer.get_window("AAPL", "macd", date(2023, 6, 1), date(2023, 6, 30), loader)
+        materializer.get_window("AAPL", "boll_ub", date(2023, 9, 1), date(2023, 9, 29), loader)
+
+        assert loader.calls == 1
+        assert materializer.get_stats()["materializations"] == 1
+
+    def test_ti004_warmup_values_are_none(self, cache):
+        """TI-004: 预热期不足的 NaN 以 None 返回"""
+        materializer = IndicatorMaterializer(cache)
+        loader = CountingLoader(_history())
+
+        window = materializer.get_window("AAPL", "macds", date(2023, 1, 2), date(2023, 1, 2), loader)
+
+        frame = compute_indicators(loader.history)
+        first = frame["macds"].iloc[0]
+        assert list(window) == [date(2023, 1, 2)]
+        assert (window[date(2023, 1, 2)] is None) == bool(np.isnan(first))
+
+    def test_ti005_temporal_bound(self, cache):
+        """TI-005: 传入 ctx 时窗口上界截断到 analysis_date"""
+        materializer = IndicatorMaterializer(cache)
+        loader = CountingLoader(_history())
+        ctx = TemporalContext.for_backtest(date(2023, 9, 15))
+
+        window = materializer.get_window(
+            "AAPL", "atr", date(2023, 9, 1), date(2023, 9, 29), loader, ctx=ctx
+        )
+
+        assert max(window) == date(2023, 9, 15)
+        assert min(window) == date(2023, 9, 1)
+        with pytest.raises(ValueError):
+            materializer.get_window("AAPL", "unknown", date(2023, 9, 1), date(2023, 9, 2), loader)
+
+    def test_ti006_sources_do_not_share_rows(self, cache):
+        """TI-006: 同一股票不同历史来源分别物化，互不覆盖"""
+        materializer = IndicatorMaterializer(cache)
+        local = CountingLoader(_history(seed=1))
+        online = CountingLoader(_history(seed=2))
+        day = date(2023, 9, 29)
+
+        from_local = materializer.get_window("AAPL", "rsi", day, day, local, source="local")
+        from_online = materializer.get_window("AAPL", "rsi", day, day, online, source="yfinance")
+        again_local = materializer.get_window("AAPL", "rsi", day, day, local, source="local")
+
+        expected = compute_indicators(local.history).set_index("date")["rsi"]
+        assert from_local == again_local
+        assert from_local[day] == pytest.approx(expected[pd.Timestamp(day)])
+        assert from_online != from_local
+        assert (local.calls, online.calls) == (1, 1)
+        assert cache.get_technical_state("AAPL") is None
+        assert materializer.get_state("AAPL", "local") is not None
+
+    def test_ti007_shared_materializer_per_cache_dir(self, tmp_path, monkeypatch):
+        """TI-007: 全局物化器按缓存目录分别创建，数据库位于该目录下"""
+        monkeypatch.setattr(indicators, "_global_materializers", {})
+        first = indicators.get_indicator_materializer(str(tmp_path / "a"))
+        other = indicators.get_indicator_materializer(str(tmp_path / "b"))
+        try:
+            assert indicators.get_indicator_materializer(str(tmp_path / "a")) is first
+            assert other is not first
+            assert first.cache.db_path == tmp_path / "a" / "pstds" / "cache.db"
+            assert first.cache.pooled
+        finally:
+            first.cache.close()
+            other.cache.close()
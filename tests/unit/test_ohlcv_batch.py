@@ -0,0 +1,94 @@
+# tests/unit/test_ohlcv_batch.py
+# 批量 OHLCV 测试套件 - OB-001 至 OB-003
+
+import threading
+import time
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from pstds.data.adapters.batch import OHLCV_COLUMNS, fan_out_ohlcv, to_long_format
+from pstds.data.router import DataRouter
+from pstds.temporal.context import TemporalContext
+
+
+def _frame(symbol, days=2):
+    return pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=days, tz="UTC"),
+        "open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": 100, "adj_close": 1.0,
+        "data_source": symbol,
+    })
+
+
+class FakeBatchAdapter:
+    def __init__(self, name, empty=()):
+        self.name = name
+        self.empty = set(empty)
+        self.batches = []
+
+    def get_ohlcv_batch(self, symbols, start_date, end_date, interval, ctx):
+        self.batches.append(list(symbols))
+        return {s: pd.DataFrame(columns=OHLCV_COLUMNS) if s in self.empty else _frame(self.name) for s in symbols}
+
+
+class FakeFallback:
+    def get_ohlcv(self, symbol, start_date, end_date, interval, ctx):
+        return _frame("local_csv", days=1)
+
+
+@pytest.fixture
+def ctx():
+    return TemporalContext.for_live(date(2024, 1, 2))
+
+
+class TestOHLCVBatch:
+    """OB-001 至 OB-003: 批量 OHLCV"""
+
+    def test_ob001_fan_out_bounded(self):
+        """OB-001: 扇出并发不超过上限，单只失败返回空 DataFrame"""
+        lock = threading.Lock()
+        state = {"in_flight": 0, "peak": 0}
+
+        def fetch(symbol):
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            time.sleep(0.02)
+            with lock:
+                state["in_flight"] -= 1
+            if symbol == "BAD":
+                raise RuntimeError("boom")
+            return _frame(symbol)
+
+        symbols = [f"S{i}" for i in range(12)] + ["BAD"]
+        frames = fan_out_ohlcv(fetch, symbols, max_workers=3)
+
+        assert list(frames) == symbols
+        assert state["peak"] <= 3
+        assert frames["BAD"].empty
+        assert len(frames["S0"]) == 2
+
+    def test_ob002_long_format(self):
+        """OB-002: 长表带 symbol 列，跳过空结果"""
+        long_df = to_long_format({"MSFT": _frame("x"), "AAPL": _frame("y", 3), "NONE": pd.DataFrame()})
+
+        assert list(long_df.columns) == ["symbol"] + OHLCV_COLUMNS
+        assert long_df["symbol"].tolist() == ["AAPL"] * 3 + ["MSFT"] * 2
+
+    def test_ob003_router_groups_by_adapter_and_falls_back(self, ctx, monkeypatch):
+        """OB-003: DataRouter 按主源分组批量获取，主源缺失的股票逐只降级"""
+        router = DataRouter({"singleflight": False})
+        router.yfinance_adapter = FakeBatchAdapter("yfinance", empty={"MSFT"})
+        router.akshare_adapter = FakeBatchAdapter("akshare")
+        monkeypatch.setattr(router, "get_fallback_manager", lambda symbol, quality_report=None: FakeFallback())
+
+        frames = router.get_ohlcv_batch(
+            ["AAPL", "600519", "MSFT", "0700.HK"], date(2024, 1, 1), date(2024, 1, 2), "1d", ctx,
+        )
+
+        assert router.yfinance_adapter.batches == [["AAPL", "MSFT"]]
+        assert router.akshare_adapter.batches == [["600519", "0700.HK"]]
+        assert list(frames) == ["AAPL", "600519", "MSFT", "0700.HK"]
+        assert frames["MSFT"]["data_source"].iloc[0] == "local_csv"
+        assert frames["600519"]["data_source"].iloc[0] == "akshare"
@@ -0,0 +1,171 @@
+# tests/unit/test_price_history.py
+# 价格历史存储测试套件 - PH-001 至 PH-006
+
+import os
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows import stockstats_utils
+from tradingagents.dataflows.price_history import PriceHistoryStore
+from tradingagents.dataflows.stockstats_utils import StockstatsUtils
+
+
+class FakeVendor:
+    """按日期区间返回固定行情的下载器，记录每次请求区间"""
+
+    def __init__(self, seed=3):
+        rng = np.random.default_rng(seed)
+        dates = pd.bdate_range("2008-01-01", "2024-12-31")
+        close = 100 + np.cumsum(rng.normal(0, 1, len(dates)))
+        self.bars = pd.DataFrame({
+            "Date": dates,
+            "Open": close,
+            "High": close + 1.0,
+            "Low": close - 1.0,
+            "Close": close,
+            "Volume": rng.integers(1_000, 5_000, len(dates)),
+        })
+        self.calls = []
+
+    def __call__(self, symbol, start, end):
+        self.calls.append((start, end))
+        mask = (self.bars["Date"] >= pd.Timestamp(start)) & (self.bars["Date"] < pd.Timestamp(end))
+        return self.bars[mask]
+
+
+class Clock:
+    def __init__(self, today):
+        self.today = today
+
+    def __call__(self):
+        return self.today
+
+
+def _mark_checked_before(path, day):
+    """把文件 mtime 设为 day 之前（模拟上次检查发生在更早的一天）"""
+    ts = time.mktime((day - timedelta(days=1)).timetuple())
+    os.utime(path, (ts, ts))
+
+
+@pytest.fixture
+def vendor():
+    return FakeVendor()
+
+
+@pytest.fixture
+def clock():
+    return Clock(date(2024, 6, 3))
+
+
+@pytest.fixture
+def store(tmp_path, vendor, clock):
+    return PriceHistoryStore(str(tmp_path), downloader=vendor, today=clock)
+
+
+class TestPriceHistoryStore:
+    """PH-001 至 PH-006: 稳定文件名、增量追加、复权变化重建与旧文件清理"""
+
+    def test_ph001_first_load_downloads_once_per_day(self, store, vendor, tmp_path):
+        """PH-001: 首次加载下载 15 年历史并写入固定文件名；当天再次加载不访问供应商"""
+        first = store.load("AAPL")
+        assert vendor.calls == [(date(2009, 6, 3), date(2024, 6, 3))]
+        assert first["Date"].iloc[-1] == pd.Timestamp("2024-05-31")
+        assert os.path.exists(store.path("AAPL"))
+
+        assert store.load("AAPL") is first
+        reopened = PriceHistoryStore(str(tmp_path), downloader=vendor, today=store._today)
+        pd.testing.assert_frame_equal(reopened.load("AAPL"), first)
+        assert len(vendor.calls) == 1
+
+    def test_ph002_next_day_appends_only_new_bars(self, store, vendor, clock):
+        """PH-002: 次日只请求上次最后一根 K 线之后的区间并追加"""
+        first = store.load("AAPL")
+        clock.today = date(2024, 6, 6)
+        _mark_checked_before(store.path("AAPL"), clock.today)
+
+        second = store.load("AAPL")
+
+        assert vendor.calls[-1] == (date(2024, 5, 31), date(2024, 6, 6))
+        assert store.stats["full_downloads"] == 1
+        assert store.stats["bars_appended"] == 3
+        assert second["Date"].iloc[-1] == pd.Timestamp("2024-06-05")
+        # 15 年窗口随日期前移，窗口外的最早几根 K 线被裁掉
+        kept = first[first["Date"] >= pd.Timestamp("2009-06-06")].reset_index(drop=True)
+        pd.testing.assert_frame_equal(second.iloc[:len(kept)], kept)
+
+    def test_ph003_adjustment_change_rebuilds(self, store, vendor, clock):
+        """PH-003: 重取的最后一根 K 线收盘价变化（分红/拆股复权）时整体重新下载"""
+        store.load("AAPL")
+        vendor.bars[["Open", "High", "Low", "Close"]] *= 0.5
+        clock.today = date(2024, 6, 6)
+        _mark_checked_before(store.path("AAPL"), clock.today)
+
+        rebuilt = store.load("AAPL")
+
+        assert store.stats["full_downloads"] == 2
+        expected = vendor.bars.loc[vendor.bars["Date"] == pd.Timestamp("2024-05-31"), "Close"].iloc[0]
+        assert rebuilt.loc[rebuilt["Date"] == pd.Timestamp("2024-05-31"), "Close"].iloc[0] == pytest.approx(expected)
+
+    def test_ph004_legacy_files_seed_and_cleanup(self, store, vendor, tmp_path):
+        """PH-004: 旧的日期命名文件作为种子只补新 K 线，随后被删除；离线快照文件保留"""
+        legacy = vendor.bars[vendor.bars["Date"] < pd.Timestamp("2024-05-29")]
+        legacy.to_csv(tmp_path / "AAPL-YFin-data-2009-05-29-2024-05-29.csv", index=False)
+        legacy.iloc[:-5].to_csv(tmp_path / "AAPL-YFin-data-2009-05-20-2024-05-20.csv", index=False)
+        legacy.to_csv(tmp_path / "AAPL-YFin-data-2015-01-01-2025-03-25.csv", index=False)
+        legacy.to_csv(tmp_path / "MSFT-YFin-data-2009-05-29-2024-05-29.csv", index=False)
+
+        history = store.load("AAPL")
+
+        assert vendor.calls == [(date(2024, 5, 28), date(2024, 6, 3))]
+        assert history["Date"].iloc[-1] == pd.Timestamp("2024-05-31")
+        assert sorted(name for name in os.listdir(tmp_path) if "YFin" in name or name == "price_history") == [
+            "AAPL-YFin-data-2015-01-01-2025-03-25.csv",
+            "MSFT-YFin-data-2009-05-29-2024-05-29.csv",
+            "price_history",
+        ]
+
+    def test_ph006_legacy_files_kept_until_store_written(self, store, vendor, tmp_path, monkeypatch):
+        """PH-006: 种子数据更新失败或写入失败时保留旧文件，写入成功后才清理"""
+        legacy_name = "AAPL-YFin-data-2009-05-29-2024-05-29.csv"
+        vendor.bars[vendor.bars["Date"] < pd.Timestamp("2024-05-29")].to_csv(tmp_path / legacy_name, index=False)
+
+        def offline(symbol, start, end):
+            raise ConnectionError("vendor down")
+
+        def disk_full(path, frame):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(store, "downloader", offline)
+        assert store.load("AAPL")["Date"].iloc[-1] == pd.Timestamp("2024-05-28")
+        assert os.path.exists(tmp_path / legacy_name)
+
+        monkeypatch.setattr(store, "downloader", vendor)
+        monkeypatch.setattr(store, "_write", disk_full)
+        assert store.load("AAPL")["Date"].iloc[-1] == pd.Timestamp("2024-05-31")
+        assert os.path.exists(tmp_path / legacy_name)
+
+        monkeypatch.undo()
+        store.clear()
+        store.load("AAPL")
+        assert os.path.exists(store.path("AAPL"))
+        assert not os.path.exists(tmp_path / legacy_name)
+
+    def test_ph005_stockstats_reuses_wrapped_frame(self, store, monkeypatch):
+        """PH-005: 同一进程内复用已包装的行情与已计算的指标列，结果与逐次计算一致"""
+        from stockstats import wrap
+
+        monkeypatch.setattr(stockstats_utils, "get_price_history_store", lambda: store)
+        monkeypatch.setattr(stockstats_utils, "_wrapped_cache", {})
+
+        value = StockstatsUtils.get_stock_stats("AAPL", "rsi", "2024-05-31")
+        wrapped = stockstats_utils._wrapped_cache["AAPL"][1]
+        assert StockstatsUtils.get_stock_stats("AAPL", "rsi", "2024-05-30") is not None
+        assert stockstats_utils._wrapped_cache["AAPL"][1] is wrapped
+
+        reference = wrap(store.load("AAPL").copy())["rsi"].iloc[-1]
+        assert value == pytest.approx(reference)
+        assert StockstatsUtils.get_stock_stats("AAPL", "rsi", "2024-06-01").startswith("N/A")
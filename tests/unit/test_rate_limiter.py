@@ -0,0 +1,169 @@
+# tests/unit/test_rate_limiter.py
+# 跨进程限速器测试套件 - RL-001 至 RL-006
+
+import asyncio
+import sqlite3
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+import tradingagents.dataflows.alpha_vantage_common as av
+from pstds.data.rate_limiter import (
+    QuotaExhaustedError,
+    RateLimit,
+    RateLimitExceeded,
+    RateLimiter,
+    SQLiteRateLimitBackend,
+)
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def backend(tmp_path):
+    return SQLiteRateLimitBackend(str(tmp_path / "limits.db"))
+
+
+class TestRateLimiter:
+    """RL-001 至 RL-006: 令牌桶、每日配额、跨进程共享与降级"""
+
+    def test_rl001_token_bucket_queues(self, backend):
+        """RL-001: 桶内令牌用完后排队等待补充，而不是失败"""
+        limiter = RateLimiter(backend, limits={"yfinance": RateLimit(rate=20, burst=2)}, key_limits={})
+
+        start = time.monotonic()
+        waits = [limiter.acquire("yfinance") for _ in range(4)]
+        elapsed = time.monotonic() - start
+
+        assert waits[0] == pytest.approx(0, abs=0.02)
+        assert waits[1] == pytest.approx(0, abs=0.02)
+        assert elapsed >= 0.09  # 后两次各需等待约 1/20 秒
+        assert limiter.get_metrics()["yfinance"]["acquired"] == 4
+        assert limiter.get_metrics()["yfinance"]["waited"] == 2
+        assert limiter.acquire("unlimited") == pytest.approx(0, abs=0.02)
+
+    def test_rl002_daily_quota_per_key(self, backend):
+        """RL-002: key 级每日配额用尽后立即抛出 QuotaExhaustedError，其他 key 不受影响"""
+        limiter = RateLimiter(
+            backend, limits={}, key_limits={"alpha_vantage": RateLimit(rate=100, daily_quota=2)},
+        )
+
+        limiter.acquire("alpha_vantage", key="key-a")
+        limiter.acquire("alpha_vantage", key="key-a")
+        start = time.monotonic()
+        with pytest.raises(QuotaExhaustedError) as exc:
+            limiter.acquire("alpha_vantage", key="key-a")
+
+        assert time.monotonic() - start < 0.1
+        assert 0 < exc.value.retry_after <= 86400
+        limiter.acquire("alpha_vantage", key="key-b")
+        assert limiter.get_metrics()["alpha_vantage"]["rejected"] == 1
+
+    def test_rl003_shared_across_processes(self, tmp_path):
+        """RL-003: 多个进程共享同一数据库文件时总速率受同一个桶约束"""
+        db_path = tmp_path / "shared.db"
+        SQLiteRateLimitBackend(str(db_path))
+        script = textwrap.dedent(f"""
+            import sys
+            sys.path.insert(0, {str(ROOT)!r})
+            from pstds.data.rate_limiter import RateLimit, RateLimiter, SQLiteRateLimitBackend
+            limiter = RateLimiter(
+                SQLiteRateLimitBackend({str(db_path)!r}),
+                limits={{"akshare": RateLimit(rate=20, burst=4)}},
+                key_limits={{}},
+            )
+            for _ in range(5):
+                limiter.acquire("akshare")
+        """)
+
+        start = time.monotonic()
+        procs = [subprocess.Popen([sys.executable, "-c", script]) for _ in range(4)]
+        codes = [p.wait(timeout=60) for p in procs]
+        elapsed = time.monotonic() - start
+
+        assert codes == [0, 0, 0, 0]
+        # 20 次请求，初始 4 个令牌，其余 16 个按 20/秒补充
+        assert elapsed >= 0.8
+        with sqlite3.connect(db_path) as conn:
+            (count,) = conn.execute("SELECT day_count FROM rate_buckets WHERE bucket = 'akshare'").fetchone()
+        assert count == 20
+
+    def test_rl004_fail_fast_and_drain(self, backend):
+        """RL-004: 预计等待超过 max_wait 时立即抛出；drain 后所有调用方都需等待补充"""
+        limiter = RateLimiter(backend, limits={"yfinance": RateLimit(rate=1, period=60)}, key_limits={})
+        limiter.acquire("yfinance")
+
+        start = time.monotonic()
+        with pytest.raises(RateLimitExceeded) as exc:
+            limiter.acquire("yfinance", max_wait=1.0)
+        assert time.monotonic() - start < 0.1
+        assert exc.value.retry_after > 50
+
+        other = RateLimiter(backend, limits={"akshare": RateLimit(rate=10, burst=10)}, key_limits={})
+        assert other.try_acquire("akshare") == 0
+        other.drain("akshare")
+        assert other.try_acquire("akshare") > 0
+
+        async def main():
+            ticks = 0
+
+            async def heartbeat():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            beat = asyncio.create_task(heartbeat())
+            waited = await other.acquire_async("akshare")
+            beat.cancel()
+            return waited, ticks
+
+        waited, ticks = asyncio.run(main())
+        assert waited >= 0.05
+        assert ticks >= 3
+
+    def test_rl005_alpha_vantage_falls_back_without_request(self, backend, monkeypatch):
+        """RL-005: Alpha Vantage 配额用尽时不发请求，直接抛出 AlphaVantageRateLimitError 触发降级"""
+        from pstds.data import rate_limiter
+
+        limiter = RateLimiter(backend, limits={}, key_limits={"alpha_vantage": RateLimit(rate=5, daily_quota=0)})
+        monkeypatch.setattr(rate_limiter, "_rate_limiter", limiter)
+        monkeypatch.setenv("ALPHA_VANTAGE_API_KEY", "test")
+        av.clear_response_cache()
+
+        def no_network():
+            raise AssertionError("request should not be sent")
+
+        monkeypatch.setattr(av, "get_session", no_network)
+
+        with pytest.raises(av.AlphaVantageRateLimitError):
+            av._make_api_request("RSI", {"symbol": "IBM"})
+
+    def test_rl006_async_acquire_runs_backend_off_loop(self, tmp_path):
+        """RL-006: acquire_async 的后端事务在工作线程执行，不占用事件循环线程"""
+        threads = []
+
+        class RecordingBackend(SQLiteRateLimitBackend):
+            def try_acquire(self, buckets, cost=1.0):
+                threads.append(threading.get_ident())
+                return super().try_acquire(buckets, cost)
+
+        limiter = RateLimiter(
+            RecordingBackend(str(tmp_path / "limits.db")),
+            limits={"akshare": RateLimit(rate=20, burst=1)}, key_limits={},
+        )
+
+        async def main():
+            await limiter.acquire_async("akshare")
+            await limiter.acquire_async("akshare")
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(main())
+
+        assert len(threads) >= 2
+        assert loop_thread not in threads
@@ -0,0 +1,169 @@
+# tests/unit/test_run_memo.py
+# 运行期工具调用记忆测试套件 - RM-001 至 RM-005
+
+import contextvars
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows import interface, y_finance
+from tradingagents.dataflows.run_memo import RunMemo, active_run_memo, run_memo, slice_stock_data
+
+
+class FakeTicker:
+    """替代 yf.Ticker：按 [start, end) 返回固定日线，记录请求次数"""
+
+    calls = []
+    bars = None
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def history(self, start, end):
+        FakeTicker.calls.append((self.symbol, start, end))
+        bars = FakeTicker.bars
+        return bars[(bars.index >= pd.Timestamp(start)) & (bars.index < pd.Timestamp(end))].copy()
+
+
+class CountingVendor:
+    """记录调用参数的供应商实现"""
+
+    def __init__(self, fail_times=0):
+        self.calls = []
+        self.fail_times = fail_times
+
+    def __call__(self, ticker, start_date, end_date):
+        self.calls.append((ticker, start_date, end_date))
+        if len(self.calls) <= self.fail_times:
+            raise ConnectionError("vendor down")
+        return f"news for {ticker} {start_date}..{end_date}"
+
+
+@pytest.fixture
+def vendors(monkeypatch):
+    dates = pd.bdate_range("2023-01-02", "2024-12-31", name="Date")
+    close = 100 + np.cumsum(np.random.default_rng(7).normal(0, 1, len(dates)))
+    FakeTicker.bars = pd.DataFrame(
+        {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1_000},
+        index=dates,
+    )
+    FakeTicker.calls = []
+    monkeypatch.setattr(y_finance.yf, "Ticker", FakeTicker)
+
+    news = CountingVendor()
+    monkeypatch.setitem(interface.VENDOR_METHODS, "get_news", {"yfinance": news})
+    return news
+
+
+def _without_retrieval_time(text):
+    return [line for line in text.splitlines() if not line.startswith("# Data retrieved on")]
+
+
+class TestRunMemo:
+    """RM-001 至 RM-005: 运行期内相同请求只访问一次供应商，区间包含时切片复用"""
+
+    def test_rm001_repeated_calls_hit_once(self, vendors):
+        """RM-001: 社交与新闻分析师的相同 get_news 只请求一次；参数写法差异归一；记忆仅在运行期内生效"""
+        with run_memo("2024-06-10") as memo:
+            social = interface.route_to_vendor("get_news", "AAPL", "2024-06-03", "2024-06-10")
+            news = interface.route_to_vendor("get_news", " aapl ", start_date="2024-06-03", end_date="2024-06-10")
+            interface.route_to_vendor("get_news", "AAPL", "2024-06-01", "2024-06-10")
+
+        assert social == news
+        assert vendors.calls == [("AAPL", "2024-06-03", "2024-06-10"), ("AAPL", "2024-06-01", "2024-06-10")]
+        assert memo.get_stats() == {"calls": 3, "hits": 1, "range_hits": 0, "upstream_calls": 2, "saved_calls": 1}
+
+        assert active_run_memo() is None
+        interface.route_to_vendor("get_news", "AAPL", "2024-06-03", "2024-06-10")
+        assert len(vendors.calls) == 3
+
+    def test_rm002_stock_data_range_containment(self, vendors):
+        """RM-002: get_stock_data 请求区间落在已取区间内时切片复用，结果与直接请求一致"""
+        fresh = interface.route_to_vendor("get_stock_data", "AAPL", "2024-03-01", "2024-04-01")
+        FakeTicker.calls = []
+
+        with run_memo("2024-06-10") as memo:
+            interface.route_to_vendor("get_stock_data", "AAPL", "2024-01-01", "2024-06-10")
+            sliced = interface.route_to_vendor("get_stock_data", "aapl", "2024-03-01", "2024-04-01")
+            interface.route_to_vendor("get_stock_data", "AAPL", "2023-12-01", "2024-04-01")
+
+        assert _without_retrieval_time(sliced) == _without_retrieval_time(fresh)
+        assert [call[1:] for call in FakeTicker.calls] == [
+            ("2024-01-01", "2024-06-10"),
+            ("2023-12-01", "2024-04-01"),
+        ]
+        assert memo.get_stats()["range_hits"] == 1
+
+    def test_rm003_end_inclusive_vendor_and_failures(self, vendors):
+        """RM-003: 结束日包含型供应商按闭区间切片；失败的调用不被记忆"""
+        csv = "timestamp,open,close\n2024-03-04,1,2\n2024-03-01,3,4\n2024-02-29,5,6\n"
+        assert slice_stock_data(csv, "2024-03-01", "2024-03-04", end_inclusive=True) == (
+            "timestamp,open,close\n2024-03-04,1,2\n2024-03-01,3,4\n"
+        )
+        assert slice_stock_data(csv, "2024-03-01", "2024-03-04", end_inclusive=False) == (
+            "timestamp,open,close\n2024-03-01,3,4\n"
+        )
+        assert slice_stock_data(csv, "2024-03-05", "2024-03-08", end_inclusive=True) is None
+
+        vendors.fail_times = 1
+        with run_memo("2024-06-10"):
+            with pytest.raises(ConnectionError):
+                interface.route_to_vendor("get_news", "AAPL", "2024-06-03", "2024-06-10")
+            assert interface.route_to_vendor("get_news", "AAPL", "2024-06-03", "2024-06-10").startswith("news")
+        assert len(vendors.calls) == 2
+
+    def test_rm004_shared_across_threads_and_nested_runs(self, vendors, monkeypatch):
+        """RM-004: 嵌套运行共用外层记忆；并发的相同请求只访问一次供应商；不同分析日期不共享"""
+        slow = CountingVendor()
+
+        def slow_vendor(ticker, start_date, end_date):
+            time.sleep(0.05)
+            return slow(ticker, start_date, end_date)
+
+        monkeypatch.setitem(interface.VENDOR_METHODS, "get_news", {"yfinance": slow_vendor})
+        memo = RunMemo("2024-06-10", session_id="s1")
+
+        with run_memo(memo=memo):
+            with run_memo("2024-06-10") as inner:
+                assert inner is memo
+            # 与 LangGraph 执行工具节点一样，把当前上下文复制进工作线程
+            threads = [
+                threading.Thread(
+                    target=contextvars.copy_context().run,
+                    args=(interface.route_to_vendor, "get_news", "AAPL", "2024-06-03", "2024-06-10"),
+                )
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert len(slow.calls) == 1
+        assert memo.get_stats()["hits"] == 3
+        assert memo.key("get_news", ("AAPL",), {}) != RunMemo("2024-06-11").key("get_news", ("AAPL",), {})
+
+    def test_rm005_extended_graph_memo_per_propagate(self, monkeypatch):
+        """RM-005: 扩展图每次 propagate 新建记忆，同一会话内重复运行不复用上一次的供应商结果"""
+        pytest.importorskip("langgraph")
+        from datetime import date
+
+        from pstds.agents.extended_graph import ExtendedTradingAgentsGraph
+        from pstds.temporal.context import TemporalContext
+
+        graph = ExtendedTradingAgentsGraph.__new__(ExtendedTradingAgentsGraph)
+        graph._run_memo = None
+        seen = []
+        monkeypatch.setattr(graph, "_propagate_in_session", lambda *args: seen.append(active_run_memo()))
+        ctx = TemporalContext.for_live(date(2024, 6, 10))
+
+        graph.propagate("AAPL", date(2024, 6, 10), ctx)
+        graph.propagate("AAPL", date(2024, 6, 10), ctx, refresh_cache=True)
+
+        assert seen[0] is not None and seen[1] is not None
+        assert seen[0] is not seen[1]
+        assert graph._run_memo is seen[1]
+        assert active_run_memo() is None
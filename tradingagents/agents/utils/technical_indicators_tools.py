@@ -5,7 +5,7 @@ from tradingagents.dataflows.interface import route_to_vendor
 @tool
 def get_indicators(
     symbol: Annotated[str, "ticker symbol of the company"],
-    indicator: Annotated[str, "technical indicator to get the analysis and report of"],
+    indicator: Annotated[str, "technical indicator(s) to get the analysis and report of, comma-separated for several"],
     curr_date: Annotated[str, "The current trading date you are trading on, YYYY-mm-dd"],
     look_back_days: Annotated[int, "how many days to look back"] = 30,
 ) -> str:
@@ -14,10 +14,10 @@ def get_indicators(
     Uses the configured technical_indicators vendor.
     Args:
         symbol (str): Ticker symbol of the company, e.g. AAPL, TSM
-        indicator (str): Technical indicator to get the analysis and report of
+        indicator (str): Technical indicator to get the analysis and report of; pass a comma-separated list (e.g. "rsi,macd") to get several in one call
         curr_date (str): The current trading date you are trading on, YYYY-mm-dd
         look_back_days (int): How many days to look back, default is 30
     Returns:
-        str: A formatted dataframe containing the technical indicators for the specified ticker symbol and indicator.
+        str: A formatted dataframe containing the technical indicators for the specified ticker symbol and indicator(s).
     """
     return route_to_vendor("get_indicators", symbol, indicator, curr_date, look_back_days)
\ No newline at end of file
@@ -1,12 +1,99 @@
 import os
+import threading
 import requests
 import pandas as pd
 import json
+from collections import OrderedDict
 from datetime import datetime
 from io import StringIO
+from zoneinfo import ZoneInfo
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 API_BASE_URL = "https://www.alphavantage.co/query"
 
+# (connect, read) timeouts in seconds
+REQUEST_TIMEOUT = (5, 30)
+# Keep-alive connections kept per host by the shared session
+POOL_MAXSIZE = 16
+# Retries on 5xx / connection errors, with exponential backoff plus random jitter
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+BACKOFF_JITTER = 0.5
+# Responses cached per (function, params, API key, trading day)
+RESPONSE_CACHE_SIZE = 256
+# Top-level keys of JSON bodies that carry a message instead of data (sent with HTTP 200)
+ERROR_PAYLOAD_KEYS = frozenset({"Error Message", "Information", "Note"})
+# Vendor name used for the shared pstds rate limiter buckets
+RATE_LIMIT_VENDOR = "alpha_vantage"
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+_response_cache: "OrderedDict[tuple, str]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    """Create a session with a keep-alive connection pool, gzip and retry policy."""
+    retry = Retry(
+        total=MAX_RETRIES,
+        connect=MAX_RETRIES,
+        read=MAX_RETRIES,
+        status=MAX_RETRIES,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        backoff_factor=BACKOFF_FACTOR,
+        backoff_jitter=BACKOFF_JITTER,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide Alpha Vantage session.
+
+    The underlying urllib3 pool is thread-safe, so all threads share the same
+    keep-alive connections instead of paying TCP+TLS setup per call.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def close_session() -> None:
+    """Close the shared session and drop cached responses."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+    clear_response_cache()
+
+
+def clear_response_cache() -> None:
+    with _response_cache_lock:
+        _response_cache.clear()
+
+
+def _trading_day() -> str:
+    """Current US market date; cached responses expire when it rolls over."""
+    return datetime.now(ZoneInfo("America/New_York")).strftime("%Y-%m-%d")
+
+
+def _cache_key(api_params: dict) -> tuple:
+    """Key by every request param, the API key included: keys can differ in entitlement."""
+    params = tuple(sorted((k, str(v)) for k, v in api_params.items()))
+    return (api_params.get("function"), params, _trading_day())
+
 def get_api_key() -> str:
     """Retrieve the API key for Alpha Vantage from environment variables."""
     api_key = os.getenv("ALPHA_VANTAGE_API_KEY")
@@ -39,6 +126,31 @@ class AlphaVantageRateLimitError(Exception):
     """Exception raised when Alpha Vantage API rate limit is exceeded."""
     pass
 
+def _acquire_quota(api_key: str) -> None:
+    """Wait for a token from the shared cross-process rate limiter.
+
+    Raises AlphaVantageRateLimitError without sending the request when the
+    wait would exceed the limiter's max_wait or the daily quota is used up,
+    so route_to_vendor falls back instead of burning quota on a failed call.
+    """
+    try:
+        from pstds.data.rate_limiter import RateLimitExceeded, get_rate_limiter
+    except ImportError:
+        return
+    try:
+        get_rate_limiter().acquire(RATE_LIMIT_VENDOR, key=api_key)
+    except RateLimitExceeded as e:
+        raise AlphaVantageRateLimitError(f"Alpha Vantage rate limit exceeded: {e}") from e
+
+
+def _report_throttled(api_key: str, message: str) -> None:
+    """Drain the shared bucket so other processes stop sending requests too."""
+    try:
+        from pstds.data.rate_limiter import get_rate_limiter
+    except ImportError:
+        return
+    get_rate_limiter().drain(RATE_LIMIT_VENDOR, key=api_key, daily="per day" in message.lower())
+
 def _make_api_request(function_name: str, params: dict) -> dict | str:
     """Helper function to make API requests and handle responses.
     
@@ -63,23 +175,46 @@ def _make_api_request(function_name: str, params: dict) -> dict | str:
         # Remove entitlement if it's None or empty
         api_params.pop("entitlement", None)
     
-    response = requests.get(API_BASE_URL, params=api_params)
+    key = _cache_key(api_params)
+    with _response_cache_lock:
+        if key in _response_cache:
+            _response_cache.move_to_end(key)
+            return _response_cache[key]
+
+    _acquire_quota(api_params["apikey"])
+    response = get_session().get(API_BASE_URL, params=api_params, timeout=REQUEST_TIMEOUT)
     response.raise_for_status()
 
     response_text = response.text
     
     # Check if response is JSON (error responses are typically JSON)
+    cacheable = True
     try:
         response_json = json.loads(response_text)
         # Check for rate limit error
         if "Information" in response_json:
             info_message = response_json["Information"]
             if "rate limit" in info_message.lower() or "api key" in info_message.lower():
+                _report_throttled(api_params["apikey"], info_message)
                 raise AlphaVantageRateLimitError(f"Alpha Vantage rate limit exceeded: {info_message}")
+        # Older per-minute throttling message
+        if "Note" in response_json and "call frequency" in str(response_json["Note"]).lower():
+            _report_throttled(api_params["apikey"], str(response_json["Note"]))
+            raise AlphaVantageRateLimitError(f"Alpha Vantage rate limit exceeded: {response_json['Note']}")
+        # Other vendor messages (invalid call, premium endpoint, ...) are passed on but not memoized
+        if isinstance(response_json, dict) and ERROR_PAYLOAD_KEYS & response_json.keys():
+            cacheable = False
     except json.JSONDecodeError:
         # Response is not JSON (likely CSV data), which is normal
         pass
 
+    # Rate-limit responses raise above; neither they nor other error payloads are cached
+    if cacheable:
+        with _response_cache_lock:
+            _response_cache[key] = response_text
+            while len(_response_cache) > RESPONSE_CACHE_SIZE:
+                _response_cache.popitem(last=False)
+
     return response_text
 
 
@@ -14,7 +14,7 @@ def get_indicator(
 
     Args:
         symbol: ticker symbol of the company
-        indicator: technical indicator to get the analysis and report of
+        indicator: technical indicator to get the analysis and report of (comma-separated for several)
         curr_date: The current trading date you are trading on, YYYY-mm-dd
         look_back_days: how many days to look back
         interval: Time interval (daily, weekly, monthly)
@@ -27,6 +27,14 @@ def get_indicator(
     from datetime import datetime
     from dateutil.relativedelta import relativedelta
 
+    # Alpha Vantage serves one indicator per request; split comma-separated lists
+    if "," in indicator:
+        return "\n\n".join(
+            get_indicator(symbol, name.strip(), curr_date, look_back_days, interval, time_period, series_type)
+            for name in indicator.split(",")
+            if name.strip()
+        )
+
     supported_indicators = {
         "close_50_sma": ("50 SMA", "close"),
         "close_200_sma": ("200 SMA", "close"),
@@ -0,0 +1,473 @@
+"""
+NumPy implementations of the technical indicators used by the agents and charts.
+
+Definitions follow stockstats (the reference implementation used before), so
+values match `stockstats.wrap(df)[name]`:
+
+- SMA / rolling sums / rolling std use partial windows (min_periods=1).
+- EMA and SMMA are adjusted exponentially weighted means (pandas
+  ``ewm(adjust=True, ignore_na=False)``), with alpha = 2 / (span + 1) and
+  1 / window respectively. RSI and ATR smooth with SMMA.
+
+Batch kernels evaluate the EMA recurrence s[t] = d * s[t-1] + x[t] block-wise
+with cumulative sums instead of a Python loop. IndicatorStream offers the
+same indicators as an O(1)-per-bar update for live bars.
+"""
+
+import math
+import re
+from collections import deque
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Largest growth factor d**-i allowed within one block of the exponential scan
+_SCAN_GROWTH_LIMIT = 1e100
+BOLL_WINDOW = 20
+BOLL_STD_TIMES = 2
+MACD_WINDOWS = (12, 26, 9)
+DEFAULT_WINDOWS = {"rsi": 14, "atr": 14, "vwma": 14, "mfi": 14}
+
+_MOVING_AVERAGE = re.compile(r"^(open|high|low|close|volume)_(\d+)_(sma|ema)$")
+_WINDOWED = re.compile(r"^(rsi|atr|vwma|mfi)(?:_(\d+))?$")
+_FAMILIES = {
+    "macd": "macd", "macds": "macd", "macdh": "macd",
+    "boll": "boll", "boll_ub": "boll", "boll_lb": "boll",
+}
+
+
+def _as_float(values) -> np.ndarray:
+    return np.asarray(values, dtype="float64")
+
+
+def _exp_scan(values: np.ndarray, decay: float) -> np.ndarray:
+    """s[t] = decay * s[t-1] + values[t] with s[-1] = 0."""
+    out = np.empty_like(values)
+    if len(values) == 0 or decay == 0.0:
+        out[:] = values
+        return out
+    # Within a block s[k+j] = d**j * (d * s[k-1] + cumsum(x[k+i] * d**-i)); blocks bound d**-i
+    block = max(1, min(len(values), int(math.log(_SCAN_GROWTH_LIMIT) / -math.log(decay))))
+    powers = np.exp(np.arange(block) * math.log(decay))
+    inverse = 1.0 / powers
+    carry = 0.0
+    for start in range(0, len(values), block):
+        chunk = values[start:start + block]
+        m = len(chunk)
+        scanned = powers[:m] * (decay * carry + np.cumsum(chunk * inverse[:m]))
+        out[start:start + m] = scanned
+        carry = scanned[-1]
+    return out
+
+
+def ewm_mean(values, alpha: float) -> np.ndarray:
+    """Adjusted exponentially weighted mean; NaNs keep their position in the weights."""
+    x = _as_float(values)
+    decay = 1.0 - alpha
+    valid = ~np.isnan(x)
+    if valid.all():
+        numerator = _exp_scan(x, decay)
+        # Without gaps the weight sum has a closed form: (1 - d**(t+1)) / (1 - d)
+        denominator = -np.expm1(np.arange(1, len(x) + 1) * math.log(decay)) / alpha if decay > 0 else np.ones_like(x)
+        return numerator / denominator
+    numerator = _exp_scan(np.where(valid, x, 0.0), decay)
+    denominator = _exp_scan(valid.astype("float64"), decay)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+def ema(values, span: int) -> np.ndarray:
+    return ewm_mean(values, 2.0 / (span + 1))
+
+
+def smma(values, window: int) -> np.ndarray:
+    return ewm_mean(values, 1.0 / window)
+
+
+def _rolling_sum_count(values, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Rolling sum and count of the non-NaN values in each trailing window."""
+    x = _as_float(values)
+    valid = ~np.isnan(x)
+    if valid.all():
+        # Centre before the cumulative sum to limit cancellation on long series
+        ref = x.mean() if len(x) else 0.0
+        sums = np.cumsum(x - ref)
+        sums[window:] -= sums[:-window].copy()
+        count = np.minimum(np.arange(1, len(x) + 1), window)
+        return sums + ref * count, count
+    ref = x[valid].mean() if valid.any() else 0.0
+    sums = np.concatenate(([0.0], np.cumsum(np.where(valid, x - ref, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+    hi = np.arange(1, len(x) + 1)
+    lo = np.maximum(hi - window, 0)
+    count = counts[hi] - counts[lo]
+    return sums[hi] - sums[lo] + ref * count, count
+
+
+def rolling_sum(values, window: int) -> np.ndarray:
+    total, count = _rolling_sum_count(values, window)
+    return np.where(count > 0, total, np.nan)
+
+
+def sma(values, window: int, min_periods: int = 1) -> np.ndarray:
+    total, count = _rolling_sum_count(values, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(count >= max(min_periods, 1), total / count, np.nan)
+
+
+def rolling_std(values, window: int, ddof: int = 1) -> np.ndarray:
+    """Rolling sample standard deviation over partial windows (two-pass per window)."""
+    x = _as_float(values)
+    n = len(x)
+    out = np.full(n, np.nan)
+    if not np.isnan(x).any():
+        if n >= window > ddof:
+            full = np.lib.stride_tricks.sliding_window_view(x, window)
+            deviation = full - full.mean(axis=1)[:, None]
+            out[window - 1:] = np.sqrt(np.einsum("ij,ij->i", deviation, deviation) / (window - ddof))
+        for i in range(ddof, min(window - 1, n)):
+            out[i] = x[:i + 1].std(ddof=ddof)
+        return out
+
+    padded = np.concatenate((np.full(window - 1, np.nan), x))
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window)
+    valid = ~np.isnan(windows)
+    count = valid.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(valid, windows, 0.0).sum(axis=1) / count
+        deviation = np.where(valid, windows - mean[:, None], 0.0)
+        var = (deviation ** 2).sum(axis=1) / (count - ddof)
+    return np.where(count > ddof, np.sqrt(var), np.nan)
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD line, signal line and histogram."""
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def rsi(close, window: int = 14) -> np.ndarray:
+    x = _as_float(close)
+    diff = np.zeros_like(x)
+    diff[1:] = np.diff(x)
+    up = smma(np.where(diff > 0, diff, 0.0), window)
+    down = smma(np.where(diff < 0, -diff, 0.0), window)
+    total = up + down
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = np.where(total != 0, 100 * (up / total), 50.0)
+    if len(out):
+        out[0] = 50.0
+    return np.where(np.isnan(out), 0.0, out)
+
+
+def bollinger(close, window: int = BOLL_WINDOW, k: float = BOLL_STD_TIMES) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Middle, upper and lower Bollinger bands."""
+    middle = sma(close, window)
+    width = k * rolling_std(close, window)
+    return middle, middle + width, middle - width
+
+
+def true_range(high, low, close) -> np.ndarray:
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    prev_close = np.empty_like(close)
+    if len(close):
+        prev_close[0] = close[0]
+        prev_close[1:] = close[:-1]
+    tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return np.nan_to_num(tr)
+
+
+def atr(high, low, close, window: int = 14) -> np.ndarray:
+    return smma(true_range(high, low, close), window)
+
+
+def typical_price(high, low, close) -> np.ndarray:
+    return (_as_float(close) + _as_float(high) + _as_float(low)) / 3.0
+
+
+def vwma(high, low, close, volume, window: int = 14) -> np.ndarray:
+    volume = _as_float(volume)
+    weighted = rolling_sum(volume * typical_price(high, low, close), window)
+    total_volume = rolling_sum(volume, window)
+    return np.divide(weighted, total_volume, out=np.zeros_like(weighted), where=total_volume != 0)
+
+
+def mfi(high, low, close, volume, window: int = 14) -> np.ndarray:
+    tp = typical_price(high, low, close)
+    money_flow = tp * _as_float(volume)
+    tp_diff = np.zeros_like(tp)
+    tp_diff[1:] = np.diff(tp)
+    positive = _trailing_sum(np.where(tp_diff > 0, money_flow, 0.0), window)
+    negative = _trailing_sum(np.where(tp_diff < 0, money_flow, 0.0), window)
+    total = positive + negative
+    out = np.divide(positive, total, out=np.full_like(positive, 0.5), where=total > 0)
+    out[:window] = 0.5
+    return np.where(np.isnan(out), 0.0, out)
+
+
+def _trailing_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Partial-window rolling sum via cumsum (NaNs propagate, as in stockstats' MFI)."""
+    cumulative = np.cumsum(values)
+    out = cumulative.copy()
+    out[window:] = cumulative[window:] - cumulative[:-window]
+    return out
+
+
+def is_supported(indicator: str) -> bool:
+    return bool(
+        indicator in _FAMILIES or _MOVING_AVERAGE.match(indicator) or _WINDOWED.match(indicator)
+    )
+
+
+def _ohlcv(history: pd.DataFrame) -> Dict[str, np.ndarray]:
+    columns = {str(c).lower(): c for c in history.columns}
+    return {
+        name: history[columns[name]].to_numpy(dtype="float64")
+        for name in ("open", "high", "low", "close", "volume")
+        if name in columns
+    }
+
+
+def compute_arrays(history: pd.DataFrame, indicators: Sequence[str]) -> Dict[str, np.ndarray]:
+    """
+    Compute several indicators over the full history in one pass.
+
+    Args:
+        history: OHLCV bars in chronological order (column names in any case)
+        indicators: stockstats-style names, e.g. "close_50_sma", "macd", "rsi"
+
+    Returns:
+        {indicator: values aligned with history's rows}
+
+    Raises:
+        ValueError: an indicator has no kernel (see is_supported)
+    """
+    bars = _ohlcv(history)
+    out: Dict[str, np.ndarray] = {}
+    for name in indicators:
+        if name in out:
+            continue
+        family = _FAMILIES.get(name)
+        if family == "macd":
+            out["macd"], out["macds"], out["macdh"] = macd(bars["close"], *MACD_WINDOWS)
+            continue
+        if family == "boll":
+            out["boll"], out["boll_ub"], out["boll_lb"] = bollinger(bars["close"])
+            continue
+
+        match = _MOVING_AVERAGE.match(name)
+        if match:
+            column, window, kind = match.group(1), int(match.group(2)), match.group(3)
+            out[name] = (sma if kind == "sma" else ema)(bars[column], window)
+            continue
+
+        match = _WINDOWED.match(name)
+        if not match:
+            raise ValueError(f"Indicator {name} has no NumPy kernel")
+        kind = match.group(1)
+        window = int(match.group(2) or DEFAULT_WINDOWS[kind])
+        if kind == "rsi":
+            out[name] = rsi(bars["close"], window)
+        elif kind == "atr":
+            out[name] = atr(bars["high"], bars["low"], bars["close"], window)
+        elif kind == "vwma":
+            out[name] = vwma(bars["high"], bars["low"], bars["close"], bars["volume"], window)
+        else:
+            out[name] = mfi(bars["high"], bars["low"], bars["close"], bars["volume"], window)
+    return {name: out[name] for name in indicators}
+
+
+def compute(history: pd.DataFrame, indicators: Sequence[str]) -> pd.DataFrame:
+    """compute_arrays as a DataFrame sharing history's index."""
+    return pd.DataFrame(compute_arrays(history, indicators), index=history.index)
+
+
+# --- Streaming (O(1) per bar) ---
+
+
+class _Ewm:
+    """Adjusted exponentially weighted mean, updated one value at a time."""
+
+    def __init__(self, alpha: float):
+        self.decay = 1.0 - alpha
+        self.numerator = 0.0
+        self.denominator = 0.0
+
+    def update(self, value: float) -> float:
+        self.numerator *= self.decay
+        self.denominator *= self.decay
+        if not math.isnan(value):
+            self.numerator += value
+            self.denominator += 1.0
+        return self.numerator / self.denominator if self.denominator > 0 else math.nan
+
+
+class _Rolling:
+    """Trailing-window sum / mean / sample std over partial windows."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values: deque = deque()
+        self.ref = 0.0
+        self.sum = 0.0
+        self.sumsq = 0.0
+        self.count = 0
+        self._since_resum = 0
+
+    def update(self, value: float) -> None:
+        self.values.append(value)
+        self._add(value, 1)
+        if len(self.values) > self.window:
+            self._add(self.values.popleft(), -1)
+        # Re-sum every `window` bars (amortized O(1)) so rounding errors do not accumulate
+        self._since_resum += 1
+        if self._since_resum >= self.window:
+            self._resum()
+
+    def _add(self, value: float, sign: int) -> None:
+        if not math.isnan(value):
+            delta = value - self.ref
+            self.sum += sign * delta
+            self.sumsq += sign * delta * delta
+            self.count += sign
+
+    def _resum(self) -> None:
+        valid = [v for v in self.values if not math.isnan(v)]
+        self.ref = sum(valid) / len(valid) if valid else 0.0
+        self.sum = sum(v - self.ref for v in valid)
+        self.sumsq = sum((v - self.ref) ** 2 for v in valid)
+        self.count = len(valid)
+        self._since_resum = 0
+
+    def total(self) -> float:
+        return self.sum + self.ref * self.count if self.count else math.nan
+
+    def mean(self) -> float:
+        return self.ref + self.sum / self.count if self.count else math.nan
+
+    def std(self) -> float:
+        if self.count < 2:
+            return math.nan
+        var = (self.sumsq - self.sum * self.sum / self.count) / (self.count - 1)
+        return math.sqrt(max(var, 0.0))
+
+
+class IndicatorStream:
+    """
+    Incremental indicators: feed bars one at a time, get the latest values.
+
+    Produces the same values as compute_arrays over the bars seen so far,
+    in O(1) time per bar.
+
+        stream = IndicatorStream(["rsi", "macd", "close_50_sma"])
+        stream.warmup(history)
+        latest = stream.update(high=..., low=..., close=..., volume=...)
+    """
+
+    def __init__(self, indicators: Sequence[str]):
+        unsupported = [name for name in indicators if not is_supported(name)]
+        if unsupported:
+            raise ValueError(f"Indicator {', '.join(unsupported)} has no NumPy kernel")
+        self.indicators = list(indicators)
+        self.bars = 0
+        self.prev_close: Optional[float] = None
+        self.prev_tp: Optional[float] = None
+        self._states: Dict[str, object] = {}
+
+    def _state(self, key: str, factory):
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = factory()
+        return state
+
+    def warmup(self, history: pd.DataFrame) -> Dict[str, float]:
+        """Feed historical bars in order; returns the values after the last one."""
+        bars = _ohlcv(history)
+        latest: Dict[str, float] = {}
+        for i in range(len(history)):
+            latest = self.update(**{name: values[i] for name, values in bars.items()})
+        return latest
+
+    def update(
+        self,
+        high: float = math.nan,
+        low: float = math.nan,
+        close: float = math.nan,
+        volume: float = math.nan,
+        open: float = math.nan,
+    ) -> Dict[str, float]:
+        """Add one bar and return {indicator: value at this bar}."""
+        bar = {"open": open, "high": high, "low": low, "close": close, "volume": volume}
+        values: Dict[str, float] = {}
+        for name in self.indicators:
+            if name not in values:
+                values.update(self._compute(name, bar))
+
+        self.bars += 1
+        self.prev_close = close
+        self.prev_tp = (close + high + low) / 3.0
+        return {name: values[name] for name in self.indicators}
+
+    def _compute(self, name: str, bar: Dict[str, float]) -> Dict[str, float]:
+        close = bar["close"]
+        family = _FAMILIES.get(name)
+        if family == "macd":
+            fast, slow, signal = self._state("macd", lambda: tuple(_Ewm(2.0 / (w + 1)) for w in MACD_WINDOWS))
+            line = fast.update(close) - slow.update(close)
+            signal_line = signal.update(line)
+            return {"macd": line, "macds": signal_line, "macdh": line - signal_line}
+        if family == "boll":
+            rolling = self._state("boll", lambda: _Rolling(BOLL_WINDOW))
+            rolling.update(close)
+            middle, width = rolling.mean(), BOLL_STD_TIMES * rolling.std()
+            return {"boll": middle, "boll_ub": middle + width, "boll_lb": middle - width}
+
+        match = _MOVING_AVERAGE.match(name)
+        if match:
+            column, window, kind = match.group(1), int(match.group(2)), match.group(3)
+            if kind == "ema":
+                return {name: self._state(name, lambda: _Ewm(2.0 / (window + 1))).update(bar[column])}
+            rolling = self._state(name, lambda: _Rolling(window))
+            rolling.update(bar[column])
+            return {name: rolling.mean()}
+
+        match = _WINDOWED.match(name)
+        kind = match.group(1)
+        window = int(match.group(2) or DEFAULT_WINDOWS[kind])
+        if kind == "rsi":
+            return {name: self._rsi(name, window, close)}
+        if kind == "atr":
+            prev_close = close if self.prev_close is None else self.prev_close
+            tr = max(bar["high"] - bar["low"], abs(bar["high"] - prev_close), abs(bar["low"] - prev_close))
+            tr = 0.0 if math.isnan(tr) else tr
+            return {name: self._state(name, lambda: _Ewm(1.0 / window)).update(tr)}
+        tp = (close + bar["high"] + bar["low"]) / 3.0
+        if kind == "vwma":
+            weighted, total = self._state(name, lambda: (_Rolling(window), _Rolling(window)))
+            weighted.update(bar["volume"] * tp)
+            total.update(bar["volume"])
+            return {name: weighted.total() / total.total() if total.total() != 0 else 0.0}
+        return {name: self._mfi(name, window, tp, tp * bar["volume"])}
+
+    def _rsi(self, name: str, window: int, close: float) -> float:
+        up, down = self._state(name, lambda: (_Ewm(1.0 / window), _Ewm(1.0 / window)))
+        diff = 0.0 if self.prev_close is None else close - self.prev_close
+        up_value = up.update(diff if diff > 0 else 0.0)
+        down_value = down.update(-diff if diff < 0 else 0.0)
+        if self.bars == 0:
+            return 50.0
+        total = up_value + down_value
+        value = 100 * up_value / total if total != 0 else 50.0
+        return 0.0 if math.isnan(value) else value
+
+    def _mfi(self, name: str, window: int, tp: float, money_flow: float) -> float:
+        positive, negative = self._state(name, lambda: (_Rolling(window), _Rolling(window)))
+        diff = 0.0 if self.prev_tp is None else tp - self.prev_tp
+        positive.update(money_flow if diff > 0 else 0.0)
+        negative.update(money_flow if diff < 0 else 0.0)
+        if self.bars < window:
+            return 0.5
+        total = positive.total() + negative.total()
+        return positive.total() / total if total > 0 else 0.5
@@ -1,4 +1,5 @@
-from typing import Annotated
+import inspect
+from typing import Annotated, Any, Tuple
 
 # Import from vendor-specific modules
 from .y_finance import (
@@ -26,6 +27,7 @@ from .alpha_vantage_common import AlphaVantageRateLimitError
 
 # Configuration and routing logic
 from .config import get_config
+from .run_memo import active_run_memo
 
 # Tools organized by category
 TOOLS_CATEGORIES = {
@@ -132,7 +134,36 @@ def get_vendor(category: str, method: str = None) -> str:
     return config.get("data_vendors", {}).get(category, "default")
 
 def route_to_vendor(method: str, *args, **kwargs):
-    """Route method calls to appropriate vendor implementation with fallback support."""
+    """Route method calls to appropriate vendor implementation with fallback support.
+
+    Inside a run with an active RunMemo (see run_memo.py), repeated calls
+    are answered from the memo instead of calling the vendor again.
+    """
+    memo = active_run_memo()
+    if memo is None:
+        return _call_vendor(method, args, kwargs)[1]
+    return memo.call(
+        method,
+        args,
+        kwargs,
+        lambda call_args, call_kwargs: _call_vendor(method, call_args, call_kwargs),
+        signature=_method_signature(method),
+    )
+
+def _method_signature(method: str):
+    """Signature of the method's first vendor implementation, used to normalize arguments."""
+    vendor_impls = VENDOR_METHODS.get(method)
+    if not vendor_impls:
+        return None
+    impl = next(iter(vendor_impls.values()))
+    impl = impl[0] if isinstance(impl, list) else impl
+    try:
+        return inspect.signature(impl)
+    except (TypeError, ValueError):
+        return None
+
+def _call_vendor(method: str, args: tuple, kwargs: dict) -> Tuple[str, Any]:
+    """Call the first available vendor for method; returns (vendor, result)."""
     category = get_category_for_method(method)
     vendor_config = get_vendor(category, method)
     primary_vendors = [v.strip() for v in vendor_config.split(',')]
@@ -155,8 +186,8 @@ def route_to_vendor(method: str, *args, **kwargs):
         impl_func = vendor_impl[0] if isinstance(vendor_impl, list) else vendor_impl
 
         try:
-            return impl_func(*args, **kwargs)
+            return vendor, impl_func(*args, **kwargs)
         except AlphaVantageRateLimitError:
             continue  # Only rate limits trigger fallback
 
-    raise RuntimeError(f"No available vendor for '{method}'")
\ No newline at end of file
+    raise RuntimeError(f"No available vendor for '{method}'")
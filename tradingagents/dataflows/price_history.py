@@ -0,0 +1,273 @@
+import glob
+import os
+import re
+import threading
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    feather = None
+
+from .config import get_config
+
+# Years of daily history kept per symbol
+HISTORY_YEARS = 15
+# Subdirectory of data_cache_dir holding one file per symbol
+HISTORY_DIR = "price_history"
+PRICE_COLUMNS = ["Date", "Open", "High", "Low", "Close", "Volume"]
+# Relative tolerance when checking that re-fetched bars still match the stored ones
+ADJUSTMENT_RTOL = 1e-6
+
+# Old per-day downloads: {symbol}-YFin-data-{start}-{end}.csv
+_LEGACY_NAME = re.compile(r"-YFin-data-(\d{4}-\d{2}-\d{2})-(\d{4}-\d{2}-\d{2})\.csv$")
+# Fixed snapshot read by the "local" technical_indicators vendor; never cleaned up
+OFFLINE_SNAPSHOT_RANGE = ("2015-01-01", "2025-03-25")
+
+Downloader = Callable[[str, date, date], pd.DataFrame]
+
+
+def download_yfinance(symbol: str, start: date, end: date) -> pd.DataFrame:
+    """Daily auto-adjusted bars from Yahoo Finance for [start, end)."""
+    import yfinance as yf
+
+    data = yf.download(
+        symbol,
+        start=start.strftime("%Y-%m-%d"),
+        end=end.strftime("%Y-%m-%d"),
+        multi_level_index=False,
+        progress=False,
+        auto_adjust=True,
+    )
+    return data.reset_index()
+
+
+def _normalize(data: pd.DataFrame) -> pd.DataFrame:
+    """Keep PRICE_COLUMNS, with naive datetimes sorted and unique by Date."""
+    if data is None or data.empty or "Date" not in data.columns:
+        return pd.DataFrame(columns=PRICE_COLUMNS).astype({"Date": "datetime64[ns]"})
+    data = data[[c for c in PRICE_COLUMNS if c in data.columns]].copy()
+    dates = pd.to_datetime(data["Date"])
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    data["Date"] = dates.astype("datetime64[ns]")
+    data = data.dropna(subset=["Date"]).sort_values("Date", kind="stable")
+    return data.drop_duplicates("Date", keep="last").reset_index(drop=True)
+
+
+@dataclass
+class _StoredHistory:
+    signature: tuple
+    frame: pd.DataFrame
+
+
+class PriceHistoryStore:
+    """
+    Per-symbol daily price history that only grows by new bars.
+
+    Each symbol lives in one file with a stable name: Arrow IPC (read
+    memory-mapped) when pyarrow is installed, CSV otherwise. The file's
+    mtime records the last day the vendor was asked for new bars, so each
+    symbol costs at most one small download per day across processes.
+
+    Appending auto-adjusted bars is only valid while the stored history
+    shares the same adjustment basis. Every update therefore re-fetches the
+    last stored bar, and rebuilds the full history when its close has moved
+    (dividend or split adjustment).
+
+    Parsed frames are kept in-process and reused until the file changes.
+    Callers must treat returned frames as read-only.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        years: int = HISTORY_YEARS,
+        downloader: Optional[Downloader] = None,
+        today: Optional[Callable[[], date]] = None,
+    ):
+        self.cache_dir = cache_dir
+        self.history_dir = os.path.join(cache_dir, HISTORY_DIR)
+        self.years = years
+        self.downloader = downloader or download_yfinance
+        self._today = today or date.today
+        self._frames: Dict[str, _StoredHistory] = {}
+        self._cleaned: set = set()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.stats = {"downloads": 0, "full_downloads": 0, "reads": 0, "bars_appended": 0}
+
+    def _symbol_lock(self, symbol: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(symbol, threading.Lock())
+
+    def path(self, symbol: str) -> str:
+        suffix = ".arrow" if feather is not None else ".csv"
+        return os.path.join(self.history_dir, f"{symbol}{suffix}")
+
+    @staticmethod
+    def _signature(path: str) -> Optional[tuple]:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def load(self, symbol: str) -> pd.DataFrame:
+        """
+        Return the symbol's history (Date plus OHLCV columns), first
+        appending any bars published since the last check today.
+        """
+        with self._symbol_lock(symbol):
+            path = self.path(symbol)
+            signature = self._signature(path)
+            cached = self._frames.get(symbol)
+            frame = cached.frame if cached is not None and cached.signature == signature else None
+
+            if frame is None and signature is not None:
+                frame = self._read(path)
+                self.stats["reads"] += 1
+            if frame is None:
+                frame = self._seed_from_legacy(symbol)
+
+            checked_on = date.fromtimestamp(signature[0] / 1e9) if signature is not None else None
+            if checked_on is None or checked_on < self._today():
+                frame = self._update(symbol, path, frame)
+                signature = self._signature(path)
+
+            # Keep the old downloads until the stored file exists (update or write may have failed)
+            if symbol not in self._cleaned and signature is not None:
+                self.cleanup_legacy(symbol)
+                self._cleaned.add(symbol)
+
+            self._frames[symbol] = _StoredHistory(signature=signature, frame=frame)
+            return frame
+
+    def _update(self, symbol: str, path: str, stored: Optional[pd.DataFrame]) -> pd.DataFrame:
+        """Fetch bars after the last stored one; write the file (or touch it when nothing is new)."""
+        today = self._today()
+        try:
+            if stored is None or stored.empty:
+                frame = self._download_full(symbol, today)
+            else:
+                frame = self._append_new_bars(symbol, stored, today)
+        except Exception as e:
+            if stored is None:
+                raise
+            print(f"PriceHistoryStore: update {symbol} failed, using stored history: {e}")
+            return stored
+
+        try:
+            if frame is stored and os.path.exists(path):
+                # Nothing new: only mark the symbol as checked today
+                os.utime(path)
+                return stored
+            cutoff = pd.Timestamp(today) - pd.DateOffset(years=self.years)
+            frame = frame[frame["Date"] >= cutoff].reset_index(drop=True)
+            self._write(path, frame)
+        except Exception as e:
+            print(f"PriceHistoryStore: write {path} failed: {e}")
+        return frame
+
+    def _download(self, symbol: str, start: date, end: date) -> pd.DataFrame:
+        self.stats["downloads"] += 1
+        return _normalize(self.downloader(symbol, start, end))
+
+    def _download_full(self, symbol: str, today: date) -> pd.DataFrame:
+        self.stats["full_downloads"] += 1
+        start = (pd.Timestamp(today) - pd.DateOffset(years=self.years)).date()
+        return self._download(symbol, start, today)
+
+    def _append_new_bars(self, symbol: str, stored: pd.DataFrame, today: date) -> pd.DataFrame:
+        last = stored["Date"].iloc[-1]
+        if last.date() >= today - timedelta(days=1):
+            return stored
+
+        # Re-fetch the last stored bar as well, to detect a changed adjustment basis
+        fresh = self._download(symbol, last.date(), today)
+        if fresh.empty:
+            return stored
+        overlap = fresh.loc[fresh["Date"] == last, "Close"]
+        if overlap.empty or not np.isclose(overlap.iloc[0], stored["Close"].iloc[-1], rtol=ADJUSTMENT_RTOL):
+            return self._download_full(symbol, today)
+
+        new_bars = fresh[fresh["Date"] > last]
+        if new_bars.empty:
+            return stored
+        self.stats["bars_appended"] += len(new_bars)
+        return pd.concat([stored, new_bars], ignore_index=True)
+
+    def _read(self, path: str) -> Optional[pd.DataFrame]:
+        try:
+            if path.endswith(".arrow"):
+                return _normalize(feather.read_table(path, memory_map=True).to_pandas())
+            return _normalize(pd.read_csv(path))
+        except Exception as e:
+            print(f"PriceHistoryStore: read {path} failed: {e}")
+            return None
+
+    def _write(self, path: str, frame: pd.DataFrame) -> None:
+        """Write to a temporary file, then atomically replace the stored one."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        if path.endswith(".arrow"):
+            feather.write_feather(pa.Table.from_pandas(frame, preserve_index=False), tmp_path)
+        else:
+            frame.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def _legacy_files(self, symbol: str) -> Dict[str, tuple]:
+        """Date-stamped downloads for symbol, mapped to their (start, end) range."""
+        files = {}
+        pattern = os.path.join(glob.escape(self.cache_dir), f"{glob.escape(symbol)}-YFin-data-*.csv")
+        for path in glob.glob(pattern):
+            name = os.path.basename(path)
+            match = _LEGACY_NAME.search(name)
+            if match and name[:match.start()] == symbol and match.groups() != OFFLINE_SNAPSHOT_RANGE:
+                files[path] = match.groups()
+        return files
+
+    def _seed_from_legacy(self, symbol: str) -> Optional[pd.DataFrame]:
+        """Start from the newest old-style download instead of fetching 15 years again."""
+        files = self._legacy_files(symbol)
+        if not files:
+            return None
+        newest = max(files, key=lambda path: files[path][1])
+        return self._read(newest)
+
+    def cleanup_legacy(self, symbol: str) -> int:
+        """Delete symbol's date-stamped downloads; returns the number removed."""
+        removed = 0
+        for path in self._legacy_files(symbol):
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError as e:
+                print(f"PriceHistoryStore: remove {path} failed: {e}")
+        return removed
+
+    def clear(self) -> None:
+        """Drop the in-process frames (files are kept)."""
+        with self._locks_guard:
+            self._frames.clear()
+
+
+_stores: Dict[str, PriceHistoryStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_price_history_store() -> PriceHistoryStore:
+    """Process-wide store for the configured data_cache_dir."""
+    cache_dir = get_config()["data_cache_dir"]
+    with _stores_lock:
+        store = _stores.get(cache_dir)
+        if store is None:
+            store = _stores[cache_dir] = PriceHistoryStore(cache_dir)
+    return store
@@ -0,0 +1,211 @@
+"""
+Run-scoped memoization of vendor tool calls.
+
+During one analysis run several analysts ask for the same data: the social
+and news analysts both call get_news for the same ticker and window, and the
+market analyst calls get_stock_data with overlapping ranges. While a RunMemo
+is active, route_to_vendor answers repeated calls from it, so each unique
+upstream request is made once per run. get_stock_data requests whose range
+lies inside an earlier one are answered by slicing that result.
+
+Activate a memo around a run with `with run_memo(analysis_date): ...`. The
+active memo is held in a context variable, which LangGraph and LangChain
+copy into the worker threads that execute tool nodes.
+"""
+
+import datetime as dt
+import inspect
+import re
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Vendors whose get_stock_data end_date is inclusive (yfinance's is exclusive)
+END_INCLUSIVE_VENDORS = {"alpha_vantage"}
+# Parameter names holding a ticker symbol; normalized to upper case
+_SYMBOL_PARAMS = {"symbol", "ticker"}
+
+_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_DATA_ROW = re.compile(r"^(\d{4}-\d{2}-\d{2})[ T,]")
+_STOCK_HEADER = re.compile(r"^(# Stock data for \S+ from )\S+ to \S+$")
+_RECORD_COUNT = re.compile(r"^# Total records: \d+$")
+
+# fetch(args, kwargs) -> (vendor, result)
+Fetch = Callable[[tuple, dict], Tuple[str, Any]]
+
+_active: ContextVar[Optional["RunMemo"]] = ContextVar("tradingagents_run_memo", default=None)
+
+
+def _normalize(name: str, value: Any) -> Any:
+    if isinstance(value, (dt.date, dt.datetime)):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, str):
+        value = value.strip()
+        return value.upper() if name in _SYMBOL_PARAMS else value
+    return value
+
+
+def slice_stock_data(text: str, start: str, end: str, end_inclusive: bool) -> Optional[str]:
+    """
+    Keep only the rows of a get_stock_data result dated within [start, end]
+    (or [start, end) when not end_inclusive), updating the yfinance header.
+    Returns None when no data row is left.
+    """
+    lines = text.splitlines(keepends=True)
+    kept: List[str] = []
+    rows = 0
+    for line in lines:
+        match = _DATA_ROW.match(line)
+        if match is None:
+            kept.append(line)
+            continue
+        day = match.group(1)
+        if start <= day and (day <= end if end_inclusive else day < end):
+            kept.append(line)
+            rows += 1
+    if rows == 0:
+        return None
+
+    for i, line in enumerate(kept):
+        body = line.rstrip("\n")
+        if _STOCK_HEADER.match(body):
+            kept[i] = _STOCK_HEADER.sub(rf"\g<1>{start} to {end}", body) + "\n"
+        elif _RECORD_COUNT.match(body):
+            kept[i] = f"# Total records: {rows}\n"
+    return "".join(kept)
+
+
+class _StockRange:
+    __slots__ = ("start", "end", "vendor", "result")
+
+    def __init__(self, start: str, end: str, vendor: str, result: str):
+        self.start = start
+        self.end = end
+        self.vendor = vendor
+        self.result = result
+
+
+class RunMemo:
+    """
+    Results of vendor calls made during one analysis run, keyed on
+    (method, normalized arguments, analysis_date).
+
+    Concurrent calls with the same key wait for the first one instead of
+    calling the vendor again. Failed calls are not remembered.
+    """
+
+    def __init__(self, analysis_date: Any, session_id: Optional[str] = None):
+        self.analysis_date = _normalize("analysis_date", analysis_date)
+        self.session_id = session_id
+        self._results: Dict[tuple, Any] = {}
+        self._stock_ranges: Dict[str, List[_StockRange]] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[tuple, threading.Lock] = {}
+        self.stats = {"calls": 0, "hits": 0, "range_hits": 0, "upstream_calls": 0}
+
+    def key(self, method: str, args: tuple, kwargs: dict, signature: Optional[inspect.Signature] = None) -> tuple:
+        """Memo key; with the vendor signature, positional and keyword spellings match."""
+        if signature is not None:
+            try:
+                bound = signature.bind(*args, **kwargs)
+                params = tuple((name, _normalize(name, value)) for name, value in bound.arguments.items())
+                return (method, params, self.analysis_date)
+            except TypeError:
+                pass
+        params = tuple((str(i), _normalize("", value)) for i, value in enumerate(args))
+        params += tuple(sorted((name, _normalize(name, value)) for name, value in kwargs.items()))
+        return (method, params, self.analysis_date)
+
+    def _key_lock(self, key: tuple) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def call(
+        self,
+        method: str,
+        args: tuple,
+        kwargs: dict,
+        fetch: Fetch,
+        signature: Optional[inspect.Signature] = None,
+    ) -> Any:
+        """Return the remembered result for this call, fetching it on first use."""
+        key = self.key(method, args, kwargs, signature)
+        with self._lock:
+            self.stats["calls"] += 1
+        with self._key_lock(key):
+            with self._lock:
+                if key in self._results:
+                    self.stats["hits"] += 1
+                    return self._results[key]
+            stock_range = self._stock_range(method, key)
+            if stock_range is not None:
+                sliced = self._from_stock_ranges(*stock_range)
+                if sliced is not None:
+                    with self._lock:
+                        self.stats["range_hits"] += 1
+                        self._results[key] = sliced
+                    return sliced
+
+            vendor, result = fetch(args, kwargs)
+            with self._lock:
+                self.stats["upstream_calls"] += 1
+                self._results[key] = result
+                if stock_range is not None and isinstance(result, str):
+                    symbol, start, end = stock_range
+                    self._stock_ranges.setdefault(symbol, []).append(_StockRange(start, end, vendor, result))
+            return result
+
+    @staticmethod
+    def _stock_range(method: str, key: tuple) -> Optional[Tuple[str, str, str]]:
+        """(symbol, start, end) of a get_stock_data key with ISO dates, else None."""
+        if method != "get_stock_data":
+            return None
+        values = [value for _, value in key[1]]
+        if len(values) != 3 or not all(isinstance(value, str) for value in values):
+            return None
+        symbol, start, end = values
+        if not (_DATE.match(start) and _DATE.match(end)):
+            return None
+        return symbol, start, end
+
+    def _from_stock_ranges(self, symbol: str, start: str, end: str) -> Optional[str]:
+        """Slice an earlier get_stock_data result whose range covers [start, end]."""
+        with self._lock:
+            candidates = [r for r in self._stock_ranges.get(symbol, ()) if r.start <= start and end <= r.end]
+        for stored in candidates:
+            sliced = slice_stock_data(stored.result, start, end, stored.vendor in END_INCLUSIVE_VENDORS)
+            if sliced is not None:
+                return sliced
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        stats["saved_calls"] = stats["hits"] + stats["range_hits"]
+        return stats
+
+
+def active_run_memo() -> Optional[RunMemo]:
+    """The memo of the run executing in this context, if any."""
+    return _active.get()
+
+
+@contextmanager
+def run_memo(analysis_date: Any = None, memo: Optional[RunMemo] = None) -> Iterator[Optional[RunMemo]]:
+    """
+    Make `memo` (or a new RunMemo for analysis_date) the active memo for the
+    duration of the block. Inside a run that already has an active memo,
+    the outer memo is kept, so nested propagate calls share one memo.
+    """
+    current = _active.get()
+    if memo is None and current is not None:
+        yield current
+        return
+    if memo is None:
+        memo = RunMemo(analysis_date)
+    token = _active.set(memo)
+    try:
+        yield memo
+    finally:
+        _active.reset(token)
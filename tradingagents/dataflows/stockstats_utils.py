@@ -1,12 +1,62 @@
+import threading
 import pandas as pd
-import yfinance as yf
 from stockstats import wrap
-from typing import Annotated
-import os
-from .config import get_config
+from typing import Annotated, Dict, List, Tuple
+from . import indicator_kernels
+from .price_history import get_price_history_store
+
+# symbol -> (source frame, prepared frame). Computed indicators are kept as
+# columns of the prepared frame, so each one is computed only once.
+_wrapped_cache: Dict[str, Tuple[pd.DataFrame, pd.DataFrame]] = {}
+_wrapped_lock = threading.Lock()
 
 
 class StockstatsUtils:
+    @staticmethod
+    def wrap_history(symbol: str, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Prepare price history for indicator calculation (lowercase columns,
+        sorted date index), reusing the prepared frame and the indicator
+        columns already computed on it while `data` is the same object,
+        e.g. the shared frame from PriceHistoryStore.
+        """
+        with _wrapped_lock:
+            cached = _wrapped_cache.get(symbol)
+            if cached is not None and cached[0] is data:
+                return cached[1]
+        df = data.rename(columns=str.lower).set_index("date")
+        df.index = pd.to_datetime(df.index)
+        df = df.sort_index()
+        with _wrapped_lock:
+            _wrapped_cache[symbol] = (data, df)
+        return df
+
+    @staticmethod
+    def indicator_frame(symbol: str, data: pd.DataFrame, indicators: List[str]) -> pd.DataFrame:
+        """
+        Several indicators for every bar (one column each), indexed by date.
+        Supported indicators use the NumPy kernels; anything else falls back
+        to stockstats.
+        """
+        df = StockstatsUtils.wrap_history(symbol, data)
+        # Computed indicators are added as columns of the shared frame
+        with _wrapped_lock:
+            missing = [name for name in dict.fromkeys(indicators) if name not in df.columns]
+            native = [name for name in missing if indicator_kernels.is_supported(name)]
+            for name, values in indicator_kernels.compute_arrays(df, native).items():
+                df[name] = values
+            others = [name for name in missing if name not in native]
+            if others:
+                stats = wrap(df.copy())
+                for name in others:
+                    df[name] = stats[name].to_numpy()
+            return pd.DataFrame(df[list(indicators)])
+
+    @staticmethod
+    def indicator_series(symbol: str, data: pd.DataFrame, indicator: str) -> pd.Series:
+        """Indicator values for every bar, indexed by date."""
+        return StockstatsUtils.indicator_frame(symbol, data, [indicator])[indicator]
+
     @staticmethod
     def get_stock_stats(
         symbol: Annotated[str, "ticker symbol for the company"],
@@ -17,48 +67,12 @@ class StockstatsUtils:
             str, "curr date for retrieving stock price data, YYYY-mm-dd"
         ],
     ):
-        config = get_config()
-
-        today_date = pd.Timestamp.today()
-        curr_date_dt = pd.to_datetime(curr_date)
-
-        end_date = today_date
-        start_date = today_date - pd.DateOffset(years=15)
-        start_date_str = start_date.strftime("%Y-%m-%d")
-        end_date_str = end_date.strftime("%Y-%m-%d")
-
-        # Ensure cache directory exists
-        os.makedirs(config["data_cache_dir"], exist_ok=True)
-
-        data_file = os.path.join(
-            config["data_cache_dir"],
-            f"{symbol}-YFin-data-{start_date_str}-{end_date_str}.csv",
-        )
-
-        if os.path.exists(data_file):
-            data = pd.read_csv(data_file)
-            data["Date"] = pd.to_datetime(data["Date"])
-        else:
-            data = yf.download(
-                symbol,
-                start=start_date_str,
-                end=end_date_str,
-                multi_level_index=False,
-                progress=False,
-                auto_adjust=True,
-            )
-            data = data.reset_index()
-            data.to_csv(data_file, index=False)
-
-        df = wrap(data)
-        df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-        curr_date_str = curr_date_dt.strftime("%Y-%m-%d")
-
-        df[indicator]  # trigger stockstats to calculate the indicator
-        matching_rows = df[df["Date"].str.startswith(curr_date_str)]
+        data = get_price_history_store().load(symbol)
+        series = StockstatsUtils.indicator_series(symbol, data, indicator)
 
-        if not matching_rows.empty:
-            indicator_value = matching_rows[indicator].values[0]
-            return indicator_value
+        curr_date_dt = pd.to_datetime(curr_date).normalize()
+        pos = series.index.searchsorted(curr_date_dt)
+        if pos < len(series) and series.index[pos].normalize() == curr_date_dt:
+            return series.iloc[pos]
         else:
             return "N/A: Not a trading day (weekend or holiday)"
@@ -1,9 +1,12 @@
-from typing import Annotated
+from typing import Annotated, Dict, List
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
+import numpy as np
+import pandas as pd
 import yfinance as yf
 import os
 from .stockstats_utils import StockstatsUtils
+from .price_history import get_price_history_store
 
 def get_YFin_data_online(
     symbol: Annotated[str, "ticker symbol of the company"],
@@ -128,143 +131,163 @@ def get_stock_stats_indicators_window(
         ),
     }
 
-    if indicator not in best_ind_params:
+    # Several indicators may be requested at once as a comma-separated list
+    indicators = [name.strip() for name in indicator.split(",") if name.strip()]
+    unsupported = [name for name in indicators if name not in best_ind_params]
+    if not indicators or unsupported:
         raise ValueError(
-            f"Indicator {indicator} is not supported. Please choose from: {list(best_ind_params.keys())}"
+            f"Indicator {', '.join(unsupported) or indicator} is not supported. Please choose from: {list(best_ind_params.keys())}"
         )
 
     end_date = curr_date
     curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
     before = curr_date_dt - relativedelta(days=look_back_days)
 
-    # Optimized: Get stock data once and calculate indicators for all dates
+    # Optimized: compute all requested indicators in one pass and slice the window
     try:
-        indicator_data = _get_stock_stats_bulk(symbol, indicator, curr_date)
-        
-        # Generate the date range we need
-        current_dt = curr_date_dt
-        date_values = []
-        
-        while current_dt >= before:
-            date_str = current_dt.strftime('%Y-%m-%d')
-            
-            # Look up the indicator value for this date
-            if date_str in indicator_data:
-                indicator_value = indicator_data[date_str]
-            else:
-                indicator_value = "N/A: Not a trading day (weekend or holiday)"
-            
-            date_values.append((date_str, indicator_value))
-            current_dt = current_dt - relativedelta(days=1)
-        
-        # Build the result string
-        ind_string = ""
-        for date_str, value in date_values:
-            ind_string += f"{date_str}: {value}\n"
-        
+        windows = _get_indicator_windows(
+            symbol, indicators, curr_date, before.strftime("%Y-%m-%d")
+        )
+        # Calendar days of the window, newest first
+        days = pd.date_range(before, curr_date_dt, freq="D")[::-1]
+        ind_strings = [_format_indicator_window(windows[name], days) for name in indicators]
+
     except Exception as e:
         print(f"Error getting bulk stockstats data: {e}")
         # Fallback to original implementation if bulk method fails
-        ind_string = ""
-        curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
-        while curr_date_dt >= before:
-            indicator_value = get_stockstats_indicator(
-                symbol, indicator, curr_date_dt.strftime("%Y-%m-%d")
-            )
-            ind_string += f"{curr_date_dt.strftime('%Y-%m-%d')}: {indicator_value}\n"
-            curr_date_dt = curr_date_dt - relativedelta(days=1)
+        ind_strings = []
+        for name in indicators:
+            ind_string = ""
+            curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
+            while curr_date_dt >= before:
+                indicator_value = get_stockstats_indicator(
+                    symbol, name, curr_date_dt.strftime("%Y-%m-%d")
+                )
+                ind_string += f"{curr_date_dt.strftime('%Y-%m-%d')}: {indicator_value}\n"
+                curr_date_dt = curr_date_dt - relativedelta(days=1)
+            ind_strings.append(ind_string)
 
-    result_str = (
-        f"## {indicator} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
+    return "\n\n".join(
+        f"## {name} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
         + ind_string
         + "\n\n"
-        + best_ind_params.get(indicator, "No description available.")
+        + best_ind_params.get(name, "No description available.")
+        for name, ind_string in zip(indicators, ind_strings)
+    )
+
+
+def _format_indicator_window(values: pd.Series, days: pd.DatetimeIndex) -> str:
+    """
+    Format one indicator as "YYYY-mm-dd: value" lines for every calendar day
+    in `days`; days without a bar are marked as non-trading days.
+    """
+    aligned = values.reindex(days)
+    text = np.where(
+        days.isin(values.index),
+        np.where(aligned.isna(), "N/A", aligned.astype(object).astype(str)),
+        "N/A: Not a trading day (weekend or holiday)",
     )
+    return "".join(f"{day}: {value}\n" for day, value in zip(days.strftime("%Y-%m-%d"), text))
+
+
+def indicator_history_source() -> str:
+    """
+    Source load_stock_history reads from: "local" for the offline CSV
+    snapshot, "yfinance" for the online per-symbol history.
+    """
+    from .config import get_config
 
-    return result_str
+    return "local" if get_config()["data_vendors"]["technical_indicators"] == "local" else "yfinance"
 
 
-def _get_stock_stats_bulk(
-    symbol: Annotated[str, "ticker symbol of the company"],
-    indicator: Annotated[str, "technical indicator to calculate"],
-    curr_date: Annotated[str, "current date for reference"]
-) -> dict:
+def load_stock_history(symbol: Annotated[str, "ticker symbol of the company"]):
     """
-    Optimized bulk calculation of stock stats indicators.
-    Fetches data once and calculates indicator for all available dates.
-    Returns dict mapping date strings to indicator values.
+    Load the full price history used for indicator calculation.
+    Returns a DataFrame with a Date column and OHLCV columns.
     """
     from .config import get_config
     import pandas as pd
-    from stockstats import wrap
     import os
-    
+
     config = get_config()
-    online = config["data_vendors"]["technical_indicators"] != "local"
-    
-    if not online:
+
+    if indicator_history_source() == "local":
         # Local data path
         try:
-            data = pd.read_csv(
+            return pd.read_csv(
                 os.path.join(
                     config.get("data_cache_dir", "data"),
                     f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
                 )
             )
-            df = wrap(data)
         except FileNotFoundError:
             raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
-    else:
-        # Online data fetching with caching
-        today_date = pd.Timestamp.today()
-        curr_date_dt = pd.to_datetime(curr_date)
-        
-        end_date = today_date
-        start_date = today_date - pd.DateOffset(years=15)
-        start_date_str = start_date.strftime("%Y-%m-%d")
-        end_date_str = end_date.strftime("%Y-%m-%d")
-        
-        os.makedirs(config["data_cache_dir"], exist_ok=True)
-        
-        data_file = os.path.join(
-            config["data_cache_dir"],
-            f"{symbol}-YFin-data-{start_date_str}-{end_date_str}.csv",
+
+    # Online: persistent per-symbol history, extended with new bars once a day
+    return get_price_history_store().load(symbol)
+
+
+def _get_indicator_materializer():
+    """
+    Return the shared pstds indicator materializer for the configured
+    data_cache_dir, or None when the indicator cache is disabled or pstds
+    is not importable.
+    """
+    from .config import get_config
+
+    config = get_config()
+    if not config.get("indicator_cache", False):
+        return None
+    try:
+        from pstds.data.indicators import get_indicator_materializer
+    except ImportError:
+        return None
+    return get_indicator_materializer(config["data_cache_dir"])
+
+
+def _get_indicator_windows(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    indicators: Annotated[List[str], "technical indicators to calculate"],
+    curr_date: Annotated[str, "current date for reference"],
+    start_date: Annotated[str, "first date needed, yyyy-mm-dd"] = None,
+) -> Dict[str, pd.Series]:
+    """
+    Optimized batch calculation of stock stats indicators.
+    Returns, per indicator, the values of the trading days in
+    [start_date, curr_date] (NaN during the warm-up period).
+
+    When the indicator cache is enabled, all supported indicators are
+    materialized once per symbol and history source per new bar and only the requested
+    window is read back from the cache. Otherwise all indicators are
+    computed on the shared in-process history frame and the window is
+    located with a binary search on its sorted date index.
+    """
+    start = pd.Timestamp(start_date or curr_date)
+    end = pd.Timestamp(curr_date)
+
+    materializer = _get_indicator_materializer()
+    if materializer is not None and all(name in materializer.indicators for name in indicators):
+        windows = materializer.get_windows(
+            symbol,
+            indicators,
+            start.date(),
+            end.date(),
+            lambda: load_stock_history(symbol),
+            source=indicator_history_source(),
         )
-        
-        if os.path.exists(data_file):
-            data = pd.read_csv(data_file)
-            data["Date"] = pd.to_datetime(data["Date"])
-        else:
-            data = yf.download(
-                symbol,
-                start=start_date_str,
-                end=end_date_str,
-                multi_level_index=False,
-                progress=False,
-                auto_adjust=True,
+        return {
+            name: pd.Series(
+                [np.nan if value is None else value for value in window.values()],
+                index=pd.DatetimeIndex(list(window.keys())),
+                dtype="float64",
             )
-            data = data.reset_index()
-            data.to_csv(data_file, index=False)
-        
-        df = wrap(data)
-        df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-    
-    # Calculate the indicator for all rows at once
-    df[indicator]  # This triggers stockstats to calculate the indicator
-    
-    # Create a dictionary mapping date strings to indicator values
-    result_dict = {}
-    for _, row in df.iterrows():
-        date_str = row["Date"]
-        indicator_value = row[indicator]
-        
-        # Handle NaN/None values
-        if pd.isna(indicator_value):
-            result_dict[date_str] = "N/A"
-        else:
-            result_dict[date_str] = str(indicator_value)
-    
-    return result_dict
+            for name, window in windows.items()
+        }
+
+    frame = StockstatsUtils.indicator_frame(symbol, load_stock_history(symbol), indicators)
+    lo, hi = frame.index.searchsorted(start, "left"), frame.index.searchsorted(end, "right")
+    window = frame.iloc[lo:hi]
+    return {name: window[name] for name in indicators}
 
 
 def get_stockstats_indicator(
@@ -31,4 +31,8 @@ DEFAULT_CONFIG = {
     "tool_vendors": {
         # Example: "get_stock_data": "alpha_vantage",  # Override category default
     },
+    # Serve yfinance indicator windows from the pstds technical_cache under
+    # data_cache_dir (all indicators materialized once per symbol and
+    # history source per new bar)
+    "indicator_cache": False,
 }
@@ -1,11 +1,6 @@
 # TradingAgents/graph/__init__.py
 
-from .trading_graph import TradingAgentsGraph
-from .conditional_logic import ConditionalLogic
-from .setup import GraphSetup
-from .propagation import Propagator
-from .reflection import Reflector
-from .signal_processing import SignalProcessor
+import importlib
 
 __all__ = [
     "TradingAgentsGraph",
@@ -15,3 +10,26 @@ __all__ = [
     "Reflector",
     "SignalProcessor",
 ]
+
+# Submodules pull in langchain/langgraph, so they are imported on first access (PEP 562)
+_EXPORTS = {
+    "TradingAgentsGraph": ".trading_graph",
+    "ConditionalLogic": ".conditional_logic",
+    "GraphSetup": ".setup",
+    "Propagator": ".propagation",
+    "Reflector": ".reflection",
+    "SignalProcessor": ".signal_processing",
+}
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -15,12 +15,7 @@ except ImportError:
     go = None
     make_subplots = None
 
-try:
-    import pandas_ta as ta
-    PANDAS_TA_AVAILABLE = True
-except ImportError:
-    PANDAS_TA_AVAILABLE = False
-    ta = None
+from tradingagents.dataflows import indicator_kernels
 
 
 def create_candlestick_chart(
@@ -119,7 +114,7 @@ def create_candlestick_chart(
     )
 
     # 添加均线
-    if show_ma and PANDAS_TA_AVAILABLE:
+    if show_ma:
         ma_colors = ['#ff9800', '#2196f3', '#4caf50', '#9c27b0']
         for i, period in enumerate(ma_periods):
             ma_col = f'MA{period}'
@@ -288,54 +283,18 @@ def _add_technical_indicators(df: pd.DataFrame, ma_periods: list) -> pd.DataFram
         添加了技术指标的 DataFrame
     """
     df = df.copy()
+    close = df['close'].to_numpy(dtype='float64')
 
-    if PANDAS_TA_AVAILABLE:
-        # 计算均线
-        for period in ma_periods:
-            ma_col = f'MA{period}'
-            if len(df) >= period:
-                df[ma_col] = ta.sma(df['close'], length=period)
-
-        # 计算 MACD
-        if len(df) >= 26:
-            macd_df = ta.macd(df['close'], fast=12, slow=26, signal=9)
-            if macd_df is not None and not macd_df.empty:
-                # 获取实际的列名（pandas_ta 返回: MACD_12_26_9, MACDs_12_26_9, MACDh_12_26_9）
-                macd_cols = [c for c in macd_df.columns if c == 'MACD_12_26_9' or (c.startswith('MACD') and 'h' not in c and 's' not in c)]
-                if macd_cols:
-                    df['MACD'] = macd_df[macd_cols[0]]
-                signal_cols = [c for c in macd_df.columns if 'MACDs' in c or 'signal' in c.lower()]
-                if signal_cols:
-                    df['MACD_signal'] = macd_df[signal_cols[0]]
-                hist_cols = [c for c in macd_df.columns if 'MACDh' in c or 'hist' in c.lower()]
-                if hist_cols:
-                    df['MACD_hist'] = macd_df[hist_cols[0]]
-
-        # 计算 RSI
-        if len(df) >= 14:
-            rsi_series = ta.rsi(df['close'], length=14)
-            if rsi_series is not None:
-                df['RSI'] = rsi_series
-    else:
-        # 如果 pandas-ta 不可用，使用简化计算
-        for period in ma_periods:
-            ma_col = f'MA{period}'
-            if len(df) >= period:
-                df[ma_col] = df['close'].rolling(window=period).mean()
-
-        if len(df) >= 26:
-            ema_fast = df['close'].ewm(span=12).mean()
-            ema_slow = df['close'].ewm(span=26).mean()
-            df['MACD'] = ema_fast - ema_slow
-            df['MACD_signal'] = df['MACD'].ewm(span=9).mean()
-            df['MACD_hist'] = df['MACD'] - df['MACD_signal']
-
-        if len(df) >= 15:
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            df['RSI'] = 100 - (100 / (1 + rs))
+    # 与 Agent 使用同一套指标内核（tradingagents.dataflows.indicator_kernels）
+    for period in ma_periods:
+        if len(df) >= period:
+            df[f'MA{period}'] = indicator_kernels.sma(close, period, min_periods=period)
+
+    if len(df) >= 26:
+        df['MACD'], df['MACD_signal'], df['MACD_hist'] = indicator_kernels.macd(close)
+
+    if len(df) >= 15:
+        df['RSI'] = indicator_kernels.rsi(close, 14)
 
     return df
 
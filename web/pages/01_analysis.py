@@ -16,10 +16,9 @@ from pstds.temporal.context import TemporalContext
 from pstds.agents.output_schemas import TradeDecision, DataSource
 from pstds.data.router import MarketRouter
 from pstds.data.fallback import FallbackManager
-from pstds.data.adapters.yfinance_adapter import YFinanceAdapter
-from pstds.data.adapters.akshare_adapter import AKShareAdapter
-from pstds.data.adapters.alphavantage_adapter import AlphaVantageAdapter
-from pstds.data.adapters.local_csv_adapter import LocalCSVAdapter
+from pstds.data.cache import get_cache_manager
+from pstds.data.incremental import IncrementalOHLCVFetcher
+from pstds.data.adapters.registry import get_adapter_registry
 from pstds.config import get_config
 from web.components.chart import create_candlestick_chart
 
@@ -324,12 +323,12 @@ else:
 
         # 获取 OHLCV 数据用于图表显示
         chart_df = None
-        if (FallbackManager is None or YFinanceAdapter is None or
-            AKShareAdapter is None or AlphaVantageAdapter is None or LocalCSVAdapter is None):
+        if FallbackManager is None:
             st.error("数据适配器模块未正确导入，无法显示图表")
         else:
-            # 加载配置
+            # 加载配置；适配器取自进程级注册表，页面重跑之间复用同一实例
             config = get_config()
+            registry = get_adapter_registry()
 
             # 根据市场类型选择适配器
             primary_adapters = []
@@ -340,7 +339,7 @@ else:
             try:
                 av_api_key = config.get_api_key("alpha_vantage")
                 if av_api_key:
-                    av_adapter = AlphaVantageAdapter(api_key=av_api_key)
+                    av_adapter = registry.get("alphavantage")
                     st.info("✅ AlphaVantage 备用数据源已启用")
                 else:
                     st.warning("⚠️ AlphaVantage 未配置 API key，将跳过此数据源")
@@ -348,20 +347,20 @@ else:
                 st.warning(f"⚠️ AlphaVantage 配置错误: {e}")
 
             if market_type == "US":
-                primary_adapters = [YFinanceAdapter()]
+                primary_adapters = [registry.get("yfinance")]
                 if av_adapter:
-                    fallback_adapters = [av_adapter, LocalCSVAdapter()]
+                    fallback_adapters = [av_adapter, registry.get("local_csv")]
                 else:
-                    fallback_adapters = [LocalCSVAdapter()]
+                    fallback_adapters = [registry.get("local_csv")]
             elif market_type == "CN_A":
-                primary_adapters = [AKShareAdapter()]
-                fallback_adapters = [LocalCSVAdapter()]
+                primary_adapters = [registry.get("akshare")]
+                fallback_adapters = [registry.get("local_csv")]
             elif market_type == "HK":
-                primary_adapters = [YFinanceAdapter()]
+                primary_adapters = [registry.get("yfinance")]
                 if av_adapter:
-                    fallback_adapters = [av_adapter, LocalCSVAdapter()]
+                    fallback_adapters = [av_adapter, registry.get("local_csv")]
                 else:
-                    fallback_adapters = [LocalCSVAdapter()]
+                    fallback_adapters = [registry.get("local_csv")]
 
             fallback_manager = FallbackManager(
                 primary_adapters=primary_adapters,
@@ -378,12 +377,14 @@ else:
                 market_type_for_chart = st.session_state.get("market_type", market_type)
                 ctx_for_chart = st.session_state.get("ctx", ctx)
 
-                ohlcv_result = fallback_manager.get_ohlcv(
+                # 经缓存增量获取：重复查看同一股票时只请求缓存未覆盖的日期
+                ohlcv_result = IncrementalOHLCVFetcher(get_cache_manager()).get_ohlcv(
                     symbol=symbol_for_chart,
                     start_date=chart_start_date,
                     end_date=analysis_date,
                     interval="1d",
                     ctx=ctx_for_chart,
+                    fallback_manager=fallback_manager,
                 )
                 # 检查结果类型（调试用）
                 if ohlcv_result is not None: